@@ -577,6 +577,80 @@ def updater(cursor, current_version):
         # Set the new new user_version
         cursor.execute("PRAGMA user_version = 22")
         print("Updated database to version 22")
+        return False
+    elif current_version == 22:
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS log_webhooks (
+            id INTEGER PRIMARY KEY,
+            channel_id INTEGER NOT NULL UNIQUE,
+            guild_id INTEGER NOT NULL,
+            webhook_id INTEGER NOT NULL,
+            webhook_token TEXT NOT NULL
+        );
+        """)
+
+        # Set the new user_version
+        cursor.execute("PRAGMA user_version = 23")
+        print("Updated database to version 23")
+        return False
+    elif current_version == 23:
+        # Index the columns the DAOs look rows up by, so lookups don't scan whole tables
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_usernames_user_id_time ON usernames (user_id, time)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_usernames_username ON usernames (username)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_global_names_user_id_time ON global_names (user_id, time)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_global_names_global_name ON global_names (global_name)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_nicknames_user_id_guild_id_time ON nicknames (user_id, guild_id, time)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_nicknames_guild_id ON nicknames (guild_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_nicknames_nickname ON nicknames (nickname)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_punishments_user_id_guild_id ON punishments (user_id, guild_id, deleted, time)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_punishments_guild_id ON punishments (guild_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_verification_questions_guild_id ON verification_questions (guild_id, question_priority)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_verification_answers_question_id ON verification_answers (question_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_experience_user_id_guild_id ON experience (user_id, guild_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_experience_guild_id_amount ON experience (guild_id, amount)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_raffles_and_polls_type_end_date ON raffles_and_polls (type, end_date)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_raffles_and_polls_message ON raffles_and_polls (channel_id, message_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_raffles_and_polls_guild_id ON raffles_and_polls (guild_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_reminders_reminder_date ON reminders (reminder_date)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_reminders_creator_id ON reminders (creator_id, reminder_date)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_reminders_creator_guild_id ON reminders (creator_guild_id, reminder_date)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_reminders_finished ON reminders (id) WHERE repeats_left=0")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_user_reminders_reminder_id ON user_reminders (reminder_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_guild_roles_category_id ON guild_roles (category_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_guild_roles_role_id ON guild_roles (role_id, category_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_left_members_guild_id_user_id ON left_members (guild_id, user_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_left_members_user_id ON left_members (user_id, leave_date)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_temporary_bans_unban_date ON temporary_bans (unban_date)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_temporary_bans_guild_id ON temporary_bans (guild_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_unverified_reminder_messages_guild_id ON unverified_reminder_messages (guild_id, timedelta)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_unverified_reminder_history_user_id ON unverified_reminder_history (user_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_unverified_reminder_history_message_id ON unverified_reminder_history (reminder_message_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_utility_channels_guild_id ON utility_channels (guild_id, channel_purpose)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_log_webhooks_guild_id ON log_webhooks (guild_id)")
+
+        # Set the new user_version
+        cursor.execute("PRAGMA user_version = 24")
+        print("Updated database to version 24")
+        return False
+    elif current_version == 24:
+        # Merge duplicate experience rows so that every user has a single row per guild and
+        # experience can be added with upserts
+        cursor.execute("UPDATE experience SET amount=(SELECT SUM(e.amount) FROM experience e WHERE e.user_id=experience.user_id AND e.guild_id=experience.guild_id), last_experience=(SELECT MAX(e.last_experience) FROM experience e WHERE e.user_id=experience.user_id AND e.guild_id=experience.guild_id) WHERE id IN (SELECT MIN(id) FROM experience GROUP BY user_id, guild_id HAVING COUNT(*)>1)")
+        cursor.execute("DELETE FROM experience WHERE id NOT IN (SELECT MIN(id) FROM experience GROUP BY user_id, guild_id)")
+        cursor.execute("DROP INDEX IF EXISTS idx_experience_user_id_guild_id")
+        cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_experience_unique_user_id_guild_id ON experience (user_id, guild_id)")
+
+        # Set the new user_version
+        cursor.execute("PRAGMA user_version = 25")
+        print("Updated database to version 25")
+        return False
+    elif current_version == 25:
+        # Index the level reward roles so the roles a guild gives for a level are found quickly
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_level_reward_roles_guild_id ON level_reward_roles (guild_id, level_requirement)")
+
+        # Set the new user_version
+        cursor.execute("PRAGMA user_version = 26")
+        print("Updated database to version 26")
         return True
     else:
         print("No new updates found for your database version")
@@ -176,6 +176,13 @@ CREATE TABLE IF NOT EXISTS utility_channels (
     channel_purpose TEXT NOT NULL, /*LOG, RULES, PASSPHRASE*/
     CONSTRAINT unq UNIQUE (channel_id, guild_id, channel_purpose)
 );
+CREATE TABLE IF NOT EXISTS log_webhooks (
+    id INTEGER PRIMARY KEY,
+    channel_id INTEGER NOT NULL UNIQUE,
+    guild_id INTEGER NOT NULL,
+    webhook_id INTEGER NOT NULL,
+    webhook_token TEXT NOT NULL
+);
 CREATE TABLE IF NOT EXISTS currencies (
     id INTEGER PRIMARY KEY,
     guild_id INTEGER NOT NULL,
@@ -231,3 +238,36 @@ BEGIN
     SET price_currency_id = NULL
     WHERE price_currency_id = OLD.id;
 END;
+CREATE INDEX IF NOT EXISTS idx_usernames_user_id_time ON usernames (user_id, time);
+CREATE INDEX IF NOT EXISTS idx_usernames_username ON usernames (username);
+CREATE INDEX IF NOT EXISTS idx_global_names_user_id_time ON global_names (user_id, time);
+CREATE INDEX IF NOT EXISTS idx_global_names_global_name ON global_names (global_name);
+CREATE INDEX IF NOT EXISTS idx_nicknames_user_id_guild_id_time ON nicknames (user_id, guild_id, time);
+CREATE INDEX IF NOT EXISTS idx_nicknames_guild_id ON nicknames (guild_id);
+CREATE INDEX IF NOT EXISTS idx_nicknames_nickname ON nicknames (nickname);
+CREATE INDEX IF NOT EXISTS idx_punishments_user_id_guild_id ON punishments (user_id, guild_id, deleted, time);
+CREATE INDEX IF NOT EXISTS idx_punishments_guild_id ON punishments (guild_id);
+CREATE INDEX IF NOT EXISTS idx_verification_questions_guild_id ON verification_questions (guild_id, question_priority);
+CREATE INDEX IF NOT EXISTS idx_verification_answers_question_id ON verification_answers (question_id);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_experience_unique_user_id_guild_id ON experience (user_id, guild_id);
+CREATE INDEX IF NOT EXISTS idx_experience_guild_id_amount ON experience (guild_id, amount);
+CREATE INDEX IF NOT EXISTS idx_raffles_and_polls_type_end_date ON raffles_and_polls (type, end_date);
+CREATE INDEX IF NOT EXISTS idx_raffles_and_polls_message ON raffles_and_polls (channel_id, message_id);
+CREATE INDEX IF NOT EXISTS idx_raffles_and_polls_guild_id ON raffles_and_polls (guild_id);
+CREATE INDEX IF NOT EXISTS idx_reminders_reminder_date ON reminders (reminder_date);
+CREATE INDEX IF NOT EXISTS idx_reminders_creator_id ON reminders (creator_id, reminder_date);
+CREATE INDEX IF NOT EXISTS idx_reminders_creator_guild_id ON reminders (creator_guild_id, reminder_date);
+CREATE INDEX IF NOT EXISTS idx_reminders_finished ON reminders (id) WHERE repeats_left=0;
+CREATE INDEX IF NOT EXISTS idx_user_reminders_reminder_id ON user_reminders (reminder_id);
+CREATE INDEX IF NOT EXISTS idx_guild_roles_category_id ON guild_roles (category_id);
+CREATE INDEX IF NOT EXISTS idx_guild_roles_role_id ON guild_roles (role_id, category_id);
+CREATE INDEX IF NOT EXISTS idx_left_members_guild_id_user_id ON left_members (guild_id, user_id);
+CREATE INDEX IF NOT EXISTS idx_left_members_user_id ON left_members (user_id, leave_date);
+CREATE INDEX IF NOT EXISTS idx_temporary_bans_unban_date ON temporary_bans (unban_date);
+CREATE INDEX IF NOT EXISTS idx_temporary_bans_guild_id ON temporary_bans (guild_id);
+CREATE INDEX IF NOT EXISTS idx_unverified_reminder_messages_guild_id ON unverified_reminder_messages (guild_id, timedelta);
+CREATE INDEX IF NOT EXISTS idx_unverified_reminder_history_user_id ON unverified_reminder_history (user_id);
+CREATE INDEX IF NOT EXISTS idx_unverified_reminder_history_message_id ON unverified_reminder_history (reminder_message_id);
+CREATE INDEX IF NOT EXISTS idx_utility_channels_guild_id ON utility_channels (guild_id, channel_purpose);
+CREATE INDEX IF NOT EXISTS idx_log_webhooks_guild_id ON log_webhooks (guild_id);
+CREATE INDEX IF NOT EXISTS idx_level_reward_roles_guild_id ON level_reward_roles (guild_id, level_requirement);
@@ -0,0 +1,306 @@
+"""Measures the latency and throughput of the DAO methods against a large synthetic database,
+so the performance of different revisions can be compared. The database is generated from
+database/schema.sql with a fixed random seed, and the results are written to a JSON file.
+
+Usage (from the repository root):
+    PYTHONPATH=src python3 -m benchmarks.dao_benchmark [--output FILE] [--baseline FILE]
+
+A generated database can be kept with --database PATH and is then reused on later runs, which
+skips the slow generation step when comparing revisions. Every run works on a copy of the kept
+database, so the rows the write benchmarks add don't carry over to the next run."""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sqlite3
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import datetime, timedelta
+from benchmarks.storage_profile_benchmark import create_database
+from config.constants import DB_STORAGE_PROFILE
+from dao.guild_settings_dao import GuildSettingsDAO
+from dao.left_members_dao import LeftMembersDAO
+from dao.nicknames_dao import NicknamesDAO
+from dao.punishments_dao import PunishmentsDAO
+from dao.reminders_dao import RemindersDAO
+from dao.temp_bans_dao import TempBansDAO
+from dao.usernames_dao import UsernamesDAO
+from dao.utility_channels_dao import UtilityChannelsDAO
+from db_connection.db_connector import ConnectionPool
+
+SEED = 1234
+START_DATE = datetime(2023, 1, 1)
+
+def _dates(rng: random.Random):
+    """Generate random date strings within a year from START_DATE
+    Args:
+        rng: The random number generator to use
+    Returns: A function returning a new date string on every call"""
+
+    return lambda: (START_DATE + timedelta(seconds=rng.randrange(365 * 86400))).isoformat(" ")
+
+def populate_database(db_address: str, sizes: dict):
+    """Fill a database created from the schema with synthetic rows
+    Args:
+        db_address: The location of the database to fill
+        sizes: A dictionary with the numbers of users, guilds, usernames, nicknames,
+               punishments, left members, temp bans and reminders to generate"""
+
+    rng = random.Random(SEED)
+    random_date = _dates(rng)
+    users, guilds = sizes["users"], sizes["guilds"]
+
+    def user_id():
+        return rng.randrange(users)
+
+    def guild_id():
+        return rng.randrange(guilds)
+
+    connection = sqlite3.connect(db_address)
+    connection.executemany("INSERT INTO usernames (user_id, username, time) VALUES (?, ?, ?)",
+                           ((user_id(), f"user{index}", random_date())
+                            for index in range(sizes["usernames"])))
+    connection.executemany("INSERT INTO nicknames (user_id, nickname, guild_id, time) "
+                           "VALUES (?, ?, ?, ?)",
+                           ((user_id(), f"nick{index}", guild_id(), random_date())
+                            for index in range(sizes["nicknames"])))
+    connection.executemany("INSERT INTO punishments (user_id, issuer_id, guild_id, type, reason, "
+                           "time, deleted) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                           ((str(user_id()), user_id(), guild_id(),
+                             rng.choice(["BAN", "KICK", "TIMEOUT", "WARN"]), "Benchmark",
+                             random_date(), rng.random() < 0.1)
+                            for _ in range(sizes["punishments"])))
+    connection.executemany("INSERT INTO guild_settings (guild_id, setting_id, setting_value) "
+                           "SELECT ?, id, setting_value FROM settings",
+                           ((guild,) for guild in range(guilds)))
+    connection.executemany("INSERT INTO left_members (user_id, guild_id, leave_date) "
+                           "VALUES (?, ?, ?)",
+                           ((user_id(), guild_id(), random_date())
+                            for _ in range(sizes["left_members"])))
+    connection.executemany("INSERT OR IGNORE INTO temporary_bans (user_id, guild_id, unban_date) "
+                           "VALUES (?, ?, ?)",
+                           ((user_id(), guild_id(), random_date())
+                            for _ in range(sizes["temp_bans"])))
+    connection.executemany("INSERT INTO reminders (creator_id, creator_guild_id, content, "
+                           "reminder_date, public, interval, reminder_type, repeats_left) "
+                           "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                           ((user_id(), guild_id(), "Benchmark", random_date(),
+                             rng.random() < 0.5, 86400, "after", 1)
+                            for _ in range(sizes["reminders"])))
+    connection.executemany("INSERT OR IGNORE INTO utility_channels (channel_id, guild_id, "
+                           "channel_purpose) VALUES (?, ?, ?)",
+                           ((guild * 10 + index, guild, purpose)
+                            for guild in range(guilds)
+                            for index, purpose in enumerate(["LOG", "RULES", "PASSPHRASE"])))
+    connection.commit()
+    connection.execute("ANALYZE")
+    connection.close()
+
+def copy_database(source: str, target: str):
+    """Copy a database with SQLite's backup API, which also copies the changes still in its WAL
+    Args:
+        source: The location of the database to copy
+        target: Where to create the copy
+    Returns: The location of the copy"""
+
+    source_connection = sqlite3.connect(source)
+    target_connection = sqlite3.connect(target)
+    try:
+        source_connection.backup(target_connection)
+    finally:
+        target_connection.close()
+        source_connection.close()
+    return target
+
+def get_operations(db_address: str, sizes: dict):
+    """Get the DAO methods to benchmark
+    Args:
+        db_address: The location of the benchmark database
+        sizes: The sizes the database was generated with
+    Returns: A dictionary of operation names and coroutine functions taking a random number
+             generator as their only argument"""
+
+    usernames_dao = UsernamesDAO(db_address)
+    nicknames_dao = NicknamesDAO(db_address)
+    punishments_dao = PunishmentsDAO(db_address)
+    guild_settings_dao = GuildSettingsDAO(db_address)
+    left_members_dao = LeftMembersDAO(db_address)
+    temp_bans_dao = TempBansDAO(db_address)
+    reminders_dao = RemindersDAO(db_address)
+    utility_channels_dao = UtilityChannelsDAO(db_address)
+    users, guilds = sizes["users"], sizes["guilds"]
+
+    return {
+        "UsernamesDAO.find_user_usernames":
+            lambda rng: usernames_dao.find_user_usernames(rng.randrange(users)),
+        "UsernamesDAO.find_username":
+            lambda rng: usernames_dao.find_username(f"user{rng.randrange(sizes['usernames'])}"),
+        "UsernamesDAO.add_username":
+            lambda rng: usernames_dao.add_username(f"bench{rng.random()}", rng.randrange(users)),
+        "NicknamesDAO.find_user_nicknames":
+            lambda rng: nicknames_dao.find_user_nicknames(rng.randrange(users),
+                                                          rng.randrange(guilds)),
+        "PunishmentsDAO.get_user_punishments":
+            lambda rng: punishments_dao.get_user_punishments(str(rng.randrange(users)),
+                                                             rng.randrange(guilds)),
+        "PunishmentsDAO.add_punishment":
+            lambda rng: punishments_dao.add_punishment(str(rng.randrange(users)), 1,
+                                                       rng.randrange(guilds), "WARN",
+                                                       "Benchmark"),
+        "GuildSettingsDAO.get_guild_setting_value_by_name":
+            lambda rng: guild_settings_dao.get_guild_setting_value_by_name(
+                rng.randrange(guilds), "log_edited_messages"),
+        "GuildSettingsDAO.get_all_guild_settings":
+            lambda rng: guild_settings_dao.get_all_guild_settings(rng.randrange(guilds)),
+        "LeftMembersDAO.get_guild_left_member":
+            lambda rng: left_members_dao.get_guild_left_member(rng.randrange(users),
+                                                               rng.randrange(guilds)),
+        "TempBansDAO.get_guild_temp_bans":
+            lambda rng: temp_bans_dao.get_guild_temp_bans(rng.randrange(guilds)),
+        "RemindersDAO.get_reminders_by_user":
+            lambda rng: reminders_dao.get_reminders_by_user(rng.randrange(users)),
+        "UtilityChannelsDAO.get_guild_utility_channel_by_purpose":
+            lambda rng: utility_channels_dao.get_guild_utility_channel_by_purpose(
+                rng.randrange(guilds), "LOG")
+    }
+
+async def measure_operation(operation, operations: int, concurrency: int):
+    """Run an operation repeatedly from several workers and measure every call
+    Args:
+        operation: A coroutine function taking a random number generator as its only argument
+        operations: How many calls to make in total
+        concurrency: How many calls are in flight at the same time
+    Returns: A dictionary with the throughput in operations per second and the p50, p95 and
+             p99 latencies in milliseconds"""
+
+    latencies = []
+    remaining = iter(range(operations))
+
+    async def worker(rng: random.Random):
+        for _ in remaining:
+            start = time.perf_counter()
+            await operation(rng)
+            latencies.append(time.perf_counter() - start)
+
+    # Warm up the connection pool so opening the connections isn't counted
+    warm_up = random.Random(SEED)
+    await asyncio.gather(*(operation(warm_up) for _ in range(concurrency)))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(random.Random(SEED + index)) for index in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    percentiles = statistics.quantiles(latencies, n=100, method="inclusive")
+    return {
+        "operations": operations,
+        "throughput": operations / elapsed,
+        "p50_ms": percentiles[49] * 1000,
+        "p95_ms": percentiles[94] * 1000,
+        "p99_ms": percentiles[98] * 1000
+    }
+
+async def run_benchmark(db_address: str, sizes: dict, operations: int, concurrency: int):
+    """Benchmark every DAO method against the database
+    Args:
+        db_address: The location of the benchmark database
+        sizes: The sizes the database was generated with
+        operations: How many calls to make per DAO method
+        concurrency: How many calls are in flight at the same time
+    Returns: A dictionary of operation names and their measurements"""
+
+    ConnectionPool.get_pool(db_address, storage_profile=DB_STORAGE_PROFILE)
+    results = {}
+    for name, operation in get_operations(db_address, sizes).items():
+        results[name] = await measure_operation(operation, operations, concurrency)
+    await ConnectionPool.close_all()
+    return results
+
+def get_revision():
+    """Get the git revision the benchmark is run on
+    Returns: The commit hash, None if it can't be determined"""
+
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def print_results(results: dict, baseline: dict = None):
+    """Print the benchmark results as a table
+    Args:
+        results: A dictionary of operation names and their measurements
+        baseline: The results of an earlier run to compare the throughput against"""
+
+    print(f"{'DAO method':<58}{'ops/sec':>10}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+          + (f"{'change':>9}" if baseline else ""))
+    for name, result in results.items():
+        line = f"{name:<58}{result['throughput']:>10.1f}{result['p50_ms']:>9.2f}" \
+               f"{result['p95_ms']:>9.2f}{result['p99_ms']:>9.2f}"
+        if baseline and name in baseline:
+            change = result["throughput"] / baseline[name]["throughput"] - 1
+            line += f"{change:>+9.1%}"
+        print(line)
+
+def main():
+    """Generate the benchmark database, run the benchmark and write the results"""
+
+    parser = argparse.ArgumentParser(description="Benchmark the DAO methods on a large database")
+    parser.add_argument("--users", type=int, default=200000)
+    parser.add_argument("--guilds", type=int, default=10000)
+    parser.add_argument("--usernames", type=int, default=1000000)
+    parser.add_argument("--nicknames", type=int, default=500000)
+    parser.add_argument("--punishments", type=int, default=500000)
+    parser.add_argument("--left-members", type=int, default=200000)
+    parser.add_argument("--temp-bans", type=int, default=20000)
+    parser.add_argument("--reminders", type=int, default=100000)
+    parser.add_argument("--operations", type=int, default=2000,
+                        help="How many calls to make per DAO method")
+    parser.add_argument("--concurrency", type=int, default=50,
+                        help="How many calls are in flight at the same time")
+    parser.add_argument("--schema", default="database/schema.sql",
+                        help="The schema used to create the benchmark database")
+    parser.add_argument("--database",
+                        help="Where to keep the generated database, reused if it exists. "
+                             "The benchmark runs on a copy, so the kept database doesn't change.")
+    parser.add_argument("--output", default="dao_benchmark.json",
+                        help="The JSON file the results are written to")
+    parser.add_argument("--baseline", help="A results file of an earlier run to compare against")
+    args = parser.parse_args()
+
+    sizes = {"users": args.users, "guilds": args.guilds, "usernames": args.usernames,
+             "nicknames": args.nicknames, "punishments": args.punishments,
+             "left_members": args.left_members, "temp_bans": args.temp_bans,
+             "reminders": args.reminders}
+
+    with tempfile.TemporaryDirectory() as directory:
+        db_address = args.database
+        if not db_address or not os.path.exists(db_address):
+            target = os.path.dirname(os.path.abspath(db_address)) if db_address else directory
+            name = os.path.basename(db_address) if db_address else "benchmark.db"
+            start = time.perf_counter()
+            db_address = create_database(target, name, args.schema)
+            populate_database(db_address, sizes)
+            print(f"Generated the benchmark database in {time.perf_counter() - start:.1f}s")
+        if args.database:
+            db_address = copy_database(db_address, os.path.join(directory, "benchmark.db"))
+        results = asyncio.run(run_benchmark(db_address, sizes, args.operations,
+                                            args.concurrency))
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)["results"]
+    print_results(results, baseline)
+
+    with open(args.output, "w", encoding="utf-8") as output_file:
+        json.dump({"revision": get_revision(), "date": datetime.utcnow().isoformat(),
+                   "storage_profile": DB_STORAGE_PROFILE, "sizes": sizes,
+                   "operations": args.operations, "concurrency": args.concurrency,
+                   "results": results}, output_file, indent=4)
+    print(f"Wrote the results to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,370 @@
+"""Replays a synthetic stream of gateway events against the Logging cog to find out how many
+events per second it can sustain. The cog runs against a fresh database built from
+database/schema.sql and a fake bot, guild and channel layer, so nothing is sent over the network.
+Discord API calls made by the handlers, such as fetching invites or sending log messages, sleep
+for --api-latency seconds instead.
+
+Usage (from the repository root):
+    PYTHONPATH=src python3 -m benchmarks.gateway_load_generator [--rate N] [--duration N]
+        [--mix edit=0.5,delete=0.3,join=0.2] [--output FILE]"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timezone
+import aiosqlite
+from benchmarks.storage_profile_benchmark import create_database
+from cogs.logging import Logging
+from db_connection.db_connector import ConnectionPool
+from services.guild_setting_service import GuildSettingService
+from services.utility_channel_service import UtilityChannelService
+
+SEED = 1234
+
+class FakeAsset:
+    """Stands in for a discord.Asset
+    Attributes:
+        url: The URL of the asset"""
+
+    def __init__(self, url: str):
+        self.url = url
+
+class FakeUser:
+    """Stands in for a discord.Member with the attributes the Logging cog uses"""
+
+    def __init__(self, user_id: int, guild):
+        self.id = user_id
+        self.guild = guild
+        self.bot = False
+        self.name = f"user{user_id}"
+        self.display_avatar = FakeAsset(f"https://cdn.example.com/avatars/{user_id}.png")
+        self.created_at = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        self.roles = [guild]
+
+    def __str__(self):
+        return self.name
+
+    @property
+    def mention(self):
+        """The string that mentions the user in a message"""
+
+        return f"<@{self.id}>"
+
+class FakeChannel:
+    """Stands in for a discord.TextChannel and counts what is sent to it
+    Attributes:
+        messages: How many messages were sent to the channel
+        embeds: How many embeds were sent to the channel"""
+
+    def __init__(self, channel_id: int, guild, api_latency: float):
+        self.id = channel_id
+        self.guild = guild
+        self.mention = f"<#{channel_id}>"
+        self.api_latency = api_latency
+        self.messages = 0
+        self.embeds = 0
+
+    async def send(self, embeds: list = None, **_):
+        """Wait for the API latency and count the sent message
+        Args:
+            embeds: The embeds of the message"""
+
+        await asyncio.sleep(self.api_latency)
+        self.messages += 1
+        self.embeds += len(embeds or [])
+
+class FakeGuild:
+    """Stands in for a discord.Guild"""
+
+    def __init__(self, guild_id: int, api_latency: float):
+        self.id = guild_id
+        self.name = f"guild{guild_id}"
+        self.api_latency = api_latency
+        self.text_channel = FakeChannel(guild_id * 100, self, api_latency)
+        self.log_channel = FakeChannel(guild_id * 100 + 1, self, api_latency)
+
+    async def invites(self):
+        """Wait for the API latency
+        Returns: An empty list, the fake guilds have no invites"""
+
+        await asyncio.sleep(self.api_latency)
+        return []
+
+class FakeMessage:
+    """Stands in for a discord.Message"""
+
+    def __init__(self, message_id: int, author: FakeUser, content: str):
+        self.id = message_id
+        self.author = author
+        self.guild = author.guild
+        self.channel = author.guild.text_channel
+        self.content = content
+        self.jump_url = f"https://discord.com/channels/{self.guild.id}/{self.channel.id}/" \
+                        f"{message_id}"
+
+class FakeBot:
+    """Stands in for the discord.Bot the cogs get, resolving the fake channels"""
+
+    def __init__(self, guilds: list):
+        self.guilds = guilds
+        self._channels = {guild.log_channel.id: guild.log_channel for guild in guilds}
+
+    def get_channel(self, channel_id: int):
+        """Get a fake log channel
+        Args:
+            channel_id: The ID of the channel
+        Returns: A FakeChannel object, None if there's no such channel"""
+
+        return self._channels.get(channel_id)
+
+    async def fetch_channel(self, channel_id: int):
+        """Get a fake log channel like get_channel does, the fake channels are always cached
+        Args:
+            channel_id: The ID of the channel
+        Returns: A FakeChannel object, None if there's no such channel"""
+
+        return self._channels.get(channel_id)
+
+class DatabaseTimer:
+    """Measures how long the database queries take by timing every aiosqlite cursor execute
+    Attributes:
+        queries: How many queries were executed
+        seconds: The total time spent executing them"""
+
+    def __init__(self):
+        self.queries = 0
+        self.seconds = 0.0
+        self._original_execute = None
+
+    def __enter__(self):
+        self._original_execute = original_execute = aiosqlite.Cursor.execute
+        timer = self
+
+        async def timed_execute(cursor, *args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await original_execute(cursor, *args, **kwargs)
+            finally:
+                timer.queries += 1
+                timer.seconds += time.perf_counter() - start
+
+        aiosqlite.Cursor.execute = timed_execute
+        return self
+
+    def __exit__(self, *_):
+        aiosqlite.Cursor.execute = self._original_execute
+
+class LoopLagProbe:
+    """Measures how late the event loop wakes up a task that sleeps in short intervals
+    Attributes:
+        lags: The measured delays in seconds"""
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.lags = []
+        self._task = None
+
+    async def _run(self):
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.lags.append(max(time.perf_counter() - start - self.interval, 0))
+
+    def start(self):
+        """Start measuring in the background"""
+
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop measuring and wait for the measuring task to finish"""
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+def summarize(samples: list):
+    """Get the percentiles of a list of durations in milliseconds
+    Args:
+        samples: The durations in seconds
+    Returns: A dictionary with the count and the p50, p95, p99 and maximum in milliseconds"""
+
+    if len(samples) < 2:
+        samples = samples * 2 or [0.0, 0.0]
+    percentiles = statistics.quantiles(samples, n=100, method="inclusive")
+    return {"count": len(samples),
+            "p50_ms": percentiles[49] * 1000,
+            "p95_ms": percentiles[94] * 1000,
+            "p99_ms": percentiles[98] * 1000,
+            "max_ms": max(samples) * 1000}
+
+def parse_mix(mix: str):
+    """Parse an event mix such as edit=0.5,delete=0.3,join=0.2
+    Args:
+        mix: The comma separated event=weight pairs
+    Returns: A dictionary of event names and weights"""
+
+    weights = {}
+    for pair in mix.split(","):
+        name, weight = pair.split("=")
+        if name not in ("edit", "delete", "join"):
+            raise ValueError(f"Unknown event type {name}, use edit, delete or join")
+        weights[name] = float(weight)
+    return weights
+
+async def prepare_database(db_address: str, guilds: list):
+    """Give every fake guild its settings and a log channel
+    Args:
+        db_address: The location of the database
+        guilds: The fake guilds"""
+
+    await GuildSettingService(db_address).initialize_guilds_settings([guild.id for guild in guilds])
+    utility_channel_service = UtilityChannelService(db_address)
+    for guild in guilds:
+        await utility_channel_service.create_guild_utility_channel(guild.log_channel.id, guild.id,
+                                                                   "log")
+
+def create_event(cog: Logging, name: str, author: FakeUser, index: int):
+    """Create the handler call of a single event
+    Args:
+        cog: The Logging cog whose listener handles the event
+        name: The type of the event, "edit", "delete" or "join"
+        author: The member who caused the event
+        index: The position of the event in the stream, used as the message ID
+    Returns: The coroutine of the listener handling the event"""
+
+    if name == "edit":
+        return cog.on_message_edit(FakeMessage(index, author, "Before " * 20),
+                                   FakeMessage(index, author, "After " * 20))
+    if name == "delete":
+        return cog.on_message_delete(FakeMessage(index, author, "Deleted " * 20))
+    return cog.on_member_join(author)
+
+async def time_event(event, latencies: list):
+    """Wait for an event to be handled and record how long it took
+    Args:
+        event: The coroutine of the listener handling the event
+        latencies: The list the handling time is added to, in seconds"""
+
+    start = time.perf_counter()
+    await event
+    latencies.append(time.perf_counter() - start)
+
+async def replay_stream(cog: Logging, guilds: list, args):
+    """Start the events at the target rate and wait for every handler to finish
+    Args:
+        cog: The Logging cog that handles the events
+        guilds: The fake guilds the events happen in
+        args: The parsed command line arguments
+    Returns: A tuple of a dictionary of {event name: [handler latencies]} pairs, the number of
+             events and how many seconds the replay took"""
+
+    rng = random.Random(SEED)
+    weights = parse_mix(args.mix)
+    latencies = {name: [] for name in weights}
+    handlers = []
+    events = int(args.rate * args.duration)
+    start = time.perf_counter()
+    for index in range(events):
+        # Sleep until the event is due, so the stream keeps its rate even if handlers lag
+        delay = start + index / args.rate - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        name = rng.choices(list(weights), list(weights.values()))[0]
+        author = FakeUser(rng.randrange(1, args.users + 1), rng.choice(guilds))
+        handlers.append(asyncio.create_task(
+            time_event(create_event(cog, name, author, index), latencies[name])))
+    await asyncio.gather(*handlers)
+    return latencies, events, time.perf_counter() - start
+
+async def replay(db_address: str, args):
+    """Replay the event stream against the Logging cog
+    Args:
+        db_address: The location of the database
+        args: The parsed command line arguments
+    Returns: A dictionary containing the measurements"""
+
+    guilds = [FakeGuild(guild_id, args.api_latency) for guild_id in range(1, args.guilds + 1)]
+    await prepare_database(db_address, guilds)
+    cog = Logging(FakeBot(guilds), db_address, {})
+    probe = LoopLagProbe()
+    with DatabaseTimer() as database_timer:
+        probe.start()
+        latencies, events, elapsed = await replay_stream(cog, guilds, args)
+        cog.cog_unload()
+        await cog.log_dispatcher.close()
+        await probe.stop()
+
+    return {"events": events,
+            "target_rate": args.rate,
+            "achieved_rate": events / elapsed,
+            "handler_latency": {name: summarize(samples) for name, samples in latencies.items()},
+            "loop_lag": summarize(probe.lags),
+            "database": {"queries": database_timer.queries,
+                         "seconds": database_timer.seconds,
+                         "ms_per_event": database_timer.seconds * 1000 / max(events, 1)},
+            "sends": {"messages": sum(guild.log_channel.messages for guild in guilds),
+                      "embeds": sum(guild.log_channel.embeds for guild in guilds),
+                      "dispatcher": cog.log_dispatcher.get_statistics()}}
+
+def print_results(results: dict):
+    """Print the measurements in a readable form
+    Args:
+        results: The measurements returned by replay"""
+
+    print(f"Events: {results['events']} at {results['achieved_rate']:.1f}/s "
+          f"(target {results['target_rate']:.1f}/s)")
+    print(f"{'Handler':<10}{'count':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}")
+    for name, summary in list(results["handler_latency"].items()) + \
+                         [("loop lag", results["loop_lag"])]:
+        print(f"{name:<10}{summary['count']:>8}{summary['p50_ms']:>9.2f}{summary['p95_ms']:>9.2f}"
+              f"{summary['p99_ms']:>9.2f}{summary['max_ms']:>9.2f}")
+    database = results["database"]
+    print(f"Database: {database['queries']} queries, {database['seconds']:.2f}s in total, "
+          f"{database['ms_per_event']:.3f}ms per event")
+    sends = results["sends"]
+    print(f"Sent: {sends['messages']} messages with {sends['embeds']} embeds, "
+          f"{sends['dispatcher']['dropped']} embeds dropped")
+
+def main():
+    """Run the load generator and report the results"""
+
+    parser = argparse.ArgumentParser(description="Replay synthetic gateway events against the "
+                                                 "Logging cog")
+    parser.add_argument("--rate", type=float, default=200, help="Events per second to replay")
+    parser.add_argument("--duration", type=float, default=10, help="How many seconds to replay")
+    parser.add_argument("--mix", default="edit=0.5,delete=0.3,join=0.2",
+                        help="The relative weights of the edit, delete and join events")
+    parser.add_argument("--guilds", type=int, default=100)
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--api-latency", type=float, default=0.05,
+                        help="How many seconds every fake Discord API call takes")
+    parser.add_argument("--schema", default="database/schema.sql",
+                        help="The schema used to create the database")
+    parser.add_argument("--output", help="A JSON file to write the results to")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        db_address = create_database(directory, "gateway_load.db", args.schema)
+
+        async def run():
+            try:
+                return await replay(db_address, args)
+            finally:
+                await ConnectionPool.close_all()
+
+        results = asyncio.run(run())
+
+    print_results(results)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            json.dump(results, output_file, indent=4)
+        print(f"Wrote the results to {args.output}")
+
+if __name__ == "__main__":
+    main()
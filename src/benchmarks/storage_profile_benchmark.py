@@ -0,0 +1,98 @@
+"""Measures how many writes per second the DAOs manage under each database storage profile.
+Every profile gets a fresh database built from database/schema.sql in a temporary directory,
+so the bot's own database is never touched.
+
+Usage (from the repository root):
+    PYTHONPATH=src python3 -m benchmarks.storage_profile_benchmark [--writes N] [--concurrency N]"""
+
+import argparse
+import asyncio
+import os
+import sqlite3
+import tempfile
+import time
+from config.constants import DB_STORAGE_PROFILES
+from dao.punishments_dao import PunishmentsDAO
+from dao.usernames_dao import UsernamesDAO
+from db_connection.db_connector import ConnectionPool
+
+def create_database(directory: str, name: str, schema_path: str):
+    """Create a new database from a schema file
+    Args:
+        directory: The directory where the database file is created
+        name: The name of the database file
+        schema_path: The location of the SQL schema to apply
+    Returns: The location of the created database"""
+
+    db_address = os.path.join(directory, name)
+    with open(schema_path, encoding="utf-8") as schema_file:
+        schema = schema_file.read()
+    connection = sqlite3.connect(db_address)
+    connection.executescript(schema)
+    connection.close()
+    return db_address
+
+async def measure_writes(write, writes: int, concurrency: int):
+    """Run a write operation a number of times and measure the throughput
+    Args:
+        write: A coroutine function taking the index of the write as its only argument
+        writes: How many writes to do in total
+        concurrency: How many writes are in flight at the same time
+    Returns: The number of writes per second"""
+
+    start = time.perf_counter()
+    for batch_start in range(0, writes, concurrency):
+        batch = range(batch_start, min(batch_start + concurrency, writes))
+        await asyncio.gather(*[write(index) for index in batch])
+    return writes / (time.perf_counter() - start)
+
+async def benchmark_profile(db_address: str, profile: str, writes: int, concurrency: int):
+    """Benchmark the DAO writes under a single storage profile
+    Args:
+        db_address: The location of the database to benchmark against
+        profile: The name of the storage profile to use
+        writes: How many writes to do per DAO method
+        concurrency: How many writes are in flight at the same time
+    Returns: A dictionary of DAO method names and their writes per second"""
+
+    ConnectionPool.get_pool(db_address, storage_profile=profile)
+    punishments_dao = PunishmentsDAO(db_address)
+    usernames_dao = UsernamesDAO(db_address)
+
+    async def add_punishment(index: int):
+        await punishments_dao.add_punishment(str(index % 1000), 1, index % 10,
+                                             punishment_type="warn", reason="Benchmark")
+
+    async def add_username(index: int):
+        await usernames_dao.add_username(f"user{index}", index % 1000)
+
+    results = {
+        "PunishmentsDAO.add_punishment": await measure_writes(add_punishment, writes, concurrency),
+        "UsernamesDAO.add_username": await measure_writes(add_username, writes, concurrency)
+    }
+    await ConnectionPool.close_all()
+    return results
+
+def main():
+    """Run the benchmark for every storage profile and print the results"""
+
+    parser = argparse.ArgumentParser(description="Benchmark the database storage profiles")
+    parser.add_argument("--writes", type=int, default=500,
+                        help="How many writes to do per DAO method and profile")
+    parser.add_argument("--concurrency", type=int, default=10,
+                        help="How many writes are in flight at the same time")
+    parser.add_argument("--schema", default="database/schema.sql",
+                        help="The schema used to create the benchmark databases")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        print(f"{'Profile':<12}{'DAO method':<34}{'Writes/sec':>12}")
+        for profile in DB_STORAGE_PROFILES:
+            db_address = create_database(directory, f"{profile}.db", args.schema)
+            results = asyncio.run(benchmark_profile(db_address, profile, args.writes,
+                                                    args.concurrency))
+            for method, writes_per_second in results.items():
+                print(f"{profile:<12}{method:<34}{writes_per_second:>12.1f}")
+
+if __name__ == "__main__":
+    main()
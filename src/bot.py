@@ -4,33 +4,91 @@ The bot token should NEVER be hard-coded into the program. Either copy-paste
 it as an argument on each launch or store it in an encrypted file and use the
 decrypted value as an argument."""
 
+import asyncio
 import sys
+import time
 import discord
-from config.constants import DB_ADDRESS
+from config.constants import DB_ADDRESS, METRICS_ENABLED, STARTUP_CONCURRENCY
+from cogs.debug import Debug
+from cogs.experience import Experience
 from cogs.guildsettings import GuildSettings
 from cogs.logging import Logging
+from cogs.metrics import Metrics
 from cogs.modcommands import ModCommands
 from cogs.tasks import Tasks
+from db_connection.db_connector import ConnectionPool
 from services.guild_setting_service import GuildSettingService
 
 intents = discord.Intents.all()
 bot = discord.Bot(intents=intents)
 
+async def fetch_guild_invites(guild: discord.Guild, invites: dict, semaphore: asyncio.Semaphore):
+    """Fetch the invites of a guild
+    Args:
+        guild: The guild whose invites to fetch
+        invites: The dictionary of {Guild: [Invite]} pairs to store the guild's invites in
+        semaphore: Limits how many guilds are fetched at the same time"""
+
+    async with semaphore:
+        try:
+            invites[guild] = await guild.invites()
+        except discord.HTTPException:
+            print(f"Can't fetch the invites of {guild}. Skipping.")
+            invites[guild] = []
+
 @bot.event
 async def on_ready():
     """Runs when the bot has successfully logged in"""
 
     print(f"Python {sys.version}\n{sys.version_info}")
     print(f"Logged on as {bot.user}")
-    bot.add_cog(GuildSettings(bot, DB_ADDRESS))
+    timings = {}
+    phase_start = time.perf_counter()
     invites = {}
-    guild_setting_service = GuildSettingService(DB_ADDRESS)
-    for guild in bot.guilds:
-        invites[guild] = await guild.invites()
-        await guild_setting_service.initialize_guild_settings(guild.id)
+    bot.add_cog(Debug(bot, DB_ADDRESS))
+    bot.add_cog(Experience(bot, DB_ADDRESS))
+    bot.add_cog(GuildSettings(bot, DB_ADDRESS))
     bot.add_cog(Logging(bot, DB_ADDRESS, invites))
     bot.add_cog(ModCommands(bot, DB_ADDRESS))
     bot.add_cog(Tasks(bot, DB_ADDRESS))
+    if METRICS_ENABLED:
+        metrics = Metrics(bot, DB_ADDRESS)
+        bot.add_cog(metrics)
+        await metrics.start_server()
+    timings["Registering cogs"] = time.perf_counter() - phase_start
+
+    phase_start = time.perf_counter()
     await bot.sync_commands()
+    timings["Syncing commands"] = time.perf_counter() - phase_start
+
+    phase_start = time.perf_counter()
+    guild_setting_service = GuildSettingService(DB_ADDRESS)
+    await guild_setting_service.initialize_guilds_settings([guild.id for guild in bot.guilds])
+    timings["Initializing guild settings"] = time.perf_counter() - phase_start
+
+    phase_start = time.perf_counter()
+    semaphore = asyncio.Semaphore(STARTUP_CONCURRENCY)
+    await asyncio.gather(*[fetch_guild_invites(guild, invites, semaphore)
+                           for guild in bot.guilds])
+    timings[f"Fetching invites of {len(bot.guilds)} guilds"] = time.perf_counter() - phase_start
+
+    for phase, duration in timings.items():
+        print(f"{phase}: {duration:.2f} s")
+
+async def main():
+    """Run the bot until it's stopped, then save what is still waiting in memory"""
+
+    try:
+        await bot.start(str(sys.argv[1]))
+    finally:
+        # The experience is saved before closing, while level reward roles can still be given
+        experience_cog = bot.get_cog("Experience")
+        if experience_cog is not None:
+            await experience_cog.save_experience()
+        await bot.close()
+        logging_cog = bot.get_cog("Logging")
+        if logging_cog is not None:
+            await logging_cog.save_name_changes(log=False)
+        await ConnectionPool.close_all()
 
-bot.run(str(sys.argv[1]))
+asyncio.run(main())
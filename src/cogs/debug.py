@@ -0,0 +1,136 @@
+"""Houses the cog that handles commands for inspecting how the bot performs"""
+
+import discord
+from discord.ext import commands
+from config.constants import DEBUG_GUILDS
+from db_connection.db_connector import DBConnection
+from helpers.embed_pager import EmbedPager
+from helpers.loop_monitor import LoopMonitor
+
+class Debug(commands.Cog):
+    """This cog handles the commands administrators can use to find out what makes the bot slow.
+    Attributes:
+        bot: The bot the commands belong to
+        db_connection: The connection whose shared pool holds the database metrics
+        loop_monitor: Measures the lag of the event loop and reports slow callbacks"""
+
+    debug_group = discord.SlashCommandGroup(
+        name="debug", description="Commands for inspecting the bot's performance.")
+    sort_choices = {"total time": "total_time", "average time": "average_time",
+                    "max time": "max_time", "count": "count", "rows": "rows",
+                    "connection wait": "total_wait"}
+
+    def __init__(self, bot: discord.Bot, db_address: str):
+        """Activate the debug cog
+        Args:
+            bot: The bot the commands belong to
+            db_address: The location of the database the bot saves data to"""
+
+        self.bot = bot
+        self.db_connection = DBConnection(db_address)
+        self.loop_monitor = LoopMonitor()
+        self.loop_monitor.start()
+
+    def cog_unload(self):
+        """Stop monitoring the event loop when the cog is unloaded"""
+
+        self.loop_monitor.stop()
+
+    def get_event_listeners(self, event: str):
+        """Get the cog listeners of a Discord event
+        Args:
+            event: The name of the event, e.g. "on_message_edit"
+        Returns: A list of the qualified names of the listeners, e.g. ["Logging.on_message_edit"]"""
+
+        return [f"{cog_name}.{listener.__name__}" for cog_name, cog in self.bot.cogs.items()
+                for name, listener in cog.get_listeners() if name == event]
+
+
+    @debug_group.command(name="dbstats",
+                         description="See which database queries take the most time",
+                         guild_ids=DEBUG_GUILDS)
+    @commands.has_permissions(administrator=True)
+    async def dbstats(self,
+        ctx: discord.ApplicationContext,
+        sort_by: discord.Option(str, "The statistic to sort the queries by",
+                                choices=list(sort_choices), default="total time",
+                                required=False)):
+        """List the recorded statistics of every database query, slowest first"""
+
+        pool = self.db_connection.pool
+        wait_metrics = pool.get_wait_metrics()
+        reader, writer = wait_metrics["reader"], wait_metrics["writer"]
+        embed = discord.Embed(title="Database statistics",
+                              description=f"Readers: {reader['contended']}/"
+                                          f"{reader['acquisitions']} acquisitions contended, "
+                                          f"max wait {reader['max_wait'] * 1000:.1f} ms\n"
+                                          f"Writer: {writer['contended']}/"
+                                          f"{writer['acquisitions']} acquisitions contended, "
+                                          f"max wait {writer['max_wait'] * 1000:.1f} ms\n")
+        if pool.query_metrics is None:
+            embed.add_field(name="Query metrics are disabled",
+                            value="Set `DB_QUERY_METRICS` to True to record database queries.")
+            await ctx.respond(embed=embed, ephemeral=True)
+            return
+        statements = self.db_connection.get_query_metrics(self.sort_choices[sort_by])
+        embed.description += f"{pool.query_metrics.slow_queries} slow queries logged, " \
+                             f"sorted by {sort_by}"
+        if not statements:
+            embed.add_field(name="No queries recorded",
+                            value="The database hasn't been queried yet.")
+            await ctx.respond(embed=embed, ephemeral=True)
+            return
+        fields = []
+        for statement in statements:
+            sql = " ".join(statement["sql"].split())
+            if len(sql) > 800:
+                sql = sql[:797] + "..."
+            fields.append(discord.EmbedField(
+                f"{statement['count']} runs, {statement['total_time'] * 1000:.1f} ms in total",
+                f"Average {statement['average_time'] * 1000:.2f} ms, "
+                f"max {statement['max_time'] * 1000:.2f} ms, {statement['rows']} rows, "
+                f"average wait {statement['average_wait'] * 1000:.2f} ms\n```sql\n{sql}\n```"))
+        embed_pager = EmbedPager(fields, 5)
+        embed_pager.embed = embed
+        res_embed, res_view = embed_pager.get_embed_and_view()
+        await ctx.respond(embed=res_embed, view=res_view, ephemeral=True)
+
+
+    @debug_group.command(name="looplag",
+                         description="See how responsive the bot is and what blocks it",
+                         guild_ids=DEBUG_GUILDS)
+    @commands.has_permissions(administrator=True)
+    async def looplag(self, ctx: discord.ApplicationContext):
+        """Show the event loop lag histogram and the listeners and tasks that blocked the loop"""
+
+        summary = self.loop_monitor.get_summary()
+        embed = discord.Embed(title="Event loop lag",
+                              description=f"{summary['samples']} measurements every "
+                                          f"{self.loop_monitor.interval} s: "
+                                          f"p50 {summary['p50'] * 1000:.1f} ms, "
+                                          f"p95 {summary['p95'] * 1000:.1f} ms, "
+                                          f"p99 {summary['p99'] * 1000:.1f} ms, "
+                                          f"max {summary['max'] * 1000:.1f} ms")
+        histogram = self.loop_monitor.get_histogram()
+        most = max(count for _, count in histogram) or 1
+        lines = []
+        for bound, count in histogram:
+            label = f"<= {bound * 1000:g} ms" if bound is not None else "slower"
+            lines.append(f"{label:>11} {'#' * round(count * 20 / most):<20} {count}")
+        embed.add_field(name="Histogram", value="```\n" + "\n".join(lines) + "\n```",
+                        inline=False)
+        if self.loop_monitor.slow_callback_threshold is None:
+            embed.add_field(name="Slow callbacks", value="Slow callback reporting is disabled.")
+        elif not summary["slow_callbacks"]:
+            embed.add_field(name="Slow callbacks",
+                            value="Nothing has blocked the loop for more than "
+                                  f"{self.loop_monitor.slow_callback_threshold * 1000:g} ms.")
+        for callback in summary["slow_callbacks"][:10]:
+            listeners = self.get_event_listeners(callback["owner"])
+            embed.add_field(name=callback["owner"],
+                            value=f"{callback['count']} times, max "
+                                  f"{callback['max_time'] * 1000:.1f} ms, "
+                                  f"{callback['total_time'] * 1000:.1f} ms in total"
+                                  + (f"\nListeners: {', '.join(listeners)}" if listeners else ""),
+                            inline=False)
+        await ctx.respond(embed=embed, ephemeral=True)
@@ -0,0 +1,139 @@
+"""Houses the cog that awards experience to members for chatting"""
+
+import discord
+from discord.ext import commands, tasks
+from config.constants import DEBUG_GUILDS, EXPERIENCE_FLUSH_INTERVAL, EXPERIENCE_INTERVAL, \
+    EXPERIENCE_PER_MESSAGE, LEADERBOARD_PAGE_SIZE
+from helpers.levels import get_level
+from services.experience_service import ExperienceService
+from services.level_reward_role_service import LevelRewardRoleService
+
+class Experience(commands.Cog):
+    """This cog awards experience to members who send messages in guilds. The experience is
+    gathered in memory and saved to the database every few seconds, after which the members who
+    reached a rewarded level are given their level reward roles.
+    Attributes:
+        bot: The bot that awards the experience
+        experience_service: The service for awarding and saving experience
+        level_reward_role_service: The service for finding the level reward roles members earn"""
+
+    def __init__(self, bot: discord.Bot, db_address):
+        """Activate the experience cog
+        Args:
+            bot: The bot that awards the experience
+            db_address: The location of the database the bot saves data to"""
+
+        self.bot = bot
+        self.experience_service = ExperienceService(db_address)
+        self.level_reward_role_service = LevelRewardRoleService(db_address)
+        self.flush_experience.start()
+
+    def cog_unload(self):
+        """Stop saving experience periodically when the cog is unloaded"""
+
+        self.flush_experience.cancel()
+
+    @commands.Cog.listener()
+    async def on_message(self, message: discord.Message):
+        """Award experience to the author of a guild message"""
+
+        if message.author.bot or message.guild is None:
+            return
+        await self.experience_service.add_user_experience(message.author.id, message.guild.id,
+                                                          EXPERIENCE_PER_MESSAGE,
+                                                          EXPERIENCE_INTERVAL)
+
+    @tasks.loop(seconds=EXPERIENCE_FLUSH_INTERVAL)
+    async def flush_experience(self):
+        """Save the experience awarded since the last flush"""
+
+        await self.save_experience()
+
+    async def save_experience(self):
+        """Save the experience awarded since the last flush and give the level reward roles it
+        earned. Rewards are only given for the levels a flush moves members past, so every flush
+        of the bot's experience must go through here."""
+
+        try:
+            totals = await self.experience_service.flush_experience()
+        except Exception as error: # pylint: disable=broad-exception-caught
+            # The experience was put back and is saved with the next flush
+            print(f"Can't save experience. Retrying later. {error}")
+            return
+        try:
+            await self.give_level_rewards(totals)
+        except Exception as error: # pylint: disable=broad-exception-caught
+            print(f"Can't give level rewards. {error}")
+
+    async def give_level_rewards(self, totals: list):
+        """Give members the level reward roles they earned with their latest experience. All the
+        roles a member earned are given in a single request.
+        Args:
+            totals: A list of (experience entity, previous amount) tuples from a flush"""
+
+        earned = await self.level_reward_role_service.get_earned_roles(
+            [(experience.user_id, experience.guild_id, previous_amount, experience.amount)
+             for experience, previous_amount in totals])
+        for (guild_id, user_id), role_ids in earned.items():
+            guild = self.bot.get_guild(guild_id)
+            member = guild.get_member(user_id) if guild is not None else None
+            if member is None:
+                continue
+            roles = [role for role in map(guild.get_role, role_ids)
+                     if role is not None and role not in member.roles]
+            if not roles:
+                continue
+            try:
+                # A non-atomic add edits the member's whole role list at once instead of making
+                # a request for every role
+                await member.add_roles(*roles, reason="Level reward", atomic=False)
+            except discord.HTTPException as error:
+                print(f"Can't give level rewards to {member}. {error}")
+
+    @flush_experience.after_loop
+    async def flush_remaining_experience(self):
+        """Save the experience that was still waiting when the loop stopped"""
+
+        await self.save_experience()
+
+    @discord.slash_command(name="rank", description="See a member's experience and rank",
+                           guild_ids=DEBUG_GUILDS)
+    async def rank(self,
+        ctx: discord.ApplicationContext,
+        member: discord.Option(discord.Member, "The member whose rank to see, yourself by default",
+                               required=False)):
+        """Show the experience and leaderboard position of a member"""
+
+        member = member or ctx.author
+        rank = await self.experience_service.get_user_rank(member.id, ctx.guild.id)
+        if rank is None:
+            await ctx.respond(f"{member.mention} doesn't have any experience yet.", ephemeral=True)
+            return
+        experience = await self.experience_service.get_user_experience(member.id, ctx.guild.id)
+        size = await self.experience_service.get_leaderboard_size(ctx.guild.id)
+        embed = discord.Embed(title=f"{member.display_name}'s rank")
+        embed.add_field(name="Rank", value=f"#{rank} of {size}")
+        embed.add_field(name="Level", value=str(get_level(experience.amount)))
+        embed.add_field(name="Experience", value=str(experience.amount))
+        await ctx.respond(embed=embed)
+
+    @discord.slash_command(name="leaderboard", description="See who has the most experience",
+                           guild_ids=DEBUG_GUILDS)
+    async def leaderboard(self,
+        ctx: discord.ApplicationContext,
+        page: discord.Option(int, "The page of the leaderboard to see", min_value=1, default=1,
+                             required=False)):
+        """Show a page of the guild's experience leaderboard"""
+
+        size = await self.experience_service.get_leaderboard_size(ctx.guild.id)
+        pages = max((size + LEADERBOARD_PAGE_SIZE - 1) // LEADERBOARD_PAGE_SIZE, 1)
+        page = min(page, pages)
+        entries = await self.experience_service.get_leaderboard_page(ctx.guild.id, page,
+                                                                     LEADERBOARD_PAGE_SIZE)
+        first_rank = (page - 1) * LEADERBOARD_PAGE_SIZE + 1
+        lines = [f"**#{rank}** <@{entry.user_id}>: {entry.amount}"
+                 for rank, entry in enumerate(entries, first_rank)]
+        embed = discord.Embed(title=f"{ctx.guild.name} leaderboard",
+                              description="\n".join(lines) or "Nobody has any experience yet.")
+        embed.set_footer(text=f"Page {page}/{pages}")
+        await ctx.respond(embed=embed)
@@ -1,19 +1,29 @@
 """Houses the cog that handles logging"""
 
+import asyncio
 import datetime
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 from services.utility_channel_service import UtilityChannelService
 from services.guild_setting_service import GuildSettingService
+from services.global_name_service import GlobalNameService
+from services.nickname_service import NicknameService
+from services.username_service import UsernameService
 from entities.punishment_entity import PunishmentEntity
 from helpers.invite_use_tracker import InviteUseTracker
+from helpers.log_dispatcher import LogDispatcher
+from helpers.log_webhook_manager import LogWebhookManager
+from helpers.name_change_buffer import NameChangeBuffer
+from config.constants import LOG_DELIVERY_MODE, NAME_CHANGE_WINDOW
 
 class Logging(commands.Cog):
     """This cog handles all listeners that are used for logging events in the logging channel
     if one is defined for the guild.
     Attributes:
         bot: The bot that handles the logging
-        utility_channel_service: The service used to get the logging channel"""
+        utility_channel_service: The service used to get the logging channel
+        log_dispatcher: Sends the log messages in the background
+        name_changes: The name changes waiting to be saved and logged"""
 
     def __init__(self, bot: discord.Client, db_address, invites: dict):
         """Activate the Logging cog
@@ -26,7 +36,18 @@ class Logging(commands.Cog):
         self._utility_channel_service = UtilityChannelService(db_address)
         self._guild_setting_service = GuildSettingService(db_address)
         self.invites = invites
+        webhook_manager = LogWebhookManager(db_address) if LOG_DELIVERY_MODE == "webhook" else None
+        self.log_dispatcher = LogDispatcher(webhook_manager=webhook_manager)
+        self._username_service = UsernameService(db_address)
+        self._global_name_service = GlobalNameService(db_address)
+        self._nickname_service = NicknameService(db_address)
+        self.name_changes = NameChangeBuffer()
+        self.flush_name_changes.start()
 
+    def cog_unload(self):
+        """Stop saving name changes periodically when the cog is unloaded"""
+
+        self.flush_name_changes.stop()
 
     async def _get_guild_log_channels(self, guild: discord.Guild):
         """Get the channels used for logs for a specific guild
@@ -34,12 +55,9 @@ class Logging(commands.Cog):
             guild: The Discord Guild whose log channels to get
         Returns: A list of discord.Channel objects if log channels were found"""
 
-        channels = await self._utility_channel_service.get_guild_utility_channel_by_purpose(guild.id,
-                                                                                            "log")
-        if not channels:
-            return []
-        log_channels = [await channel.get_discord_channel(self.bot) for channel in channels]
-        return log_channels
+        return await self._utility_channel_service.get_guild_discord_channels_by_purpose(self.bot,
+                                                                                         guild.id,
+                                                                                         "log")
 
 
     async def _get_guild_message_log_channels(self, guild: discord.Guild):
@@ -48,13 +66,9 @@ class Logging(commands.Cog):
             guild: The Discord Guild whose message log channels to get
         Returns: A list of discord.Channel objects if message log channels are found"""
 
-        channels = await self._utility_channel_service.get_guild_utility_channel_by_purpose(guild.id,
-                                                                                            "message log")
-
-        if not channels:
-            return []
-        message_log_channels = [await channel.get_discord_channel(self.bot) for channel in channels]
-        return message_log_channels
+        return await self._utility_channel_service.get_guild_discord_channels_by_purpose(self.bot,
+                                                                                         guild.id,
+                                                                                         "message log")
 
 
     async def _get_guild_member_log_channels(self, guild: discord.Guild):
@@ -63,13 +77,9 @@ class Logging(commands.Cog):
             guild: The Discord Guild whose member log channels to get
         Returns: A list of discord.Channel objects if member log channels are found"""
 
-        channels = await self._utility_channel_service.get_guild_utility_channel_by_purpose(guild.id,
-                                                                                            "member log")
-
-        if not channels:
-            return []
-        member_log_channels = [await channel.get_discord_channel(self.bot) for channel in channels]
-        return member_log_channels
+        return await self._utility_channel_service.get_guild_discord_channels_by_purpose(self.bot,
+                                                                                         guild.id,
+                                                                                         "member log")
 
 
     async def _get_guild_moderation_log_channels(self, guild: discord.Guild):
@@ -78,13 +88,9 @@ class Logging(commands.Cog):
             guild: The Discord Guild whose moderation log channels to get
         Returns: A list of discord.Channel objects if moderation log channels are found"""
 
-        channels = await self._utility_channel_service.get_guild_utility_channel_by_purpose(guild.id,
-                                                                                            "moderation log")
-
-        if not channels:
-            return []
-        moderation_log_channels = [await channel.get_discord_channel(self.bot) for channel in channels]
-        return moderation_log_channels
+        return await self._utility_channel_service.get_guild_discord_channels_by_purpose(self.bot,
+                                                                                         guild.id,
+                                                                                         "moderation log")
 
 
     @commands.Cog.listener()
@@ -117,10 +123,7 @@ class Logging(commands.Cog):
         embed.add_field(name="After", value=after_content)
         guild_setting = await self._guild_setting_service.get_guild_setting_value_by_name(after.guild.id, "log_edited_messages")
         if guild_setting.value == "1":
-            for channel in log_channels:
-                await channel.send(embed=embed)
-            for channel in message_log_channels:
-                await channel.send(embed=embed)
+            self.log_dispatcher.dispatch(log_channels + message_log_channels, embed)
 
 
     @commands.Cog.listener()
@@ -148,10 +151,7 @@ class Logging(commands.Cog):
         embed.add_field(name="Content", value=content)
         guild_setting = await self._guild_setting_service.get_guild_setting_value_by_name(message.guild.id, "log_deleted_messages")
         if guild_setting.value == "1":
-            for channel in log_channels:
-                await channel.send(embed=embed)
-            for channel in message_log_channels:
-                await channel.send(embed=embed)
+            self.log_dispatcher.dispatch(log_channels + message_log_channels, embed)
 
 
     @commands.Cog.listener()
@@ -167,7 +167,7 @@ class Logging(commands.Cog):
         embed.set_footer(text=f"ID: {member.id}")
         embed.set_thumbnail(url=member.display_avatar.url)
         invites = await member.guild.invites()
-        invite_tracker = InviteUseTracker(self.invites[member.guild], invites)
+        invite_tracker = InviteUseTracker(self.invites.get(member.guild, []), invites)
         join_invite = invite_tracker.check_difference()
         if not join_invite:
             join_invite = "`Could not fetch`"
@@ -181,10 +181,7 @@ class Logging(commands.Cog):
         self.invites[member.guild] = await member.guild.invites()
         guild_setting = await self._guild_setting_service.get_guild_setting_value_by_name(member.guild.id, "log_membership_changes")
         if guild_setting.value == "1":
-            for channel in log_channels:
-                await channel.send(embed=embed)
-            for channel in member_log_channels:
-                await channel.send(embed=embed)
+            self.log_dispatcher.dispatch(log_channels + member_log_channels, embed)
 
 
     @commands.Cog.listener()
@@ -207,10 +204,7 @@ class Logging(commands.Cog):
         embed.add_field(name="Roles", value=', '.join(roles))
         guild_setting = await self._guild_setting_service.get_guild_setting_value_by_name(member.guild.id, "log_membership_changes")
         if guild_setting.value == "1":
-            for channel in log_channels:
-                await channel.send(embed=embed)
-            for channel in member_log_channels:
-                await channel.send(embed=embed)
+            self.log_dispatcher.dispatch(log_channels + member_log_channels, embed)
 
 
     @commands.Cog.listener()
@@ -226,10 +220,7 @@ class Logging(commands.Cog):
         embed.set_footer(text=f"ID: {user.id}")
         guild_setting = await self._guild_setting_service.get_guild_setting_value_by_name(guild.id, "log_bans")
         if guild_setting.value == "1":
-            for channel in log_channels:
-                await channel.send(embed=embed)
-            for channel in moderation_log_channels:
-                await channel.send(embed=embed)
+            self.log_dispatcher.dispatch(log_channels + moderation_log_channels, embed)
 
 
     @commands.Cog.listener()
@@ -245,16 +236,132 @@ class Logging(commands.Cog):
         embed.set_footer(text=f"ID: {user.id}")
         guild_setting = await self._guild_setting_service.get_guild_setting_value_by_name(guild.id, "log_bans")
         if guild_setting.value == "1":
-            for channel in log_channels:
-                await channel.send(embed=embed)
-            for channel in moderation_log_channels:
-                await channel.send(embed=embed)
+            self.log_dispatcher.dispatch(log_channels + moderation_log_channels, embed)
+
+
+    @commands.Cog.listener()
+    async def on_user_update(self, before: discord.User, after: discord.User):
+        """Gather username and global name changes to be saved and logged"""
+
+        if before.name != after.name:
+            self.name_changes.record("username", after.id, None, before.name, after.name)
+        if before.global_name != after.global_name:
+            self.name_changes.record("global_name", after.id, None, before.global_name,
+                                     after.global_name)
+
+    async def _is_logging_name_changes(self, guild: discord.Guild):
+        """Check whether a guild saves and logs the name changes of its members
+        Args:
+            guild: The Discord Guild whose setting to check
+        Returns: True if the guild's log_name_changes setting is on, False otherwise"""
 
+        guild_setting = await self._guild_setting_service.get_guild_setting_value_by_name(
+            guild.id, "log_name_changes")
+        return guild_setting is not None and guild_setting.value == "1"
+
+    def _get_name_change_embed(self, user: discord.abc.User, kind: str, guild: discord.Guild,
+                               before: str, after: str):
+        """Create the log embed of a name change
+        Args:
+            user: The user or member whose name changed
+            kind: "username", "global_name" or "nickname"
+            guild: The Discord Guild the embed is logged in
+            before: The name before the change, None if there wasn't one
+            after: The name after the change, None if the name was removed
+        Returns: A discord.Embed object"""
+
+        name = {"username": "Username", "global_name": "Display name",
+                "nickname": "Nickname"}[kind]
+        description = f"{user.mention} changed their {name.lower()}"
+        if kind == "nickname":
+            description += f" in **{guild.name}**"
+        embed = discord.Embed(color=discord.Color.teal(),
+                              title=f"{name} changed",
+                              description=description)
+        embed.set_author(name=user, icon_url=user.display_avatar.url)
+        embed.set_footer(text=f"ID: {user.id}")
+        embed.add_field(name="Before", value=before or "`None`")
+        embed.add_field(name="After", value=after or "`None`")
+        return embed
+
+    async def save_name_changes(self, log: bool = True):
+        """Save the gathered name changes to the name histories in a single group commit and
+        log them in the guilds that have name change logging on. Usernames and global names
+        are saved if any guild the user shares with the bot has it on.
+        Args:
+            log: Whether to send the log embeds, False e.g. when the bot is shutting down"""
+
+        changes = self.name_changes.take()
+        try:
+            usernames, global_names, nicknames, logs = await self._sort_name_changes(changes)
+        except BaseException:
+            self.name_changes.restore(changes)
+            raise
+        # The writes are queued together so that they land in the same group commit. Each of
+        # them has its own savepoint, so only the kinds whose write failed are put back.
+        results = await asyncio.gather(
+            self._username_service.add_usernames([name[:2] for name in usernames]),
+            self._global_name_service.add_global_names([name[:2] for name in global_names]),
+            self._nickname_service.add_nicknames(nicknames),
+            return_exceptions=True)
+        errors = dict(zip(("username", "global_name", "nickname"), results))
+        errors = {kind: error for kind, error in errors.items() if isinstance(error, Exception)}
+        self.name_changes.restore([change for change in changes if change[0] in errors])
+        if log:
+            for kind, guild, embed in logs:
+                if kind in errors:
+                    continue
+                log_channels = await self._get_guild_log_channels(guild)
+                member_log_channels = await self._get_guild_member_log_channels(guild)
+                self.log_dispatcher.dispatch(log_channels + member_log_channels, embed)
+        if errors:
+            raise next(iter(errors.values()))
+
+    async def _sort_name_changes(self, changes: list):
+        """Sort name changes into the names to save and the embeds to log. Changes in guilds
+        without name change logging are left out.
+        Args:
+            changes: A list of (kind, user ID, guild ID, before, after) tuples
+        Returns: A tuple of the (username, user ID, None) tuples, the (global name, user ID,
+                 None) tuples and the (nickname, user ID, guild ID) tuples to save, and a list
+                 of (kind, discord.Guild, discord.Embed) tuples to log"""
+
+        usernames, global_names, nicknames = [], [], []
+        logs = []
+        for kind, user_id, guild_id, before, after in changes:
+            if kind == "nickname":
+                guild = self.bot.get_guild(guild_id)
+                user = guild.get_member(user_id) if guild is not None else None
+                guilds = [guild] if user is not None else []
+            else:
+                user = self.bot.get_user(user_id)
+                guilds = user.mutual_guilds if user is not None else []
+            guilds = [guild for guild in guilds if await self._is_logging_name_changes(guild)]
+            if not guilds:
+                continue
+            if after is not None:
+                {"username": usernames, "global_name": global_names,
+                 "nickname": nicknames}[kind].append((after, user_id, guild_id))
+            logs.extend((kind, guild, self._get_name_change_embed(user, kind, guild, before, after))
+                        for guild in guilds)
+        return usernames, global_names, nicknames, logs
+
+    @tasks.loop(seconds=NAME_CHANGE_WINDOW)
+    async def flush_name_changes(self):
+        """Save and log the name changes gathered since the last flush"""
+
+        try:
+            await self.save_name_changes()
+        except Exception as error: # pylint: disable=broad-exception-caught
+            print(f"Can't save name changes. {error}")
 
     @commands.Cog.listener()
     async def on_member_update(self, before: discord.Member, after: discord.Member):
         """Log updates to members"""
 
+        if before.nick != after.nick:
+            self.name_changes.record("nickname", after.id, after.guild.id, before.nick,
+                                     after.nick)
         log_channels = await self._get_guild_log_channels(after.guild)
         moderation_log_channels = await self._get_guild_moderation_log_channels(after.guild)
         if not before.timed_out and after.timed_out:
@@ -266,10 +373,7 @@ class Logging(commands.Cog):
             embed.set_footer(text=f"ID: {after.id}")
             guild_setting = await self._guild_setting_service.get_guild_setting_value_by_name(after.guild.id, "log_timeouts")
             if guild_setting.value == "1":
-                for channel in log_channels:
-                    await channel.send(embed=embed)
-                for channel in moderation_log_channels:
-                    await channel.send(embed=embed)
+                self.log_dispatcher.dispatch(log_channels + moderation_log_channels, embed)
 
         if before.timed_out and not after.timed_out:
             embed = discord.Embed(color=discord.Color.dark_blue(),
@@ -280,10 +384,7 @@ class Logging(commands.Cog):
             embed.set_footer(text=f"ID: {after.id}")
             guild_setting = await self._guild_setting_service.get_guild_setting_value_by_name(after.guild.id, "log_timeouts")
             if guild_setting.value == "1":
-                for channel in log_channels:
-                    await channel.send(embed=embed)
-                for channel in moderation_log_channels:
-                    await channel.send(embed=embed)
+                self.log_dispatcher.dispatch(log_channels + moderation_log_channels, embed)
 
 
     async def on_member_warn(self, member: discord.Member, warning: PunishmentEntity):
@@ -299,17 +400,23 @@ class Logging(commands.Cog):
         embed.add_field(name="Warning", value=warning.reason)
         guild_setting = await self._guild_setting_service.get_guild_setting_value_by_name(member.guild.id, "log_warnings")
         if guild_setting.value == "1":
-            for channel in log_channels:
-                await channel.send(embed=embed)
-            for channel in moderation_log_channels:
-                await channel.send(embed=embed)
+            self.log_dispatcher.dispatch(log_channels + moderation_log_channels, embed)
+
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel: discord.abc.GuildChannel):
+        """Stop logging into a deleted channel"""
+
+        self._utility_channel_service.forget_discord_channel(channel.guild.id, channel.id)
+        if self.log_dispatcher.webhook_manager is not None:
+            await self.log_dispatcher.webhook_manager.forget_webhook(channel.id)
 
 
     @commands.Cog.listener()
     async def on_invite_create(self, invite: discord.Invite):
         """Log an invite creation"""
 
-        self.invites[invite.guild].append(invite)
+        self.invites.setdefault(invite.guild, []).append(invite)
 
 
     @commands.Cog.listener()
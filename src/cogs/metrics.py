@@ -0,0 +1,226 @@
+"""Houses the cog that serves the bot's metrics to Prometheus"""
+
+import asyncio
+import time
+from datetime import datetime
+import discord
+from aiohttp import web
+from discord.ext import commands
+from config.constants import METRICS_HOST, METRICS_PORT
+from db_connection.db_connector import DBConnection
+from helpers.prometheus_metrics import Histogram, MetricsWriter
+from services.guild_setting_service import GuildSettingCache
+from services.reminder_service import ReminderSchedule
+from services.temp_ban_service import TempBanSchedule
+
+class Metrics(commands.Cog):
+    """This cog times every event listener and slash command and serves them, together with the
+    database, log queue, cache and scheduler statistics, on a local HTTP endpoint in the
+    Prometheus text format. Everything but the listener and command timings is read from the
+    rest of the bot when the endpoint is scraped.
+    Attributes:
+        bot: The bot whose metrics are served
+        db_address: The location of the database the bot saves data to
+        db_connection: The connection whose shared pool holds the database metrics
+        host: The address the endpoint listens on
+        port: The port the endpoint listens on
+        listener_durations: A Histogram of listener run times by listener and event
+        command_durations: A Histogram of slash command run times by command, cog and outcome"""
+
+    def __init__(self, bot: discord.Bot, db_address: str, host: str = METRICS_HOST,
+                 port: int = METRICS_PORT):
+        """Activate the metrics cog and start timing listeners and commands. The endpoint is
+        started separately with start_server.
+        Args:
+            bot: The bot whose metrics are served
+            db_address: The location of the database the bot saves data to
+            host: The address the endpoint listens on
+            port: The port the endpoint listens on"""
+
+        self.bot = bot
+        self.db_address = db_address
+        self.db_connection = DBConnection(db_address)
+        self.host = host
+        self.port = port
+        self.listener_durations = Histogram(("listener", "event"))
+        self.command_durations = Histogram(("command", "cog", "outcome"))
+        self._command_starts = {}
+        self._runner = None
+        # Pycord has no public hook around listener runs. Every listener, whether it belongs to
+        # a cog or was added with bot.event, is run through Client._run_event, so wrapping that
+        # single method times all of them without touching the cogs. The original is put back
+        # when the cog is unloaded.
+        self._original_run_event = bot._run_event # pylint: disable=protected-access
+        bot._run_event = self._run_timed_event # pylint: disable=protected-access
+
+    def cog_unload(self):
+        """Stop timing listeners and commands and shut down the endpoint"""
+
+        self.bot._run_event = self._original_run_event # pylint: disable=protected-access
+        if self._runner is not None:
+            asyncio.create_task(self.stop_server())
+
+    async def _run_timed_event(self, coro, event_name: str, *args, **kwargs):
+        """Run an event listener the way the bot would and record how long it took
+        Args:
+            coro: The listener coroutine function
+            event_name: The name of the event, e.g. "on_message_edit"
+            args: The positional arguments of the event
+            kwargs: The keyword arguments of the event"""
+
+        start = time.perf_counter()
+        try:
+            await self._original_run_event(coro, event_name, *args, **kwargs)
+        finally:
+            self.listener_durations.observe((getattr(coro, "__qualname__", str(coro)), event_name),
+                                            time.perf_counter() - start)
+
+    @commands.Cog.listener()
+    async def on_application_command(self, ctx: discord.ApplicationContext):
+        """Remember when a slash command started"""
+
+        self._command_starts[ctx.interaction.id] = time.perf_counter()
+
+    @commands.Cog.listener()
+    async def on_application_command_completion(self, ctx: discord.ApplicationContext):
+        """Record how long a successful slash command took"""
+
+        self._record_command(ctx, "completed")
+
+    @commands.Cog.listener()
+    async def on_application_command_error(self, ctx: discord.ApplicationContext,
+                                           _error: discord.DiscordException):
+        """Record how long a failed slash command took"""
+
+        self._record_command(ctx, "failed")
+
+    def _record_command(self, ctx: discord.ApplicationContext, outcome: str):
+        """Record how long a slash command took. Pycord dispatches the start, completion and
+        error events of a command separately, so a command whose start wasn't seen is skipped.
+        Args:
+            ctx: The context of the command
+            outcome: "completed" or "failed", depending on how the command ended"""
+
+        start = self._command_starts.pop(ctx.interaction.id, None)
+        if start is None:
+            return
+        cog = ctx.command.cog.qualified_name if ctx.command.cog is not None else ""
+        self.command_durations.observe((ctx.command.qualified_name, cog, outcome),
+                                       time.perf_counter() - start)
+
+    async def start_server(self):
+        """Start serving the metrics on http://host:port/metrics"""
+
+        app = web.Application()
+        app.router.add_get("/metrics", self.handle_metrics)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        print(f"Serving metrics on http://{self.host}:{self.port}/metrics")
+
+    async def stop_server(self):
+        """Stop serving the metrics"""
+
+        runner = self._runner
+        self._runner = None
+        if runner is not None:
+            await runner.cleanup()
+
+    async def handle_metrics(self, _request: web.Request):
+        """Respond to a scrape with the current metrics
+        Returns: A Response containing the metrics in the Prometheus text format"""
+
+        return web.Response(text=self.render(), content_type="text/plain",
+                            headers={"X-Content-Type-Options": "nosniff"})
+
+    def render(self):
+        """Collect the metrics of the bot
+        Returns: The metrics as a string in the Prometheus text format"""
+
+        writer = MetricsWriter()
+        writer.add_histogram("likahbot_listener_duration_seconds",
+                             "How long event listeners took to run", self.listener_durations)
+        writer.add_histogram("likahbot_command_duration_seconds",
+                             "How long slash commands took to run", self.command_durations)
+        self._add_database_metrics(writer)
+        self._add_log_queue_metrics(writer)
+        cache = GuildSettingCache.get_cache(self.db_address)
+        writer.add("likahbot_guild_setting_cache_lookups_total", "counter",
+                   "Guild setting lookups by whether they were answered from the cache",
+                   [({"result": "hit"}, cache.hits), ({"result": "miss"}, cache.misses)])
+        self._add_scheduler_metrics(writer)
+        return writer.render()
+
+    def _add_database_metrics(self, writer: MetricsWriter):
+        """Add the connection pool, write queue and per-statement metrics
+        Args:
+            writer: The MetricsWriter to add the metrics to"""
+
+        pool_metrics = self.db_connection.pool.get_wait_metrics()
+        connections = [("reader", pool_metrics["reader"]), ("writer", pool_metrics["writer"])]
+        writer.add("likahbot_db_connection_acquisitions_total", "counter",
+                   "Connections taken from the pool",
+                   [({"connection": kind}, metrics["acquisitions"])
+                    for kind, metrics in connections])
+        writer.add("likahbot_db_connection_contended_total", "counter",
+                   "Connection acquisitions that had to wait for another user",
+                   [({"connection": kind}, metrics["contended"]) for kind, metrics in connections])
+        writer.add("likahbot_db_connection_wait_seconds_total", "counter",
+                   "Time spent waiting for pooled connections",
+                   [({"connection": kind}, metrics["total_wait"]) for kind, metrics in connections])
+        write_queue = pool_metrics["write_queue"]
+        writer.add("likahbot_db_write_queue_batches_total", "counter",
+                   "Group commits made by the write queue", [({}, write_queue["batches"])])
+        writer.add("likahbot_db_write_queue_depth", "gauge",
+                   "Writes waiting in the write queue", [({}, write_queue["queued"])])
+        statements = self.db_connection.get_query_metrics()
+        writer.add("likahbot_db_queries_total", "counter", "Executions of each SQL statement",
+                   [({"sql": statement["sql"]}, statement["count"]) for statement in statements])
+        writer.add("likahbot_db_query_seconds_total", "counter",
+                   "Time spent executing each SQL statement and fetching its rows",
+                   [({"sql": statement["sql"]}, statement["total_time"])
+                    for statement in statements])
+        writer.add("likahbot_db_query_max_seconds", "gauge",
+                   "The longest single execution of each SQL statement",
+                   [({"sql": statement["sql"]}, statement["max_time"]) for statement in statements])
+        writer.add("likahbot_db_query_rows_total", "counter", "Rows fetched by each SQL statement",
+                   [({"sql": statement["sql"]}, statement["rows"]) for statement in statements])
+
+    def _add_log_queue_metrics(self, writer: MetricsWriter):
+        """Add the log dispatcher metrics if the Logging cog is loaded
+        Args:
+            writer: The MetricsWriter to add the metrics to"""
+
+        logging_cog = self.bot.get_cog("Logging")
+        if logging_cog is None:
+            return
+        statistics = logging_cog.log_dispatcher.get_statistics()
+        writer.add("likahbot_log_queue_depth", "gauge", "Log embeds waiting to be sent",
+                   [({}, statistics["queued"])])
+        writer.add("likahbot_log_queue_max_depth", "gauge",
+                   "Log embeds waiting in the longest channel queue",
+                   [({}, statistics["max_queue_depth"])])
+        writer.add("likahbot_log_embeds_total", "counter", "Log embeds by what happened to them",
+                   [({"outcome": outcome}, statistics[outcome])
+                    for outcome in ("sent", "failed", "dropped")])
+
+    def _add_scheduler_metrics(self, writer: MetricsWriter):
+        """Add how many items each scheduler holds and how overdue its next item is
+        Args:
+            writer: The MetricsWriter to add the metrics to"""
+
+        temp_bans = TempBanSchedule.get_schedule(self.db_address)
+        reminders = ReminderSchedule.get_schedule(self.db_address)
+        schedulers = [("temp_bans", temp_bans, temp_bans.next_expiration()),
+                      ("reminders", reminders, reminders.next_date())]
+        tasks_cog = self.bot.get_cog("Tasks")
+        if tasks_cog is not None:
+            unverified = tasks_cog.unverified_member_scheduler
+            schedulers.append(("unverified_members", unverified, unverified.next_deadline()))
+        now = datetime.utcnow()
+        writer.add("likahbot_scheduled_items", "gauge", "Items waiting in each scheduler",
+                   [({"scheduler": name}, len(scheduler)) for name, scheduler, _ in schedulers])
+        writer.add("likahbot_scheduler_overdue_seconds", "gauge",
+                   "How long the next item of each scheduler has been due, 0 if it isn't yet",
+                   [({"scheduler": name}, max((now - due).total_seconds(), 0) if due else 0)
+                    for name, _, due in schedulers])
@@ -1,15 +1,37 @@
 """Houses the cog for tasks, i.e. timed events"""
 
+import asyncio
+from datetime import datetime, timedelta
 import discord
 from discord.ext import commands, tasks
+from config.constants import UNBAN_CONCURRENCY, REMINDER_SEND_CONCURRENCY, \
+    UNVERIFIED_ACTION_CONCURRENCY
+from helpers.unverified_member_scheduler import UnverifiedMemberScheduler
+from services.guild_role_service import GuildRoleService
+from services.reminder_service import ReminderService
 from services.temp_ban_service import TempBanService
+from services.unverified_kick_rule_service import UnverifiedKickRuleService
+from services.unverified_reminder_history_service import UnverifiedReminderHistoryService
+from services.unverified_reminder_message_service import UnverifiedReminderMessageService
+from services.user_reminder_service import UserReminderService
 from services.utility_channel_service import UtilityChannelService
 
 class Tasks(commands.Cog):
     """The Tasks class houses the different tasks the bot runs in certain intervals
     Attributes:
         temp_ban_service: The service for fetching and managing temp bans
-        utility_channel_service: The service for fetching and managing guild utility channels"""
+        utility_channel_service: The service for fetching and managing guild utility channels
+        reminder_service: The service for fetching and managing reminders
+        user_reminder_service: The service for fetching the users opted into reminders
+        guild_role_service: The service for fetching the verified roles of guilds
+        unverified_kick_rule_service: The service for fetching unverified kick rules
+        unverified_reminder_message_service: The service for fetching unverified reminder messages
+        unverified_reminder_history_service: The service for recording sent unverified reminders
+        unverified_member_scheduler: Tracks when unverified members are reminded or kicked
+        verified_roles: A dictionary of {guild ID: set of verified role IDs} pairs
+        unban_semaphore: Limits how many guilds have their expired temp bans lifted at once
+        reminder_semaphore: Limits how many reminder messages are sent at once
+        unverified_semaphore: Limits how many unverified members are reminded or kicked at once"""
 
     def __init__(self, bot: discord.Bot, db_address):
         """Activate the Tasks cog
@@ -20,20 +42,340 @@ class Tasks(commands.Cog):
         self.bot = bot
         self.temp_ban_service = TempBanService(db_address)
         self.utility_channel_service = UtilityChannelService(db_address)
+        self.reminder_service = ReminderService(db_address)
+        self.user_reminder_service = UserReminderService(db_address)
+        self.guild_role_service = GuildRoleService(db_address)
+        self.unverified_kick_rule_service = UnverifiedKickRuleService(db_address)
+        self.unverified_reminder_message_service = UnverifiedReminderMessageService(db_address)
+        self.unverified_reminder_history_service = UnverifiedReminderHistoryService(db_address)
+        self.unverified_member_scheduler = UnverifiedMemberScheduler()
+        self.verified_roles = {}
+        self.unsaved_reminder_history = []
+        self.unban_semaphore = asyncio.Semaphore(UNBAN_CONCURRENCY)
+        self.reminder_semaphore = asyncio.Semaphore(REMINDER_SEND_CONCURRENCY)
+        self.unverified_semaphore = asyncio.Semaphore(UNVERIFIED_ACTION_CONCURRENCY)
         self.unban_expired_temp_bans.start()
+        self.send_due_reminders.start()
+        self.process_unverified_members.start()
 
-    @tasks.loop(minutes=1)
+    def cog_unload(self):
+        """Stop the running tasks when the cog is unloaded"""
+
+        self.unban_expired_temp_bans.cancel()
+        self.send_due_reminders.cancel()
+        self.process_unverified_members.cancel()
+
+    @tasks.loop()
     async def unban_expired_temp_bans(self):
-        """Checks the temp ban table for expired bans and automatically unbans applicable users"""
+        """Sleeps until the next temp ban expires, or until an earlier one is scheduled, and
+        automatically unbans the users whose bans have expired"""
+
+        schedule = self.temp_ban_service.schedule
+        next_expiration = schedule.next_expiration()
+        if next_expiration is not None:
+            timeout = max((next_expiration - datetime.utcnow()).total_seconds(), 0)
+            await schedule.wait_for_change(timeout)
+        else:
+            await schedule.wait_for_change()
+
+        expired_bans = schedule.pop_expired(datetime.utcnow())
+        if expired_bans:
+            await self.unban_temp_bans(expired_bans)
+
+    async def unban_temp_bans(self, expired_bans: list):
+        """Unban the users of expired temp bans and delete the bans that were handled. The bans
+        of a guild that fails unexpectedly are scheduled to be retried in a minute without
+        affecting the other guilds.
+        Args:
+            expired_bans: A list of expired temp ban entities"""
+
+        guild_bans = {}
+        for ban in expired_bans:
+            guild_bans.setdefault(ban.guild_id, []).append(ban)
+        # Discord rate limits bans per guild, so each guild's bans are lifted one by one while
+        # several guilds are handled at the same time
+        results = await asyncio.gather(*(self.unban_guild_temp_bans(bans)
+                                         for bans in guild_bans.values()),
+                                       return_exceptions=True)
+        processed_ids = []
+        for bans, result in zip(guild_bans.values(), results):
+            if isinstance(result, Exception):
+                print(f"Can't lift the expired temp bans of guild with ID {bans[0].guild_id}. "
+                      f"Retrying in a minute. {result}")
+                retry = datetime.utcnow() + timedelta(minutes=1)
+                for ban in bans:
+                    self.temp_ban_service.schedule.add(ban.user_id, ban.guild_id, retry,
+                                                       ban.db_id)
+                continue
+            processed_ids.extend(db_id for db_id in result if db_id is not None)
+        try:
+            await self.temp_ban_service.delete_temp_bans_by_ids(processed_ids)
+        except Exception as error: # pylint: disable=broad-exception-caught
+            # The bans are no longer scheduled, so they are put back to be deleted with a retry
+            print(f"Can't delete the lifted temp bans. Retrying in a minute. {error}")
+            retry = datetime.utcnow() + timedelta(minutes=1)
+            processed_ids = set(processed_ids)
+            for ban in expired_bans:
+                if ban.db_id in processed_ids:
+                    self.temp_ban_service.schedule.add(ban.user_id, ban.guild_id, retry,
+                                                       ban.db_id)
+
+    async def unban_guild_temp_bans(self, bans: list):
+        """Unban the users of the expired temp bans of a single guild. Bans that couldn't be
+        lifted are scheduled to be retried in a minute.
+        Args:
+            bans: A list of expired temp ban entities that all belong to the same guild
+        Returns: A list of the database IDs of the temp bans that no longer need to be kept"""
+
+        processed_ids = []
+        async with self.unban_semaphore:
+            # Fetching a guild the bot has left fails with Forbidden, so only the cache is used
+            guild = self.bot.get_guild(bans[0].guild_id)
+            if guild is None:
+                print(f"Guild with ID {bans[0].guild_id} is no longer available. "
+                      "Dropping its expired temp bans.")
+                return [ban.db_id for ban in bans]
+            for ban in bans:
+                retry = datetime.utcnow() + timedelta(minutes=1)
+                try:
+                    await guild.unban(discord.Object(id=ban.user_id), reason="Expired temp ban")
+                    processed_ids.append(ban.db_id)
+                except discord.NotFound:
+                    processed_ids.append(ban.db_id)
+                except discord.Forbidden:
+                    print(f"Missing permissions to unban user with ID {ban.user_id} in {guild}. "
+                          "Retrying in a minute.")
+                    self.temp_ban_service.schedule.add(ban.user_id, ban.guild_id, retry, ban.db_id)
+                except discord.HTTPException:
+                    print(f"Can't unban user with ID {ban.user_id} in {guild}. HTTPException. "
+                          "Retrying in a minute.")
+                    self.temp_ban_service.schedule.add(ban.user_id, ban.guild_id, retry, ban.db_id)
+        return processed_ids
+
+    @unban_expired_temp_bans.before_loop
+    async def load_temp_ban_schedule(self):
+        """Load the temp ban schedule from the database before the unbanning starts"""
+
+        await self.bot.wait_until_ready()
+        if not self.temp_ban_service.schedule.loaded:
+            await self.temp_ban_service.load_schedule()
+
+    @tasks.loop()
+    async def send_due_reminders(self):
+        """Sleeps until the next reminder is due, or until an earlier one is scheduled, and sends
+        the due reminders to their creators and opted in users"""
+
+        schedule = self.reminder_service.schedule
+        next_date = schedule.next_date()
+        if next_date is not None:
+            await schedule.wait_for_change(max((next_date - datetime.utcnow()).total_seconds(), 0))
+        else:
+            await schedule.wait_for_change()
 
-        temp_bans = await self.temp_ban_service.get_expired_temp_bans()
-        for ban in temp_bans:
-            guild = await ban.get_discord_guild(self.bot)
-            user = await ban.get_discord_user(self.bot)
+        now = datetime.utcnow()
+        try:
+            reminders = await self.reminder_service.pop_due_reminders(now)
+        except Exception as error: # pylint: disable=broad-exception-caught
+            # The popped reminders were put back and are retried in a minute
+            print(f"Can't load the due reminders. Retrying in a minute. {error}")
+            return
+        if not reminders:
+            return
+
+        try:
+            await self.deliver_reminders(reminders, now)
+        except Exception as error: # pylint: disable=broad-exception-caught
+            print(f"Can't send the due reminders. Retrying in a minute. {error}")
+            schedule.retry([reminder.db_id for reminder in reminders], now)
+
+    async def deliver_reminders(self, reminders: list, now: datetime):
+        """Send due reminders to their creators and opted in users and move them to their next
+        dates
+        Args:
+            reminders: A list of ReminderEntity objects of the due reminders
+            now: The current time in UTC"""
+
+        opted_in_users = await self.user_reminder_service.get_opted_in_users_of_reminders(
+            [reminder.db_id for reminder in reminders])
+        deliveries = []
+        for reminder in reminders:
+            user_ids = {reminder.user_id, *opted_in_users.get(reminder.db_id, [])}
+            deliveries.extend(self.send_reminder(user_id, reminder) for user_id in user_ids)
+        await asyncio.gather(*deliveries)
+        await self.reminder_service.reschedule_delivered_reminders(reminders, now)
+
+    async def send_reminder(self, user_id: int, reminder):
+        """Send a reminder to a single user in direct messages
+        Args:
+            user_id: The Discord ID of the user to remind
+            reminder: The ReminderEntity object of the reminder to send"""
+
+        async with self.reminder_semaphore:
+            user = self.bot.get_user(user_id)
             try:
-                await guild.unban(user, reason="Expired temp ban")
-                await self.temp_ban_service.delete_temp_ban(user.id, guild.id)
+                if not user:
+                    user = await self.bot.fetch_user(user_id)
+                await user.send(f"Reminder: {reminder.content}")
+            except discord.NotFound:
+                print(f"Can't find user with ID {user_id} to remind. Skipping.")
             except discord.Forbidden:
-                print(f"Missing permissions to unban {user} in {guild}. Skipping.")
+                print(f"Can't send a reminder to {user}. Direct messages closed. Skipping.")
             except discord.HTTPException:
-                print(f"Can't unban {user} in {guild}. HTTPException. Skipping.")
+                print(f"Can't send a reminder to {user}. HTTPException. Skipping.")
+
+    @send_due_reminders.before_loop
+    async def load_reminder_schedule(self):
+        """Load the reminder schedule from the database before reminders start being sent"""
+
+        await self.bot.wait_until_ready()
+        if not self.reminder_service.schedule.loaded:
+            await self.reminder_service.load_schedule()
+
+    async def load_guild_unverified_members(self, guild: discord.Guild):
+        """Load the verification rules of a guild and start tracking its unverified members.
+        Guilds without verified roles or without a kick rule and reminder messages are skipped.
+        Args:
+            guild: The guild whose unverified members to track"""
+
+        scheduler = self.unverified_member_scheduler
+        roles = await self.guild_role_service.get_guild_roles_of_type("VERIFIED", guild.id)
+        kick_rule = await self.unverified_kick_rule_service.get_guild_unverified_kick_rules(guild.id)
+        reminders = await self.unverified_reminder_message_service.\
+            get_guild_unverified_reminder_messages(guild.id)
+        kick_after = kick_rule.timedelta if kick_rule else None
+        if not roles or (kick_after is None and not reminders):
+            self.verified_roles.pop(guild.id, None)
+            scheduler.remove_guild(guild.id)
+            return
+
+        self.verified_roles[guild.id] = {role.role_id for role in roles}
+        scheduler.set_guild_rules(guild.id, kick_after, reminders)
+        history = await self.unverified_reminder_history_service.get_guild_reminder_history(guild.id)
+        sent_reminders = {}
+        for entry in history:
+            sent_reminders.setdefault(entry.user_id, set()).add(entry.reminder_message_id)
+        for member in guild.members:
+            if not member.bot and not self._is_verified(member):
+                scheduler.track(guild.id, member.id, member.joined_at or datetime.utcnow(),
+                                sent_reminders.get(member.id, ()))
+
+    def _is_verified(self, member: discord.Member):
+        """Check whether a member has any of their guild's verified roles
+        Args:
+            member: The member to check
+        Returns: True if the member is verified, False otherwise"""
+
+        verified_roles = self.verified_roles.get(member.guild.id, set())
+        return any(role.id in verified_roles for role in member.roles)
+
+    @commands.Cog.listener()
+    async def on_member_join(self, member: discord.Member):
+        """Start tracking a new member if their guild reminds or kicks unverified members"""
+
+        if member.bot or not self.unverified_member_scheduler.has_rules(member.guild.id):
+            return
+        self.unverified_member_scheduler.track(member.guild.id, member.id,
+                                               member.joined_at or datetime.utcnow())
+
+    @commands.Cog.listener()
+    async def on_member_update(self, before: discord.Member, after: discord.Member):
+        """Stop tracking a member once they get a verified role"""
+
+        if self.unverified_member_scheduler.is_tracked(after.guild.id, after.id) \
+           and self._is_verified(after):
+            self.unverified_member_scheduler.untrack(after.guild.id, after.id)
+
+    @commands.Cog.listener()
+    async def on_member_remove(self, member: discord.Member):
+        """Stop tracking a member who left and forget the reminders they got, so they are
+        reminded again if they rejoin"""
+
+        if self.unverified_member_scheduler.has_rules(member.guild.id):
+            self.unverified_member_scheduler.untrack(member.guild.id, member.id)
+            self.unsaved_reminder_history = [
+                entry for entry in self.unsaved_reminder_history
+                if entry[:2] != (member.guild.id, member.id)]
+            await self.unverified_reminder_history_service.delete_member_reminder_history(
+                member.id, member.guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_join(self, guild: discord.Guild):
+        """Start tracking the unverified members of a newly joined guild"""
+
+        await self.load_guild_unverified_members(guild)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild):
+        """Stop tracking the members of a guild the bot left"""
+
+        self.verified_roles.pop(guild.id, None)
+        self.unverified_member_scheduler.remove_guild(guild.id)
+
+    @tasks.loop()
+    async def process_unverified_members(self):
+        """Sleeps until the next unverified member is due to be reminded or kicked, or until an
+        earlier deadline is scheduled, and reminds or kicks the due members"""
+
+        scheduler = self.unverified_member_scheduler
+        next_deadline = scheduler.next_deadline()
+        timeout = None
+        if next_deadline is not None:
+            timeout = max((next_deadline - datetime.utcnow()).total_seconds(), 0)
+        if self.unsaved_reminder_history:
+            # Reminder history that couldn't be saved is retried within a minute
+            timeout = min(timeout, 60) if timeout is not None else 60
+        await scheduler.wait_for_change(timeout)
+
+        due = scheduler.pop_due(datetime.utcnow())
+        await asyncio.gather(*(self.remind_or_kick_unverified_member(*action) for action in due))
+        self.unsaved_reminder_history.extend((guild_id, user_id, reminder.db_id)
+                                             for guild_id, user_id, reminders, kick in due
+                                             if not kick for reminder in reminders)
+        await self.save_reminder_history()
+
+    async def save_reminder_history(self):
+        """Save the unverified reminders that were sent to the reminder history. If the history
+        can't be saved, it is kept and tried again in a minute, since the members were already
+        reminded and are no longer due for those reminders."""
+
+        unsaved, self.unsaved_reminder_history = self.unsaved_reminder_history, []
+        if not unsaved:
+            return
+        try:
+            await self.unverified_reminder_history_service.add_to_reminder_history_in_bulk(
+                [(user_id, reminder_id) for _, user_id, reminder_id in unsaved])
+        except Exception as error: # pylint: disable=broad-exception-caught
+            print(f"Can't save the unverified reminder history. Retrying in a minute. {error}")
+            self.unsaved_reminder_history[:0] = unsaved
+
+    async def remind_or_kick_unverified_member(self, guild_id: int, user_id: int,
+                                               reminders: list, kick: bool):
+        """Send an unverified member their latest due reminder or kick them
+        Args:
+            guild_id: The Discord ID of the member's guild
+            user_id: The Discord ID of the member
+            reminders: The unverified reminder message entities that became due, oldest first
+            kick: Whether to kick the member instead of reminding them"""
+
+        guild = self.bot.get_guild(guild_id)
+        member = guild.get_member(user_id) if guild else None
+        if not member:
+            return
+        async with self.unverified_semaphore:
+            try:
+                if kick:
+                    await member.kick(reason="Did not verify in time")
+                else:
+                    await member.send(reminders[-1].message)
+            except discord.Forbidden:
+                print(f"Missing permissions to remind or kick {member} in {guild}. Skipping.")
+            except discord.HTTPException:
+                print(f"Can't remind or kick {member} in {guild}. HTTPException. Skipping.")
+
+    @process_unverified_members.before_loop
+    async def load_unverified_members(self):
+        """Start tracking the unverified members of every guild before they start being processed"""
+
+        await self.bot.wait_until_ready()
+        for guild in self.bot.guilds:
+            await self.load_guild_unverified_members(guild)
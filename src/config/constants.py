@@ -2,3 +2,64 @@
 
 DB_ADDRESS = "database/likahbotdatabase.db"
 DEBUG_GUILDS = [383107941173166083] # set to [] for global slash commands
+STARTUP_CONCURRENCY = 10 # how many guilds have their invites fetched at the same time on startup
+DB_READER_CONNECTIONS = 4 # how many pooled read connections the bot keeps open per database
+DB_WRITE_BATCH_INTERVAL = 0.01 # how many seconds queued writes are gathered before a group commit
+DB_WRITE_BATCH_SIZE = 100 # how many queued writes are committed at most in a single transaction
+DB_QUERY_METRICS = True # whether the time, rows and connection wait of every statement are recorded
+DB_SLOW_QUERY_THRESHOLD = 0.1 # how many seconds a statement can take before it's logged as slow
+UNBAN_CONCURRENCY = 5 # how many guilds have their expired temp bans lifted at the same time
+REMINDER_SEND_CONCURRENCY = 10 # how many reminder messages are sent at the same time
+UNVERIFIED_ACTION_CONCURRENCY = 5 # how many unverified members are reminded or kicked at once
+EXPERIENCE_PER_MESSAGE = 10 # how much experience a member gets for a message
+EXPERIENCE_INTERVAL = 60 # how many seconds a member has to wait between experience awards
+EXPERIENCE_FLUSH_INTERVAL = 5.0 # how many seconds awarded experience is gathered before saving it
+LEADERBOARD_PAGE_SIZE = 10 # how many members are shown on a page of the experience leaderboard
+RANK_INDEX_BUCKET_SIZE = 500 # how many members a bucket of a leaderboard rank index holds at most
+LEVEL_EXPERIENCE_STEP = 100 # how much more experience each level takes than the one before it
+LOG_SEND_CONCURRENCY = 5 # how many log messages are sent at the same time across all channels
+LOG_QUEUE_LIMIT = 100 # how many log messages can wait per channel before new ones are dropped
+LOG_FLUSH_INTERVAL = 1.0 # how many seconds log messages are gathered before sending them together
+NAME_CHANGE_WINDOW = 10.0 # how many seconds name changes are gathered, keeping only the latest name
+LOOP_LAG_INTERVAL = 0.5 # how many seconds there are between event loop lag measurements
+LOOP_LAG_SAMPLES = 1200 # how many of the latest event loop lag measurements are kept
+LOOP_LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0) # lag histogram bounds
+# How many seconds a callback can block the event loop before it's reported, None to not check.
+# Reporting slow callbacks turns on asyncio's debug mode, which slows the whole bot down, so only
+# set this while looking for what blocks the loop.
+LOOP_SLOW_CALLBACK_THRESHOLD = None
+METRICS_ENABLED = False # whether the bot serves Prometheus metrics over HTTP
+METRICS_HOST = "127.0.0.1" # the address the metrics endpoint listens on, keep it local
+METRICS_PORT = 9108 # the port of the metrics endpoint, scraped from /metrics
+METRICS_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0) # seconds
+LOG_DELIVERY_MODE = "channel" # "channel" to send logs as the bot, "webhook" to use log webhooks
+LOG_WEBHOOK_RETRY_INTERVAL = 600.0 # how many seconds until a failed log webhook is tried again
+
+# The PRAGMA values applied to every pooled database connection. "default" keeps the SQLite
+# defaults (rollback journal, full sync), "wal" lets readers run while a write is committing
+# and only syncs at checkpoints, "wal_unsafe" skips syncing altogether and can lose the latest
+# transactions on a power loss.
+DB_STORAGE_PROFILES = {
+    "default": {
+        "busy_timeout": 5000,
+        "journal_mode": "DELETE",
+        "synchronous": "FULL"
+    },
+    "wal": {
+        "busy_timeout": 5000,
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": 268435456, # 256 MiB
+        "cache_size": -65536, # 64 MiB, negative values are in KiB
+        "temp_store": "MEMORY"
+    },
+    "wal_unsafe": {
+        "busy_timeout": 5000,
+        "journal_mode": "WAL",
+        "synchronous": "OFF",
+        "mmap_size": 268435456,
+        "cache_size": -65536,
+        "temp_store": "MEMORY"
+    }
+}
+DB_STORAGE_PROFILE = "wal"
@@ -1,14 +1,12 @@
 """The classes and functions handling data access objects for the experience table.
 The experience is used for leveling up on a server and advancing in the associated leaderboard."""
-from datetime import datetime
+import json
 from db_connection.db_connector import DBConnection
-from time_handler.time import TimeStringConverter, TimeDifference
 
 class ExperienceDAO:
     """A data access object for experience
     Attributes:
-        db_connection: An object that handles database connections
-        time_convert: An object that handles conversion between datetime and string"""
+        db_connection: An object that handles database connections"""
 
     def __init__(self, db_address):
         """Create a new data access object for experience
@@ -16,7 +14,6 @@ class ExperienceDAO:
             db_address: The address for the database file where the experience table resides"""
 
         self.db_connection = DBConnection(db_address)
-        self.time_convert = TimeStringConverter()
 
     async def get_guild_leaderboard(self, guild_id: int):
         """Get all experience in a Guild
@@ -24,11 +21,10 @@ class ExperienceDAO:
             guild_id: The ID of the Guild whose experience points to list
         Returns: A list of Rows containing the experience points of the selected Guild"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "SELECT * FROM experience WHERE guild_id=? ORDER BY amount DESC"
-        await cursor.execute(sql, (guild_id,))
-        experience = await cursor.fetchall()
-        await self.db_connection.close_connection(connection)
+        async with self.db_connection.reader() as cursor:
+            await cursor.execute(sql, (guild_id,))
+            experience = await cursor.fetchall()
         return experience
 
     async def get_user_experience(self, user_id: int, guild_id: int):
@@ -38,11 +34,10 @@ class ExperienceDAO:
             guild_id: The ID of the Guild from which to get the experience
         Returns: A single Row with the user experience, None if no experience is found"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "SELECT * FROM experience WHERE user_id=? AND guild_id=?"
-        await cursor.execute(sql, (user_id, guild_id))
-        experience = await cursor.fetchone()
-        await self.db_connection.close_connection(connection)
+        async with self.db_connection.reader() as cursor:
+            await cursor.execute(sql, (user_id, guild_id))
+            experience = await cursor.fetchone()
         return experience
 
     async def add_user_experience(self, user_id: int, guild_id: int, amount: int, interval: int):
@@ -56,19 +51,46 @@ class ExperienceDAO:
             interval: The interval, in seconds, after which the user is eligible for more
                       experience"""
 
-        experience = await self.get_user_experience(user_id, guild_id)
-        connection, cursor = await self.db_connection.connect_to_db()
-        if not experience:
-            sql = "INSERT INTO experience (user_id, guild_id, last_experience, amount) " \
-                   "VALUES (?, ?, datetime(), ?)"
-            await cursor.execute(sql, (user_id, guild_id, amount))
-        else:
-            last_experience = await self.time_convert.string_to_datetime(experience["last_experience"])
-            time_difference = TimeDifference().time_difference(last_experience, datetime.utcnow())
-            if time_difference > interval:
-                sql = "UPDATE experience SET amount=amount+?, last_experience=datetime() WHERE user_id=? AND guild_id=?"
-                await cursor.execute(sql, (amount, user_id, guild_id))
-        await self.db_connection.commit_and_close(connection)
+        sql = "INSERT INTO experience (user_id, guild_id, last_experience, amount) " \
+              "VALUES (?, ?, datetime(), ?) ON CONFLICT (user_id, guild_id) DO UPDATE " \
+              "SET amount=amount+excluded.amount, last_experience=excluded.last_experience " \
+              "WHERE last_experience IS NULL OR last_experience<datetime('now', ?)"
+        async with self.db_connection.writer() as cursor:
+            await cursor.execute(sql, (user_id, guild_id, amount, f"-{interval} seconds"))
+
+    async def get_recent_guild_experience(self, guild_id: int, seconds: int):
+        """Get the users of a guild who were awarded experience recently
+        Args:
+            guild_id: The ID of the Guild whose experience to get
+            seconds: How many seconds ago the experience was awarded at the earliest
+        Returns: A list of Rows containing the user IDs and the times of their last experience"""
+
+        sql = "SELECT user_id, last_experience FROM experience " \
+              "WHERE guild_id=? AND last_experience>datetime('now', ?)"
+        async with self.db_connection.reader() as cursor:
+            await cursor.execute(sql, (guild_id, f"-{seconds} seconds"))
+            experience = await cursor.fetchall()
+        return experience
+
+    async def add_experience_in_bulk(self, experience: list):
+        """Add experience to many users in a single statement, creating the rows of users who
+        don't have any experience yet
+        Args:
+            experience: A list of (user ID, guild ID, last experience, amount) tuples, where the
+                        last experience is a string in the database's datetime format
+        Returns: A list of Rows containing the user IDs, guild IDs and new experience amounts"""
+
+        # The WHERE clause tells the parser that ON CONFLICT doesn't belong to a join
+        sql = "INSERT INTO experience (user_id, guild_id, last_experience, amount) " \
+              "SELECT json_extract(value, '$[0]'), json_extract(value, '$[1]'), " \
+              "json_extract(value, '$[2]'), json_extract(value, '$[3]') FROM json_each(?) " \
+              "WHERE true ON CONFLICT (user_id, guild_id) DO UPDATE " \
+              "SET amount=amount+excluded.amount, last_experience=excluded.last_experience " \
+              "RETURNING user_id, guild_id, amount"
+        async with self.db_connection.writer() as cursor:
+            await cursor.execute(sql, (json.dumps([list(row) for row in experience]),))
+            totals = await cursor.fetchall()
+        return totals
 
     async def reset_user_experience(self, user_id: int, guild_id: int):
         """Reset a user's experience in a Guild back to 0
@@ -76,10 +98,9 @@ class ExperienceDAO:
             user_id: The Discord ID of the user whose experience to reset
             guild_id: The ID of the guild in which the experience is reset"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "UPDATE experience SET amount=0, last_experience=datetime() WHERE user_id=? AND guild_id=?"
-        await cursor.execute(sql, (user_id, guild_id))
-        await self.db_connection.commit_and_close(connection)
+        async with self.db_connection.writer() as cursor:
+            await cursor.execute(sql, (user_id, guild_id))
 
     async def delete_user_experience(self, user_id: int, guild_id: int):
         """Delete the database entry for a user's experience
@@ -87,17 +108,22 @@ class ExperienceDAO:
             user_id: The Discord ID of the user whose experience to delete
             guild_id: The ID of the guild from which to delete"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "DELETE FROM experience WHERE user_id=? AND guild_id=?"
-        await cursor.execute(sql, (user_id, guild_id))
-        await self.db_connection.commit_and_close(connection)
+        async with self.db_connection.writer() as cursor:
+            await cursor.execute(sql, (user_id, guild_id))
 
     async def delete_guild_experience(self, guild_id: int):
         """Delete all experience records for a given guild
         Args:
             guild_id: The Discord ID of the guild whose experience records to delete"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "DELETE FROM experience WHERE guild_id=?"
-        await cursor.execute(sql, (guild_id,))
-        await self.db_connection.commit_and_close(connection)
+        async with self.db_connection.writer() as cursor:
+            await cursor.execute(sql, (guild_id,))
+
+    async def clear_experience_table(self):
+        """Delete every single experience record from the table"""
+
+        sql = "DELETE FROM experience"
+        async with self.db_connection.writer() as cursor:
+            await cursor.execute(sql)
@@ -1,6 +1,7 @@
 """The classes and functions handling data access objects for the global names table.
 The database table keeps track of the history of a user's global names, i.e. the one displayed
 above the username."""
+import json
 from db_connection.db_connector import DBConnection
 
 class GlobalNamesDAO:
@@ -15,30 +16,16 @@ class GlobalNamesDAO:
 
         self.db_connection = DBConnection(db_address)
 
-    async def _delete_earlier_global_names(self, user_id: int, global_name_id: int):
-        """Delete the global_name_id global name and all global names registered before it
-        Args:
-            user_id: The Discord ID of the user whose global names to delete
-            global_name_id: The database ID of the global name used as a reference point for
-                            deletion"""
-
-        connection, cursor = await self.db_connection.connect_to_db()
-        sql = "DELETE FROM global_names WHERE user_id=? "\
-              "AND time<=(SELECT time FROM global_names WHERE id=?)"
-        await cursor.execute(sql, (user_id, global_name_id))
-        await self.db_connection.commit_and_close(connection)
-
     async def find_global_names(self, global_name: str):
         """Find all instances of a given global name in the database
         Args:
             global_name: The global name to find in the database
         Returns: A list of Row objects containing the found global names"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "SELECT * FROM global_names WHERE global_name=?"
-        await cursor.execute(sql, (global_name,))
-        rows = await cursor.fetchall()
-        await self.db_connection.close_connection(connection)
+        async with self.db_connection.reader() as cursor:
+            await cursor.execute(sql, (global_name,))
+            rows = await cursor.fetchall()
         return rows
 
     async def find_user_global_names(self, user_id: int):
@@ -47,16 +34,15 @@ class GlobalNamesDAO:
             user_id: The Discord ID of the user whose global names to find
         Returns: A list of Row objects containing the user's saved global name history"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "SELECT * FROM global_names WHERE user_id=? ORDER BY time DESC"
-        await cursor.execute(sql, (user_id,))
-        rows = await cursor.fetchall()
-        await self.db_connection.close_connection(connection)
+        async with self.db_connection.reader() as cursor:
+            await cursor.execute(sql, (user_id,))
+            rows = await cursor.fetchall()
         return rows
 
     async def add_global_name(self, global_name: str, user_id: int, global_name_limit: int = 5):
-        """Add a new global name to the database. If more than limit names exist already,
-           the oldest are deleted.
+        """Add a new global name to the database. If the user then has more than limit names,
+           the oldest are deleted in the same transaction.
         Args:
             global_name: The username to add
             user_id: The Discord ID of the user this global name is associated with
@@ -64,43 +50,63 @@ class GlobalNamesDAO:
                                at a time
         Returns: The database ID of the newly created global name"""
 
-        previous_global_names = await self.find_user_global_names(user_id)
-        if len(previous_global_names) >= global_name_limit:
-            this_username = previous_global_names.pop(0)
-            await self._delete_earlier_global_names(user_id, this_username["id"])
-
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "INSERT INTO global_names (user_id, global_name, time) "\
               "VALUES (?, ?, datetime()) RETURNING id"
-        await cursor.execute(sql, (user_id, global_name))
-        row = await cursor.fetchone()
-        await self.db_connection.commit_and_close(connection)
+        # Everything after the newest limit names, read backwards along the history index
+        trim_sql = "DELETE FROM global_names WHERE user_id=? AND id IN (SELECT id " \
+                   "FROM global_names WHERE user_id=? ORDER BY time DESC, id DESC " \
+                   "LIMIT -1 OFFSET ?)"
+        row = await self.db_connection.queue_write(
+            sql, (user_id, global_name), fetch="one",
+            followed_by=((trim_sql, (user_id, user_id, global_name_limit)),))
         return row["id"]
 
+    async def add_global_names(self, global_names: list, global_name_limit: int = 5):
+        """Add many new global names to the database at once, e.g. during a wave of renames.
+           Every user who then has more than limit names loses the oldest ones in the same
+           transaction.
+        Args:
+            global_names: A list of (global name, user ID) tuples, oldest first
+            global_name_limit: How many global names for one user are allowed in the database
+                               at a time
+        Returns: A list of the database IDs of the newly created global names"""
+
+        if not global_names:
+            return []
+        values = json.dumps([[user_id, global_name] for global_name, user_id in global_names])
+        sql = "INSERT INTO global_names (user_id, global_name, time) " \
+              "SELECT json_extract(value, '$[0]'), json_extract(value, '$[1]'), datetime() " \
+              "FROM json_each(?) RETURNING id"
+        trim_sql = "DELETE FROM global_names AS trimmed WHERE user_id IN " \
+                   "(SELECT json_extract(value, '$[0]') FROM json_each(?)) AND id IN " \
+                   "(SELECT id FROM global_names WHERE user_id=trimmed.user_id " \
+                   "ORDER BY time DESC, id DESC LIMIT -1 OFFSET ?)"
+        rows = await self.db_connection.queue_write(
+            sql, (values,), fetch="all",
+            followed_by=((trim_sql, (values, global_name_limit)),))
+        return [row["id"] for row in rows]
+
     async def delete_global_name(self, global_name_id: int):
         """Delete a global name by its database ID
         Args:
             global_name_id: The database ID of the global name to delete"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "DELETE FROM global_names WHERE id=?"
-        await cursor.execute(sql, (global_name_id,))
-        await self.db_connection.commit_and_close(connection)
+        async with self.db_connection.writer() as cursor:
+            await cursor.execute(sql, (global_name_id,))
 
     async def delete_user_global_names(self, user_id: int):
         """Delete all saved global names of a given user
         Args:
             user_id: The Discord ID of the user whose global names to delete"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "DELETE FROM global_names WHERE user_id=?"
-        await cursor.execute(sql, (user_id,))
-        await self.db_connection.commit_and_close(connection)
+        async with self.db_connection.writer() as cursor:
+            await cursor.execute(sql, (user_id,))
 
     async def clear_global_names_table(self):
         """Delete every single global name from the table"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "DELETE FROM global_names"
-        await cursor.execute(sql)
-        await self.db_connection.commit_and_close(connection)
+        async with self.db_connection.writer() as cursor:
+            await cursor.execute(sql)
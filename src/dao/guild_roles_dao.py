@@ -23,13 +23,12 @@ class GuildRolesDAO:
         Returns:
             A list of Rows containing the found roles"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "SELECT gr.id, role_id, category_id, guild_id, category FROM guild_roles AS gr " \
               "INNER JOIN guild_role_categories AS grc ON category_id=grc.id " \
               "WHERE guild_id=? ORDER BY category ASC"
-        await cursor.execute(sql, (guild_id,))
-        roles = await cursor.fetchall()
-        await self.db_connection.close_connection(connection)
+        async with self.db_connection.reader() as cursor:
+            await cursor.execute(sql, (guild_id,))
+            roles = await cursor.fetchall()
         return roles
 
     async def get_guild_roles_of_type(self, role_category: str, guild_id: int):
@@ -40,13 +39,12 @@ class GuildRolesDAO:
         Returns:
             A list of Rows containing the found roles"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "SELECT gr.id, role_id, category_id, guild_id, category FROM guild_roles AS gr " \
               "INNER JOIN guild_role_categories AS grc ON category_id=grc.id " \
               "WHERE category=? AND guild_id=?"
-        await cursor.execute(sql, (role_category, guild_id))
-        roles = await cursor.fetchall()
-        await self.db_connection.close_connection(connection)
+        async with self.db_connection.reader() as cursor:
+            await cursor.execute(sql, (role_category, guild_id))
+            roles = await cursor.fetchall()
         return roles
 
     async def get_guild_roles_by_role_id(self, role_id: int):
@@ -55,13 +53,12 @@ class GuildRolesDAO:
             role_id: The ID of the role from the Discord Guild
         Returns: A list of Rows containing the found roles"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "SELECT gr.id, role_id, category_id, guild_id, category FROM guild_roles AS gr " \
               "INNER JOIN guild_role_categories AS grc ON category_id=grc.id " \
               "WHERE role_id=?"
-        await cursor.execute(sql, (role_id,))
-        roles = await cursor.fetchall()
-        await self.db_connection.close_connection(connection)
+        async with self.db_connection.reader() as cursor:
+            await cursor.execute(sql, (role_id,))
+            roles = await cursor.fetchall()
         return roles
 
     async def add_guild_role(self, role_id: int, category_id: int):
@@ -70,10 +67,9 @@ class GuildRolesDAO:
             role_id: The ID of the role from the Discord Guild
             category_id: The database ID of the category this role belongs in"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "INSERT INTO guild_roles (role_id, category_id) VALUES (?, ?)"
-        await cursor.execute(sql, (role_id, category_id))
-        await self.db_connection.commit_and_close(connection)
+        async with self.db_connection.writer() as cursor:
+            await cursor.execute(sql, (role_id, category_id))
 
     async def remove_guild_role_from_category(self, role_id: int, category_id: int):
         """Remove a guild role by the role's Discord ID
@@ -81,26 +77,23 @@ class GuildRolesDAO:
             role_id: The Discord ID of the role to remove
             category_id: The database ID of the category to remove this role from"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "DELETE FROM guild_roles WHERE role_id=? AND category_id=?"
-        await cursor.execute(sql, (role_id, category_id))
-        await self.db_connection.commit_and_close(connection)
+        async with self.db_connection.writer() as cursor:
+            await cursor.execute(sql, (role_id, category_id))
 
     async def delete_guild_roles(self, guild_id: int):
         """Delete all guild roles of a given guild
         Args:
             guild_id: The Discord ID of the guild whose guild roles to delete"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "DELETE FROM guild_roles WHERE category_id IN " \
               "(SELECT id FROM guild_role_categories WHERE guild_id=?)"
-        await cursor.execute(sql, (guild_id,))
-        await self.db_connection.commit_and_close(connection)
+        async with self.db_connection.writer() as cursor:
+            await cursor.execute(sql, (guild_id,))
 
     async def clear_guild_roles_table(self):
         """Delete every single guild role from the table"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "DELETE FROM guild_roles"
-        await cursor.execute(sql)
-        await self.db_connection.commit_and_close(connection)
+        async with self.db_connection.writer() as cursor:
+            await cursor.execute(sql)
@@ -1,10 +1,13 @@
 """The classes and functions handling data access objects for the guild_settings table.
 Guild settings are the guild-specific values of the defaults set in the settings table.
 They contain values such as what the bot will log on the guild."""
+import json
 from db_connection.db_connector import DBConnection
 from dao.settings_dao import SettingsDAO
 
-class GuildSettingsDAO:
+# Every guild setting statement has its own method, like in the other DAOs, and initializing
+# one guild and many guilds at once are separate statements
+class GuildSettingsDAO: # pylint: disable=too-many-public-methods
     """A data access object for guild settings
     Attributes:
         db_connection: An object that handles database connections"""
@@ -23,12 +26,11 @@ class GuildSettingsDAO:
             guild_setting_id: The database ID of the guild setting
         Returns: A Row object containing the guild setting status, None if not found"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "SELECT gs.*, s.name FROM guild_settings AS gs "\
               "LEFT JOIN settings AS s ON gs.setting_id = s.id WHERE gs.id=?"
-        await cursor.execute(sql, (guild_setting_id,))
-        row = await cursor.fetchone()
-        await self.db_connection.close_connection(connection)
+        async with self.db_connection.reader() as cursor:
+            await cursor.execute(sql, (guild_setting_id,))
+            row = await cursor.fetchone()
         return row
 
     async def get_guild_setting_value_by_name(self, guild_id: int, setting_name: str):
@@ -38,12 +40,11 @@ class GuildSettingsDAO:
             setting_name: The name of the setting to get
         Returns: A Row object containing the setting status, or None if not found"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "SELECT gs.*, s.name FROM guild_settings AS gs "\
               "LEFT JOIN settings AS s ON setting_id=s.id WHERE guild_id=? AND s.name=?"
-        await cursor.execute(sql, (guild_id, setting_name))
-        row = await cursor.fetchone()
-        await self.db_connection.close_connection(connection)
+        async with self.db_connection.reader() as cursor:
+            await cursor.execute(sql, (guild_id, setting_name))
+            row = await cursor.fetchone()
         return row
 
     async def get_guild_setting_value_by_setting_id(self, guild_id: int, setting_id: int):
@@ -53,13 +54,12 @@ class GuildSettingsDAO:
             setting_id: The database ID of the setting to get (from the settings table)
         Returns: A Row object containing the setting status, None if not found"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "SELECT gs.*, s.name FROM guild_settings AS gs "\
               "LEFT JOIN settings AS s ON gs.setting_id = s.id "\
               "WHERE gs.guild_id=? AND gs.setting_id=?"
-        await cursor.execute(sql, (guild_id, setting_id))
-        row = await cursor.fetchone()
-        await self.db_connection.close_connection(connection)
+        async with self.db_connection.reader() as cursor:
+            await cursor.execute(sql, (guild_id, setting_id))
+            row = await cursor.fetchone()
         return row
 
     async def get_all_guild_settings(self, guild_id: int):
@@ -68,13 +68,12 @@ class GuildSettingsDAO:
             guild_id: The Discord ID of the guild whose guild settings to get
         Returns: A list of Row objects containing the guild settings of the given guild"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "SELECT gs.*, s.name FROM guild_settings AS gs "\
               "LEFT JOIN settings AS s ON gs.setting_id = s.id "\
               "WHERE gs.guild_id=?"
-        await cursor.execute(sql, (guild_id,))
-        rows = await cursor.fetchall()
-        await self.db_connection.close_connection(connection)
+        async with self.db_connection.reader() as cursor:
+            await cursor.execute(sql, (guild_id,))
+            rows = await cursor.fetchall()
         return rows
 
     async def search_guild_settings(self, guild_id: int, keyword: str):
@@ -84,12 +83,11 @@ class GuildSettingsDAO:
             keyword: The keyword to search guild settings with
         Returns: A list of Row objects containing the found guild settings"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "SELECT gs.*, s.name FROM guild_settings AS gs "\
               "LEFT JOIN settings AS s ON setting_id=s.id WHERE guild_id=? AND s.name LIKE ?"
-        await cursor.execute(sql, (guild_id, "%"+keyword+"%"))
-        rows = await cursor.fetchall()
-        await self.db_connection.close_connection(connection)
+        async with self.db_connection.reader() as cursor:
+            await cursor.execute(sql, (guild_id, "%"+keyword+"%"))
+            rows = await cursor.fetchall()
         return rows
 
     async def initialize_guild_settings(self, guild_id: int):
@@ -98,14 +96,29 @@ class GuildSettingsDAO:
             guild_id: The Discord ID of the guild whose settings to initialize
         Returns: A list of Row objects containing the IDs of the newly created guild settings"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "INSERT INTO guild_settings (guild_id, setting_id, setting_value) "\
               "SELECT (?), id, setting_value FROM settings WHERE id NOT IN "\
               "(SELECT setting_id FROM guild_settings WHERE guild_id=?) "\
               "RETURNING id"
-        await cursor.execute(sql, (guild_id, guild_id))
-        rows = await cursor.fetchall()
-        await self.db_connection.commit_and_close(connection)
+        async with self.db_connection.writer() as cursor:
+            await cursor.execute(sql, (guild_id, guild_id))
+            rows = await cursor.fetchall()
+        return rows
+
+    async def initialize_guilds_settings(self, guild_ids: list):
+        """Create the missing guild settings of several guilds in a single statement
+        Args:
+            guild_ids: A list of the Discord IDs of the guilds whose settings to initialize
+        Returns: A list of Row objects containing the IDs and guild IDs of the newly created
+                 guild settings"""
+
+        sql = "INSERT INTO guild_settings (guild_id, setting_id, setting_value) "\
+              "SELECT g.value, s.id, s.setting_value FROM json_each(?) AS g, settings AS s "\
+              "WHERE TRUE ON CONFLICT (guild_id, setting_id) DO NOTHING "\
+              "RETURNING id, guild_id"
+        async with self.db_connection.writer() as cursor:
+            await cursor.execute(sql, (json.dumps(list(guild_ids)),))
+            rows = await cursor.fetchall()
         return rows
 
     async def add_guild_setting_by_setting_id(self, guild_id: int, setting_id: int,
@@ -117,12 +130,11 @@ class GuildSettingsDAO:
             setting_value: The value to set the setting to
         Returns: A Row object containing the ID of the newly created guild setting"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "INSERT INTO guild_settings (guild_id, setting_id, setting_value) VALUES (?, ?, ?) "\
               "RETURNING id"
-        await cursor.execute(sql, (guild_id, setting_id, setting_value))
-        row = await cursor.fetchone()
-        await self.db_connection.commit_and_close(connection)
+        async with self.db_connection.writer() as cursor:
+            await cursor.execute(sql, (guild_id, setting_id, setting_value))
+            row = await cursor.fetchone()
         return row
 
     async def add_guild_setting_by_setting_name(self,
@@ -136,24 +148,24 @@ class GuildSettingsDAO:
             setting_value: The value to set the setting to
         Returns: A Row object containing the ID of the newly created guild setting"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "INSERT INTO guild_settings (guild_id, setting_id, setting_value) "\
               "VALUES (?, (SELECT id FROM settings WHERE name=?), ?) RETURNING id"
-        await cursor.execute(sql, (guild_id, setting_name, setting_value))
-        row = await cursor.fetchone()
-        await self.db_connection.commit_and_close(connection)
+        async with self.db_connection.writer() as cursor:
+            await cursor.execute(sql, (guild_id, setting_name, setting_value))
+            row = await cursor.fetchone()
         return row
 
     async def edit_guild_setting_by_id(self, guild_setting_id: int, setting_value: str):
         """Edit a guild setting by its ID
         Args:
             guild_setting_id: The database ID of the guild setting to edit
-            setting_value: The value to change to"""
+            setting_value: The value to change to
+        Returns: A Row object containing the guild ID of the edited guild setting, None if it
+                 doesn't exist"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
-        sql = "UPDATE guild_settings SET setting_value=? WHERE id=?"
-        await cursor.execute(sql, (setting_value, guild_setting_id))
-        await self.db_connection.commit_and_close(connection)
+        sql = "UPDATE guild_settings SET setting_value=? WHERE id=? RETURNING guild_id"
+        return await self.db_connection.queue_write(sql, (setting_value, guild_setting_id),
+                                                    fetch="one")
 
     async def edit_guild_setting_by_setting_id(self, guild_id: int, setting_id: int,
                                                setting_value: str):
@@ -163,10 +175,8 @@ class GuildSettingsDAO:
             setting_id: The database ID of the setting from the settings table
             setting_value: The value to change to"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "UPDATE guild_settings SET setting_value=? WHERE guild_id=? AND setting_id=?"
-        await cursor.execute(sql, (setting_value, guild_id, setting_id))
-        await self.db_connection.commit_and_close(connection)
+        await self.db_connection.queue_write(sql, (setting_value, guild_id, setting_id))
 
     async def edit_guild_setting_by_setting_name(self,
         guild_id: int,
@@ -178,11 +188,9 @@ class GuildSettingsDAO:
             setting_name: The name of the setting
             setting_value: The value to change to"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "UPDATE guild_settings SET setting_value=? WHERE guild_id=? "\
               "AND setting_id=(SELECT id FROM settings WHERE name=?)"
-        await cursor.execute(sql, (setting_value, guild_id, setting_name))
-        await self.db_connection.commit_and_close(connection)
+        await self.db_connection.queue_write(sql, (setting_value, guild_id, setting_name))
 
     async def edit_guild_settings_by_setting_name_pattern(self,
         guild_id: int,
@@ -194,11 +202,10 @@ class GuildSettingsDAO:
             setting_name_pattern: The pattern of setting names which need to be changed
             setting_value: The value to change the settings to"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "UPDATE guild_settings SET setting_value=? WHERE guild_id=? AND setting_id IN "\
               "(SELECT id FROM settings WHERE name LIKE ?)"
-        await cursor.execute(sql, (setting_value, guild_id, "%"+setting_name_pattern+"%"))
-        await self.db_connection.commit_and_close(connection)
+        await self.db_connection.queue_write(sql, (setting_value, guild_id,
+                                                   "%"+setting_name_pattern+"%"))
 
     async def reset_guild_setting_to_default_value(self, guild_id: int, guild_setting_id: int):
         """Return a guild setting back to its default value as defined in the settings table
@@ -206,12 +213,11 @@ class GuildSettingsDAO:
             guild_id: The Discord ID of the guild whose setting to reset
             guild_setting_id: The database ID of the guild setting to reset"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "UPDATE guild_settings SET setting_value=(SELECT setting_value FROM settings "\
               "WHERE id=(SELECT setting_id FROM guild_settings WHERE guild_id=? AND id=?)) "\
               "WHERE guild_id=? AND setting_id=?"
-        await cursor.execute(sql, (guild_id, guild_setting_id, guild_id, guild_setting_id))
-        await self.db_connection.commit_and_close(connection)
+        async with self.db_connection.writer() as cursor:
+            await cursor.execute(sql, (guild_id, guild_setting_id, guild_id, guild_setting_id))
 
     async def reset_guild_setting_to_default_value_by_name(self, guild_id: int, setting_name: str):
         """Return a guild setting back to its default value as defined by the settings table,
@@ -220,12 +226,11 @@ class GuildSettingsDAO:
             guild_id: The Discord ID of the guild whose setting to reset
             setting_name: The name of the setting to reset"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "UPDATE guild_settings SET setting_value=(SELECT setting_value FROM settings "\
               "WHERE name=?) WHERE guild_id=? AND setting_id=(SELECT id FROM settings "\
               "WHERE name=?)"
-        await cursor.execute(sql, (setting_name, guild_id, setting_name))
-        await self.db_connection.commit_and_close(connection)
+        async with self.db_connection.writer() as cursor:
+            await cursor.execute(sql, (setting_name, guild_id, setting_name))
 
     async def reset_all_guild_settings_to_default_value(self, guild_id: int):
         """Reset all guild settings within a guild into their default values as defined in the
@@ -233,22 +238,24 @@ class GuildSettingsDAO:
         Args:
             guild_id: The Discord ID of the guild whose settings to reset"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "UPDATE guild_settings AS gs SET setting_value="\
               "(SELECT setting_value FROM settings AS s WHERE s.id=gs.setting_id) "\
               "WHERE guild_id=?"
-        await cursor.execute(sql, (guild_id,))
-        await self.db_connection.commit_and_close(connection)
+        async with self.db_connection.writer() as cursor:
+            await cursor.execute(sql, (guild_id,))
 
     async def delete_guild_setting_by_id(self, guild_setting_id: int):
         """Delete a guild setting by its ID
         Args:
-            guild_setting_id: The database ID of the guild setting to delete"""
-
-        connection, cursor = await self.db_connection.connect_to_db()
-        sql = "DELETE FROM guild_settings WHERE id=?"
-        await cursor.execute(sql, (guild_setting_id,))
-        await self.db_connection.commit_and_close(connection)
+            guild_setting_id: The database ID of the guild setting to delete
+        Returns: A Row object containing the guild ID of the deleted guild setting, None if it
+                 doesn't exist"""
+
+        sql = "DELETE FROM guild_settings WHERE id=? RETURNING guild_id"
+        async with self.db_connection.writer() as cursor:
+            await cursor.execute(sql, (guild_setting_id,))
+            row = await cursor.fetchone()
+        return row
 
     async def delete_guild_setting_by_setting_id(self, guild_id: int, setting_id: int):
         """Delete a guild setting by the setting's ID
@@ -257,10 +264,9 @@ class GuildSettingsDAO:
             setting_id: The database ID of the setting corresponding to the guild setting to
                         delete"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "DELETE FROM guild_settings WHERE guild_id=? AND setting_id=?"
-        await cursor.execute(sql, (guild_id, setting_id))
-        await self.db_connection.commit_and_close(connection)
+        async with self.db_connection.writer() as cursor:
+            await cursor.execute(sql, (guild_id, setting_id))
 
     async def delete_guild_setting_by_setting_name(self, guild_id: int, setting_name: str):
         """Delete a guild setting by the setting's name
@@ -268,26 +274,23 @@ class GuildSettingsDAO:
             guild_id: The Discord ID of the guild whose setting to delete
             setting_name: The name of the setting to delete"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "DELETE FROM guild_settings WHERE guild_id=? "\
               "AND setting_id=(SELECT id FROM settings WHERE name=?)"
-        await cursor.execute(sql, (guild_id, setting_name))
-        await self.db_connection.commit_and_close(connection)
+        async with self.db_connection.writer() as cursor:
+            await cursor.execute(sql, (guild_id, setting_name))
 
     async def delete_guild_settings(self, guild_id: int):
         """Delete all settings associated with a given guild
         Args:
             guild_id: The Discord ID of the guild whose settings to delete"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "DELETE FROM guild_settings WHERE guild_id=?"
-        await cursor.execute(sql, (guild_id,))
-        await self.db_connection.commit_and_close(connection)
+        async with self.db_connection.writer() as cursor:
+            await cursor.execute(sql, (guild_id,))
 
     async def clear_guild_settings_table(self):
         """Delete every single guild setting from the table"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "DELETE FROM guild_settings"
-        await cursor.execute(sql)
-        await self.db_connection.commit_and_close(connection)
+        async with self.db_connection.writer() as cursor:
+            await cursor.execute(sql)
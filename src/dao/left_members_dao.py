@@ -23,22 +23,20 @@ class LeftMembersDAO:
             guild_id: The Discord ID of the guild whose left members to get
         Returns: A list of Rows containing data on left members"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "SELECT * FROM left_members WHERE guild_id=? ORDER BY leave_date ASC"
-        await cursor.execute(sql, (guild_id,))
-        members = await cursor.fetchall()
-        await self.db_connection.close_connection(connection)
+        async with self.db_connection.reader() as cursor:
+            await cursor.execute(sql, (guild_id,))
+            members = await cursor.fetchall()
         return members
 
     async def get_all_left_members(self):
         """Find all members who have left any guild the bot is in
         Returns: A list of Rows containing data on left members"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "SELECT * FROM left_members ORDER BY leave_date ASC"
-        await cursor.execute(sql)
-        members = await cursor.fetchall()
-        await self.db_connection.close_connection(connection)
+        async with self.db_connection.reader() as cursor:
+            await cursor.execute(sql)
+            members = await cursor.fetchall()
         return members
 
     async def get_guild_left_member(self, user_id: int, guild_id: int):
@@ -48,11 +46,10 @@ class LeftMembersDAO:
             guild_id: The Discord ID of the guild the user left
         Returns: A Row object containing data on the left member"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "SELECT * FROM left_members WHERE user_id=? AND guild_id=?"
-        await cursor.execute(sql, (user_id, guild_id))
-        member = await cursor.fetchone()
-        await self.db_connection.close_connection(connection)
+        async with self.db_connection.reader() as cursor:
+            await cursor.execute(sql, (user_id, guild_id))
+            member = await cursor.fetchone()
         return member
 
     async def get_left_member(self, user_id: int):
@@ -61,11 +58,10 @@ class LeftMembersDAO:
             user_id: The Discord ID of the member whose records to find
         Returns: A list of Row objects containing data on the selected user"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "SELECT * FROM left_members WHERE user_id=? ORDER BY leave_date ASC"
-        await cursor.execute(sql, (user_id,))
-        members = await cursor.fetchall()
-        await self.db_connection.close_connection(connection)
+        async with self.db_connection.reader() as cursor:
+            await cursor.execute(sql, (user_id,))
+            members = await cursor.fetchall()
         return members
 
     async def add_left_member(self, user_id: int, guild_id: int):
@@ -74,10 +70,8 @@ class LeftMembersDAO:
             user_id: The Discord ID of the member who has left
             guild_id: The Discord ID of the guild the member has left"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "INSERT INTO left_members (user_id, guild_id, leave_date) VALUES (?, ?, datetime())"
-        await cursor.execute(sql, (user_id, guild_id))
-        await self.db_connection.commit_and_close(connection)
+        await self.db_connection.queue_write(sql, (user_id, guild_id))
 
     async def remove_left_member(self, user_id: int, guild_id: int):
         """Remove the record of a left member
@@ -85,35 +79,31 @@ class LeftMembersDAO:
             user_id: The Discord ID of the member whose record to remove
             guild_id: The Discord ID of the guild from which to remove the record"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "DELETE FROM left_members WHERE user_id=? AND guild_id=?"
-        await cursor.execute(sql, (user_id, guild_id))
-        await self.db_connection.commit_and_close(connection)
+        async with self.db_connection.writer() as cursor:
+            await cursor.execute(sql, (user_id, guild_id))
 
     async def remove_all_member_records(self, user_id: int):
         """Remove all records of a left member regardless of guild
         Args:
             user_id: The Discord ID of the user whose records to remove"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "DELETE FROM left_members WHERE user_id=?"
-        await cursor.execute(sql, (user_id,))
-        await self.db_connection.commit_and_close(connection)
+        async with self.db_connection.writer() as cursor:
+            await cursor.execute(sql, (user_id,))
 
     async def remove_guild_left_member_records(self, guild_id: int):
         """Remove all records of left members of a guild
         Args:
             guild_id: The Discord ID of the guild whose records to remove"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "DELETE FROM left_members WHERE guild_id=?"
-        await cursor.execute(sql, (guild_id,))
-        await self.db_connection.commit_and_close(connection)
+        async with self.db_connection.writer() as cursor:
+            await cursor.execute(sql, (guild_id,))
 
     async def clear_left_members_table(self):
         """Delete every single left member from the table"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "DELETE FROM left_members"
-        await cursor.execute(sql)
-        await self.db_connection.commit_and_close(connection)
+        async with self.db_connection.writer() as cursor:
+            await cursor.execute(sql)
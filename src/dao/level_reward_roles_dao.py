@@ -0,0 +1,69 @@
+"""The classes and functions handling data access objects for the level_reward_roles table.
+Level reward roles are given to members when they reach a certain experience level."""
+from db_connection.db_connector import DBConnection
+
+class LevelRewardRolesDAO:
+    """A data access object for level reward roles
+    Attributes:
+        db_connection: An object that handles database connections"""
+
+    def __init__(self, db_address):
+        """Create a new data access object for level reward roles
+        Args:
+            db_address: The address for the database file where the level_reward_roles table
+                        resides"""
+
+        self.db_connection = DBConnection(db_address)
+
+    async def get_guild_level_reward_roles(self, guild_id: int):
+        """Get all level reward roles of a Guild, lowest level requirement first
+        Args:
+            guild_id: The ID of the Guild whose level reward roles to get
+        Returns: A list of Rows containing the level reward roles"""
+
+        sql = "SELECT * FROM level_reward_roles WHERE guild_id=? ORDER BY level_requirement, id"
+        async with self.db_connection.reader() as cursor:
+            await cursor.execute(sql, (guild_id,))
+            roles = await cursor.fetchall()
+        return roles
+
+    async def add_level_reward_role(self, role_id: int, guild_id: int, level_requirement: int):
+        """Add a role that members of a Guild get when they reach a level
+        Args:
+            role_id: The Discord ID of the role to give
+            guild_id: The ID of the Guild the role belongs in
+            level_requirement: The level at which members get the role
+        Returns: The database ID of the new level reward role"""
+
+        sql = "INSERT INTO level_reward_roles (role_id, guild_id, level_requirement) " \
+              "VALUES (?, ?, ?) RETURNING id"
+        async with self.db_connection.writer() as cursor:
+            await cursor.execute(sql, (role_id, guild_id, level_requirement))
+            row = await cursor.fetchone()
+        return row["id"]
+
+    async def delete_level_reward_role(self, role_id: int, guild_id: int):
+        """Stop giving a role as a level reward
+        Args:
+            role_id: The Discord ID of the role
+            guild_id: The ID of the Guild the role belongs in"""
+
+        sql = "DELETE FROM level_reward_roles WHERE role_id=? AND guild_id=?"
+        async with self.db_connection.writer() as cursor:
+            await cursor.execute(sql, (role_id, guild_id))
+
+    async def delete_guild_level_reward_roles(self, guild_id: int):
+        """Delete all level reward roles of a given guild
+        Args:
+            guild_id: The Discord ID of the guild whose level reward roles to delete"""
+
+        sql = "DELETE FROM level_reward_roles WHERE guild_id=?"
+        async with self.db_connection.writer() as cursor:
+            await cursor.execute(sql, (guild_id,))
+
+    async def clear_level_reward_roles_table(self):
+        """Delete every single level reward role from the table"""
+
+        sql = "DELETE FROM level_reward_roles"
+        async with self.db_connection.writer() as cursor:
+            await cursor.execute(sql)
@@ -0,0 +1,83 @@
+"""The classes and functions handling data access objects for the log_webhooks table.
+The database table keeps track of the webhooks the bot has created to post logs into
+utility channels, so they can be reused instead of creating new ones."""
+from db_connection.db_connector import DBConnection
+
+class LogWebhooksDAO:
+    """A data access object for log webhooks
+    Attributes:
+        db_connection: An object that handles database connections"""
+
+    def __init__(self, db_address):
+        """Create a new data access object for log webhooks
+        Args:
+            db_address: The address for the database file where the log webhooks table resides"""
+
+        self.db_connection = DBConnection(db_address)
+
+    async def get_channel_webhook(self, channel_id: int):
+        """Get the log webhook of a channel
+        Args:
+            channel_id: The Discord ID of the channel whose webhook to get
+        Returns: A Row containing the webhook, None if the channel has no webhook"""
+
+        sql = "SELECT * FROM log_webhooks WHERE channel_id=?"
+        async with self.db_connection.reader() as cursor:
+            await cursor.execute(sql, (channel_id,))
+            webhook = await cursor.fetchone()
+        return webhook
+
+    async def get_guild_webhooks(self, guild_id: int):
+        """Get all log webhooks of a guild
+        Args:
+            guild_id: The Discord ID of the guild whose webhooks to get
+        Returns: A list of Rows containing the webhooks"""
+
+        sql = "SELECT * FROM log_webhooks WHERE guild_id=? ORDER BY channel_id ASC"
+        async with self.db_connection.reader() as cursor:
+            await cursor.execute(sql, (guild_id,))
+            webhooks = await cursor.fetchall()
+        return webhooks
+
+    async def add_webhook(self, channel_id: int, guild_id: int, webhook_id: int,
+                          webhook_token: str):
+        """Add a new log webhook. A channel can only have one, so an existing webhook of the
+        channel is replaced.
+        Args:
+            channel_id: The Discord ID of the channel the webhook posts to
+            guild_id: The Discord ID of the guild where the channel is
+            webhook_id: The Discord ID of the webhook
+            webhook_token: The token used to post with the webhook
+        Returns: A Row containing the database ID of the new webhook"""
+
+        sql = "INSERT OR REPLACE INTO log_webhooks "\
+              "(channel_id, guild_id, webhook_id, webhook_token) VALUES (?, ?, ?, ?) RETURNING id"
+        async with self.db_connection.writer() as cursor:
+            await cursor.execute(sql, (channel_id, guild_id, webhook_id, webhook_token))
+            row = await cursor.fetchone()
+        return row
+
+    async def delete_channel_webhook(self, channel_id: int):
+        """Delete the log webhook of a channel
+        Args:
+            channel_id: The Discord ID of the channel whose webhook to delete"""
+
+        sql = "DELETE FROM log_webhooks WHERE channel_id=?"
+        async with self.db_connection.writer() as cursor:
+            await cursor.execute(sql, (channel_id,))
+
+    async def delete_guild_webhooks(self, guild_id: int):
+        """Delete all log webhooks of a guild
+        Args:
+            guild_id: The Discord ID of the guild whose webhooks to delete"""
+
+        sql = "DELETE FROM log_webhooks WHERE guild_id=?"
+        async with self.db_connection.writer() as cursor:
+            await cursor.execute(sql, (guild_id,))
+
+    async def clear_log_webhooks_table(self):
+        """Delete every single log webhook from the table"""
+
+        sql = "DELETE FROM log_webhooks"
+        async with self.db_connection.writer() as cursor:
+            await cursor.execute(sql)
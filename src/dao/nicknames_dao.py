@@ -2,6 +2,7 @@
 The database table keeps track of a user's nickname history, including what nickname
 they were and when they changed to that. Nicknames are guild specific and hence the
 inclusion of an identifying guild ID is necessary"""
+import json
 from db_connection.db_connector import DBConnection
 
 class NicknamesDAO:
@@ -22,11 +23,10 @@ class NicknamesDAO:
             nickname: The nickname to find in the database
         Returns: The database entries with that nickname if found, an empty list otherwise"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "SELECT * FROM nicknames WHERE nickname=?"
-        await cursor.execute(sql, (nickname,))
-        nicknames = await cursor.fetchall()
-        await self.db_connection.close_connection(connection)
+        async with self.db_connection.reader() as cursor:
+            await cursor.execute(sql, (nickname,))
+            nicknames = await cursor.fetchall()
         return nicknames
 
     async def find_user_nicknames(self, user_id: int, guild_id: int):
@@ -36,54 +36,62 @@ class NicknamesDAO:
             guild_id: The ID of the Discord Guild the nickname is associated with
         Returns: The database entries for that user if found, an empty list otherwise"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "SELECT * FROM nicknames WHERE user_id=? AND guild_id=? ORDER BY time ASC"
-        await cursor.execute(sql, (user_id, guild_id))
-        nicknames = await cursor.fetchall()
-        await self.db_connection.close_connection(connection)
+        async with self.db_connection.reader() as cursor:
+            await cursor.execute(sql, (user_id, guild_id))
+            nicknames = await cursor.fetchall()
         return nicknames
 
     async def add_nickname(self, nickname: str, user_id: int, guild_id: int, nickname_limit: int = 5):
-        """Add a new nickname to the database. If more than limit names exist already, the oldest
-        are deleted.
+        """Add a new nickname to the database. If the user then has more than limit names in the
+        guild, the oldest are deleted in the same transaction.
         Args:
             nickname: The nickname to add
             user_id: The Discord ID of the user this nickname is associated with
             guild_id: The ID of the Discord Guild the nickname is associated with
             nickname_limit: How many nicknames for one user are allowed in the database at a time"""
 
-        previous_nicknames = await self.find_user_nicknames(user_id, guild_id)
-        if len(previous_nicknames) >= nickname_limit:
-            this_nickname = previous_nicknames.pop()
-            await self._delete_earlier_user_nicknames(user_id, guild_id, this_nickname["id"])
-
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "INSERT INTO nicknames (user_id, nickname, guild_id, time) "\
               "VALUES (?, ?, ?, datetime())"
-        await cursor.execute(sql, (user_id, nickname, guild_id))
-        await self.db_connection.commit_and_close(connection)
+        # Everything after the newest limit names, read backwards along the history index
+        trim_sql = "DELETE FROM nicknames WHERE user_id=? AND guild_id=? AND id IN " \
+                   "(SELECT id FROM nicknames WHERE user_id=? AND guild_id=? " \
+                   "ORDER BY time DESC, id DESC LIMIT -1 OFFSET ?)"
+        await self.db_connection.queue_write(
+            sql, (user_id, nickname, guild_id),
+            followed_by=((trim_sql, (user_id, guild_id, user_id, guild_id, nickname_limit)),))
+
+    async def add_nicknames(self, nicknames: list, nickname_limit: int = 5):
+        """Add many new nicknames to the database at once, e.g. during a wave of renames. Every
+        user who then has more than limit names in a guild loses the oldest ones in the same
+        transaction.
+        Args:
+            nicknames: A list of (nickname, user ID, guild ID) tuples, oldest first
+            nickname_limit: How many nicknames for one user are allowed in the database at a time"""
+
+        if not nicknames:
+            return
+        values = json.dumps([[user_id, nickname, guild_id]
+                             for nickname, user_id, guild_id in nicknames])
+        sql = "INSERT INTO nicknames (user_id, nickname, guild_id, time) " \
+              "SELECT json_extract(value, '$[0]'), json_extract(value, '$[1]'), " \
+              "json_extract(value, '$[2]'), datetime() FROM json_each(?)"
+        trim_sql = "DELETE FROM nicknames AS trimmed WHERE (user_id, guild_id) IN " \
+                   "(SELECT json_extract(value, '$[0]'), json_extract(value, '$[2]') " \
+                   "FROM json_each(?)) AND id IN (SELECT id FROM nicknames " \
+                   "WHERE user_id=trimmed.user_id AND guild_id=trimmed.guild_id " \
+                   "ORDER BY time DESC, id DESC LIMIT -1 OFFSET ?)"
+        await self.db_connection.queue_write(sql, (values,),
+                                             followed_by=((trim_sql, (values, nickname_limit)),))
 
     async def delete_nickname(self, nickname_id: int):
         """Delete a nickname from the database
         Args:
             nickname_id: The database ID for the nickname to delete"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "DELETE FROM nicknames WHERE id=?"
-        await cursor.execute(sql, (nickname_id,))
-        await self.db_connection.commit_and_close(connection)
-
-    async def _delete_earlier_user_nicknames(self, user_id: int, guild_id: int, nickname_id: int):
-        """Delete the specified nickname and any nicknames added before it
-        Args:
-            user_id: The Discord ID of the user whose nicknames to delete
-            guild_id: The Discord ID of the guild from which the nicknames come from
-            nickname_id: All nicknames added before this are deleted"""
-
-        connection, cursor = await self.db_connection.connect_to_db()
-        sql = "DELETE FROM nicknames WHERE id<=? AND user_id=? AND guild_id=?"
-        await cursor.execute(sql, (nickname_id, user_id, guild_id))
-        await self.db_connection.commit_and_close(connection)
+        async with self.db_connection.writer() as cursor:
+            await cursor.execute(sql, (nickname_id,))
 
     async def delete_user_nicknames(self, user_id: int, guild_id: int):
         """Delete all nicknames associated with a specific user
@@ -91,25 +99,22 @@ class NicknamesDAO:
             user_id: The Discord ID for the user whose nickname history to delete
             guild_id: The ID of the Discord Guild the deleted nicknames are associated with"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "DELETE FROM nicknames WHERE user_id=? AND guild_id=?"
-        await cursor.execute(sql, (user_id, guild_id))
-        await self.db_connection.commit_and_close(connection)
+        async with self.db_connection.writer() as cursor:
+            await cursor.execute(sql, (user_id, guild_id))
 
     async def delete_guild_nicknames(self, guild_id: int):
         """Delete the entire nickname record of a given guild
         Args:
             guild_id: The Discord ID of the guild whose nickname records to delete"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "DELETE FROM nicknames WHERE guild_id=?"
-        await cursor.execute(sql, (guild_id,))
-        await self.db_connection.commit_and_close(connection)
+        async with self.db_connection.writer() as cursor:
+            await cursor.execute(sql, (guild_id,))
 
     async def clear_nicknames_table(self):
         """Delete every single nickname from the table"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "DELETE FROM nicknames"
-        await cursor.execute(sql)
-        await self.db_connection.commit_and_close(connection)
+        async with self.db_connection.writer() as cursor:
+            await cursor.execute(sql)
@@ -23,14 +23,13 @@ class PunishmentsDAO:
         Returns: A list of Rows containing all the found punishments,
                  an empty list if none are found"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "SELECT * FROM punishments WHERE user_id=? " \
                "AND guild_id=? " \
                "AND deleted=FALSE " \
                "ORDER BY time DESC"
-        await cursor.execute(sql, (user_id, guild_id))
-        punishments = await cursor.fetchall()
-        await self.db_connection.close_connection(connection)
+        async with self.db_connection.reader() as cursor:
+            await cursor.execute(sql, (user_id, guild_id))
+            punishments = await cursor.fetchall()
         return punishments
 
     async def get_all_user_punishments(self, user_id: int, guild_id: int):
@@ -41,12 +40,11 @@ class PunishmentsDAO:
         Returns: A list of Rows containing all the found punishments,
                  an empty list if none are found"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "SELECT * FROM punishments WHERE user_id=? AND guild_id=? " \
                "ORDER BY deleted ASC, time DESC"
-        await cursor.execute(sql, (user_id, guild_id))
-        punishments = await cursor.fetchall()
-        await self.db_connection.close_connection(connection)
+        async with self.db_connection.reader() as cursor:
+            await cursor.execute(sql, (user_id, guild_id))
+            punishments = await cursor.fetchall()
         return punishments
 
     async def get_deleted_punishments(self, user_id: int, guild_id: int):
@@ -56,12 +54,11 @@ class PunishmentsDAO:
             guild_id: The Discord ID of the guild in which the punishments were given
         Returns: A list of Rows containing all the found punishments"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "SELECT * FROM punishments WHERE user_id=? AND guild_id=? AND deleted=TRUE " \
               "ORDER BY time DESC"
-        await cursor.execute(sql, (user_id, guild_id))
-        punishments = await cursor.fetchall()
-        await self.db_connection.close_connection(connection)
+        async with self.db_connection.reader() as cursor:
+            await cursor.execute(sql, (user_id, guild_id))
+            punishments = await cursor.fetchall()
         return punishments
 
     async def get_punishment_by_id(self, punishment_id: int):
@@ -70,11 +67,10 @@ class PunishmentsDAO:
             punishment_id: The database ID of the punishment to get
         Returns: A Row representing the found punishment. None if not found."""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "SELECT * FROM punishments WHERE id=?"
-        await cursor.execute(sql, (punishment_id,))
-        punishment = await cursor.fetchone()
-        await self.db_connection.close_connection(connection)
+        async with self.db_connection.reader() as cursor:
+            await cursor.execute(sql, (punishment_id,))
+            punishment = await cursor.fetchone()
         return punishment
 
     async def add_punishment(self, user_id: int, issuer_id: int, guild_id: int,
@@ -89,15 +85,13 @@ class PunishmentsDAO:
             deleted: Whether the punishment is deleted
         Returns: A Row containing the database ID of the newly created punishment"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "INSERT INTO punishments " \
                     "(user_id, issuer_id, guild_id, type, reason, time, deleted) " \
                "VALUES " \
                     "(?, ?, ?, ?, ?, datetime(), ?) " \
                "RETURNING id"
-        await cursor.execute(sql, (user_id, issuer_id, guild_id, punishment_type, reason, deleted))
-        punishment = await cursor.fetchone()
-        await self.db_connection.commit_and_close(connection)
+        punishment = await self.db_connection.queue_write(
+            sql, (user_id, issuer_id, guild_id, punishment_type, reason, deleted), fetch="one")
         return punishment
 
     async def mark_deleted(self, punishment_id: int):
@@ -105,20 +99,18 @@ class PunishmentsDAO:
         Args:
             punishment_id: The database ID of the punishment to mark as deleted"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "UPDATE punishments SET deleted=TRUE WHERE id=?"
-        await cursor.execute(sql, (punishment_id,))
-        await self.db_connection.commit_and_close(connection)
+        async with self.db_connection.writer() as cursor:
+            await cursor.execute(sql, (punishment_id,))
 
     async def unmark_deleted(self, punishment_id: int):
         """Mark a deleted punishment as undeleted
         Args:
             punishment_id: The database ID of the deleted punishment to mark as undeleted"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "UPDATE punishments SET deleted=FALSE WHERE id=?"
-        await cursor.execute(sql, (punishment_id,))
-        await self.db_connection.commit_and_close(connection)
+        async with self.db_connection.writer() as cursor:
+            await cursor.execute(sql, (punishment_id,))
 
     async def edit_punishment_reason(self, punishment_id: int, reason: str):
         """Edit the reason for an existing punishment
@@ -126,35 +118,31 @@ class PunishmentsDAO:
             punishment_id: The database ID of the punishment to edit
             reason: The new reason for the punishment"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "UPDATE punishments SET reason=? WHERE id=?"
-        await cursor.execute(sql, (reason, punishment_id))
-        await self.db_connection.commit_and_close(connection)
+        async with self.db_connection.writer() as cursor:
+            await cursor.execute(sql, (reason, punishment_id))
 
     async def delete_punishment(self, punishment_id: int):
         """Permanently delete a punishment
         Args:
             punishment_id: The database ID of the punishment to delete"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "DELETE FROM punishments WHERE id=?"
-        await cursor.execute(sql, (punishment_id,))
-        await self.db_connection.commit_and_close(connection)
+        async with self.db_connection.writer() as cursor:
+            await cursor.execute(sql, (punishment_id,))
 
     async def delete_guild_punishments(self, guild_id: int):
         """Permanently delete the entire punishment record of a given guild
         Args:
             guild_id: The Discord ID of the guild whose punishment records to delete"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "DELETE FROM punishments WHERE guild_id=?"
-        await cursor.execute(sql, (guild_id,))
-        await self.db_connection.commit_and_close(connection)
+        async with self.db_connection.writer() as cursor:
+            await cursor.execute(sql, (guild_id,))
 
     async def clear_punishments_table(self):
         """Delete every single punishment from the table"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "DELETE FROM punishments"
-        await cursor.execute(sql)
-        await self.db_connection.commit_and_close(connection)
+        async with self.db_connection.writer() as cursor:
+            await cursor.execute(sql)
@@ -1,5 +1,6 @@
 """The classes and functions handling data access objects for the reminders table.
 Reminders are messages sent to opted in users at specified times or intervals."""
+import json
 from db_connection.db_connector import DBConnection
 from datetime import datetime
 
@@ -21,11 +22,10 @@ class RemindersDAO:
             user_id: The Discord ID of the user whose reminders to get
         Returns: A list of Row objects containing the user's reminders"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "SELECT * FROM reminders WHERE creator_id=? ORDER BY reminder_date ASC"
-        await cursor.execute(sql, (user_id,))
-        rows = await cursor.fetchall()
-        await self.db_connection.close_connection(connection)
+        async with self.db_connection.reader() as cursor:
+            await cursor.execute(sql, (user_id,))
+            rows = await cursor.fetchall()
         return rows
 
     async def get_public_reminders_by_user(self, user_id: int):
@@ -34,12 +34,11 @@ class RemindersDAO:
             user_id: The Discord ID of the user whose public reminders to get
         Returns: A list of Row objects containing the user's public reminders"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "SELECT * FROM reminders WHERE creator_id=? AND public=TRUE " \
               "ORDER BY reminder_date ASC"
-        await cursor.execute(sql, (user_id,))
-        rows = await cursor.fetchall()
-        await self.db_connection.close_connection(connection)
+        async with self.db_connection.reader() as cursor:
+            await cursor.execute(sql, (user_id,))
+            rows = await cursor.fetchall()
         return rows
 
     async def get_reminders_by_user_in_guild(self, user_id: int, guild_id: int):
@@ -49,13 +48,12 @@ class RemindersDAO:
             guild_id: The Discord ID of the guild in which the reminders were created
         Returns: A list of Row objects containing the user's reminders in the guild"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "SELECT * FROM reminders " \
               "WHERE creator_id=? AND creator_guild_id=? AND creator_guild_id IS NOT NULL " \
               "ORDER BY reminder_date ASC"
-        await cursor.execute(sql, (user_id, guild_id))
-        rows = await cursor.fetchall()
-        await self.db_connection.close_connection(connection)
+        async with self.db_connection.reader() as cursor:
+            await cursor.execute(sql, (user_id, guild_id))
+            rows = await cursor.fetchall()
         return rows
 
     async def get_public_reminders_by_user_in_guild(self, user_id: int, guild_id: int):
@@ -65,14 +63,13 @@ class RemindersDAO:
             guild_id: The Discord ID of the guild in which the reminders were created
         Returns: A list of Row objects containing the user's public reminders in the guild"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "SELECT * FROM reminders " \
               "WHERE creator_id=? AND creator_guild_id=? AND public=TRUE " \
               "AND creator_guild_id IS NOT NULL " \
               "ORDER BY reminder_date ASC"
-        await cursor.execute(sql, (user_id, guild_id))
-        rows = await cursor.fetchall()
-        await self.db_connection.close_connection(connection)
+        async with self.db_connection.reader() as cursor:
+            await cursor.execute(sql, (user_id, guild_id))
+            rows = await cursor.fetchall()
         return rows
 
     async def get_reminders_in_guild(self, guild_id: int):
@@ -81,12 +78,11 @@ class RemindersDAO:
             guild_id: The Discord ID of the guild in which the reminders were created
         Returns: A list of Row objects containing the reminders of the guild"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "SELECT * FROM reminders WHERE creator_guild_id=? AND creator_guild_id IS NOT NULL " \
               "ORDER BY reminder_date ASC"
-        await cursor.execute(sql, (guild_id,))
-        rows = await cursor.fetchall()
-        await self.db_connection.close_connection(connection)
+        async with self.db_connection.reader() as cursor:
+            await cursor.execute(sql, (guild_id,))
+            rows = await cursor.fetchall()
         return rows
 
     async def get_public_reminders_in_guild(self, guild_id: int):
@@ -95,24 +91,45 @@ class RemindersDAO:
             guild_id: The Discord ID of the guild in which the public reminders were created
         Returns: A list of Row objects containing the public reminders of the guild"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "SELECT * FROM reminders WHERE creator_guild_id=? AND public=TRUE " \
               "AND creator_guild_id IS NOT NULL " \
               "ORDER BY reminder_date ASC"
-        await cursor.execute(sql, (guild_id,))
-        rows = await cursor.fetchall()
-        await self.db_connection.close_connection(connection)
+        async with self.db_connection.reader() as cursor:
+            await cursor.execute(sql, (guild_id,))
+            rows = await cursor.fetchall()
         return rows
 
     async def get_expired_reminders(self):
         """Get all reminders that have expired
         Returns: A list of Row objects containing all the expired reminders"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "SELECT * FROM reminders WHERE reminder_date<datetime() ORDER BY reminder_date ASC"
-        await cursor.execute(sql)
-        rows = await cursor.fetchall()
-        await self.db_connection.close_connection(connection)
+        async with self.db_connection.reader() as cursor:
+            await cursor.execute(sql)
+            rows = await cursor.fetchall()
+        return rows
+
+    async def get_reminder_dates(self):
+        """Get the expiration date of every reminder
+        Returns: A list of Row objects containing the IDs and dates of all reminders"""
+
+        sql = "SELECT id, reminder_date FROM reminders"
+        async with self.db_connection.reader() as cursor:
+            await cursor.execute(sql)
+            rows = await cursor.fetchall()
+        return rows
+
+    async def get_reminders_by_ids(self, reminder_ids: list):
+        """Get several reminders by their database IDs
+        Args:
+            reminder_ids: A list of the database IDs of the reminders to get
+        Returns: A list of Row objects containing the found reminders"""
+
+        sql = "SELECT * FROM reminders WHERE id IN (SELECT value FROM json_each(?)) " \
+              "ORDER BY reminder_date ASC"
+        async with self.db_connection.reader() as cursor:
+            await cursor.execute(sql, (json.dumps(list(reminder_ids)),))
+            rows = await cursor.fetchall()
         return rows
 
     async def get_reminder_by_id(self, reminder_id: int):
@@ -121,11 +138,10 @@ class RemindersDAO:
             reminder_id: The database ID of the reminder to get
         Returns: A Row object containing the found reminder, None if not found"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "SELECT * FROM reminders WHERE id=?"
-        await cursor.execute(sql, (reminder_id,))
-        row = await cursor.fetchone()
-        await self.db_connection.close_connection(connection)
+        async with self.db_connection.reader() as cursor:
+            await cursor.execute(sql, (reminder_id,))
+            row = await cursor.fetchone()
         return row
 
     async def add_new_reminder(self, user_id: int, guild_id: int, content: str, reminder_date: datetime,
@@ -144,14 +160,13 @@ class RemindersDAO:
             repeats: How many times the reminder repeats before getting deleted. Defaults to 1.
         Returns: A Row object containing the database ID of the newly created reminder."""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "INSERT INTO reminders (creator_id, creator_guild_id, content, reminder_date, " \
                                      "public, interval, reminder_type, repeats_left) " \
               "VALUES (?, ?, ?, ?, ?, ?, ?, ?) RETURNING id"
-        await cursor.execute(sql, (user_id, guild_id, content, reminder_date, is_public, interval,
-                                   reminder_type, repeats))
-        row = await cursor.fetchone()
-        await self.db_connection.commit_and_close(connection)
+        async with self.db_connection.writer() as cursor:
+            await cursor.execute(sql, (user_id, guild_id, content, reminder_date, is_public,
+                                       interval, reminder_type, repeats))
+            row = await cursor.fetchone()
         return row
 
     async def edit_reminder(self, reminder_id: int, content: str, reminder_date: datetime,
@@ -165,12 +180,11 @@ class RemindersDAO:
             interval: How often the reminder repeats, in seconds
             repeats: How many times the reminder repeats before getting deleted"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "UPDATE reminders SET content=?, reminder_date=?, public=?, interval=?, " \
               "reminder_type=?, repeats_left=? WHERE id=?"
-        await cursor.execute(sql, (content, reminder_date, is_public, interval, reminder_type, repeats,
-                                   reminder_id))
-        await self.db_connection.commit_and_close(connection)
+        async with self.db_connection.writer() as cursor:
+            await cursor.execute(sql, (content, reminder_date, is_public, interval, reminder_type,
+                                       repeats, reminder_id))
 
     async def update_reminder_repeats(self, reminder_id: int):
         """Update the repeats in a given reminder if it hasn't reached 0. This method will not
@@ -178,20 +192,35 @@ class RemindersDAO:
         Args:
             reminder_id: The database ID of the reminder whose repeats to update"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "UPDATE reminders SET repeats_left=repeats_left-1 WHERE id=? AND repeats_left>0"
-        await cursor.execute(sql, (reminder_id,))
-        await self.db_connection.commit_and_close(connection)
+        async with self.db_connection.writer() as cursor:
+            await cursor.execute(sql, (reminder_id,))
+
+    async def reschedule_reminders(self, rescheduled: list, finished_ids: list):
+        """Move delivered reminders to their next dates and delete the ones that won't repeat,
+        all in a single transaction
+        Args:
+            rescheduled: A list of (reminder ID, next reminder date, repeats left) tuples
+            finished_ids: A list of the database IDs of the reminders to delete"""
+
+        update_sql = "UPDATE reminders SET reminder_date=json_extract(r.value, '$[1]'), " \
+                     "repeats_left=json_extract(r.value, '$[2]') FROM json_each(?) AS r " \
+                     "WHERE reminders.id=json_extract(r.value, '$[0]')"
+        delete_sql = "DELETE FROM reminders WHERE id IN (SELECT value FROM json_each(?))"
+        async with self.db_connection.writer() as cursor:
+            if rescheduled:
+                await cursor.execute(update_sql, (json.dumps([list(row) for row in rescheduled]),))
+            if finished_ids:
+                await cursor.execute(delete_sql, (json.dumps(list(finished_ids)),))
 
     async def delete_user_reminders(self, user_id: int):
         """Delete all reminders made by a given user
         Args:
             user_id: The Discord ID of the user whose reminders to delete"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "DELETE FROM reminders WHERE creator_id=?"
-        await cursor.execute(sql, (user_id,))
-        await self.db_connection.commit_and_close(connection)
+        async with self.db_connection.writer() as cursor:
+            await cursor.execute(sql, (user_id,))
 
     async def delete_user_reminders_in_guild(self, user_id: int, guild_id: int):
         """Delete all reminders made by a given user in a given guild
@@ -199,43 +228,38 @@ class RemindersDAO:
             user_id: The Discord ID of the user whose reminders to delete
             guild_id: The Discord ID of the guild in which the reminders were created"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "DELETE FROM reminders WHERE creator_id=? AND creator_guild_id=?"
-        await cursor.execute(sql, (user_id, guild_id))
-        await self.db_connection.commit_and_close(connection)
+        async with self.db_connection.writer() as cursor:
+            await cursor.execute(sql, (user_id, guild_id))
 
     async def delete_guild_reminders(self, guild_id: int):
         """Delete all reminders made in a given guild
         Args:
             guild_id: The Discord ID of the guild in which the reminders were created"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "DELETE FROM reminders WHERE creator_guild_id=?"
-        await cursor.execute(sql, (guild_id,))
-        await self.db_connection.commit_and_close(connection)
+        async with self.db_connection.writer() as cursor:
+            await cursor.execute(sql, (guild_id,))
 
     async def delete_reminder_by_id(self, reminder_id: int):
         """Delete a reminder by its database ID
         Args:
             reminder_id: The database ID of the reminder to delete"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "DELETE FROM reminders WHERE id=?"
-        await cursor.execute(sql, (reminder_id,))
-        await self.db_connection.commit_and_close(connection)
+        async with self.db_connection.writer() as cursor:
+            await cursor.execute(sql, (reminder_id,))
 
     async def delete_reminders_with_no_repeats(self):
         """Delete all reminders that have reached 0 repeats"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "DELETE FROM reminders WHERE repeats_left=0"
-        await cursor.execute(sql)
-        await self.db_connection.commit_and_close(connection)
+        async with self.db_connection.writer() as cursor:
+            await cursor.execute(sql)
 
     async def clear_reminders_table(self):
         """Delete every single reminder from the table"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "DELETE FROM reminders"
-        await cursor.execute(sql)
-        await self.db_connection.commit_and_close(connection)
+        async with self.db_connection.writer() as cursor:
+            await cursor.execute(sql)
@@ -1,6 +1,7 @@
 """The classes and functions handling data access objects for the temporary bans table.
 Temporary bans function like regular bans but the bot will unban temp-banned users automatically
 once the specified ban time has expired."""
+import json
 from datetime import datetime
 from db_connection.db_connector import DBConnection
 
@@ -22,11 +23,20 @@ class TempBansDAO:
             guild_id: The Discord ID of the guild whose temporary bans to get
         Returns: A list of Rows containing the found temporary bans"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "SELECT * FROM temporary_bans WHERE guild_id=?"
-        await cursor.execute(sql, (guild_id,))
-        temp_bans = await cursor.fetchall()
-        await self.db_connection.close_connection(connection)
+        async with self.db_connection.reader() as cursor:
+            await cursor.execute(sql, (guild_id,))
+            temp_bans = await cursor.fetchall()
+        return temp_bans
+
+    async def get_all_temp_bans(self):
+        """Get every temporary ban regardless of guild
+        Returns: A list of Rows containing the temporary bans"""
+
+        sql = "SELECT * FROM temporary_bans"
+        async with self.db_connection.reader() as cursor:
+            await cursor.execute(sql)
+            temp_bans = await cursor.fetchall()
         return temp_bans
 
     async def get_temp_ban(self, user_id: int, guild_id: int):
@@ -36,22 +46,20 @@ class TempBansDAO:
             guild_id: The Discord ID of the guild from which to get the ban
         Returns: A Row object containing the found temporary ban"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "SELECT * FROM temporary_bans WHERE user_id=? AND guild_id=?"
-        await cursor.execute(sql, (user_id, guild_id))
-        temp_ban = await cursor.fetchone()
-        await self.db_connection.close_connection(connection)
+        async with self.db_connection.reader() as cursor:
+            await cursor.execute(sql, (user_id, guild_id))
+            temp_ban = await cursor.fetchone()
         return temp_ban
 
     async def get_expired_temp_bans(self):
         """Get all expired temporary bans
         Returns: A list of Rows containing expired bans"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "SELECT * FROM temporary_bans WHERE unban_date<datetime()"
-        await cursor.execute(sql)
-        temp_bans = await cursor.fetchall()
-        await self.db_connection.close_connection(connection)
+        async with self.db_connection.reader() as cursor:
+            await cursor.execute(sql)
+            temp_bans = await cursor.fetchall()
         return temp_bans
 
     async def create_temp_ban(self, user_id: int, guild_id: int, expiration: datetime):
@@ -62,12 +70,11 @@ class TempBansDAO:
             expiration: The date when the temporary bans ends
         Returns: A Row object containing the database ID of the newly created temporary ban"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "INSERT INTO temporary_bans (user_id, guild_id, unban_date) VALUES (?, ?, ?) " \
               "RETURNING id"
-        await cursor.execute(sql, (user_id, guild_id, expiration))
-        temp_ban_id = await cursor.fetchone()
-        await self.db_connection.commit_and_close(connection)
+        async with self.db_connection.writer() as cursor:
+            await cursor.execute(sql, (user_id, guild_id, expiration))
+            temp_ban_id = await cursor.fetchone()
         return temp_ban_id
 
     async def edit_temp_ban(self, user_id: int, guild_id: int, expiration: datetime):
@@ -77,10 +84,9 @@ class TempBansDAO:
             guild_id: The Discord ID of the guild this ban is associated with
             expiration: The new expiration date for the unban"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "UPDATE temporary_bans SET unban_date=? WHERE user_id=? AND guild_id=?"
-        await cursor.execute(sql, (expiration, user_id, guild_id))
-        await self.db_connection.commit_and_close(connection)
+        async with self.db_connection.writer() as cursor:
+            await cursor.execute(sql, (expiration, user_id, guild_id))
 
     async def delete_temp_ban(self, user_id: int, guild_id: int):
         """Delete a temporary ban
@@ -88,35 +94,40 @@ class TempBansDAO:
             user_id: The Discord ID of the user whose temporary ban to delete
             guild_id: The Discord ID of the guild from which to delete the ban"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "DELETE FROM temporary_bans WHERE user_id=? AND guild_id=?"
-        await cursor.execute(sql, (user_id, guild_id))
-        await self.db_connection.commit_and_close(connection)
+        async with self.db_connection.writer() as cursor:
+            await cursor.execute(sql, (user_id, guild_id))
+
+    async def delete_temp_bans_by_ids(self, temp_ban_ids: list):
+        """Delete several temporary bans in a single statement
+        Args:
+            temp_ban_ids: A list of the database IDs of the temporary bans to delete"""
+
+        sql = "DELETE FROM temporary_bans WHERE id IN (SELECT value FROM json_each(?))"
+        async with self.db_connection.writer() as cursor:
+            await cursor.execute(sql, (json.dumps(list(temp_ban_ids)),))
 
     async def delete_user_temp_bans(self, user_id: int):
         """Delete all temporary bans of a single user
         Args:
             user_id: The Discord ID of the user whose temporary bans to delete"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "DELETE FROM temporary_bans WHERE user_id=?"
-        await cursor.execute(sql, (user_id,))
-        await self.db_connection.commit_and_close(connection)
+        async with self.db_connection.writer() as cursor:
+            await cursor.execute(sql, (user_id,))
 
     async def delete_guild_temp_bans(self, guild_id: int):
         """Delete all temporary bans associated with a given guild
         Args:
             guild_id: The Discord ID of the guild whose temporary bans to delete"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "DELETE FROM temporary_bans WHERE guild_id=?"
-        await cursor.execute(sql, (guild_id,))
-        await self.db_connection.commit_and_close(connection)
+        async with self.db_connection.writer() as cursor:
+            await cursor.execute(sql, (guild_id,))
 
     async def clear_temp_bans_table(self):
         """Delete every single temporary ban from the table"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "DELETE FROM temporary_bans"
-        await cursor.execute(sql)
-        await self.db_connection.commit_and_close(connection)
+        async with self.db_connection.writer() as cursor:
+            await cursor.execute(sql)
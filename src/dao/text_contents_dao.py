@@ -21,11 +21,10 @@ class TextContentsDAO:
             guild_id: The Discord ID of the guild whose text contents to get
         Returns: A list of Row objects containing the text contents"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "SELECT * FROM text_contents WHERE guild_id=? ORDER BY content ASC"
-        await cursor.execute(sql, (guild_id,))
-        text_contents = await cursor.fetchall()
-        await self.db_connection.close_connection(connection)
+        async with self.db_connection.reader() as cursor:
+            await cursor.execute(sql, (guild_id,))
+            text_contents = await cursor.fetchall()
         return text_contents
 
     async def get_guild_text_contents_by_type(self, guild_id: int, content_type: str):
@@ -35,11 +34,10 @@ class TextContentsDAO:
             content_type: The type of the text content to find (e.g. WELCOME MESSAGE)
         Returns: A Row object with the text content, if found"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "SELECT * FROM text_contents WHERE guild_id=? AND type=?"
-        await cursor.execute(sql, (guild_id, content_type))
-        text_content = await cursor.fetchone()
-        await self.db_connection.close_connection(connection)
+        async with self.db_connection.reader() as cursor:
+            await cursor.execute(sql, (guild_id, content_type))
+            text_content = await cursor.fetchone()
         return text_content
 
     async def create_text_content(self, guild_id: int, content: str = None, content_type: str = None):
@@ -49,10 +47,9 @@ class TextContentsDAO:
             content: The actual text content
             content_type: The type of text content (e.g. WELCOME MESSAGE)"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "INSERT INTO text_contents (guild_id, content, type) VALUES (?, ?, ?)"
-        await cursor.execute(sql, (guild_id, content, content_type))
-        await self.db_connection.commit_and_close(connection)
+        async with self.db_connection.writer() as cursor:
+            await cursor.execute(sql, (guild_id, content, content_type))
 
     async def edit_text_content(self, guild_id: int, content_type: str, content: str = None):
         """Edit existing text contents for a given guild
@@ -61,10 +58,9 @@ class TextContentsDAO:
             content_type: The type of text content to edit (e.g. WELCOME MESSAGE)
             content: The content to change to"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "UPDATE text_contents SET content=? WHERE guild_id=? AND type=?"
-        await cursor.execute(sql, (content, guild_id, content_type))
-        await self.db_connection.commit_and_close(connection)
+        async with self.db_connection.writer() as cursor:
+            await cursor.execute(sql, (content, guild_id, content_type))
 
     async def delete_text_content(self, guild_id: int, content_type: str):
         """Delete specific text content from a given guild
@@ -72,25 +68,22 @@ class TextContentsDAO:
             guild_id: The Discord ID of the guild whose text content to delete
             content_type: The type of text content to delete (e.g. WELCOME MESSAGE)"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "DELETE FROM text_contents WHERE guild_id=? AND type=?"
-        await cursor.execute(sql, (guild_id, content_type))
-        await self.db_connection.commit_and_close(connection)
+        async with self.db_connection.writer() as cursor:
+            await cursor.execute(sql, (guild_id, content_type))
 
     async def delete_guild_text_contents(self, guild_id: int):
         """Delete all text contents for a given guild
         Args:
             guild_id: The Discord ID of the guild whose text contents to delete"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "DELETE FROM text_contents WHERE guild_id=?"
-        await cursor.execute(sql, (guild_id,))
-        await self.db_connection.commit_and_close(connection)
+        async with self.db_connection.writer() as cursor:
+            await cursor.execute(sql, (guild_id,))
 
     async def clear_text_contents_table(self):
         """Delete every single text content from the table"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "DELETE FROM text_contents"
-        await cursor.execute(sql)
-        await self.db_connection.commit_and_close(connection)
+        async with self.db_connection.writer() as cursor:
+            await cursor.execute(sql)
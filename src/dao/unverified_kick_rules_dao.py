@@ -23,11 +23,10 @@ class UnverifiedKickRulesDAO:
             guild_id: The Discord ID of the guild whose kick rules to get
         Returns: A Row object containing the kick timing of the specified guild"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "SELECT timedelta FROM unverified_kick_rules WHERE guild_id=?"
-        await cursor.execute(sql, (guild_id,))
-        kick_rule = await cursor.fetchone()
-        await self.db_connection.close_connection(connection)
+        async with self.db_connection.reader() as cursor:
+            await cursor.execute(sql, (guild_id,))
+            kick_rule = await cursor.fetchone()
         return kick_rule
 
     async def add_guild_unverified_kick_rules(self, guild_id: int, kick_timing: int):
@@ -37,10 +36,9 @@ class UnverifiedKickRulesDAO:
             kick_timing: The time, in seconds, it takes before an unverified member is kicked,
                          counted from the time of joining the guild."""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "INSERT INTO unverified_kick_rules (guild_id, timedelta) VALUES (?, ?)"
-        await cursor.execute(sql, (guild_id, kick_timing))
-        await self.db_connection.commit_and_close(connection)
+        async with self.db_connection.writer() as cursor:
+            await cursor.execute(sql, (guild_id, kick_timing))
 
     async def edit_guild_unverified_kick_rules(self, guild_id: int, kick_timing: int):
         """Edit the timing for a guild's unverified kick timing
@@ -49,25 +47,22 @@ class UnverifiedKickRulesDAO:
             kick_timing: The new time, in seconds, it takes before and unverified member is
                          kicked"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "UPDATE unverified_kick_rules SET timedelta=? WHERE guild_id=?"
-        await cursor.execute(sql, (kick_timing, guild_id))
-        await self.db_connection.commit_and_close(connection)
+        async with self.db_connection.writer() as cursor:
+            await cursor.execute(sql, (kick_timing, guild_id))
 
     async def remove_guild_unverified_kick_rules(self, guild_id: int):
         """Remove the kick rules of a specific guild
         Args:
             guild_id: The Discord ID of the guild whose kick rules to remove"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "DELETE FROM unverified_kick_rules WHERE guild_id=?"
-        await cursor.execute(sql, (guild_id,))
-        await self.db_connection.commit_and_close(connection)
+        async with self.db_connection.writer() as cursor:
+            await cursor.execute(sql, (guild_id,))
 
     async def clear_unverified_kick_rules_table(self):
         """Delete every single unverified kick rule from the table"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "DELETE FROM unverified_kick_rules"
-        await cursor.execute(sql)
-        await self.db_connection.commit_and_close(connection)
+        async with self.db_connection.writer() as cursor:
+            await cursor.execute(sql)
@@ -24,12 +24,11 @@ class UtilityChannelsDAO:
             channel_purpose: The purpose of the utility channels to get (e.g. RULES)
         Returns: A list of Rows with all the channels found"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "SELECT * FROM utility_channels WHERE guild_id=? AND channel_purpose=? " \
               "ORDER BY channel_id ASC"
-        await cursor.execute(sql, (guild_id, channel_purpose))
-        channels = await cursor.fetchall()
-        await self.db_connection.close_connection(connection)
+        async with self.db_connection.reader() as cursor:
+            await cursor.execute(sql, (guild_id, channel_purpose))
+            channels = await cursor.fetchall()
         return channels
 
     async def get_all_guild_utility_channels(self, guild_id: int):
@@ -38,12 +37,11 @@ class UtilityChannelsDAO:
             guild_id: The Discord ID of the guild whose channels to get
         Returns: A list of Rows containing all the utility channels"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "SELECT * FROM utility_channels WHERE guild_id=? " \
               "ORDER BY channel_purpose ASC, channel_id ASC"
-        await cursor.execute(sql, (guild_id,))
-        channels = await cursor.fetchall()
-        await self.db_connection.close_connection(connection)
+        async with self.db_connection.reader() as cursor:
+            await cursor.execute(sql, (guild_id,))
+            channels = await cursor.fetchall()
         return channels
 
     async def get_guild_utility_channel_by_id(self, guild_id: int, channel_id: int):
@@ -53,12 +51,11 @@ class UtilityChannelsDAO:
             channel_id: The Discord ID of the channel to get
         Returns: A list of Rows containing all the different utilities for this channel"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "SELECT * FROM utility_channels WHERE guild_id=? AND channel_id=? " \
               "ORDER BY channel_purpose ASC"
-        await cursor.execute(sql, (guild_id, channel_id))
-        channel = await cursor.fetchall()
-        await self.db_connection.close_connection(connection)
+        async with self.db_connection.reader() as cursor:
+            await cursor.execute(sql, (guild_id, channel_id))
+            channel = await cursor.fetchall()
         return channel
 
     async def create_guild_utility_channel(self, channel_id: int, guild_id: int, channel_purpose: str):
@@ -68,11 +65,10 @@ class UtilityChannelsDAO:
             guild_id: The Discord ID of the guild in which the channel resides
             channel_purpose: The purpose of the utility channel (e.g. LOGS)"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "INSERT INTO utility_channels (channel_id, guild_id, channel_purpose)" \
               "VALUES (?, ?, ?)"
-        await cursor.execute(sql, (channel_id, guild_id, channel_purpose))
-        await self.db_connection.commit_and_close(connection)
+        async with self.db_connection.writer() as cursor:
+            await cursor.execute(sql, (channel_id, guild_id, channel_purpose))
 
     async def delete_utility_channel(self, channel_id: int, guild_id: int):
         """Stop using a specific channel as a utility channel
@@ -80,10 +76,9 @@ class UtilityChannelsDAO:
             channel_id: The Discord ID of the channel to no longer be used as a utility channel
             guild_id: The Discord ID of the guild where the channel resides"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "DELETE FROM utility_channels WHERE channel_id=? AND guild_id=?"
-        await cursor.execute(sql, (channel_id, guild_id))
-        await self.db_connection.commit_and_close(connection)
+        async with self.db_connection.writer() as cursor:
+            await cursor.execute(sql, (channel_id, guild_id))
 
     async def delete_utility_from_channel(self, channel_id: int, guild_id: int, channel_purpose: str):
         """Stop using a specific channel as a specific utility channel
@@ -92,25 +87,22 @@ class UtilityChannelsDAO:
             guild_id: The Discord ID of the guild where the channel resides
             channel_purpose: The purpose to remove from the channel"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "DELETE FROM utility_channels WHERE channel_id=? AND guild_id=? AND channel_purpose=?"
-        await cursor.execute(sql, (channel_id, guild_id, channel_purpose))
-        await self.db_connection.commit_and_close(connection)
+        async with self.db_connection.writer() as cursor:
+            await cursor.execute(sql, (channel_id, guild_id, channel_purpose))
 
     async def delete_guild_utility_channels(self, guild_id: int):
         """Delete all utility channels used by a guild
         Args:
             guild_id: The Discord ID of the guild whose utility channels to delete"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "DELETE FROM utility_channels WHERE guild_id=?"
-        await cursor.execute(sql, (guild_id,))
-        await self.db_connection.commit_and_close(connection)
+        async with self.db_connection.writer() as cursor:
+            await cursor.execute(sql, (guild_id,))
 
     async def clear_utility_channels_table(self):
         """Delete every single utility channel from the table"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "DELETE FROM utility_channels"
-        await cursor.execute(sql)
-        await self.db_connection.commit_and_close(connection)
+        async with self.db_connection.writer() as cursor:
+            await cursor.execute(sql)
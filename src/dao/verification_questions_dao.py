@@ -22,12 +22,11 @@ class VerificationQuestionsDAO:
             guild_id: The Discord ID of the guild whose verification questions to get
         Returns: A list of Rows with the found verification questions"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "SELECT * FROM verification_questions WHERE guild_id=? " \
               "ORDER BY question_priority ASC"
-        await cursor.execute(sql, (guild_id,))
-        rows = await cursor.fetchall()
-        await self.db_connection.close_connection(connection)
+        async with self.db_connection.reader() as cursor:
+            await cursor.execute(sql, (guild_id,))
+            rows = await cursor.fetchall()
         return rows
 
     async def get_verification_question(self, question_id: int):
@@ -36,11 +35,10 @@ class VerificationQuestionsDAO:
             question_id: The database ID of the question to get
         Returns: A Row object with the found question, or None if none are found"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "SELECT * FROM verification_questions WHERE id=?"
-        await cursor.execute(sql, (question_id,))
-        row = await cursor.fetchone()
-        await self.db_connection.close_connection(connection)
+        async with self.db_connection.reader() as cursor:
+            await cursor.execute(sql, (question_id,))
+            row = await cursor.fetchone()
         return row
 
     async def add_verification_question(self, guild_id: int, question: str, priority: int = 0):
@@ -50,11 +48,10 @@ class VerificationQuestionsDAO:
             question: The question itself
             priority: The priority number of the question. Lower numbers are displayed first."""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "INSERT INTO verification_questions (guild_id, question, question_priority) " \
               "VALUES (?, ?, ?)"
-        await cursor.execute(sql, (guild_id, question, priority))
-        await self.db_connection.commit_and_close(connection)
+        async with self.db_connection.writer() as cursor:
+            await cursor.execute(sql, (guild_id, question, priority))
 
     async def edit_verification_question(self, question_id: int, question: str, priority: int):
         """Edit an existing verification question
@@ -63,35 +60,31 @@ class VerificationQuestionsDAO:
             question: The new question
             priority: The new priority number for the question"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "UPDATE verification_questions SET question=?, question_priority=? WHERE id=?"
-        await cursor.execute(sql, (question, priority, question_id))
-        await self.db_connection.commit_and_close(connection)
+        async with self.db_connection.writer() as cursor:
+            await cursor.execute(sql, (question, priority, question_id))
 
     async def delete_verification_question(self, question_id: int):
         """Delete a specific verification question
         Args:
             question_id: The database ID of the question to delete"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "DELETE FROM verification_questions WHERE id=?"
-        await cursor.execute(sql, (question_id,))
-        await self.db_connection.commit_and_close(connection)
+        async with self.db_connection.writer() as cursor:
+            await cursor.execute(sql, (question_id,))
 
     async def delete_guild_verification_questions(self, guild_id: int):
         """Delete all verification questions of a specific guild
         Args:
             guild_id: The Discord ID of the guild whose verification questions to delete"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "DELETE FROM verification_questions WHERE guild_id=?"
-        await cursor.execute(sql, (guild_id,))
-        await self.db_connection.commit_and_close(connection)
+        async with self.db_connection.writer() as cursor:
+            await cursor.execute(sql, (guild_id,))
 
     async def clear_verification_questions_table(self):
         """Delete every single verification question from the table"""
 
-        connection, cursor = await self.db_connection.connect_to_db()
         sql = "DELETE FROM verification_questions"
-        await cursor.execute(sql)
-        await self.db_connection.commit_and_close(connection)
+        async with self.db_connection.writer() as cursor:
+            await cursor.execute(sql)
@@ -1,11 +1,811 @@
-"""Houses the class used to control database connections."""
+"""Houses the classes used to control database connections."""
 import asyncio
+import time
+from contextlib import asynccontextmanager
 import aiosqlite as sqlite3
+from config.constants import DB_QUERY_METRICS, DB_READER_CONNECTIONS, DB_SLOW_QUERY_THRESHOLD, \
+    DB_STORAGE_PROFILE, DB_STORAGE_PROFILES, DB_WRITE_BATCH_INTERVAL, DB_WRITE_BATCH_SIZE
+
+class PoolWaitMetrics:
+    """Keeps track of how long connection acquisitions had to wait for a free connection
+    Attributes:
+        acquisitions: How many times a connection was acquired
+        contended: How many of those acquisitions had to wait for another user to release
+        total_wait: The total time, in seconds, spent waiting for connections
+        max_wait: The longest single wait, in seconds"""
+
+    def __init__(self):
+        """Create a new, empty set of pool wait metrics"""
+
+        self.acquisitions = 0
+        self.contended = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record(self, wait: float, contended: bool):
+        """Record a single connection acquisition
+        Args:
+            wait: How long, in seconds, the acquisition took
+            contended: Whether the acquisition had to wait for a connection to be released"""
+
+        self.acquisitions += 1
+        if contended:
+            self.contended += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+
+    def to_dict(self):
+        """Get the metrics as a dictionary
+        Returns: A dictionary containing the recorded metrics and the average wait"""
+
+        average_wait = self.total_wait / self.acquisitions if self.acquisitions else 0.0
+        return {"acquisitions": self.acquisitions,
+                "contended": self.contended,
+                "total_wait": self.total_wait,
+                "average_wait": average_wait,
+                "max_wait": self.max_wait}
+
+def redact_parameters(parameters):
+    """Describe the parameters of an SQL statement without revealing their values
+    Args:
+        parameters: The positional or named parameters of the statement
+    Returns: A string containing the type of every parameter, such as (int, str)"""
+
+    if not parameters:
+        return "()"
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f":{name}: {type(value).__name__}"
+                               for name, value in parameters.items()) + "}"
+    return "(" + ", ".join(type(value).__name__ for value in parameters) + ")"
+
+class QueryStatistics:
+    """The recorded executions of a single SQL statement
+    Attributes:
+        count: How many times the statement was executed
+        total_time: The total time, in seconds, spent executing the statement and fetching its rows
+        max_time: The longest single execution, in seconds
+        rows: The total number of rows fetched
+        total_wait: The total time, in seconds, spent waiting for a connection to execute it on"""
+
+    def __init__(self):
+        """Create a new, empty set of query statistics"""
+
+        self.count = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.rows = 0
+        self.total_wait = 0.0
+
+    def record(self, duration: float, rows: int, wait: float):
+        """Record a single execution of the statement
+        Args:
+            duration: How long, in seconds, the statement and its fetches took
+            rows: How many rows were fetched
+            wait: How long, in seconds, the statement waited for a connection"""
+
+        self.count += 1
+        self.total_time += duration
+        self.max_time = max(self.max_time, duration)
+        self.rows += rows
+        self.total_wait += wait
+
+    def to_dict(self):
+        """Get the statistics as a dictionary
+        Returns: A dictionary containing the recorded statistics and the averages"""
+
+        return {"count": self.count,
+                "total_time": self.total_time,
+                "average_time": self.total_time / self.count if self.count else 0.0,
+                "max_time": self.max_time,
+                "rows": self.rows,
+                "total_wait": self.total_wait,
+                "average_wait": self.total_wait / self.count if self.count else 0.0}
+
+class QueryMetrics:
+    """Keeps track of how every distinct SQL statement run against a database performs.
+    Statements that take longer than the slow query threshold are printed with their parameters
+    redacted, so that the log doesn't leak user data.
+    Attributes:
+        slow_query_threshold: How many seconds a statement can take before it's logged as slow,
+                              None to never log slow statements
+        slow_queries: How many slow statements have been logged"""
+
+    def __init__(self, slow_query_threshold: float = DB_SLOW_QUERY_THRESHOLD):
+        """Create a new, empty set of query metrics
+        Args:
+            slow_query_threshold: How many seconds a statement can take before it's logged"""
+
+        self.slow_query_threshold = slow_query_threshold
+        self.slow_queries = 0
+        self._statistics = {}
+
+    def record(self, sql: str, parameters, duration: float, rows: int, wait: float):
+        """Record a single execution of a statement and log it if it was slow
+        Args:
+            sql: The SQL statement that was executed
+            parameters: The parameters of the statement, only used to describe a slow statement
+            duration: How long, in seconds, the statement and its fetches took
+            rows: How many rows were fetched
+            wait: How long, in seconds, the statement waited for a connection"""
+
+        statistics = self._statistics.get(sql)
+        if statistics is None:
+            statistics = self._statistics[sql] = QueryStatistics()
+        statistics.record(duration, rows, wait)
+        if self.slow_query_threshold is not None and duration >= self.slow_query_threshold:
+            self.slow_queries += 1
+            print(f"Slow query took {duration * 1000:.1f} ms and returned {rows} rows after "
+                  f"waiting {wait * 1000:.1f} ms for a connection: {' '.join(sql.split())} "
+                  f"with parameters {redact_parameters(parameters)}")
+
+    def get_summary(self, sort_by: str = "total_time", limit: int = None):
+        """Get the statistics of every recorded statement
+        Args:
+            sort_by: The statistic to sort the statements by, largest first
+            limit: How many statements to return at most, None to return all of them
+        Returns: A list of dictionaries containing the SQL and statistics of each statement"""
+
+        summary = [{"sql": sql, **statistics.to_dict()}
+                   for sql, statistics in self._statistics.items()]
+        summary.sort(key=lambda statement: statement[sort_by], reverse=True)
+        return summary[:limit] if limit is not None else summary
+
+    def reset(self):
+        """Forget every recorded statement"""
+
+        self.slow_queries = 0
+        self._statistics.clear()
+
+class InstrumentedCursor:
+    """Wraps a Cursor and records every statement executed through it in a QueryMetrics object.
+    The time of a statement covers both executing it and fetching its rows, so a statement is
+    recorded once the next one is executed or the cursor is closed. An executemany call or an
+    executed script is recorded as a single statement. Everything but executing, fetching and
+    closing is passed through to the wrapped cursor.
+    Attributes:
+        cursor: The wrapped Cursor object
+        metrics: The QueryMetrics object the statements are recorded in"""
+
+    def __init__(self, cursor: sqlite3.Cursor, metrics: QueryMetrics, wait: float):
+        """Wrap a cursor
+        Args:
+            cursor: The Cursor object to wrap
+            metrics: The QueryMetrics object to record the statements in
+            wait: How long, in seconds, it took to get the connection of the cursor. Only the
+                  first statement is recorded as having waited."""
+
+        self.cursor = cursor
+        self.metrics = metrics
+        self._wait = wait
+        self._statement = None
+        self._duration = 0.0
+        self._rows = 0
+
+    def __getattr__(self, name: str):
+        return getattr(self.cursor, name)
+
+    def flush(self):
+        """Record the statement executed last, if it hasn't been recorded yet. Fetches made
+        after this are not counted."""
+
+        if self._statement is None:
+            return
+        sql, parameters = self._statement
+        self.metrics.record(sql, parameters, self._duration, self._rows, self._wait)
+        self._statement = None
+        self._wait = 0.0
+
+    async def _timed(self, awaitable):
+        """Await a cursor operation and add its duration to the current statement
+        Args:
+            awaitable: The cursor operation to await
+        Returns: The result of the operation"""
+
+        start = time.perf_counter()
+        try:
+            return await awaitable
+        finally:
+            self._duration += time.perf_counter() - start
+
+    def _start(self, sql: str, parameters):
+        """Record the previous statement and start timing a new one
+        Args:
+            sql: The SQL of the new statement
+            parameters: The parameters of the new statement"""
+
+        self.flush()
+        self._statement = (sql, parameters)
+        self._duration = 0.0
+        self._rows = 0
+
+    async def execute(self, sql: str, parameters=None):
+        """Execute an SQL statement
+        Args:
+            sql: The SQL statement to execute
+            parameters: The parameters of the SQL statement
+        Returns: This cursor"""
+
+        self._start(sql, parameters)
+        await self._timed(self.cursor.execute(sql, parameters))
+        return self
+
+    async def executemany(self, sql: str, parameters):
+        """Execute an SQL statement once for every set of parameters
+        Args:
+            sql: The SQL statement to execute
+            parameters: An iterable of the parameters of every execution. They're not described
+                        if the statement is slow, because that would consume the iterable.
+        Returns: This cursor"""
+
+        self._start(sql, None)
+        await self._timed(self.cursor.executemany(sql, parameters))
+        return self
+
+    async def executescript(self, script: str):
+        """Execute several SQL statements separated by semicolons
+        Args:
+            script: The SQL statements to execute
+        Returns: This cursor"""
+
+        self._start(script, None)
+        await self._timed(self.cursor.executescript(script))
+        return self
+
+    async def fetchone(self):
+        """Fetch the next row of the current statement
+        Returns: A Row object, None if there are no more rows"""
+
+        row = await self._timed(self.cursor.fetchone())
+        if row is not None:
+            self._rows += 1
+        return row
+
+    async def fetchmany(self, size: int = None):
+        """Fetch the next rows of the current statement
+        Args:
+            size: How many rows to fetch at most
+        Returns: A list of Rows"""
+
+        rows = await self._timed(self.cursor.fetchmany(size))
+        self._rows += len(rows)
+        return rows
+
+    async def fetchall(self):
+        """Fetch the remaining rows of the current statement
+        Returns: A list of Rows"""
+
+        rows = await self._timed(self.cursor.fetchall())
+        self._rows += len(rows)
+        return rows
+
+    async def close(self):
+        """Record the last statement and close the wrapped cursor"""
+
+        self.flush()
+        await self.cursor.close()
+
+class WriteOperation:
+    """A single write waiting in a WriteQueue
+    Attributes:
+        sql: The SQL statement to execute
+        parameters: The parameters of the SQL statement
+        fetch: "one" or "all" to fetch the rows the statement returns, None to fetch nothing
+        future: The Future that receives the result once the write has been committed
+        followed_by: (sql, parameters) tuples of statements executed after the first one, in
+                     the same savepoint
+        queued_at: When the write was queued, as a time.perf_counter value"""
+
+    def __init__(self, sql: str, parameters: tuple, fetch: str, future: asyncio.Future,
+                 followed_by: tuple = ()):
+        """Create a new write operation
+        Args:
+            sql: The SQL statement to execute
+            parameters: The parameters of the SQL statement
+            fetch: "one" or "all" to fetch the rows the statement returns, None to fetch nothing
+            future: The Future that receives the result once the write has been committed
+            followed_by: (sql, parameters) tuples of statements executed after the first one,
+                         in the same savepoint"""
+
+        self.sql = sql
+        self.parameters = parameters
+        self.fetch = fetch
+        self.future = future
+        self.followed_by = followed_by
+        self.queued_at = time.perf_counter()
+
+class WriteQueueMetrics:
+    """Keeps track of the group commits of a write queue
+    Attributes:
+        batches: How many group commits have been made
+        operations: How many writes have been committed
+        failed: How many writes failed"""
+
+    def __init__(self):
+        """Create a new, empty set of write queue metrics"""
+
+        self.batches = 0
+        self.operations = 0
+        self.failed = 0
+
+    def record(self, operations: int, failed: int):
+        """Record a single group commit
+        Args:
+            operations: How many writes of the group were committed
+            failed: How many writes of the group failed"""
+
+        self.batches += 1
+        self.operations += operations
+        self.failed += failed
+
+    def to_dict(self):
+        """Get the metrics as a dictionary
+        Returns: A dictionary containing the group commit counts and the average batch size"""
+
+        average_batch = (self.operations + self.failed) / self.batches if self.batches else 0.0
+        return {"batches": self.batches,
+                "operations": self.operations,
+                "failed": self.failed,
+                "average_batch_size": average_batch}
+
+class WriteQueue:
+    """A write-behind queue that gathers writes from every DAO using the same database and
+    commits them in groups through the pool's writer connection. Every write runs inside its
+    own savepoint, so a failing write is rolled back without affecting the rest of its group.
+    Attributes:
+        pool: The connection pool whose writer connection is used
+        batch_interval: How many seconds writes are gathered before they are committed
+        batch_size: How many writes are committed at most in a single transaction
+        metrics: The WriteQueueMetrics of the group commits"""
+
+    def __init__(self, pool, batch_interval: float = DB_WRITE_BATCH_INTERVAL,
+                 batch_size: int = DB_WRITE_BATCH_SIZE):
+        """Create a new write queue. The writer task is started when the first write is queued.
+        Args:
+            pool: The ConnectionPool object whose writer connection is used
+            batch_interval: How many seconds writes are gathered before they are committed
+            batch_size: How many writes are committed at most in a single transaction"""
+
+        self.pool = pool
+        self.batch_interval = batch_interval
+        self.batch_size = max(batch_size, 1)
+        self.metrics = WriteQueueMetrics()
+        self._loop = None
+        self._queue = None
+        self._task = None
+
+    def _bind_to_running_loop(self):
+        """Make sure the queue and its writer task belong to the running event loop"""
+
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._task is not None and not self._task.done():
+            return
+        self._loop = loop
+        self._queue = asyncio.Queue()
+        self._task = loop.create_task(self._run())
+
+    async def submit(self, sql: str, parameters: tuple = (), fetch: str = None,
+                     followed_by: tuple = ()):
+        """Queue a write and wait until the group commit containing it has landed
+        Args:
+            sql: The SQL statement to execute
+            parameters: The parameters of the SQL statement
+            fetch: "one" or "all" to fetch the rows the statement returns, None to fetch nothing
+            followed_by: (sql, parameters) tuples of statements executed after the first one.
+                         Either all of the statements are committed or none of them are.
+        Returns: A Row or a list of Rows depending on fetch, None if nothing was fetched"""
+
+        self._bind_to_running_loop()
+        future = self._loop.create_future()
+        self._queue.put_nowait(WriteOperation(sql, parameters, fetch, future, followed_by))
+        return await future
+
+    async def _gather_batch(self):
+        """Wait for the next write and gather more until the batch is full or the interval ends
+        Returns: A list of WriteOperation objects. The list ends with None if the queue is
+                 being closed."""
+
+        batch = [await self._queue.get()]
+        deadline = self._loop.time() + self.batch_interval
+        while batch[-1] is not None and len(batch) < self.batch_size:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            timeout = deadline - self._loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _execute(self, cursor: sqlite3.Cursor, operation: WriteOperation):
+        """Execute a single write, and the statements following it, inside its own savepoint
+        Args:
+            cursor: The cursor of the writer connection
+            operation: The write to execute
+        Returns: The fetched result of the write"""
+
+        await cursor.execute("SAVEPOINT queued_write")
+        statement_cursor = cursor
+        if self.pool.query_metrics is not None:
+            # The time the write spent in the queue is its wait for the writer connection
+            statement_cursor = InstrumentedCursor(cursor, self.pool.query_metrics,
+                                                  time.perf_counter() - operation.queued_at)
+        try:
+            await statement_cursor.execute(operation.sql, operation.parameters)
+            if operation.fetch == "one":
+                result = await statement_cursor.fetchone()
+            elif operation.fetch == "all":
+                result = await statement_cursor.fetchall()
+            else:
+                result = None
+            for sql, parameters in operation.followed_by:
+                await statement_cursor.execute(sql, parameters)
+        except sqlite3.Error:
+            await cursor.execute("ROLLBACK TO SAVEPOINT queued_write")
+            await cursor.execute("RELEASE SAVEPOINT queued_write")
+            raise
+        finally:
+            if statement_cursor is not cursor:
+                statement_cursor.flush()
+        await cursor.execute("RELEASE SAVEPOINT queued_write")
+        return result
+
+    async def _commit_batch(self, batch: list):
+        """Execute a batch of writes in a single transaction and resolve their futures once the
+        transaction has been committed
+        Args:
+            batch: A list of WriteOperation objects"""
+
+        outcomes = []
+        try:
+            async with self.pool.writer() as connection:
+                cursor = await connection.cursor()
+                try:
+                    await cursor.execute("BEGIN")
+                    for operation in batch:
+                        try:
+                            outcomes.append((await self._execute(cursor, operation), None))
+                        except sqlite3.Error as error:
+                            outcomes.append((None, error))
+                    await connection.commit()
+                except BaseException:
+                    if connection.in_transaction:
+                        await connection.rollback()
+                    raise
+                finally:
+                    await cursor.close()
+        except Exception as error: # pylint: disable=broad-exception-caught
+            # The whole transaction was lost, so every write in it failed
+            outcomes = [(None, error)] * len(batch)
+        failed = sum(1 for _, error in outcomes if error is not None)
+        self.metrics.record(len(batch) - failed, failed)
+        for operation, (result, error) in zip(batch, outcomes):
+            if operation.future.done():
+                continue
+            if error is None:
+                operation.future.set_result(result)
+            else:
+                operation.future.set_exception(error)
+
+    async def _run(self):
+        """The writer task that commits queued writes until the queue is closed"""
+
+        while True:
+            batch = await self._gather_batch()
+            operations = [operation for operation in batch if operation is not None]
+            if operations:
+                await self._commit_batch(operations)
+            if batch[-1] is None:
+                return
+
+    def get_metrics(self):
+        """Get the metrics of this write queue
+        Returns: A dictionary containing the group commit counts, the average batch size and
+                 the number of writes still waiting"""
+
+        return {**self.metrics.to_dict(),
+                "queued": self._queue.qsize() if self._queue is not None else 0}
+
+    async def close(self):
+        """Commit the writes that are still waiting and stop the writer task"""
+
+        task = self._task
+        self._task = None
+        if task is None or task.done() or self._loop is not asyncio.get_running_loop():
+            return
+        self._queue.put_nowait(None)
+        await task
+
+class ReaderConnections:
+    """The reader connections of a pool and the idle ones waiting to be borrowed
+    Attributes:
+        count: The maximum number of reader connections that are opened
+        connections: Every open reader connection
+        metrics: Wait metrics for reader connection acquisitions"""
+
+    def __init__(self, count: int):
+        """Create a new, empty set of reader connections
+        Args:
+            count: The maximum number of reader connections to open"""
+
+        self.count = max(count, 1)
+        self.connections = []
+        self.metrics = PoolWaitMetrics()
+        self._idle = None
+        self._opening = 0
+
+    def bind(self):
+        """Create the idle connection queue in the running event loop, keeping the connections"""
+
+        self._idle = asyncio.Queue()
+        for connection in self.connections:
+            self._idle.put_nowait(connection)
+        self._opening = 0
+
+    async def acquire(self, open_connection):
+        """Get an idle reader connection, open a new one if there's room for it or wait for one
+        to be released
+        Args:
+            open_connection: The coroutine function used to open a new connection
+        Returns: A Connection object that must be given back with release"""
+
+        start = time.perf_counter()
+        contended = False
+        if not self._idle.empty():
+            connection = self._idle.get_nowait()
+        elif len(self.connections) + self._opening < self.count:
+            self._opening += 1
+            try:
+                connection = await open_connection()
+            finally:
+                self._opening -= 1
+            self.connections.append(connection)
+        else:
+            contended = True
+            connection = await self._idle.get()
+        self.metrics.record(time.perf_counter() - start, contended)
+        return connection
+
+    def release(self, connection: sqlite3.Connection):
+        """Give a reader connection back
+        Args:
+            connection: The connection to give back"""
+
+        self._idle.put_nowait(connection)
+
+class WriterConnection:
+    """The single writer connection of a pool and the lock that serializes its users
+    Attributes:
+        connection: The writer Connection object, None until it's first needed
+        metrics: Wait metrics for writer connection acquisitions"""
+
+    def __init__(self):
+        """Create a new writer connection slot. The connection is opened when first needed."""
+
+        self.connection = None
+        self.metrics = PoolWaitMetrics()
+        self._lock = None
+
+    def bind(self):
+        """Create the lock in the running event loop, keeping the connection"""
+
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, open_connection):
+        """Get the writer connection, waiting for the current writer to finish if needed
+        Args:
+            open_connection: The coroutine function used to open the connection
+        Returns: The writer Connection object that must be given back with release"""
+
+        start = time.perf_counter()
+        contended = self._lock.locked()
+        await self._lock.acquire()
+        try:
+            if self.connection is None:
+                self.connection = await open_connection()
+        except BaseException:
+            self._lock.release()
+            raise
+        self.metrics.record(time.perf_counter() - start, contended)
+        return self.connection
+
+    def release(self):
+        """Give the writer connection back"""
+
+        self._lock.release()
+
+class ConnectionPool:
+    """A pool of long-lived connections to a single database. All DBConnection objects that
+    use the same database address share the same pool. The pool holds a fixed number of reader
+    connections and a single writer connection, so that writes are serialized instead of fighting
+    over the database lock.
+    Attributes:
+        db_address: The location of the database
+        storage_profile: The name of the storage profile applied to every connection
+        readers: The ReaderConnections of the pool
+        writer_connection: The WriterConnection of the pool
+        write_queue: The write-behind queue that group commits writes through the writer
+        query_metrics: The per-statement QueryMetrics of the database, None if disabled"""
+
+    _pools = {}
+
+    def __init__(self, db_address: str, reader_count: int = DB_READER_CONNECTIONS,
+                 storage_profile: str = DB_STORAGE_PROFILE, query_metrics: bool = DB_QUERY_METRICS):
+        """Create a new connection pool. Connections are opened lazily when first needed.
+        Args:
+            db_address: The location of the database
+            reader_count: The maximum number of reader connections to open
+            storage_profile: The name of a profile in DB_STORAGE_PROFILES whose PRAGMA values
+                             are applied to every connection
+            query_metrics: Whether to record the statements run through DBConnection objects"""
+
+        if storage_profile not in DB_STORAGE_PROFILES:
+            raise ValueError(f"Unknown database storage profile: {storage_profile}")
+        self.db_address = db_address
+        self.storage_profile = storage_profile
+        self.readers = ReaderConnections(reader_count)
+        self.writer_connection = WriterConnection()
+        self.write_queue = WriteQueue(self)
+        self.query_metrics = QueryMetrics() if query_metrics else None
+        self._loop = None
+
+    @property
+    def reader_count(self):
+        """The maximum number of reader connections the pool opens"""
+
+        return self.readers.count
+
+    @classmethod
+    def get_pool(cls, db_address: str, storage_profile: str = DB_STORAGE_PROFILE):
+        """Get the shared pool of a database, creating it if it doesn't exist yet
+        Args:
+            db_address: The location of the database
+            storage_profile: The storage profile to use if the pool is created by this call
+        Returns: The ConnectionPool object shared by everything using that database"""
+
+        pool = cls._pools.get(db_address)
+        if pool is None:
+            pool = cls(db_address, storage_profile=storage_profile)
+            cls._pools[db_address] = pool
+        return pool
+
+    @classmethod
+    async def close_all(cls):
+        """Close every connection in every pool. Used when the bot shuts down."""
+
+        pools = list(cls._pools.values())
+        cls._pools.clear()
+        for pool in pools:
+            await pool.close()
+
+    def _bind_to_running_loop(self):
+        """Make sure the pool's synchronization primitives belong to the running event loop.
+        The connections themselves are not tied to a loop, so they're kept when the loop changes."""
+
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        self._loop = loop
+        self.readers.bind()
+        self.writer_connection.bind()
+
+    async def _open_connection(self):
+        """Open a new long-lived connection to the database
+        Returns: A Connection object"""
+
+        retries = 0
+        while retries <= 10:
+            try:
+                connection = sqlite3.connect(self.db_address)
+                # Pooled connections live for the lifetime of the bot, so they must not keep the
+                # interpreter alive if the pool was never closed
+                connection.daemon = True
+                connection = await connection
+                break
+            except sqlite3.DatabaseError:
+                await asyncio.sleep(0.1)
+                retries += 1
+        if retries > 10:
+            raise sqlite3.DatabaseError("Database connection failed")
+        connection.row_factory = sqlite3.Row
+        await connection.execute("PRAGMA foreign_keys = ON;")
+        for pragma, value in DB_STORAGE_PROFILES[self.storage_profile].items():
+            await connection.execute(f"PRAGMA {pragma} = {value};")
+        return connection
+
+    async def acquire_reader(self):
+        """Get a reader connection from the pool, waiting for one to be released if needed
+        Returns: A Connection object that must be given back with release_reader"""
+
+        self._bind_to_running_loop()
+        return await self.readers.acquire(self._open_connection)
+
+    def release_reader(self, connection: sqlite3.Connection):
+        """Give a reader connection back to the pool
+        Args:
+            connection: The connection to give back"""
+
+        self.readers.release(connection)
+
+    async def acquire_writer(self):
+        """Get the writer connection, waiting for the current writer to finish if needed
+        Returns: The writer Connection object that must be given back with release_writer"""
+
+        self._bind_to_running_loop()
+        return await self.writer_connection.acquire(self._open_connection)
+
+    def release_writer(self):
+        """Give the writer connection back to the pool"""
+
+        self.writer_connection.release()
+
+    @asynccontextmanager
+    async def reader(self):
+        """Borrow a reader connection for the duration of a with block
+        Yields: A Connection object"""
+
+        connection = await self.acquire_reader()
+        try:
+            yield connection
+        finally:
+            if connection.in_transaction:
+                await connection.rollback()
+            self.release_reader(connection)
+
+    @asynccontextmanager
+    async def writer(self):
+        """Borrow the writer connection for the duration of a with block
+        Yields: The writer Connection object"""
+
+        connection = await self.acquire_writer()
+        try:
+            yield connection
+        finally:
+            self.release_writer()
+
+    def get_wait_metrics(self):
+        """Get the connection wait metrics of this pool
+        Returns: A dictionary containing the reader and writer wait metrics and the number of
+                 open connections"""
+
+        return {"readers_open": len(self.readers.connections),
+                "writer_open": self.writer_connection.connection is not None,
+                "reader": self.readers.metrics.to_dict(),
+                "writer": self.writer_connection.metrics.to_dict(),
+                "write_queue": self.write_queue.get_metrics()}
+
+    def get_query_metrics(self, sort_by: str = "total_time", limit: int = None):
+        """Get the statistics of the SQL statements run against this pool's database
+        Args:
+            sort_by: The statistic to sort the statements by, largest first
+            limit: How many statements to return at most, None to return all of them
+        Returns: A list of dictionaries containing the SQL and statistics of each statement,
+                 empty if query metrics are disabled"""
+
+        if self.query_metrics is None:
+            return []
+        return self.query_metrics.get_summary(sort_by, limit)
+
+    async def close(self):
+        """Commit the queued writes and close all connections in the pool"""
+
+        await self.write_queue.close()
+        connections = self.readers.connections
+        if self.writer_connection.connection is not None:
+            connections.append(self.writer_connection.connection)
+        self.readers.connections = []
+        self.writer_connection.connection = None
+        self._loop = None
+        for connection in connections:
+            await connection.close()
 
 class DBConnection:
     """A class for controlling database connections
     Attributes:
-        db_address: The location of the database"""
+        db_address: The location of the database
+        pool: The connection pool shared by everything using the same database"""
 
     def __init__(self, db_address: str):
         """Create a new object for controlling database connections.
@@ -13,9 +813,75 @@ class DBConnection:
             db_address: The location of the database"""
 
         self.db_address = db_address
+        self.pool = ConnectionPool.get_pool(db_address)
+
+    async def _get_cursor(self, connection: sqlite3.Connection, wait: float):
+        """Open a cursor on a pooled connection, instrumented if the pool records query metrics
+        Args:
+            connection: The pooled connection
+            wait: How long, in seconds, it took to get the connection
+        Returns: A Cursor or an InstrumentedCursor object"""
+
+        cursor = await connection.cursor()
+        if self.pool.query_metrics is None:
+            return cursor
+        return InstrumentedCursor(cursor, self.pool.query_metrics, wait)
+
+    def get_query_metrics(self, sort_by: str = "total_time", limit: int = None):
+        """Get the statistics of the SQL statements run against the database
+        Args:
+            sort_by: The statistic to sort the statements by, largest first
+            limit: How many statements to return at most, None to return all of them
+        Returns: A list of dictionaries containing the SQL and statistics of each statement"""
+
+        return self.pool.get_query_metrics(sort_by, limit)
+
+    @asynccontextmanager
+    async def reader(self):
+        """Borrow a pooled reader connection for read-only queries
+        Yields: A Cursor object for database commands"""
+
+        start = time.perf_counter()
+        async with self.pool.reader() as connection:
+            cursor = await self._get_cursor(connection, time.perf_counter() - start)
+            try:
+                yield cursor
+            finally:
+                await cursor.close()
+
+    @asynccontextmanager
+    async def writer(self):
+        """Borrow the pooled writer connection. The changes are committed when the with block
+        exits normally and rolled back if it raises.
+        Yields: A Cursor object for database commands"""
+
+        start = time.perf_counter()
+        async with self.pool.writer() as connection:
+            cursor = await self._get_cursor(connection, time.perf_counter() - start)
+            try:
+                yield cursor
+                await cursor.close()
+                await connection.commit()
+            except BaseException:
+                await cursor.close()
+                await connection.rollback()
+                raise
+
+    async def queue_write(self, sql: str, parameters: tuple = (), fetch: str = None,
+                          followed_by: tuple = ()):
+        """Queue a write to be committed together with other writes to the same database
+        Args:
+            sql: The SQL statement to execute
+            parameters: The parameters of the SQL statement
+            fetch: "one" or "all" to fetch the rows the statement returns, e.g. with RETURNING
+            followed_by: (sql, parameters) tuples of statements executed after the first one
+                         as part of the same write, e.g. to trim a history after an insert
+        Returns: A Row or a list of Rows depending on fetch, None if nothing was fetched"""
+
+        return await self.pool.write_queue.submit(sql, parameters, fetch, followed_by)
 
     async def connect_to_db(self):
-        """Make a new connection to a database
+        """Make a new connection to a database outside the pool
         Returns: A Connection object and a Cursor object for database commands"""
 
         retries = 0
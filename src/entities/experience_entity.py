@@ -0,0 +1,26 @@
+"""Experience database rows converted into Python objects"""
+from entities.master_entity import MasterEntity
+
+class ExperienceEntity(MasterEntity):
+    """An object derived from the experience database table's rows
+    Attributes:
+        db_id: The database ID of the experience record
+        user_id: The Discord ID of the user who has the experience
+        guild_id: The Discord ID of the guild the experience was earned in
+        last_experience: When the user was last awarded experience
+        amount: The amount of experience the user has"""
+
+    def __init__(self, db_id: int, user_id: int, guild_id: int, last_experience, amount: int):
+        """Create a new experience entity
+        Args:
+            db_id: The database ID of the experience record
+            user_id: The Discord ID of the user who has the experience
+            guild_id: The Discord ID of the guild the experience was earned in
+            last_experience: When the user was last awarded experience
+            amount: The amount of experience the user has"""
+
+        self.db_id = db_id
+        self.user_id = user_id
+        self.guild_id = guild_id
+        self.last_experience = last_experience
+        self.amount = amount
@@ -0,0 +1,26 @@
+"""Global name database rows converted into Python objects"""
+
+from time_handler.time import TimeStringConverter
+from entities.master_entity import MasterEntity
+
+class GlobalNameEntity(MasterEntity):
+    """An object derived from the global names database table's rows
+    Attributes:
+        db_id: The database ID of the global name
+        user_id: The Discord ID of the user this global name is tied to
+        global_name: The global name string
+        time: A datetime object telling the time this global name came to be used"""
+
+    def __init__(self, db_id: int, user_id: int, global_name: str, time: str):
+        """Create a new global name entity
+        Args:
+            db_id: The database ID of the global name
+            user_id: The Discord ID of the user this global name is tied to
+            global_name: The global name string
+            time: The time string telling the time this global name came to be used"""
+
+        self.db_id = db_id
+        self.user_id = user_id
+        self.global_name = global_name
+        converter = TimeStringConverter()
+        self.time = converter.string_to_datetime(time)
@@ -0,0 +1,23 @@
+"""Level reward role database rows converted into Python objects"""
+from entities.master_entity import MasterEntity
+
+class LevelRewardRoleEntity(MasterEntity):
+    """An object derived from the level reward roles database table's rows
+    Attributes:
+        db_id: The database ID of the level reward role
+        role_id: The Discord ID of the role that is given as a reward
+        guild_id: The Discord ID of the guild the role belongs in
+        level_requirement: The level at which members get the role"""
+
+    def __init__(self, db_id: int, role_id: int, guild_id: int, level_requirement: int):
+        """Create a new level reward role entity
+        Args:
+            db_id: The database ID of the level reward role
+            role_id: The Discord ID of the role that is given as a reward
+            guild_id: The Discord ID of the guild the role belongs in
+            level_requirement: The level at which members get the role"""
+
+        self.db_id = db_id
+        self.role_id = role_id
+        self.guild_id = guild_id
+        self.level_requirement = level_requirement
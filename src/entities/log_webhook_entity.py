@@ -0,0 +1,28 @@
+"""Log webhook database rows converted into Python objects"""
+
+from entities.master_entity import MasterEntity
+
+class LogWebhookEntity(MasterEntity):
+    """An object derived from the log webhooks database table's rows
+    Attributes:
+        db_id: The database ID of the log webhook
+        channel_id: The Discord ID of the channel the webhook posts to
+        guild_id: The Discord ID of the guild where the channel is
+        webhook_id: The Discord ID of the webhook
+        webhook_token: The token used to post with the webhook"""
+
+    def __init__(self, db_id: int, channel_id: int, guild_id: int, webhook_id: int,
+                 webhook_token: str):
+        """Create a new log webhook entity
+        Args:
+            db_id: The database ID of the log webhook
+            channel_id: The Discord ID of the channel the webhook posts to
+            guild_id: The Discord ID of the guild where the channel is
+            webhook_id: The Discord ID of the webhook
+            webhook_token: The token used to post with the webhook"""
+
+        self.db_id = db_id
+        self.channel_id = channel_id
+        self.guild_id = guild_id
+        self.webhook_id = webhook_id
+        self.webhook_token = webhook_token
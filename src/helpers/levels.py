@@ -0,0 +1,32 @@
+"""Houses the functions that convert between experience and levels. Reaching level n takes
+LEVEL_EXPERIENCE_STEP * (1 + 2 + ... + n) experience in total."""
+from math import isqrt
+from config.constants import LEVEL_EXPERIENCE_STEP
+
+def get_level_experience(level: int, step: int = LEVEL_EXPERIENCE_STEP):
+    """Get the total experience needed to reach a level
+    Args:
+        level: The level to reach
+        step: How much more experience each level takes than the one before it
+    Returns: The amount of experience at which the level is reached"""
+
+    if level <= 0:
+        return 0
+    return step * level * (level + 1) // 2
+
+def get_level(experience: int, step: int = LEVEL_EXPERIENCE_STEP):
+    """Get the level reached with an amount of experience
+    Args:
+        experience: The total amount of experience
+        step: How much more experience each level takes than the one before it
+    Returns: The highest level whose experience requirement is met"""
+
+    if experience <= 0:
+        return 0
+    # Solve step * n * (n + 1) / 2 <= experience for n, then correct for rounding
+    level = (isqrt(8 * experience // step + 1) - 1) // 2
+    while get_level_experience(level + 1, step) <= experience:
+        level += 1
+    while level > 0 and get_level_experience(level, step) > experience:
+        level -= 1
+    return level
@@ -0,0 +1,169 @@
+"""Houses the LogDispatcher helper class"""
+
+import asyncio
+from collections import deque
+import discord
+from config.constants import LOG_SEND_CONCURRENCY, LOG_QUEUE_LIMIT, LOG_FLUSH_INTERVAL
+from helpers.log_webhook_manager import LogWebhookManager
+
+# Discord's limits for the embeds of a single message
+MAX_EMBEDS_PER_MESSAGE = 10
+MAX_EMBED_CHARACTERS_PER_MESSAGE = 6000
+
+class LogDispatcher:
+    """Sends log embeds to their channels in the background. Every channel has its own queue,
+    so a slow or rate limited channel only delays the logs sent to it. Embeds queued for the same
+    channel within the flush interval are sent together in as few messages as possible.
+    Attributes:
+        max_concurrency: How many messages are sent at the same time across all channels
+        queue_limit: How many log embeds can wait per channel before new ones are dropped
+        flush_interval: How many seconds embeds are gathered before they're sent together
+        sent: How many log embeds have been sent
+        messages: How many messages the sent embeds took
+        failed: How many log embeds Discord refused
+        dropped: How many log embeds were dropped because their channel's queue was full
+        webhook_manager: Provides the webhooks logs are posted through, None to send the logs
+                         directly to the channels"""
+
+    def __init__(self, max_concurrency: int = LOG_SEND_CONCURRENCY,
+                 queue_limit: int = LOG_QUEUE_LIMIT,
+                 flush_interval: float = LOG_FLUSH_INTERVAL,
+                 webhook_manager: LogWebhookManager = None):
+        """Create a new log dispatcher
+        Args:
+            max_concurrency: How many messages are sent at the same time across all channels
+            queue_limit: How many log embeds can wait per channel before new ones are dropped
+            flush_interval: How many seconds embeds are gathered before they're sent together
+            webhook_manager: Provides the webhooks logs are posted through, None to send the logs
+                             directly to the channels"""
+
+        self.webhook_manager = webhook_manager
+        self.max_concurrency = max(max_concurrency, 1)
+        self.queue_limit = max(queue_limit, 1)
+        self.flush_interval = flush_interval
+        self.sent = 0
+        self.messages = 0
+        self.failed = 0
+        self.dropped = 0
+        self._queues = {}
+        self._workers = {}
+        self._semaphore = None
+
+    def dispatch(self, channels: list, embed: discord.Embed):
+        """Queue an embed to be sent to every given channel and return immediately
+        Args:
+            channels: The channels to send the embed to
+            embed: The embed to send"""
+
+        for channel in channels:
+            self._enqueue(channel, embed)
+
+    def _enqueue(self, channel, embed: discord.Embed):
+        """Queue an embed for a single channel and make sure the channel has a worker sending it
+        Args:
+            channel: The channel to send the embed to
+            embed: The embed to send"""
+
+        queue = self._queues.setdefault(channel.id, deque())
+        if len(queue) >= self.queue_limit:
+            self.dropped += 1
+            return
+        queue.append(embed)
+        if channel.id not in self._workers:
+            if self._semaphore is None:
+                self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._workers[channel.id] = asyncio.get_running_loop().create_task(
+                self._send_queued(channel, queue))
+
+    async def _send_queued(self, channel, queue: deque):
+        """Send the queued embeds of a channel in batches until the queue is empty
+        Args:
+            channel: The channel to send to
+            queue: The queue of embeds waiting for the channel"""
+
+        try:
+            while queue:
+                if len(queue) < MAX_EMBEDS_PER_MESSAGE:
+                    # Give other embeds for this channel a moment to arrive and join the message
+                    await asyncio.sleep(self.flush_interval)
+                embeds = self._take_batch(queue)
+                async with self._semaphore:
+                    await self._send(channel, embeds)
+        finally:
+            del self._workers[channel.id]
+            if not queue:
+                del self._queues[channel.id]
+
+    def _take_batch(self, queue: deque):
+        """Take as many embeds from the front of a queue as fit in a single message
+        Args:
+            queue: The queue of embeds to take from
+        Returns: A list of at least one embed"""
+
+        embeds = [queue.popleft()]
+        characters = len(embeds[0])
+        while queue and len(embeds) < MAX_EMBEDS_PER_MESSAGE:
+            if characters + len(queue[0]) > MAX_EMBED_CHARACTERS_PER_MESSAGE:
+                break
+            characters += len(queue[0])
+            embeds.append(queue.popleft())
+        return embeds
+
+    async def _get_destination(self, channel):
+        """Get what the logs of a channel are sent through
+        Args:
+            channel: The channel the logs are meant for
+        Returns: The channel's log webhook in webhook delivery mode, otherwise the channel itself.
+                 The channel is also returned if it can't have a webhook."""
+
+        if self.webhook_manager is None:
+            return channel
+        try:
+            webhook = await self.webhook_manager.get_webhook(channel)
+        except discord.HTTPException as error:
+            print(f"Can't get a log webhook for {channel}, sending as the bot. {error}")
+            return channel
+        return webhook or channel
+
+    async def _send(self, channel, embeds: list):
+        """Send a list of embeds to a channel as a single message
+        Args:
+            channel: The channel to send to
+            embeds: The embeds to send"""
+
+        destination = await self._get_destination(channel)
+        try:
+            try:
+                await destination.send(embeds=embeds)
+            except discord.NotFound:
+                if destination is channel:
+                    raise
+                # The webhook was deleted, so a new one is created for the next logs
+                await self.webhook_manager.forget_webhook(channel.id)
+                await channel.send(embeds=embeds)
+            self.sent += len(embeds)
+            self.messages += 1
+        except discord.HTTPException as error:
+            self.failed += len(embeds)
+            print(f"Can't send log messages to {channel}. {error}")
+
+    def get_statistics(self):
+        """Get the delivery counts of the dispatcher
+        Returns: A dictionary containing the sent, message, failed and dropped counts, the
+                 number of log embeds waiting and the longest channel queue"""
+
+        depths = [len(queue) for queue in self._queues.values()]
+        return {"sent": self.sent,
+                "messages": self.messages,
+                "failed": self.failed,
+                "dropped": self.dropped,
+                "queued": sum(depths),
+                "max_queue_depth": max(depths, default=0)}
+
+    async def close(self):
+        """Wait until every queued log embed has been sent"""
+
+        while self._workers:
+            await asyncio.gather(*self._workers.values(), return_exceptions=True)
+        if self.webhook_manager is not None:
+            await self.webhook_manager.close()
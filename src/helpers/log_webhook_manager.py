@@ -0,0 +1,87 @@
+"""Houses the LogWebhookManager helper class"""
+
+import time
+import aiohttp
+import discord
+from config.constants import LOG_WEBHOOK_RETRY_INTERVAL
+from services.log_webhook_service import LogWebhookService
+
+class LogWebhookManager:
+    """Finds the webhooks used to post logs into channels, creating them on first use. Posting
+    through webhooks keeps log traffic out of the bot's own rate limits. When a webhook can't be
+    created, e.g. because the bot lacks the Manage Webhooks permission, the channel is given no
+    webhook until the retry interval has passed.
+    Attributes:
+        log_webhook_service: The service used to store the created webhooks
+        retry_interval: How many seconds to wait before trying to create a webhook again in a
+                        channel where creating one failed"""
+
+    def __init__(self, db_address: str, retry_interval: float = LOG_WEBHOOK_RETRY_INTERVAL):
+        """Create a new log webhook manager
+        Args:
+            db_address: The location of the database where the webhooks are stored
+            retry_interval: How many seconds to wait before trying to create a webhook again in
+                            a channel where creating one failed"""
+
+        self.log_webhook_service = LogWebhookService(db_address)
+        self.retry_interval = retry_interval
+        self._webhooks = {}
+        self._failures = {}
+        self._session = None
+
+    def _get_session(self):
+        """Get the HTTP session used by webhooks loaded from the database
+        Returns: An aiohttp.ClientSession object"""
+
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession()
+        return self._session
+
+    async def get_webhook(self, channel: discord.TextChannel):
+        """Get the log webhook of a channel, creating one if the channel doesn't have one yet
+        Args:
+            channel: The channel whose webhook to get
+        Returns: A discord.Webhook object, None if creating a webhook in the channel failed within
+                 the retry interval
+        Raises:
+            discord.HTTPException: If the webhook couldn't be created"""
+
+        webhook = self._webhooks.get(channel.id)
+        if webhook:
+            return webhook
+        failed_at = self._failures.get(channel.id)
+        if failed_at is not None:
+            if time.monotonic() - failed_at < self.retry_interval:
+                return None
+            del self._failures[channel.id]
+        log_webhook = await self.log_webhook_service.get_channel_webhook(channel.id)
+        if log_webhook:
+            webhook = discord.Webhook.partial(log_webhook.webhook_id, log_webhook.webhook_token,
+                                              session=self._get_session())
+        else:
+            try:
+                webhook = await channel.create_webhook(name=channel.guild.me.name,
+                                                       reason="Used for posting logs")
+            except discord.HTTPException:
+                self._failures[channel.id] = time.monotonic()
+                raise
+            await self.log_webhook_service.add_webhook(channel.id, channel.guild.id, webhook.id,
+                                                       webhook.token)
+        self._webhooks[channel.id] = webhook
+        return webhook
+
+    async def forget_webhook(self, channel_id: int):
+        """Stop using the webhook of a channel, e.g. when the webhook or the channel was deleted
+        Args:
+            channel_id: The Discord ID of the channel whose webhook to forget"""
+
+        self._webhooks.pop(channel_id, None)
+        self._failures.pop(channel_id, None)
+        await self.log_webhook_service.delete_channel_webhook(channel_id)
+
+    async def close(self):
+        """Close the HTTP session used by the webhooks"""
+
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
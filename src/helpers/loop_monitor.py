@@ -0,0 +1,188 @@
+"""Houses the LoopMonitor helper class that measures how responsive the event loop is"""
+import asyncio
+import logging
+import re
+import time
+from collections import deque
+from config.constants import LOOP_LAG_BUCKETS, LOOP_LAG_INTERVAL, LOOP_LAG_SAMPLES, \
+    LOOP_SLOW_CALLBACK_THRESHOLD
+
+# asyncio describes a slow task step as <Task ... name='...' coro=<Cog.method() ...>> and a slow
+# plain callback as <Handle function() ...> or <TimerHandle when=... function() ...>. Pycord runs
+# every listener in a task named after its event, so the event name tells which listeners were
+# running.
+EVENT_PATTERN = re.compile(r"name='pycord: (\w+)'")
+CORO_PATTERN = re.compile(r"coro=<([^\s(]+)\(")
+HANDLE_PATTERN = re.compile(r"<\w*Handle (?:when=\S+ )?([^\s(]+)\(")
+
+def get_callback_owner(description: str):
+    """Find out which event, coroutine or function a slow callback reported by asyncio belongs to
+    Args:
+        description: The description asyncio gives of the callback
+    Returns: The name of the Discord event, e.g. "on_message_edit", if the callback ran a
+             listener. Otherwise the qualified name of the coroutine or function, e.g.
+             "Tasks.unban_expired_temp_bans", or "unknown" if it can't be found."""
+
+    match = EVENT_PATTERN.search(description) or CORO_PATTERN.search(description) \
+            or HANDLE_PATTERN.search(description)
+    return match.group(1) if match else "unknown"
+
+class SlowCallbackStatistics:
+    """The recorded slow callbacks of a single coroutine or function
+    Attributes:
+        count: How many times a callback was slow
+        total_time: The total time, in seconds, the slow callbacks blocked the loop
+        max_time: The longest the loop was blocked by a single callback, in seconds"""
+
+    def __init__(self):
+        """Create a new, empty set of slow callback statistics"""
+
+        self.count = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+
+    def record(self, duration: float):
+        """Record a single slow callback
+        Args:
+            duration: How long, in seconds, the callback blocked the loop"""
+
+        self.count += 1
+        self.total_time += duration
+        self.max_time = max(self.max_time, duration)
+
+class SlowCallbackHandler(logging.Handler):
+    """Catches the slow callback warnings asyncio logs in debug mode and hands them to a monitor
+    Attributes:
+        monitor: The LoopMonitor object the slow callbacks are recorded in"""
+
+    def __init__(self, monitor):
+        """Create a new handler
+        Args:
+            monitor: The LoopMonitor object to record the slow callbacks in"""
+
+        super().__init__(logging.WARNING)
+        self.monitor = monitor
+
+    def emit(self, record: logging.LogRecord):
+        """Record a slow callback warning in the monitor and print every other asyncio warning
+        Args:
+            record: The log record asyncio emitted"""
+
+        if record.msg == "Executing %s took %.3f seconds" and len(record.args) == 2:
+            self.monitor.record_slow_callback(str(record.args[0]), record.args[1])
+        else:
+            print(record.getMessage())
+
+class LoopMonitor:
+    """Measures how late the event loop runs a task that sleeps in regular intervals and, while
+    asyncio's debug mode is on, which coroutines block the loop for longer than a threshold.
+    The lag samples are kept in a rolling window that the histogram is calculated from.
+    Attributes:
+        interval: How many seconds there are between lag measurements
+        slow_callback_threshold: How many seconds a callback can block the loop before it's
+                                 reported, None to leave asyncio's debug mode off
+        lags: The most recent lag measurements in seconds
+        slow_callbacks: A dictionary of {qualified name: SlowCallbackStatistics} pairs"""
+
+    def __init__(self, interval: float = LOOP_LAG_INTERVAL, samples: int = LOOP_LAG_SAMPLES,
+                 slow_callback_threshold: float = LOOP_SLOW_CALLBACK_THRESHOLD):
+        """Create a new loop monitor. Nothing is measured until start is called.
+        Args:
+            interval: How many seconds there are between lag measurements
+            samples: How many of the latest lag measurements to keep
+            slow_callback_threshold: How many seconds a callback can block the loop before it's
+                                     reported, None to not report slow callbacks"""
+
+        self.interval = interval
+        self.slow_callback_threshold = slow_callback_threshold
+        self.lags = deque(maxlen=samples)
+        self.slow_callbacks = {}
+        self._handler = None
+        self._task = None
+
+    def start(self):
+        """Start measuring the lag of the running event loop and, if a threshold is set, turn on
+        asyncio's debug mode to report slow callbacks"""
+
+        if self._task is not None:
+            return
+        if self.slow_callback_threshold is not None:
+            loop = asyncio.get_running_loop()
+            loop.slow_callback_duration = self.slow_callback_threshold
+            loop.set_debug(True)
+            self._handler = SlowCallbackHandler(self)
+            logging.getLogger("asyncio").addHandler(self._handler)
+        self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        """Stop measuring and turn asyncio's debug mode back off"""
+
+        if self._handler is not None:
+            logging.getLogger("asyncio").removeHandler(self._handler)
+            asyncio.get_running_loop().set_debug(False)
+            self._handler = None
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self):
+        """Sleep in intervals and record how late each wake-up is"""
+
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.record_lag(time.perf_counter() - start - self.interval)
+
+    def record_lag(self, lag: float):
+        """Record a single lag measurement
+        Args:
+            lag: How many seconds late the loop woke up the measuring task"""
+
+        self.lags.append(max(lag, 0.0))
+
+    def record_slow_callback(self, description: str, duration: float):
+        """Record a callback that blocked the loop and print which coroutine it belongs to
+        Args:
+            description: The description asyncio gives of the callback
+            duration: How long, in seconds, the callback blocked the loop"""
+
+        owner = get_callback_owner(description)
+        statistics = self.slow_callbacks.get(owner)
+        if statistics is None:
+            statistics = self.slow_callbacks[owner] = SlowCallbackStatistics()
+        statistics.record(duration)
+        print(f"Slow callback in {owner} blocked the event loop for {duration * 1000:.1f} ms")
+
+    def get_histogram(self):
+        """Count the lag measurements of the rolling window into buckets
+        Returns: A list of (upper bound in seconds, count) tuples. The last bound is None and
+                 counts the measurements above every bucket."""
+
+        counts = [0] * (len(LOOP_LAG_BUCKETS) + 1)
+        for lag in self.lags:
+            index = 0
+            while index < len(LOOP_LAG_BUCKETS) and lag > LOOP_LAG_BUCKETS[index]:
+                index += 1
+            counts[index] += 1
+        return list(zip(list(LOOP_LAG_BUCKETS) + [None], counts))
+
+    def get_summary(self):
+        """Get the lag percentiles of the rolling window and the slow callbacks
+        Returns: A dictionary containing the number of samples, the p50, p95, p99 and maximum lag
+                 in seconds, and a list of slow callback dictionaries, worst first"""
+
+        lags = sorted(self.lags)
+
+        def percentile(fraction: float):
+            return lags[min(int(len(lags) * fraction), len(lags) - 1)] if lags else 0.0
+
+        slow_callbacks = [{"owner": owner, "count": statistics.count,
+                           "total_time": statistics.total_time, "max_time": statistics.max_time}
+                          for owner, statistics in self.slow_callbacks.items()]
+        slow_callbacks.sort(key=lambda callback: callback["total_time"], reverse=True)
+        return {"samples": len(lags),
+                "p50": percentile(0.5),
+                "p95": percentile(0.95),
+                "p99": percentile(0.99),
+                "max": lags[-1] if lags else 0.0,
+                "slow_callbacks": slow_callbacks}
@@ -0,0 +1,62 @@
+"""Houses the NameChangeBuffer helper class"""
+
+class NameChangeBuffer:
+    """Gathers the name changes of users between flushes. Successive changes of the same name are
+    merged into a single change from the first name to the last, and a name changed back to
+    what it was is dropped, so a burst of renames is recorded and logged only once.
+    Attributes:
+        merged: How many changes were merged into an earlier change of the same name"""
+
+    def __init__(self):
+        """Create a new, empty name change buffer"""
+
+        self.merged = 0
+        self._changes = {}
+
+    def __len__(self):
+        """Get the number of name changes waiting to be flushed
+        Returns: How many names have changed since the last flush"""
+
+        return len(self._changes)
+
+    def record(self, kind: str, user_id: int, guild_id: int, before: str, after: str):
+        """Record a name change
+        Args:
+            kind: "username", "global_name" or "nickname"
+            user_id: The Discord ID of the user whose name changed
+            guild_id: The Discord ID of the guild of a nickname, None for the other names
+            before: The name before the change, None if there wasn't one
+            after: The name after the change, None if the name was removed"""
+
+        key = (kind, user_id, guild_id)
+        change = self._changes.get(key)
+        if change is None:
+            self._changes[key] = [before, after]
+            return
+        self.merged += 1
+        if change[0] == after:
+            del self._changes[key]
+        else:
+            change[1] = after
+
+    def take(self):
+        """Take every waiting name change to be recorded
+        Returns: A list of (kind, user ID, guild ID, before, after) tuples in the order the names
+                 first changed"""
+
+        changes = self._changes
+        self._changes = {}
+        return [(kind, user_id, guild_id, before, after)
+                for (kind, user_id, guild_id), (before, after) in changes.items()]
+
+    def restore(self, changes: list):
+        """Put back name changes that couldn't be saved, merging them with newer ones
+        Args:
+            changes: A list of (kind, user ID, guild ID, before, after) tuples"""
+
+        newer_changes = self._changes
+        self._changes = {}
+        for kind, user_id, guild_id, before, after in changes:
+            self._changes[(kind, user_id, guild_id)] = [before, after]
+        for (kind, user_id, guild_id), (before, after) in newer_changes.items():
+            self.record(kind, user_id, guild_id, before, after)
@@ -0,0 +1,99 @@
+"""Houses the helper classes used to expose metrics in the Prometheus text format"""
+from config.constants import METRICS_LATENCY_BUCKETS
+
+def format_labels(labels: dict):
+    """Format the labels of a sample
+    Args:
+        labels: A dictionary of label names and values
+    Returns: The labels in braces, e.g. {cog="Logging"}, or an empty string if there are none"""
+
+    if not labels:
+        return ""
+    escaped = [(name, str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n"))
+               for name, value in labels.items()]
+    return "{" + ",".join(f"{name}=\"{value}\"" for name, value in escaped) + "}"
+
+class Histogram:
+    """Counts observed durations into cumulative buckets for every combination of label values
+    Attributes:
+        label_names: The names of the labels the observations are split by
+        buckets: The upper bounds of the buckets in seconds, smallest first"""
+
+    def __init__(self, label_names: tuple, buckets: tuple = METRICS_LATENCY_BUCKETS):
+        """Create a new, empty histogram
+        Args:
+            label_names: The names of the labels the observations are split by
+            buckets: The upper bounds of the buckets in seconds"""
+
+        self.label_names = label_names
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}
+
+    def observe(self, label_values: tuple, value: float):
+        """Record a single observation
+        Args:
+            label_values: The values of the labels, in the order of label_names
+            value: The observed duration in seconds"""
+
+        series = self._series.get(label_values)
+        if series is None:
+            # The bucket counts, the total count and the sum
+            series = self._series[label_values] = [[0] * len(self.buckets), 0, 0.0]
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                series[0][index] += 1
+        series[1] += 1
+        series[2] += value
+
+    def samples(self, name: str):
+        """Get the samples of the histogram
+        Args:
+            name: The name of the metric
+        Yields: (sample name, labels, value) tuples"""
+
+        for label_values, (bucket_counts, count, total) in self._series.items():
+            labels = dict(zip(self.label_names, label_values))
+            for bound, bucket_count in zip(self.buckets, bucket_counts):
+                yield f"{name}_bucket", {**labels, "le": f"{bound:g}"}, bucket_count
+            yield f"{name}_bucket", {**labels, "le": "+Inf"}, count
+            yield f"{name}_sum", labels, total
+            yield f"{name}_count", labels, count
+
+class MetricsWriter:
+    """Builds a Prometheus text format exposition one metric family at a time"""
+
+    def __init__(self):
+        """Create a new, empty exposition"""
+
+        self._lines = []
+
+    def add(self, name: str, metric_type: str, description: str, samples):
+        """Add a metric family to the exposition
+        Args:
+            name: The name of the metric
+            metric_type: "counter", "gauge" or "histogram"
+            description: The help text of the metric
+            samples: An iterable of (labels, value) tuples, or of (sample name, labels, value)
+                     tuples for histograms"""
+
+        self._lines.append(f"# HELP {name} {description}")
+        self._lines.append(f"# TYPE {name} {metric_type}")
+        for sample in samples:
+            sample_name, labels, value = sample if len(sample) == 3 else (name, *sample)
+            value = int(value) if isinstance(value, (bool, int)) else repr(float(value))
+            self._lines.append(f"{sample_name}{format_labels(labels)} {value}")
+
+    def add_histogram(self, name: str, description: str, histogram: Histogram):
+        """Add a histogram to the exposition
+        Args:
+            name: The name of the metric
+            description: The help text of the metric
+            histogram: The Histogram object"""
+
+        self.add(name, "histogram", description, histogram.samples(name))
+
+    def render(self):
+        """Get the finished exposition
+        Returns: The metrics as a string in the Prometheus text format"""
+
+        return "\n".join(self._lines) + "\n"
@@ -0,0 +1,222 @@
+"""Houses the RankIndex helper class"""
+from bisect import bisect_left, insort
+from config.constants import RANK_INDEX_BUCKET_SIZE
+
+class RankIndex:
+    """Keeps the members of a guild ordered by their experience, most experience first, so that
+    ranks and leaderboard pages can be found without sorting the whole guild. The members are
+    kept in a list of sorted buckets, and a Fenwick tree of the bucket sizes tells how many
+    members come before a bucket. Finding, adding and removing a member takes logarithmic time
+    plus a copy of a single bucket.
+    Members with the same amount of experience are ordered by their user ID."""
+
+    def __init__(self, bucket_size: int = RANK_INDEX_BUCKET_SIZE):
+        """Create a new, empty rank index
+        Args:
+            bucket_size: How many members a bucket holds before it's split in two"""
+
+        self.bucket_size = max(bucket_size, 4)
+        self._amounts = {}
+        self._buckets = []
+        self._maxes = []
+        self._tree = None
+
+    def __len__(self):
+        """Get the number of members in the index
+        Returns: How many members have experience"""
+
+        return len(self._amounts)
+
+    def load(self, amounts: dict):
+        """Replace the contents of the index, e.g. when rebuilding it from the database
+        Args:
+            amounts: A dictionary of {user ID: amount of experience} pairs"""
+
+        self._amounts = dict(amounts)
+        keys = sorted((-amount, user_id) for user_id, amount in self._amounts.items())
+        half = self.bucket_size // 2
+        self._buckets = [keys[start:start + half] for start in range(0, len(keys), half)]
+        self._maxes = [bucket[-1] for bucket in self._buckets]
+        self._tree = None
+
+    def get_amount(self, user_id: int):
+        """Get the experience of a member
+        Args:
+            user_id: The Discord ID of the member
+        Returns: The amount of experience, None if the member isn't in the index"""
+
+        return self._amounts.get(user_id)
+
+    def set(self, user_id: int, amount: int):
+        """Set the experience of a member, adding them to the index if needed
+        Args:
+            user_id: The Discord ID of the member
+            amount: The member's new amount of experience"""
+
+        if user_id in self._amounts:
+            self._delete((-self._amounts[user_id], user_id))
+        self._amounts[user_id] = amount
+        self._insert((-amount, user_id))
+
+    def add(self, user_id: int, amount: int):
+        """Add experience to a member, adding them to the index if needed
+        Args:
+            user_id: The Discord ID of the member
+            amount: The amount of experience to add"""
+
+        self.set(user_id, self._amounts.get(user_id, 0) + amount)
+
+    def remove(self, user_id: int):
+        """Remove a member from the index
+        Args:
+            user_id: The Discord ID of the member"""
+
+        amount = self._amounts.pop(user_id, None)
+        if amount is not None:
+            self._delete((-amount, user_id))
+
+    def rank(self, user_id: int):
+        """Get the leaderboard position of a member
+        Args:
+            user_id: The Discord ID of the member
+        Returns: The 1-based rank of the member, None if the member isn't in the index"""
+
+        amount = self._amounts.get(user_id)
+        if amount is None:
+            return None
+        key = (-amount, user_id)
+        position = bisect_left(self._maxes, key)
+        return self._count_before(position) + bisect_left(self._buckets[position], key) + 1
+
+    def slice(self, start: int, count: int):
+        """Get consecutive members of the leaderboard
+        Args:
+            start: The 0-based position of the first member to get
+            count: How many members to get at most
+        Returns: A list of (user ID, amount) tuples, most experience first"""
+
+        if start < 0 or count <= 0 or start >= len(self._amounts):
+            return []
+        position, index = self._locate(start)
+        members = []
+        while position < len(self._buckets) and len(members) < count:
+            bucket = self._buckets[position]
+            members.extend((user_id, -negative_amount)
+                           for negative_amount, user_id in bucket[index:index + count - len(members)])
+            position += 1
+            index = 0
+        return members
+
+    def top(self, count: int):
+        """Get the members with the most experience
+        Args:
+            count: How many members to get at most
+        Returns: A list of (user ID, amount) tuples, most experience first"""
+
+        return self.slice(0, count)
+
+    def page(self, page: int, per_page: int):
+        """Get a page of the leaderboard
+        Args:
+            page: The 1-based number of the page
+            per_page: How many members there are on a page
+        Returns: A list of (user ID, amount) tuples, most experience first"""
+
+        return self.slice((page - 1) * per_page, per_page)
+
+    def _insert(self, key: tuple):
+        """Insert a (negative amount, user ID) key into its bucket, splitting the bucket if it
+        grows too large
+        Args:
+            key: The key to insert"""
+
+        if not self._buckets:
+            self._buckets.append([key])
+            self._maxes.append(key)
+            self._tree = None
+            return
+        position = min(bisect_left(self._maxes, key), len(self._buckets) - 1)
+        bucket = self._buckets[position]
+        insort(bucket, key)
+        self._maxes[position] = bucket[-1]
+        if len(bucket) > self.bucket_size:
+            half = len(bucket) // 2
+            self._buckets.insert(position + 1, bucket[half:])
+            del bucket[half:]
+            self._maxes[position] = bucket[-1]
+            self._maxes.insert(position + 1, self._buckets[position + 1][-1])
+            self._tree = None
+        elif self._tree is not None:
+            self._update_tree(position, 1)
+
+    def _delete(self, key: tuple):
+        """Delete a (negative amount, user ID) key from its bucket, dropping the bucket if it
+        becomes empty
+        Args:
+            key: The key to delete"""
+
+        position = bisect_left(self._maxes, key)
+        bucket = self._buckets[position]
+        del bucket[bisect_left(bucket, key)]
+        if not bucket:
+            del self._buckets[position]
+            del self._maxes[position]
+            self._tree = None
+            return
+        self._maxes[position] = bucket[-1]
+        if self._tree is not None:
+            self._update_tree(position, -1)
+
+    def _build_tree(self):
+        """Build the Fenwick tree of the bucket sizes"""
+
+        tree = [0] + [len(bucket) for bucket in self._buckets]
+        for index in range(1, len(tree)):
+            parent = index + (index & -index)
+            if parent < len(tree):
+                tree[parent] += tree[index]
+        self._tree = tree
+
+    def _update_tree(self, position: int, change: int):
+        """Change the size of a bucket in the Fenwick tree
+        Args:
+            position: The 0-based position of the bucket
+            change: How much the size of the bucket changed"""
+
+        index = position + 1
+        while index < len(self._tree):
+            self._tree[index] += change
+            index += index & -index
+
+    def _count_before(self, position: int):
+        """Count the members in the buckets before a bucket
+        Args:
+            position: The 0-based position of the bucket
+        Returns: The number of members before the bucket"""
+
+        if self._tree is None:
+            self._build_tree()
+        count = 0
+        index = position
+        while index > 0:
+            count += self._tree[index]
+            index -= index & -index
+        return count
+
+    def _locate(self, start: int):
+        """Find the bucket and the position inside it of a leaderboard position
+        Args:
+            start: The 0-based leaderboard position
+        Returns: A (bucket position, position in bucket) tuple"""
+
+        if self._tree is None:
+            self._build_tree()
+        position = 0
+        step = 1 << (len(self._tree) - 1).bit_length()
+        while step:
+            following = position + step
+            if following < len(self._tree) and self._tree[following] <= start:
+                position = following
+                start -= self._tree[following]
+            step >>= 1
+        return position, start
@@ -0,0 +1,167 @@
+"""Houses the UnverifiedMemberScheduler helper class"""
+import asyncio
+import heapq
+from datetime import datetime, timedelta
+
+class UnverifiedMemberScheduler:
+    """Keeps track of the unverified members of guilds and when each of them is due to get their
+    next verification reminder or to be kicked. Every member has a single deadline in a min-heap,
+    so finding the due members doesn't require going through all of them. Members whose
+    deadlines change leave their old heap entries behind, and those are skipped when they reach
+    the top."""
+
+    def __init__(self):
+        """Create a new, empty UnverifiedMemberScheduler"""
+
+        self._rules = {}
+        self._members = {}
+        self._deadlines = {}
+        self._heap = []
+        self._changed = asyncio.Event()
+
+    def __len__(self):
+        """Get the number of members with a deadline
+        Returns: How many tracked members are waiting to be reminded or kicked"""
+
+        return len(self._deadlines)
+
+    def set_guild_rules(self, guild_id: int, kick_after: int, reminders: list):
+        """Set the kick timing and reminder messages of a guild and reschedule its members
+        Args:
+            guild_id: The Discord ID of the guild
+            kick_after: How many seconds after joining an unverified member is kicked,
+                        None if unverified members are never kicked
+            reminders: A list of unverified reminder message entities of the guild. Reminders
+                       without a timedelta are never sent."""
+
+        reminders = [reminder for reminder in reminders if reminder.timedelta is not None]
+        self._rules[guild_id] = (kick_after, sorted(reminders, key=lambda r: r.timedelta))
+        for key in [key for key in self._members if key[0] == guild_id]:
+            self._schedule(key)
+
+    def has_rules(self, guild_id: int):
+        """Check whether a guild kicks or reminds its unverified members
+        Args:
+            guild_id: The Discord ID of the guild
+        Returns: True if the guild has a kick timing or reminder messages, False otherwise"""
+
+        kick_after, reminders = self._rules.get(guild_id, (None, []))
+        return kick_after is not None or len(reminders) > 0
+
+    def remove_guild(self, guild_id: int):
+        """Stop tracking a guild and all of its members
+        Args:
+            guild_id: The Discord ID of the guild"""
+
+        self._rules.pop(guild_id, None)
+        for key in [key for key in self._members if key[0] == guild_id]:
+            self.untrack(*key)
+
+    def track(self, guild_id: int, user_id: int, joined_at: datetime, sent_reminder_ids=()):
+        """Start tracking an unverified member
+        Args:
+            guild_id: The Discord ID of the guild the member is in
+            user_id: The Discord ID of the member
+            joined_at: When the member joined the guild, in UTC
+            sent_reminder_ids: The database IDs of the reminder messages the member already got"""
+
+        if joined_at.tzinfo is not None:
+            joined_at = joined_at.replace(tzinfo=None) - joined_at.utcoffset()
+        self._members[(guild_id, user_id)] = (joined_at, set(sent_reminder_ids))
+        self._schedule((guild_id, user_id))
+
+    def untrack(self, guild_id: int, user_id: int):
+        """Stop tracking a member, e.g. when they verify or leave
+        Args:
+            guild_id: The Discord ID of the guild the member is in
+            user_id: The Discord ID of the member"""
+
+        self._members.pop((guild_id, user_id), None)
+        self._deadlines.pop((guild_id, user_id), None)
+
+    def is_tracked(self, guild_id: int, user_id: int):
+        """Check whether a member is tracked as unverified
+        Args:
+            guild_id: The Discord ID of the guild the member is in
+            user_id: The Discord ID of the member
+        Returns: True if the member is tracked, False otherwise"""
+
+        return (guild_id, user_id) in self._members
+
+    def _schedule(self, key: tuple):
+        """Calculate the next deadline of a member from the rules of their guild
+        Args:
+            key: The (guild ID, user ID) tuple of the member"""
+
+        joined_at, sent_reminder_ids = self._members[key]
+        kick_after, reminders = self._rules.get(key[0], (None, []))
+        delays = [reminder.timedelta for reminder in reminders
+                  if reminder.db_id not in sent_reminder_ids]
+        if kick_after is not None:
+            delays.append(kick_after)
+        if not delays:
+            self._deadlines.pop(key, None)
+            return
+        deadline = joined_at + timedelta(seconds=min(delays))
+        next_deadline = self.next_deadline()
+        self._deadlines[key] = deadline
+        heapq.heappush(self._heap, (deadline, key))
+        if next_deadline is None or deadline < next_deadline:
+            self._changed.set()
+
+    def _discard_outdated(self):
+        """Pop heap entries of members whose deadlines have since changed or who are untracked"""
+
+        while self._heap:
+            deadline, key = self._heap[0]
+            if self._deadlines.get(key) == deadline:
+                return
+            heapq.heappop(self._heap)
+
+    def next_deadline(self):
+        """Get the time when the next member is due to be reminded or kicked
+        Returns: A datetime object, None if nothing is scheduled"""
+
+        self._discard_outdated()
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: datetime):
+        """Take the members whose deadlines have passed. Members who are due to be kicked are
+        untracked and the rest are rescheduled for their next reminder.
+        Args:
+            now: The current time in UTC
+        Returns: A list of (guild ID, user ID, reminder message entities, kick) tuples. The
+                 reminders are the ones that became due, oldest first, and are empty for the
+                 members who are kicked."""
+
+        due = []
+        self._discard_outdated()
+        while self._heap and self._heap[0][0] <= now:
+            key = heapq.heappop(self._heap)[1]
+            joined_at, sent_reminder_ids = self._members[key]
+            kick_after, reminders = self._rules.get(key[0], (None, []))
+            if kick_after is not None and joined_at + timedelta(seconds=kick_after) <= now:
+                self.untrack(*key)
+                due.append((key[0], key[1], [], True))
+            else:
+                due_reminders = [reminder for reminder in reminders
+                                 if reminder.db_id not in sent_reminder_ids
+                                 and joined_at + timedelta(seconds=reminder.timedelta) <= now]
+                sent_reminder_ids.update(reminder.db_id for reminder in due_reminders)
+                del self._deadlines[key]
+                self._schedule(key)
+                if due_reminders:
+                    due.append((key[0], key[1], due_reminders, False))
+            self._discard_outdated()
+        return due
+
+    async def wait_for_change(self, timeout: float = None):
+        """Wait until a member gets a deadline earlier than any other, or until the timeout runs out
+        Args:
+            timeout: The most seconds to wait, None to wait indefinitely"""
+
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        self._changed.clear()
@@ -0,0 +1,410 @@
+"""The experience service is used to call methods in the experience DAO class."""
+import asyncio
+from datetime import datetime, timedelta
+from dao.experience_dao import ExperienceDAO
+from entities.experience_entity import ExperienceEntity
+from helpers.rank_index import RankIndex
+from time_handler.time import TimeStringConverter
+
+class ExperienceAccumulator:
+    """Gathers awarded experience in memory so that it can be written to the database in batches
+    instead of on every message. The accumulator is shared by every experience service that uses
+    the same database. The cooldown between awards is checked against the times kept in memory,
+    which are loaded from the database for a guild the first time one of its members is awarded
+    experience. The accumulator also keeps the leaderboard rank indexes of the guilds whose
+    ranks have been asked for, and adds awarded experience to them right away.
+    Attributes:
+        flushes: How many batches of experience have been written to the database
+        leaderboards: A dictionary of {guild ID: RankIndex} pairs"""
+
+    _accumulators = {}
+
+    def __init__(self):
+        """Create a new, empty experience accumulator"""
+
+        self.flushes = 0
+        self.leaderboards = {}
+        self._pending = {}
+        self._last_awarded = {}
+        self._loaded_guilds = set()
+        self._longest_interval = 0
+        self._loop = None
+        self._lock = None
+
+    @classmethod
+    def get_accumulator(cls, db_address: str):
+        """Get the shared accumulator of a database, creating it if it doesn't exist yet
+        Args:
+            db_address: The location of the database
+        Returns: The ExperienceAccumulator object shared by everything using that database"""
+
+        accumulator = cls._accumulators.get(db_address)
+        if accumulator is None:
+            accumulator = cls()
+            cls._accumulators[db_address] = accumulator
+        return accumulator
+
+    def get_lock(self):
+        """Get the lock that keeps flushes and leaderboard loads from overlapping. A leaderboard
+        loaded while a flush is being written could count the flushed experience twice or not
+        at all.
+        Returns: An asyncio.Lock object belonging to the running event loop"""
+
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._lock = asyncio.Lock()
+        return self._lock
+
+    def __len__(self):
+        """Get the number of users with experience waiting to be written
+        Returns: How many (guild, user) pairs have pending experience"""
+
+        return len(self._pending)
+
+    def is_guild_loaded(self, guild_id: int):
+        """Check whether the recent experience times of a guild have been loaded
+        Args:
+            guild_id: The Discord ID of the guild
+        Returns: True if the guild's times are in memory, False otherwise"""
+
+        return guild_id in self._loaded_guilds
+
+    def load_guild(self, guild_id: int, last_awarded: dict):
+        """Store the times when the members of a guild were last awarded experience
+        Args:
+            guild_id: The Discord ID of the guild
+            last_awarded: A dictionary of {user ID: datetime} pairs"""
+
+        for user_id, awarded in last_awarded.items():
+            key = (guild_id, user_id)
+            # An award made while the times were being loaded is newer than the stored one
+            if key not in self._last_awarded or self._last_awarded[key] < awarded:
+                self._last_awarded[key] = awarded
+        self._loaded_guilds.add(guild_id)
+
+    def award(self, user_id: int, guild_id: int, amount: int, interval: int, now: datetime):
+        """Award experience to a user unless they were awarded some too recently
+        Args:
+            user_id: The Discord ID of the user who gets the experience
+            guild_id: The Discord ID of the guild in which the experience is awarded
+            amount: The amount of experience to award
+            interval: The interval, in seconds, after which the user is eligible for more
+                      experience
+            now: The current time in UTC
+        Returns: True if the experience was awarded, False if the user is still on cooldown"""
+
+        key = (guild_id, user_id)
+        last_awarded = self._last_awarded.get(key)
+        if last_awarded is not None and (now - last_awarded).total_seconds() <= interval:
+            return False
+        self._last_awarded[key] = now
+        self._longest_interval = max(self._longest_interval, interval)
+        pending = self._pending.get(key)
+        if pending is None:
+            self._pending[key] = [amount, now]
+        else:
+            pending[0] += amount
+            pending[1] = now
+        leaderboard = self.leaderboards.get(guild_id)
+        if leaderboard is not None:
+            leaderboard.add(user_id, amount)
+        return True
+
+    def get_pending(self, user_id: int, guild_id: int):
+        """Get the experience of a user that hasn't been written yet
+        Args:
+            user_id: The Discord ID of the user
+            guild_id: The Discord ID of the guild
+        Returns: The amount of pending experience"""
+
+        pending = self._pending.get((guild_id, user_id))
+        return pending[0] if pending is not None else 0
+
+    def get_guild_pending(self, guild_id: int):
+        """Get the experience of a guild's members that hasn't been written yet
+        Args:
+            guild_id: The Discord ID of the guild
+        Returns: A dictionary of {user ID: amount of pending experience} pairs"""
+
+        return {key[1]: amount for key, (amount, _) in self._pending.items() if key[0] == guild_id}
+
+    def take_pending(self):
+        """Take every pending experience award to write them to the database
+        Returns: A list of (user ID, guild ID, last awarded datetime, amount) tuples"""
+
+        pending = self._pending
+        self._pending = {}
+        return [(user_id, guild_id, awarded, amount)
+                for (guild_id, user_id), (amount, awarded) in pending.items()]
+
+    def restore_pending(self, pending: list):
+        """Put back experience awards that couldn't be written, merging them with newer ones
+        Args:
+            pending: A list of (user ID, guild ID, last awarded datetime, amount) tuples"""
+
+        for user_id, guild_id, awarded, amount in pending:
+            newer = self._pending.get((guild_id, user_id))
+            if newer is None:
+                self._pending[(guild_id, user_id)] = [amount, awarded]
+            else:
+                newer[0] += amount
+
+    def forget_expired(self, now: datetime):
+        """Forget award times that are older than the longest cooldown, since they no longer
+        affect who is eligible for experience
+        Args:
+            now: The current time in UTC"""
+
+        cutoff = now - timedelta(seconds=self._longest_interval)
+        for key in [key for key, awarded in self._last_awarded.items() if awarded < cutoff]:
+            del self._last_awarded[key]
+
+    def discard_user(self, user_id: int, guild_id: int):
+        """Drop the pending experience and cooldown of a user, e.g. when it's reset
+        Args:
+            user_id: The Discord ID of the user
+            guild_id: The Discord ID of the guild"""
+
+        self._pending.pop((guild_id, user_id), None)
+        self._last_awarded.pop((guild_id, user_id), None)
+        if guild_id in self.leaderboards:
+            self.leaderboards[guild_id].remove(user_id)
+
+    def discard_guild(self, guild_id: int):
+        """Drop the pending experience and cooldowns of every member of a guild
+        Args:
+            guild_id: The Discord ID of the guild"""
+
+        for store in (self._pending, self._last_awarded):
+            for key in [key for key in store if key[0] == guild_id]:
+                del store[key]
+        self._loaded_guilds.discard(guild_id)
+        self.leaderboards.pop(guild_id, None)
+
+    def clear(self):
+        """Drop all pending experience, cooldowns and loaded guilds"""
+
+        self._pending.clear()
+        self._last_awarded.clear()
+        self._loaded_guilds.clear()
+        self.leaderboards.clear()
+
+class ExperienceService:
+    """A service for calling methods from experience DAO
+    Attributes:
+        experience_dao: The DAO object this service will use
+        accumulator: The pending experience shared by every service using the same database
+        time_convert: An object that handles conversion between datetime and string"""
+
+    def __init__(self, db_address):
+        """Create a new service for experience DAO
+        Args:
+            db_address: The address for the database file where the experience table resides"""
+
+        self.experience_dao = ExperienceDAO(db_address)
+        self.accumulator = ExperienceAccumulator.get_accumulator(db_address)
+        self.time_convert = TimeStringConverter()
+
+    def _convert_to_entity(self, row):
+        """Convert a database row to an experience entity
+        Args:
+            row: The database row to convert to an experience entity
+        Returns: An experience entity equivalent to the database row"""
+
+        if not row:
+            return None
+        return ExperienceEntity(row["id"], row["user_id"], row["guild_id"],
+                                row["last_experience"], row["amount"])
+
+    async def get_guild_leaderboard(self, guild_id: int):
+        """Get all experience in a guild, most experience first, including experience not yet
+        written. Nothing is flushed here, since the totals of a flush are needed to give level
+        rewards.
+        Args:
+            guild_id: The ID of the guild whose experience points to list
+        Returns: A list of experience entities"""
+
+        async with self.accumulator.get_lock():
+            rows = await self.experience_dao.get_guild_leaderboard(guild_id)
+            # Nothing is flushed while the lock is held, so the pending experience is exactly
+            # what the rows are missing
+            pending = self.accumulator.get_guild_pending(guild_id)
+        leaderboard = [self._convert_to_entity(row) for row in rows]
+        for experience in leaderboard:
+            experience.amount = (experience.amount or 0) + pending.pop(experience.user_id, 0)
+        leaderboard.extend(ExperienceEntity(None, user_id, guild_id, None, amount)
+                           for user_id, amount in pending.items())
+        leaderboard.sort(key=lambda experience: experience.amount, reverse=True)
+        return leaderboard
+
+    async def get_user_experience(self, user_id: int, guild_id: int):
+        """Get the experience of a user in a guild, including experience not yet written
+        Args:
+            user_id: The user whose experience to get
+            guild_id: The ID of the guild from which to get the experience
+        Returns: An experience entity, None if the user has no experience"""
+
+        experience = self._convert_to_entity(
+            await self.experience_dao.get_user_experience(user_id, guild_id))
+        pending = self.accumulator.get_pending(user_id, guild_id)
+        if experience is None and pending:
+            experience = ExperienceEntity(None, user_id, guild_id, None, 0)
+        if experience is not None:
+            experience.amount += pending
+        return experience
+
+    async def add_user_experience(self, user_id: int, guild_id: int, amount: int, interval: int):
+        """Give a user experience in memory. The experience is written to the database the next
+        time flush_experience is called. Experience is not awarded if the user was last awarded
+        experience less than the interval ago.
+        Args:
+            user_id: The Discord ID of the user who gets the experience
+            guild_id: The ID of the guild on which the experience is awarded
+            amount: The amount of experience to award
+            interval: The interval, in seconds, after which the user is eligible for more
+                      experience
+        Returns: True if the experience was awarded, False if the user is still on cooldown"""
+
+        if not self.accumulator.is_guild_loaded(guild_id):
+            rows = await self.experience_dao.get_recent_guild_experience(guild_id, interval)
+            self.accumulator.load_guild(guild_id, {
+                row["user_id"]: self.time_convert.string_to_datetime(row["last_experience"])
+                for row in rows})
+        return self.accumulator.award(user_id, guild_id, amount, interval, datetime.utcnow())
+
+    async def flush_experience(self):
+        """Write the pending experience to the database in a single statement
+        Returns: A list of (experience entity, previous amount) tuples of the users whose
+                 experience was written. Only the user ID, guild ID and new amount of the
+                 entities are set."""
+
+        async with self.accumulator.get_lock():
+            pending = self.accumulator.take_pending()
+            if not pending:
+                return []
+            try:
+                rows = await self.experience_dao.add_experience_in_bulk(
+                    [(user_id, guild_id, self.time_convert.datetime_to_string(awarded), amount)
+                     for user_id, guild_id, awarded, amount in pending])
+            except BaseException:
+                self.accumulator.restore_pending(pending)
+                raise
+        self.accumulator.flushes += 1
+        self.accumulator.forget_expired(datetime.utcnow())
+        awarded = {(user_id, guild_id): amount for user_id, guild_id, _, amount in pending}
+        return [(ExperienceEntity(None, row["user_id"], row["guild_id"], None, row["amount"]),
+                 row["amount"] - awarded[(row["user_id"], row["guild_id"])]) for row in rows]
+
+    async def rebuild_leaderboard(self, guild_id: int):
+        """Build the rank index of a guild from the database and the pending experience
+        Args:
+            guild_id: The Discord ID of the guild
+        Returns: The RankIndex object of the guild"""
+
+        async with self.accumulator.get_lock():
+            rows = await self.experience_dao.get_guild_leaderboard(guild_id)
+            # Nothing is flushed while the lock is held, so the pending experience is exactly
+            # what the rows are missing
+            amounts = {row["user_id"]: row["amount"] or 0 for row in rows}
+            for user_id, amount in self.accumulator.get_guild_pending(guild_id).items():
+                amounts[user_id] = amounts.get(user_id, 0) + amount
+            leaderboard = RankIndex()
+            leaderboard.load(amounts)
+            self.accumulator.leaderboards[guild_id] = leaderboard
+        return leaderboard
+
+    async def _get_leaderboard(self, guild_id: int):
+        """Get the rank index of a guild, building it if it hasn't been built yet
+        Args:
+            guild_id: The Discord ID of the guild
+        Returns: The RankIndex object of the guild"""
+
+        leaderboard = self.accumulator.leaderboards.get(guild_id)
+        if leaderboard is None:
+            leaderboard = await self.rebuild_leaderboard(guild_id)
+        return leaderboard
+
+    async def get_user_rank(self, user_id: int, guild_id: int):
+        """Get the leaderboard position of a user in a guild
+        Args:
+            user_id: The Discord ID of the user
+            guild_id: The Discord ID of the guild
+        Returns: The 1-based rank of the user, None if the user has no experience"""
+
+        leaderboard = await self._get_leaderboard(guild_id)
+        return leaderboard.rank(user_id)
+
+    async def get_top_experience(self, guild_id: int, limit: int):
+        """Get the users of a guild with the most experience
+        Args:
+            guild_id: The Discord ID of the guild
+            limit: How many users to get at most
+        Returns: A list of experience entities, most experience first. Only the user ID, guild
+                 ID and amount are set."""
+
+        leaderboard = await self._get_leaderboard(guild_id)
+        return [ExperienceEntity(None, user_id, guild_id, None, amount)
+                for user_id, amount in leaderboard.top(limit)]
+
+    async def get_leaderboard_page(self, guild_id: int, page: int, per_page: int):
+        """Get a page of the experience leaderboard of a guild
+        Args:
+            guild_id: The Discord ID of the guild
+            page: The 1-based number of the page
+            per_page: How many users there are on a page
+        Returns: A list of experience entities, most experience first. Only the user ID, guild
+                 ID and amount are set."""
+
+        leaderboard = await self._get_leaderboard(guild_id)
+        return [ExperienceEntity(None, user_id, guild_id, None, amount)
+                for user_id, amount in leaderboard.page(page, per_page)]
+
+    async def get_leaderboard_size(self, guild_id: int):
+        """Get how many users of a guild have experience
+        Args:
+            guild_id: The Discord ID of the guild
+        Returns: The number of users on the guild's leaderboard"""
+
+        leaderboard = await self._get_leaderboard(guild_id)
+        return len(leaderboard)
+
+    async def reset_user_experience(self, user_id: int, guild_id: int):
+        """Reset a user's experience in a guild back to 0
+        Args:
+            user_id: The Discord ID of the user whose experience to reset
+            guild_id: The ID of the guild in which the experience is reset"""
+
+        async with self.accumulator.get_lock():
+            self.accumulator.discard_user(user_id, guild_id)
+            await self.experience_dao.reset_user_experience(user_id, guild_id)
+            leaderboard = self.accumulator.leaderboards.get(guild_id)
+            # Experience awarded during the reset is already in the index
+            if leaderboard is not None and leaderboard.get_amount(user_id) is None \
+               and await self.experience_dao.get_user_experience(user_id, guild_id):
+                leaderboard.set(user_id, 0)
+
+    async def delete_user_experience(self, user_id: int, guild_id: int):
+        """Delete a user's experience in a guild
+        Args:
+            user_id: The Discord ID of the user whose experience to delete
+            guild_id: The ID of the guild from which to delete"""
+
+        async with self.accumulator.get_lock():
+            self.accumulator.discard_user(user_id, guild_id)
+            await self.experience_dao.delete_user_experience(user_id, guild_id)
+
+    async def delete_guild_experience(self, guild_id: int):
+        """Delete all experience records of a guild
+        Args:
+            guild_id: The Discord ID of the guild whose experience records to delete"""
+
+        async with self.accumulator.get_lock():
+            self.accumulator.discard_guild(guild_id)
+            await self.experience_dao.delete_guild_experience(guild_id)
+
+    async def clear_experience(self):
+        """Delete every experience record and drop the pending experience"""
+
+        self.accumulator.clear()
+        await self.experience_dao.clear_experience_table()
@@ -0,0 +1,78 @@
+"""The global name service is used to call methods in the global names DAO class."""
+
+from dao.global_names_dao import GlobalNamesDAO
+from entities.global_name_entity import GlobalNameEntity
+
+class GlobalNameService:
+    """A service for calling methods from global names DAO
+    Attributes:
+        global_names_dao: The DAO object this service will use"""
+
+    def __init__(self, db_address):
+        """Create a new service for global names DAO
+        Args:
+            db_address: The address for the database file where the global names table resides"""
+
+        self.global_names_dao = GlobalNamesDAO(db_address)
+
+    def _convert_to_entity(self, row):
+        """Convert a database row to a global name entity
+        Args:
+            row: The database row to convert to a global name entity
+        Returns: A global name entity equivalent to the database row"""
+
+        if not row:
+            return None
+        return GlobalNameEntity(row["id"], row["user_id"], row["global_name"], row["time"])
+
+    async def find_global_names(self, global_name: str):
+        """Find the instances of a given global name
+        Args:
+            global_name: The global name to find
+        Returns: A list of global name entities"""
+
+        rows = await self.global_names_dao.find_global_names(global_name)
+        return [self._convert_to_entity(row) for row in rows]
+
+    async def find_user_global_names(self, user_id: int):
+        """Find all global names of a given user, newest first
+        Args:
+            user_id: The Discord ID of the user whose previous global names to find
+        Returns: A list of global name entities"""
+
+        rows = await self.global_names_dao.find_user_global_names(user_id)
+        return [self._convert_to_entity(row) for row in rows]
+
+    async def add_global_name(self, global_name: str, user_id: int, global_name_limit: int = 5):
+        """Add a new global name. If more than limit names exist already, the oldest are deleted.
+        Args:
+            global_name: The global name to add
+            user_id: The Discord ID of the user this global name is associated with
+            global_name_limit: How many global names for one user are allowed to be saved at a
+                               time
+        Returns: The database ID of the new global name"""
+
+        return await self.global_names_dao.add_global_name(global_name, user_id,
+                                                           global_name_limit)
+
+    async def add_global_names(self, global_names: list, global_name_limit: int = 5):
+        """Add many new global names at once. Users with more than limit names lose the oldest.
+        Args:
+            global_names: A list of (global name, user ID) tuples, oldest first
+            global_name_limit: How many global names for one user are allowed to be saved at a
+                               time
+        Returns: A list of the database IDs of the new global names"""
+
+        return await self.global_names_dao.add_global_names(global_names, global_name_limit)
+
+    async def delete_user_global_names(self, user_id: int):
+        """Delete all global name records associated with a specific user
+        Args:
+            user_id: The Discord ID for the user whose global name history to delete"""
+
+        await self.global_names_dao.delete_user_global_names(user_id)
+
+    async def clear_global_names(self):
+        """Delete every single global name record"""
+
+        await self.global_names_dao.clear_global_names_table()
@@ -3,10 +3,125 @@ from dao.guild_settings_dao import GuildSettingsDAO
 from entities.setting_entity import SettingEntity
 from entities.guild_setting_entity import GuildSettingEntity
 
-class GuildSettingService:
+class GuildSettingCache:
+    """An in-memory cache of guild settings shared by every guild setting service that uses the
+    same database. A guild's settings are loaded all at once the first time one is needed and
+    kept up to date by the service methods that change them.
+    Attributes:
+        hits: How many lookups were answered from the cache
+        misses: How many lookups had to load the guild's settings from the database"""
+
+    _caches = {}
+
+    def __init__(self):
+        """Create a new, empty guild setting cache"""
+
+        self.hits = 0
+        self.misses = 0
+        self._guilds = {}
+        self._versions = {}
+
+    @classmethod
+    def get_cache(cls, db_address: str):
+        """Get the shared cache of a database, creating it if it doesn't exist yet
+        Args:
+            db_address: The location of the database
+        Returns: The GuildSettingCache object shared by everything using that database"""
+
+        cache = cls._caches.get(db_address)
+        if cache is None:
+            cache = cls()
+            cls._caches[db_address] = cache
+        return cache
+
+    def get_guild(self, guild_id: int):
+        """Get the cached settings of a guild and count the lookup as a hit or a miss
+        Args:
+            guild_id: The Discord ID of the guild whose settings to get
+        Returns: A dictionary of setting names and guild setting entities, None if the guild's
+                 settings haven't been loaded"""
+
+        settings = self._guilds.get(guild_id)
+        if settings is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return settings
+
+    def get_version(self, guild_id: int):
+        """Get the version of a guild's cached settings, used to detect changes made while the
+        settings were being loaded
+        Args:
+            guild_id: The Discord ID of the guild
+        Returns: An integer that changes every time the guild's settings are changed"""
+
+        return self._versions.get(guild_id, 0)
+
+    def store_guild(self, guild_id: int, guild_settings: list, version: int):
+        """Store the loaded settings of a guild, unless they were changed during the load
+        Args:
+            guild_id: The Discord ID of the guild whose settings were loaded
+            guild_settings: A list of guild setting entities
+            version: The version of the guild's settings when the load began
+        Returns: A dictionary of setting names and guild setting entities"""
+
+        settings = {guild_setting.setting.name: guild_setting for guild_setting in guild_settings}
+        if self.get_version(guild_id) == version:
+            self._guilds[guild_id] = settings
+        return settings
+
+    def update_value(self, guild_id: int, setting_name: str, setting_value: str):
+        """Change the value of a cached guild setting
+        Args:
+            guild_id: The Discord ID of the guild whose setting changed
+            setting_name: The name of the changed setting
+            setting_value: The new value of the setting"""
+
+        self._versions[guild_id] = self.get_version(guild_id) + 1
+        settings = self._guilds.get(guild_id)
+        if settings is None or setting_name not in settings:
+            return
+        old = settings[setting_name]
+        setting = SettingEntity(old.setting.db_id, setting_name, setting_value)
+        settings[setting_name] = GuildSettingEntity(old.db_id, guild_id, setting, setting_value)
+
+    def remove_setting(self, guild_id: int, setting_name: str):
+        """Remove a deleted guild setting from the cache
+        Args:
+            guild_id: The Discord ID of the guild whose setting was deleted
+            setting_name: The name of the deleted setting"""
+
+        self._versions[guild_id] = self.get_version(guild_id) + 1
+        settings = self._guilds.get(guild_id)
+        if settings is not None:
+            settings.pop(setting_name, None)
+
+    def invalidate_guild(self, guild_id: int):
+        """Drop the cached settings of a guild so that they're loaded again when next needed
+        Args:
+            guild_id: The Discord ID of the guild whose settings to drop"""
+
+        self._versions[guild_id] = self.get_version(guild_id) + 1
+        self._guilds.pop(guild_id, None)
+
+    def clear(self):
+        """Drop the cached settings of every guild"""
+
+        for guild_id in list(self._guilds):
+            self.invalidate_guild(guild_id)
+
+    def get_statistics(self):
+        """Get the hit and miss counts of the cache
+        Returns: A dictionary containing the hits, misses and number of cached guilds"""
+
+        return {"hits": self.hits, "misses": self.misses, "guilds": len(self._guilds)}
+
+# The service mirrors the methods of GuildSettingsDAO
+class GuildSettingService: # pylint: disable=too-many-public-methods
     """A service for calling methods from guild settings DAO
     Attributes:
-        guild_settings_dao: The DAO object this service will use"""
+        guild_settings_dao: The DAO object this service will use
+        cache: The guild setting cache shared by every service using the same database"""
 
     def __init__(self, db_address):
         """Create a new service for guild settings DAO
@@ -14,6 +129,7 @@ class GuildSettingService:
             db_address: The address for the database file where the guild settings table resides"""
 
         self.guild_settings_dao = GuildSettingsDAO(db_address)
+        self.cache = GuildSettingCache.get_cache(db_address)
 
     def _convert_to_entity(self, row):
         """Covert a database row into a guild setting entity
@@ -27,6 +143,21 @@ class GuildSettingService:
         return GuildSettingEntity(row["id"], row["guild_id"], setting,
                                   row["setting_value"])
 
+    async def _get_cached_guild_settings(self, guild_id: int):
+        """Get the settings of a guild from the cache, loading them if they aren't cached yet
+        Args:
+            guild_id: The Discord ID of the guild whose settings to get
+        Returns: A dictionary of setting names and guild setting entities"""
+
+        settings = self.cache.get_guild(guild_id)
+        if settings is None:
+            version = self.cache.get_version(guild_id)
+            rows = await self.guild_settings_dao.get_all_guild_settings(guild_id)
+            settings = self.cache.store_guild(guild_id,
+                                              [self._convert_to_entity(row) for row in rows],
+                                              version)
+        return settings
+
     async def get_guild_setting_value_by_id(self, guild_setting_id: int):
         """Get a guild setting by its database ID
         Args:
@@ -43,8 +174,8 @@ class GuildSettingService:
             setting_name: The name of the setting to get
         Returns: A guild setting entity containing the setting status, or None if not found"""
 
-        row = await self.guild_settings_dao.get_guild_setting_value_by_name(guild_id, setting_name)
-        return self._convert_to_entity(row)
+        settings = await self._get_cached_guild_settings(guild_id)
+        return settings.get(setting_name)
 
     async def get_guild_setting_value_by_setting_id(self, guild_id: int, setting_id: int):
         """Get a guild setting by the setting ID associated with it
@@ -84,6 +215,19 @@ class GuildSettingService:
         Returns: A list of database IDs of the newly create guild settings"""
 
         rows = await self.guild_settings_dao.initialize_guild_settings(guild_id)
+        if rows:
+            self.cache.invalidate_guild(guild_id)
+        return [row["id"] for row in rows]
+
+    async def initialize_guilds_settings(self, guild_ids: list):
+        """Create the missing guild settings of several guilds at once
+        Args:
+            guild_ids: A list of the Discord IDs of the guilds whose settings to initialize
+        Returns: A list of database IDs of the newly created guild settings"""
+
+        rows = await self.guild_settings_dao.initialize_guilds_settings(guild_ids)
+        for guild_id in {row["guild_id"] for row in rows}:
+            self.cache.invalidate_guild(guild_id)
         return [row["id"] for row in rows]
 
     async def add_guild_setting_by_setting_id(self, guild_id: int, setting_id: int,
@@ -97,6 +241,7 @@ class GuildSettingService:
 
         row = await self.guild_settings_dao.add_guild_setting_by_setting_id(guild_id, setting_id,
                                                                             setting_value)
+        self.cache.invalidate_guild(guild_id)
         return row["id"]
 
     async def add_guild_setting_by_setting_name(self,
@@ -113,6 +258,7 @@ class GuildSettingService:
         row = await self.guild_settings_dao.add_guild_setting_by_setting_name(guild_id,
                                                                               setting_name,
                                                                               setting_value)
+        self.cache.invalidate_guild(guild_id)
         return row["id"]
 
     async def edit_guild_setting_by_id(self, guild_setting_id: int, setting_value: str):
@@ -121,7 +267,10 @@ class GuildSettingService:
             guild_setting_id: The database ID of the guild setting to edit
             setting_value: The value to change to"""
 
-        await self.guild_settings_dao.edit_guild_setting_by_id(guild_setting_id, setting_value)
+        row = await self.guild_settings_dao.edit_guild_setting_by_id(guild_setting_id,
+                                                                     setting_value)
+        if row:
+            self.cache.invalidate_guild(row["guild_id"])
 
     async def edit_guild_setting_by_setting_id(self, guild_id: int, setting_id: int,
                                                setting_value: str):
@@ -133,6 +282,7 @@ class GuildSettingService:
 
         await self.guild_settings_dao.edit_guild_setting_by_setting_id(guild_id, setting_id,
                                                                        setting_value)
+        self.cache.invalidate_guild(guild_id)
 
     async def edit_guild_setting_by_setting_name(self,
         guild_id: int,
@@ -147,6 +297,7 @@ class GuildSettingService:
         await self.guild_settings_dao.edit_guild_setting_by_setting_name(guild_id,
                                                                          setting_name,
                                                                          setting_value)
+        self.cache.update_value(guild_id, setting_name, setting_value)
 
     async def edit_guild_settings_by_setting_name_pattern(self,
         guild_id: int,
@@ -161,6 +312,7 @@ class GuildSettingService:
         await self.guild_settings_dao.edit_guild_settings_by_setting_name_pattern(guild_id,
                                                                                   setting_name_pattern,
                                                                                   setting_value)
+        self.cache.invalidate_guild(guild_id)
 
     async def reset_guild_setting_to_default_value(self, guild_id: int, guild_setting_id: int):
         """Return a guild setting back to its default value as defined in the settings table
@@ -170,6 +322,7 @@ class GuildSettingService:
 
         await self.guild_settings_dao.reset_guild_setting_to_default_value(guild_id,
                                                                            guild_setting_id)
+        self.cache.invalidate_guild(guild_id)
 
     async def reset_guild_setting_to_default_value_by_name(self, guild_id: int, setting_name: str):
         """Return a guild setting back to its default value as defined by the settings table,
@@ -180,6 +333,7 @@ class GuildSettingService:
 
         await self.guild_settings_dao.reset_guild_setting_to_default_value_by_name(guild_id,
                                                                                    setting_name)
+        self.cache.invalidate_guild(guild_id)
 
     async def reset_all_guild_settings_to_default_value(self, guild_id: int):
         """Reset all guild settings within a guild into their default values as defined in the
@@ -188,13 +342,16 @@ class GuildSettingService:
             guild_id: The Discord ID of the guild whose settings to reset"""
 
         await self.guild_settings_dao.reset_all_guild_settings_to_default_value(guild_id)
+        self.cache.invalidate_guild(guild_id)
 
     async def delete_guild_setting_by_id(self, guild_setting_id: int):
         """Delete a guild setting by its ID
         Args:
             guild_setting_id: The database ID of the guild setting to delete"""
 
-        await self.guild_settings_dao.delete_guild_setting_by_id(guild_setting_id)
+        row = await self.guild_settings_dao.delete_guild_setting_by_id(guild_setting_id)
+        if row:
+            self.cache.invalidate_guild(row["guild_id"])
 
     async def delete_guild_setting_by_setting_id(self, guild_id: int, setting_id: int):
         """Delete a guild setting by the setting's ID
@@ -204,6 +361,7 @@ class GuildSettingService:
                         delete"""
 
         await self.guild_settings_dao.delete_guild_setting_by_setting_id(guild_id, setting_id)
+        self.cache.invalidate_guild(guild_id)
 
     async def delete_guild_setting_by_setting_name(self, guild_id: int, setting_name: str):
         """Delete a guild setting by the setting's name
@@ -212,6 +370,7 @@ class GuildSettingService:
             setting_name: The name of the setting to delete"""
 
         await self.guild_settings_dao.delete_guild_setting_by_setting_name(guild_id, setting_name)
+        self.cache.remove_setting(guild_id, setting_name)
 
     async def delete_guild_settings(self, guild_id: int):
         """Delete all settings associated with a given guild
@@ -219,8 +378,10 @@ class GuildSettingService:
             guild_id: The Discord ID of the guild whose settings to delete"""
 
         await self.guild_settings_dao.delete_guild_settings(guild_id)
+        self.cache.invalidate_guild(guild_id)
 
     async def clear_guild_settings(self):
         """Delete every single guild setting"""
 
         await self.guild_settings_dao.clear_guild_settings_table()
+        self.cache.clear()
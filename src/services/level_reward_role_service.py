@@ -0,0 +1,179 @@
+"""The level reward role service is used to call methods in the level reward roles DAO class."""
+from bisect import bisect_right
+from dao.level_reward_roles_dao import LevelRewardRolesDAO
+from entities.level_reward_role_entity import LevelRewardRoleEntity
+from helpers.levels import get_level_experience
+
+class LevelRewardThresholds:
+    """The level reward roles of each guild, kept in memory as a sorted array of the experience
+    needed for each role. The thresholds are shared by every level reward role service that uses
+    the same database. A guild's thresholds are loaded the first time its members are awarded
+    experience, and the roles a member earns are found with two binary searches."""
+
+    _thresholds = {}
+
+    def __init__(self):
+        """Create a new, empty set of thresholds"""
+
+        self._guilds = {}
+        self._versions = {}
+
+    @classmethod
+    def get_thresholds(cls, db_address: str):
+        """Get the shared thresholds of a database, creating them if they don't exist yet
+        Args:
+            db_address: The location of the database
+        Returns: The LevelRewardThresholds object shared by everything using that database"""
+
+        thresholds = cls._thresholds.get(db_address)
+        if thresholds is None:
+            thresholds = cls()
+            cls._thresholds[db_address] = thresholds
+        return thresholds
+
+    def is_guild_loaded(self, guild_id: int):
+        """Check whether the thresholds of a guild have been loaded
+        Args:
+            guild_id: The Discord ID of the guild
+        Returns: True if the guild's thresholds are in memory, False otherwise"""
+
+        return guild_id in self._guilds
+
+    def get_version(self, guild_id: int):
+        """Get the version of a guild's level reward roles, used to detect changes made while the
+        thresholds were being loaded
+        Args:
+            guild_id: The Discord ID of the guild
+        Returns: An integer that changes every time the guild's level reward roles are changed"""
+
+        return self._versions.get(guild_id, 0)
+
+    def store_guild(self, guild_id: int, level_reward_roles: list, version: int):
+        """Store the thresholds of a guild, unless its roles were changed during the load
+        Args:
+            guild_id: The Discord ID of the guild
+            level_reward_roles: A list of level reward role entities
+            version: The version of the guild's level reward roles when the load began"""
+
+        rewards = sorted((get_level_experience(role.level_requirement), role.role_id)
+                         for role in level_reward_roles)
+        if self.get_version(guild_id) == version:
+            self._guilds[guild_id] = ([experience for experience, _ in rewards],
+                                      [role_id for _, role_id in rewards])
+
+    def get_crossed_roles(self, guild_id: int, previous_amount: int, amount: int):
+        """Get the roles whose thresholds lie between two amounts of experience
+        Args:
+            guild_id: The Discord ID of the guild
+            previous_amount: The member's experience before the award
+            amount: The member's experience after the award
+        Returns: A list of role IDs, lowest level first"""
+
+        experience, role_ids = self._guilds.get(guild_id, ([], []))
+        return role_ids[bisect_right(experience, previous_amount):bisect_right(experience, amount)]
+
+    def forget_guild(self, guild_id: int):
+        """Drop the thresholds of a guild so that they are loaded again when needed
+        Args:
+            guild_id: The Discord ID of the guild"""
+
+        self._guilds.pop(guild_id, None)
+        self._versions[guild_id] = self.get_version(guild_id) + 1
+
+    def clear(self):
+        """Drop the thresholds of every guild"""
+
+        for guild_id in list(self._guilds):
+            self.forget_guild(guild_id)
+
+class LevelRewardRoleService:
+    """A service for calling methods from level reward roles DAO
+    Attributes:
+        level_reward_roles_dao: The DAO object this service will use
+        thresholds: The level reward thresholds shared by every service using the same database"""
+
+    def __init__(self, db_address):
+        """Create a new service for level reward roles DAO
+        Args:
+            db_address: The address for the database file where the level reward roles table
+                        resides"""
+
+        self.level_reward_roles_dao = LevelRewardRolesDAO(db_address)
+        self.thresholds = LevelRewardThresholds.get_thresholds(db_address)
+
+    def _convert_to_entity(self, row):
+        """Convert a database row to a level reward role entity
+        Args:
+            row: The database row to convert to a level reward role entity
+        Returns: A level reward role entity equivalent to the database row"""
+
+        if not row:
+            return None
+        return LevelRewardRoleEntity(row["id"], row["role_id"], row["guild_id"],
+                                     row["level_requirement"])
+
+    async def get_guild_level_reward_roles(self, guild_id: int):
+        """Get all level reward roles of a guild, lowest level requirement first
+        Args:
+            guild_id: The ID of the guild whose level reward roles to get
+        Returns: A list of level reward role entities"""
+
+        rows = await self.level_reward_roles_dao.get_guild_level_reward_roles(guild_id)
+        return [self._convert_to_entity(row) for row in rows]
+
+    async def add_level_reward_role(self, role_id: int, guild_id: int, level_requirement: int):
+        """Add a role that members of a guild get when they reach a level
+        Args:
+            role_id: The Discord ID of the role to give
+            guild_id: The ID of the guild the role belongs in
+            level_requirement: The level at which members get the role
+        Returns: The database ID of the new level reward role"""
+
+        db_id = await self.level_reward_roles_dao.add_level_reward_role(role_id, guild_id,
+                                                                        level_requirement)
+        self.thresholds.forget_guild(guild_id)
+        return db_id
+
+    async def delete_level_reward_role(self, role_id: int, guild_id: int):
+        """Stop giving a role as a level reward
+        Args:
+            role_id: The Discord ID of the role
+            guild_id: The ID of the guild the role belongs in"""
+
+        await self.level_reward_roles_dao.delete_level_reward_role(role_id, guild_id)
+        self.thresholds.forget_guild(guild_id)
+
+    async def delete_guild_level_reward_roles(self, guild_id: int):
+        """Delete all level reward roles of a given guild
+        Args:
+            guild_id: The Discord ID of the guild whose level reward roles to delete"""
+
+        await self.level_reward_roles_dao.delete_guild_level_reward_roles(guild_id)
+        self.thresholds.forget_guild(guild_id)
+
+    async def clear_level_reward_roles(self):
+        """Delete every level reward role and drop the loaded thresholds"""
+
+        await self.level_reward_roles_dao.clear_level_reward_roles_table()
+        self.thresholds.clear()
+
+    async def get_earned_roles(self, experience: list):
+        """Find the level reward roles that members earned with their latest experience. The
+        roles of each member are gathered together so that they can be given all at once.
+        Args:
+            experience: A list of (user ID, guild ID, previous amount, new amount) tuples
+        Returns: A dictionary of {(guild ID, user ID): list of role IDs} pairs, containing only
+                 the members who earned at least one role"""
+
+        earned = {}
+        for user_id, guild_id, previous_amount, amount in experience:
+            if amount <= previous_amount:
+                continue
+            if not self.thresholds.is_guild_loaded(guild_id):
+                version = self.thresholds.get_version(guild_id)
+                self.thresholds.store_guild(
+                    guild_id, await self.get_guild_level_reward_roles(guild_id), version)
+            role_ids = self.thresholds.get_crossed_roles(guild_id, previous_amount, amount)
+            if role_ids:
+                earned.setdefault((guild_id, user_id), []).extend(role_ids)
+        return earned
@@ -0,0 +1,78 @@
+"""The log webhook service is used to call methods in the log webhooks DAO class."""
+
+from dao.log_webhooks_dao import LogWebhooksDAO
+from entities.log_webhook_entity import LogWebhookEntity
+
+class LogWebhookService:
+    """A service for calling methods from log webhooks DAO
+    Attributes:
+        log_webhooks_dao: The DAO object this service will use"""
+
+    def __init__(self, db_address):
+        """Create a new service for log webhooks DAO
+        Args:
+            db_address: The address for the database file where the log webhooks table resides"""
+
+        self.log_webhooks_dao = LogWebhooksDAO(db_address)
+
+    def _convert_to_entity(self, row):
+        """Convert a database row to a log webhook entity
+        Args:
+            row: The database row to convert to a log webhook entity
+        Returns: A log webhook entity equivalent to the database row"""
+
+        if not row:
+            return None
+        return LogWebhookEntity(row["id"], row["channel_id"], row["guild_id"], row["webhook_id"],
+                                row["webhook_token"])
+
+    async def get_channel_webhook(self, channel_id: int):
+        """Get the log webhook of a channel
+        Args:
+            channel_id: The Discord ID of the channel whose webhook to get
+        Returns: A log webhook entity, None if the channel has no webhook"""
+
+        row = await self.log_webhooks_dao.get_channel_webhook(channel_id)
+        return self._convert_to_entity(row)
+
+    async def get_guild_webhooks(self, guild_id: int):
+        """Get all log webhooks of a guild
+        Args:
+            guild_id: The Discord ID of the guild whose webhooks to get
+        Returns: A list of log webhook entities"""
+
+        rows = await self.log_webhooks_dao.get_guild_webhooks(guild_id)
+        return [self._convert_to_entity(row) for row in rows]
+
+    async def add_webhook(self, channel_id: int, guild_id: int, webhook_id: int,
+                          webhook_token: str):
+        """Add a new log webhook, replacing an existing webhook of the channel
+        Args:
+            channel_id: The Discord ID of the channel the webhook posts to
+            guild_id: The Discord ID of the guild where the channel is
+            webhook_id: The Discord ID of the webhook
+            webhook_token: The token used to post with the webhook
+        Returns: The database ID of the new webhook"""
+
+        row = await self.log_webhooks_dao.add_webhook(channel_id, guild_id, webhook_id,
+                                                      webhook_token)
+        return row["id"]
+
+    async def delete_channel_webhook(self, channel_id: int):
+        """Delete the log webhook of a channel
+        Args:
+            channel_id: The Discord ID of the channel whose webhook to delete"""
+
+        await self.log_webhooks_dao.delete_channel_webhook(channel_id)
+
+    async def delete_guild_webhooks(self, guild_id: int):
+        """Delete all log webhooks of a guild
+        Args:
+            guild_id: The Discord ID of the guild whose webhooks to delete"""
+
+        await self.log_webhooks_dao.delete_guild_webhooks(guild_id)
+
+    async def clear_log_webhooks(self):
+        """Delete every single log webhook"""
+
+        await self.log_webhooks_dao.clear_log_webhooks_table()
@@ -55,6 +55,15 @@ class NicknameService:
 
         await self.nicknames_dao.add_nickname(nickname, user_id, guild_id, nickname_limit)
 
+    async def add_nicknames(self, nicknames: list, nickname_limit: int = 5):
+        """Add many new nicknames at once. Users with more than limit names in a guild lose the
+        oldest.
+        Args:
+            nicknames: A list of (nickname, user ID, guild ID) tuples, oldest first
+            nickname_limit: How many nicknames for one user are allowed to be saved at a time"""
+
+        await self.nicknames_dao.add_nicknames(nicknames, nickname_limit)
+
     async def delete_nickname(self, nickname_id: int):
         """Delete a nickname record
         Args:
@@ -1,13 +1,135 @@
 """The reminder service is used to call methods in the reminders DAO class."""
 
-from datetime import datetime
+import asyncio
+import heapq
+from datetime import datetime, timedelta
 from dao.reminders_dao import RemindersDAO
 from entities.reminder_entity import ReminderEntity
+from time_handler.time import TimeStringConverter
+
+class ReminderSchedule:
+    """An in-memory priority queue of upcoming reminders shared by every reminder service that
+    uses the same database. Rescheduled and removed reminders leave their old heap entries
+    behind, and those are skipped when they reach the top. Reminders deleted in bulk, e.g. all
+    reminders of a guild, may stay scheduled, so popped IDs have to be checked against the
+    database.
+    Attributes:
+        loaded: Whether the reminders have been loaded from the database"""
+
+    _schedules = {}
+
+    def __init__(self):
+        """Create a new, empty reminder schedule"""
+
+        self.loaded = False
+        self._heap = []
+        self._dates = {}
+        self._changed = asyncio.Event()
+
+    @classmethod
+    def get_schedule(cls, db_address: str):
+        """Get the shared schedule of a database, creating it if it doesn't exist yet
+        Args:
+            db_address: The location of the database
+        Returns: The ReminderSchedule object shared by everything using that database"""
+
+        schedule = cls._schedules.get(db_address)
+        if schedule is None:
+            schedule = cls()
+            cls._schedules[db_address] = schedule
+        return schedule
+
+    def __len__(self):
+        """Get the number of scheduled reminders
+        Returns: How many reminders are waiting to be sent"""
+
+        return len(self._dates)
+
+    def add(self, reminder_id: int, reminder_date):
+        """Schedule a reminder, replacing its earlier date if it has one
+        Args:
+            reminder_id: The database ID of the reminder
+            reminder_date: The date when the reminder is sent as a datetime or a string"""
+
+        if isinstance(reminder_date, str):
+            reminder_date = datetime.fromisoformat(reminder_date)
+        next_date = self.next_date()
+        self._dates[reminder_id] = reminder_date
+        heapq.heappush(self._heap, (reminder_date, reminder_id))
+        if next_date is None or reminder_date < next_date:
+            self._changed.set()
+
+    def retry(self, reminder_ids: list, now: datetime):
+        """Schedule reminders that couldn't be sent to be tried again in a minute
+        Args:
+            reminder_ids: A list of the database IDs of the reminders
+            now: The current time in UTC"""
+
+        retry = now + timedelta(minutes=1)
+        for reminder_id in reminder_ids:
+            self.add(reminder_id, retry)
+
+    def remove(self, reminder_id: int):
+        """Remove a reminder from the schedule
+        Args:
+            reminder_id: The database ID of the reminder to remove"""
+
+        self._dates.pop(reminder_id, None)
+
+    def clear(self):
+        """Remove every reminder from the schedule"""
+
+        self._dates.clear()
+        self._heap.clear()
+
+    def _discard_outdated(self):
+        """Pop heap entries of reminders that have since been rescheduled or removed"""
+
+        while self._heap:
+            reminder_date, reminder_id = self._heap[0]
+            if self._dates.get(reminder_id) == reminder_date:
+                return
+            heapq.heappop(self._heap)
+
+    def next_date(self):
+        """Get the date when the next reminder is due
+        Returns: A datetime object, None if no reminders are scheduled"""
+
+        self._discard_outdated()
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: datetime):
+        """Remove and return the reminders that are due
+        Args:
+            now: The current time in UTC
+        Returns: A list of the database IDs of the due reminders"""
+
+        due = []
+        self._discard_outdated()
+        while self._heap and self._heap[0][0] <= now:
+            reminder_id = heapq.heappop(self._heap)[1]
+            del self._dates[reminder_id]
+            due.append(reminder_id)
+            self._discard_outdated()
+        return due
+
+    async def wait_for_change(self, timeout: float = None):
+        """Wait until a reminder is scheduled earlier than any other, or until the timeout runs out
+        Args:
+            timeout: The most seconds to wait, None to wait indefinitely"""
+
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        self._changed.clear()
 
 class ReminderService:
     """A service for calling methods from reminders DAO
     Attributes:
-        reminders_dao: The DAO object this service will use"""
+        reminders_dao: The DAO object this service will use
+        schedule: The schedule of upcoming reminders shared by every service using the same
+                  database"""
 
     def __init__(self, db_address):
         """Create a new service for reminders DAO
@@ -15,6 +137,7 @@ class ReminderService:
             db_address: The address for the database file where the reminders table resides"""
 
         self.reminders_dao = RemindersDAO(db_address)
+        self.schedule = ReminderSchedule.get_schedule(db_address)
 
     def _convert_to_entity(self, row):
         """Convert a database row to a reminder entity
@@ -92,6 +215,58 @@ class ReminderService:
         rows = await self.reminders_dao.get_expired_reminders()
         return [self._convert_to_entity(row) for row in rows]
 
+    async def load_schedule(self):
+        """Load every reminder into the schedule of upcoming reminders"""
+
+        rows = await self.reminders_dao.get_reminder_dates()
+        for row in rows:
+            self.schedule.add(row["id"], row["reminder_date"])
+        self.schedule.loaded = True
+
+    async def pop_due_reminders(self, now: datetime):
+        """Take the reminders that are due out of the schedule
+        Args:
+            now: The current time in UTC
+        Returns: A list of ReminderEntity objects containing the due reminders that still exist"""
+
+        reminder_ids = self.schedule.pop_due(now)
+        if not reminder_ids:
+            return []
+        try:
+            rows = await self.reminders_dao.get_reminders_by_ids(reminder_ids)
+        except Exception:
+            # The reminders are no longer scheduled, so they are put back to be tried again
+            self.schedule.retry(reminder_ids, now)
+            raise
+        return [self._convert_to_entity(row) for row in rows]
+
+    async def reschedule_delivered_reminders(self, reminders: list, now: datetime):
+        """Move delivered reminders to their next dates, using up one repeat, and delete the ones
+        with no repeats left. Reminders whose next dates were missed, e.g. while the bot was
+        offline, skip ahead to the first date after now.
+        Args:
+            reminders: A list of ReminderEntity objects of the delivered reminders
+            now: The current time in UTC"""
+
+        converter = TimeStringConverter("%Y-%m-%d %H:%M:%S.%f")
+        rescheduled = []
+        finished_ids = []
+        for reminder in reminders:
+            repeats_left = reminder.repeats_left
+            if repeats_left is not None and repeats_left > 0:
+                repeats_left -= 1
+            if not reminder.interval or repeats_left == 0:
+                finished_ids.append(reminder.db_id)
+                continue
+            interval = timedelta(seconds=reminder.interval)
+            reminder_date = datetime.fromisoformat(reminder.reminder_date)
+            reminder_date += interval * ((now - reminder_date) // interval + 1)
+            rescheduled.append((reminder.db_id, converter.datetime_to_string(reminder_date),
+                                repeats_left))
+        await self.reminders_dao.reschedule_reminders(rescheduled, finished_ids)
+        for reminder_id, reminder_date, _ in rescheduled:
+            self.schedule.add(reminder_id, reminder_date)
+
     async def get_reminder_by_id(self, reminder_id: int):
         """Get a reminder by its database ID
         Args:
@@ -120,6 +295,7 @@ class ReminderService:
         row = await self.reminders_dao.add_new_reminder(user_id, guild_id, content, reminder_date,
                                                         reminder_type, is_public, interval,
                                                         repeats)
+        self.schedule.add(row["id"], reminder_date)
         return row["id"]
 
     async def edit_reminder(self, reminder_id: int, content: str, reminder_date: datetime,
@@ -135,6 +311,7 @@ class ReminderService:
 
         await self.reminders_dao.edit_reminder(reminder_id, content, reminder_date, is_public,
                                                interval, reminder_type, repeats)
+        self.schedule.add(reminder_id, reminder_date)
 
     async def update_reminder_repeats(self, reminder_id: int):
         """Update the repeats in a given reminder if it hasn't reached 0. This method will not
@@ -172,6 +349,7 @@ class ReminderService:
             reminder_id: The database ID of the reminder to delete"""
 
         await self.reminders_dao.delete_reminder_by_id(reminder_id)
+        self.schedule.remove(reminder_id)
 
     async def delete_reminders_with_no_repeats(self):
         """Delete all reminders that have reached 0 repeats"""
@@ -182,3 +360,4 @@ class ReminderService:
         """Delete every single reminder"""
 
         await self.reminders_dao.clear_reminders_table()
+        self.schedule.clear()
@@ -2,11 +2,14 @@
 
 from dao.settings_dao import SettingsDAO
 from entities.setting_entity import SettingEntity
+from services.guild_setting_service import GuildSettingCache
 
 class SettingService:
     """A service for calling methods from settings DAO
     Attributes:
-        settings_dao: The DAO object this service will use"""
+        settings_dao: The DAO object this service will use
+        guild_setting_cache: The guild setting cache, cleared when deleted settings cascade
+                             into the guild settings"""
 
     def __init__(self, db_address):
         """Create a new service for settings DAO
@@ -14,6 +17,7 @@ class SettingService:
             db_address: The address for the database file where the settings table resides"""
 
         self.settings_dao = SettingsDAO(db_address)
+        self.guild_setting_cache = GuildSettingCache.get_cache(db_address)
 
     def _convert_to_entity(self, row):
         """Convert a database row to a setting entity
@@ -76,6 +80,7 @@ class SettingService:
             setting_name: The name of the setting to delete"""
 
         await self.settings_dao.delete_setting_by_name(setting_name)
+        self.guild_setting_cache.clear()
 
     async def delete_setting_by_id(self, setting_id: int):
         """Delete a setting by its id
@@ -83,8 +88,10 @@ class SettingService:
             setting_id: The database ID of the setting to delete"""
 
         await self.settings_dao.delete_setting_by_id(setting_id)
+        self.guild_setting_cache.clear()
 
     async def clear_settings(self):
         """Delete every single setting default"""
 
         await self.settings_dao.clear_settings_table()
+        self.guild_setting_cache.clear()
@@ -1,13 +1,149 @@
 """The temp ban service is used to call methods in the temp bans DAO class."""
 
+import asyncio
+import heapq
 from datetime import datetime
 from dao.temp_bans_dao import TempBansDAO
 from entities.temp_ban_entity import TempBanEntity
+from time_handler.time import TimeStringConverter
+
+class TempBanSchedule:
+    """An in-memory schedule of temporary ban expirations shared by every temp ban service that
+    uses the same database. The expirations are kept in a min-heap, so the next one is always
+    known without querying the database. Changed and removed bans leave their old heap entries
+    behind, and those are skipped when they reach the top.
+    Attributes:
+        loaded: Whether the temporary bans have been loaded from the database"""
+
+    _schedules = {}
+
+    def __init__(self):
+        """Create a new, empty temp ban schedule"""
+
+        self.loaded = False
+        self._heap = []
+        self._expirations = {}
+        self._changed = asyncio.Event()
+
+    @classmethod
+    def get_schedule(cls, db_address: str):
+        """Get the shared schedule of a database, creating it if it doesn't exist yet
+        Args:
+            db_address: The location of the database
+        Returns: The TempBanSchedule object shared by everything using that database"""
+
+        schedule = cls._schedules.get(db_address)
+        if schedule is None:
+            schedule = cls()
+            cls._schedules[db_address] = schedule
+        return schedule
+
+    def __len__(self):
+        """Get the number of scheduled temporary bans
+        Returns: How many temporary bans are waiting to expire"""
+
+        return len(self._expirations)
+
+    def add(self, user_id: int, guild_id: int, expiration, db_id: int = None):
+        """Schedule a temporary ban to expire, replacing its earlier expiration if it has one
+        Args:
+            user_id: The Discord ID of the temporarily banned user
+            guild_id: The Discord ID of the guild the user is banned from
+            expiration: The date when the temporary ban ends as a datetime or a string
+            db_id: The database ID of the temporary ban, None to keep the one already scheduled"""
+
+        if isinstance(expiration, str):
+            expiration = datetime.fromisoformat(expiration)
+        if db_id is None:
+            db_id = self._expirations.get((user_id, guild_id), (None, None))[1]
+        self._expirations[(user_id, guild_id)] = (expiration, db_id)
+        next_expiration = self.next_expiration()
+        heapq.heappush(self._heap, (expiration, user_id, guild_id))
+        if next_expiration is None or expiration < next_expiration:
+            self._changed.set()
+
+    def remove(self, user_id: int, guild_id: int):
+        """Remove a temporary ban from the schedule
+        Args:
+            user_id: The Discord ID of the temporarily banned user
+            guild_id: The Discord ID of the guild the user is banned from"""
+
+        self._expirations.pop((user_id, guild_id), None)
+
+    def remove_user(self, user_id: int):
+        """Remove every temporary ban of a user from the schedule
+        Args:
+            user_id: The Discord ID of the user whose temporary bans to remove"""
+
+        for key in [key for key in self._expirations if key[0] == user_id]:
+            del self._expirations[key]
+
+    def remove_guild(self, guild_id: int):
+        """Remove every temporary ban of a guild from the schedule
+        Args:
+            guild_id: The Discord ID of the guild whose temporary bans to remove"""
+
+        for key in [key for key in self._expirations if key[1] == guild_id]:
+            del self._expirations[key]
+
+    def clear(self):
+        """Remove every temporary ban from the schedule"""
+
+        self._expirations.clear()
+        self._heap.clear()
+
+    def _discard_outdated(self):
+        """Pop heap entries of bans that have since been changed or removed"""
+
+        while self._heap:
+            expiration, user_id, guild_id = self._heap[0]
+            scheduled = self._expirations.get((user_id, guild_id))
+            if scheduled is not None and scheduled[0] == expiration:
+                return
+            heapq.heappop(self._heap)
+
+    def next_expiration(self):
+        """Get the date when the next temporary ban expires
+        Returns: A datetime object, None if no temporary bans are scheduled"""
+
+        self._discard_outdated()
+        return self._heap[0][0] if self._heap else None
+
+    def pop_expired(self, now: datetime):
+        """Remove and return the temporary bans that have expired
+        Args:
+            now: The current time in UTC
+        Returns: A list of temp ban entities of the expired bans"""
+
+        converter = TimeStringConverter()
+        expired = []
+        self._discard_outdated()
+        while self._heap and self._heap[0][0] <= now:
+            expiration, user_id, guild_id = heapq.heappop(self._heap)
+            db_id = self._expirations.pop((user_id, guild_id))[1]
+            expired.append(TempBanEntity(db_id, user_id, guild_id,
+                                         converter.datetime_to_string(expiration)))
+            self._discard_outdated()
+        return expired
+
+    async def wait_for_change(self, timeout: float = None):
+        """Wait until a temporary ban is scheduled to expire earlier than any other, or until
+        the timeout runs out
+        Args:
+            timeout: The most seconds to wait, None to wait indefinitely"""
+
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        self._changed.clear()
 
 class TempBanService:
     """A service for calling methods from temp bans DAO
     Attributes:
-        temp_bans_dao: The DAO object this service will use"""
+        temp_bans_dao: The DAO object this service will use
+        schedule: The schedule of temporary ban expirations shared by every service using the
+                  same database"""
 
     def __init__(self, db_address):
         """Create a new service for temp bans DAO
@@ -15,6 +151,7 @@ class TempBanService:
             db_address: The address for the database file where the temporary_bans table resides"""
 
         self.temp_bans_dao = TempBansDAO(db_address)
+        self.schedule = TempBanSchedule.get_schedule(db_address)
 
     def _convert_to_entity(self, row):
         """Convert a database row to a temp ban entity
@@ -42,6 +179,14 @@ class TempBanService:
         rows = await self.temp_bans_dao.get_expired_temp_bans()
         return [self._convert_to_entity(row) for row in rows]
 
+    async def load_schedule(self):
+        """Load every temporary ban into the expiration schedule"""
+
+        rows = await self.temp_bans_dao.get_all_temp_bans()
+        for row in rows:
+            self.schedule.add(row["user_id"], row["guild_id"], row["unban_date"], row["id"])
+        self.schedule.loaded = True
+
     async def get_temp_ban(self, user_id: int, guild_id: int):
         """Get a specific temporary ban
         Args:
@@ -61,6 +206,7 @@ class TempBanService:
         Returns: The database ID of the newly created temporary ban"""
 
         row = await self.temp_bans_dao.create_temp_ban(user_id, guild_id, expiration)
+        self.schedule.add(user_id, guild_id, expiration, row["id"])
         return row["id"]
 
     async def edit_temp_ban(self, user_id: int, guild_id: int, expiration: datetime):
@@ -71,6 +217,7 @@ class TempBanService:
             expiration: The new expiration date for the unban"""
 
         await self.temp_bans_dao.edit_temp_ban(user_id, guild_id, expiration)
+        self.schedule.add(user_id, guild_id, expiration)
 
     async def delete_temp_ban(self, user_id: int, guild_id: int):
         """Delete a temporary ban
@@ -79,6 +226,16 @@ class TempBanService:
             guild_id: The Discord ID of the guild from which to delete the ban"""
 
         await self.temp_bans_dao.delete_temp_ban(user_id, guild_id)
+        self.schedule.remove(user_id, guild_id)
+
+    async def delete_temp_bans_by_ids(self, temp_ban_ids: list):
+        """Delete several temporary bans at once. The bans must already be removed from the
+        schedule, e.g. by popping them as expired.
+        Args:
+            temp_ban_ids: A list of the database IDs of the temporary bans to delete"""
+
+        if temp_ban_ids:
+            await self.temp_bans_dao.delete_temp_bans_by_ids(temp_ban_ids)
 
     async def delete_user_temp_bans(self, user_id: int):
         """Delete all temporary bans of a single user
@@ -86,6 +243,7 @@ class TempBanService:
             user_id: The Discord ID of the user whose temporary bans to delete"""
 
         await self.temp_bans_dao.delete_user_temp_bans(user_id)
+        self.schedule.remove_user(user_id)
 
     async def delete_guild_temp_bans(self, guild_id: int):
         """Delete all temporary bans associated with a given guild
@@ -93,8 +251,10 @@ class TempBanService:
             guild_id: The Discord ID of the guild whose temporary bans to delete"""
 
         await self.temp_bans_dao.delete_guild_temp_bans(guild_id)
+        self.schedule.remove_guild(guild_id)
 
     async def clear_temp_bans(self):
         """Delete every single temporary ban"""
 
         await self.temp_bans_dao.clear_temp_bans_table()
+        self.schedule.clear()
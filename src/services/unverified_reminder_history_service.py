@@ -38,6 +38,15 @@ class UnverifiedReminderHistoryService:
         rows = await self.unverified_reminder_history_dao.get_member_reminder_history(user_id, guild_id)
         return [self._convert_to_entity(row) for row in rows]
 
+    async def get_guild_reminder_history(self, guild_id: int):
+        """Get all unverified reminders sent to any user from a specified guild
+        Args:
+            guild_id: The Discord ID of the guild from where the reminders were sent
+        Returns: A list of unverified reminder history entities"""
+
+        rows = await self.unverified_reminder_history_dao.get_guild_reminder_history(guild_id)
+        return [self._convert_to_entity(row) for row in rows]
+
     async def add_to_member_reminder_history(self, user_id: int, reminder_id: int):
         """Add a reminder message to an unverified user's reminder history, marking it as sent
         Args:
@@ -46,6 +55,16 @@ class UnverifiedReminderHistoryService:
 
         await self.unverified_reminder_history_dao.add_to_member_reminder_history(user_id, reminder_id)
 
+    async def add_to_reminder_history_in_bulk(self, sent_reminders: list):
+        """Add several sent reminder messages to the reminder history at once
+        Args:
+            sent_reminders: A list of (user ID, reminder message ID) tuples of the sent reminders"""
+
+        if sent_reminders:
+            await self.unverified_reminder_history_dao.add_to_reminder_history_in_bulk(
+                sent_reminders
+            )
+
     async def delete_member_reminder_history(self, user_id: int, guild_id: int):
         """Delete the entire reminder message history of a user from a given guild
         Args:
@@ -57,6 +57,18 @@ class UserReminderService:
         rows = await self.user_reminders_dao.get_user_reminders_of_reminder_id(reminder_id)
         return [self._convert_to_entity(row) for row in rows]
 
+    async def get_opted_in_users_of_reminders(self, reminder_ids: list):
+        """Get the users opted into any of the given reminders
+        Args:
+            reminder_ids: A list of the database IDs of the reminders whose users to get
+        Returns: A dictionary mapping reminder IDs to lists of Discord IDs of the opted in users"""
+
+        rows = await self.user_reminders_dao.get_opted_in_users_of_reminder_ids(reminder_ids)
+        users = {}
+        for row in rows:
+            users.setdefault(row["reminder_id"], []).append(row["user_id"])
+        return users
+
     async def get_user_reminder_by_id(self, user_reminder_id: int):
         """Get a specific user reminder by its database ID
         Args:
@@ -52,6 +52,14 @@ class UsernameService:
 
         await self.usernames_dao.add_username(username, user_id, username_limit)
 
+    async def add_usernames(self, usernames: list, username_limit: int = 5):
+        """Add many new usernames at once. Users with more than limit names lose the oldest.
+        Args:
+            usernames: A list of (username, user ID) tuples, oldest first
+            username_limit: How many usernames for one user are allowed to be saved at a time"""
+
+        await self.usernames_dao.add_usernames(usernames, username_limit)
+
     async def delete_username(self, username_id: int):
         """Delete a username record
         Args:
@@ -1,12 +1,110 @@
 """The utility channel service is used to call methods in the utility channels DAO class."""
 
+import discord
 from dao.utility_channels_dao import UtilityChannelsDAO
 from entities.utility_channel_entity import UtilityChannelEntity
 
+class UtilityChannelCache:
+    """An in-memory cache of resolved utility channels shared by every utility channel service
+    that uses the same database
+    Attributes:
+        hits: How many lookups were answered from the cache
+        misses: How many lookups had to query the database"""
+
+    _caches = {}
+
+    def __init__(self):
+        """Create a new, empty utility channel cache"""
+
+        self.hits = 0
+        self.misses = 0
+        self._channels = {}
+        self._versions = {}
+
+    @classmethod
+    def get_cache(cls, db_address: str):
+        """Get the shared cache of a database, creating it if it doesn't exist yet
+        Args:
+            db_address: The location of the database
+        Returns: The UtilityChannelCache object shared by everything using that database"""
+
+        cache = cls._caches.get(db_address)
+        if cache is None:
+            cache = cls()
+            cls._caches[db_address] = cache
+        return cache
+
+    def get_channels(self, guild_id: int, channel_purpose: str):
+        """Get the cached channels of a guild for a purpose and count the lookup as a hit or a miss
+        Args:
+            guild_id: The Discord ID of the guild whose channels to get
+            channel_purpose: The purpose of the channels to get
+        Returns: A list of Discord channels, None if they haven't been cached"""
+
+        channels = self._channels.get((guild_id, channel_purpose))
+        if channels is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return channels
+
+    def get_version(self, guild_id: int):
+        """Get the version of a guild's cached channels, used to detect changes made while the
+        channels were being resolved
+        Args:
+            guild_id: The Discord ID of the guild
+        Returns: An integer that changes every time the guild's utility channels are changed"""
+
+        return self._versions.get(guild_id, 0)
+
+    def store_channels(self, guild_id: int, channel_purpose: str, channels: list, version: int):
+        """Store the resolved channels of a guild, unless they were changed during the lookup
+        Args:
+            guild_id: The Discord ID of the guild whose channels were resolved
+            channel_purpose: The purpose of the channels
+            channels: A list of Discord channels
+            version: The version of the guild's channels when the lookup began"""
+
+        if self.get_version(guild_id) == version:
+            self._channels[(guild_id, channel_purpose)] = channels
+
+    def invalidate_guild(self, guild_id: int):
+        """Drop the cached channels of a guild
+        Args:
+            guild_id: The Discord ID of the guild whose channels to drop"""
+
+        self._versions[guild_id] = self.get_version(guild_id) + 1
+        for key in [key for key in self._channels if key[0] == guild_id]:
+            del self._channels[key]
+
+    def remove_channel(self, guild_id: int, channel_id: int):
+        """Remove a single Discord channel from the cached channels of a guild
+        Args:
+            guild_id: The Discord ID of the guild where the channel is
+            channel_id: The Discord ID of the channel to remove"""
+
+        self._versions[guild_id] = self.get_version(guild_id) + 1
+        for key, channels in self._channels.items():
+            if key[0] == guild_id:
+                self._channels[key] = [channel for channel in channels if channel.id != channel_id]
+
+    def clear(self):
+        """Drop the cached channels of every guild"""
+
+        for guild_id in {guild_id for guild_id, _ in self._channels}:
+            self.invalidate_guild(guild_id)
+
+    def get_statistics(self):
+        """Get the hit and miss counts of the cache
+        Returns: A dictionary containing the hits, misses and number of cached channel lists"""
+
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._channels)}
+
 class UtilityChannelService:
     """A service for calling methods from utility channels DAO
     Attributes:
-        utility_channels_dao: The DAO object this service will use"""
+        utility_channels_dao: The DAO object this service will use
+        cache: The resolved channel cache shared by every service using the same database"""
 
     def __init__(self, db_address):
         """Create a new service for utility channels DAO
@@ -15,6 +113,7 @@ class UtilityChannelService:
                         resides"""
 
         self.utility_channels_dao = UtilityChannelsDAO(db_address)
+        self.cache = UtilityChannelCache.get_cache(db_address)
 
     def _convert_to_entity(self, row):
         """Convert a database row to a utility channel entity
@@ -38,6 +137,35 @@ class UtilityChannelService:
                                                                                     channel_purpose)
         return [self._convert_to_entity(row) for row in rows]
 
+    async def get_guild_discord_channels_by_purpose(self, client: discord.Client, guild_id: int,
+                                                    channel_purpose: str):
+        """Get the Discord channels a guild uses for a specific purpose. The resolved channels are
+        cached until the guild's utility channels change.
+        Args:
+            client: The client used to resolve the channels
+            guild_id: The Discord ID of the guild whose channels to get
+            channel_purpose: The purpose of the utility channels to get (e.g. log)
+        Returns: A list of Discord channels. Channels that could not be found are left out."""
+
+        channels = self.cache.get_channels(guild_id, channel_purpose)
+        if channels is None:
+            version = self.cache.get_version(guild_id)
+            utility_channels = await self.get_guild_utility_channel_by_purpose(guild_id,
+                                                                               channel_purpose)
+            channels = [await utility_channel.get_discord_channel(client)
+                        for utility_channel in utility_channels]
+            channels = [channel for channel in channels if not isinstance(channel, str)]
+            self.cache.store_channels(guild_id, channel_purpose, channels, version)
+        return channels
+
+    def forget_discord_channel(self, guild_id: int, channel_id: int):
+        """Drop a Discord channel from the cache, e.g. when the channel has been deleted
+        Args:
+            guild_id: The Discord ID of the guild where the channel was
+            channel_id: The Discord ID of the channel"""
+
+        self.cache.remove_channel(guild_id, channel_id)
+
     async def get_all_guild_utility_channels(self, guild_id: int):
         """Get a list of all utility channels a specific guild uses
         Args:
@@ -67,6 +195,7 @@ class UtilityChannelService:
 
         await self.utility_channels_dao.create_guild_utility_channel(channel_id, guild_id,
                                                                      channel_purpose)
+        self.cache.invalidate_guild(guild_id)
 
     async def delete_utility_channel(self, channel_id: int, guild_id: int):
         """Stop using a specific channel as a utility channel
@@ -75,6 +204,7 @@ class UtilityChannelService:
             guild_id: The Discord ID of the guild where the channel resides"""
 
         await self.utility_channels_dao.delete_utility_channel(channel_id, guild_id)
+        self.cache.invalidate_guild(guild_id)
 
     async def delete_utility_from_channel(self, channel_id: int, guild_id: int,
                                           channel_purpose: str):
@@ -85,6 +215,7 @@ class UtilityChannelService:
             channel_purpose: The purpose to remove from the channel"""
 
         await self.utility_channels_dao.delete_utility_from_channel(channel_id, guild_id, channel_purpose)
+        self.cache.invalidate_guild(guild_id)
 
     async def delete_guild_utility_channels(self, guild_id: int):
         """Delete all utility channels used by a guild
@@ -92,8 +223,10 @@ class UtilityChannelService:
             guild_id: The Discord ID of the guild whose utility channels to delete"""
 
         await self.utility_channels_dao.delete_guild_utility_channels(guild_id)
+        self.cache.invalidate_guild(guild_id)
 
     async def clear_utility_channels(self):
         """Delete every single utility channel"""
 
         await self.utility_channels_dao.clear_utility_channels_table()
+        self.cache.clear()
@@ -0,0 +1,56 @@
+import asyncio
+import unittest
+import os
+from cogs.experience import Experience
+
+class FakeBot:
+    def get_guild(self, guild_id: int):
+        return None
+
+class TestExperience(unittest.TestCase):
+    def setUp(self):
+        self.db_address = "database/test_db.db"
+        os.popen(f"sqlite3 {self.db_address} < database/test_schema.sql")
+
+    def tearDown(self):
+        async def clear():
+            cog = Experience(FakeBot(), self.db_address)
+            cog.flush_experience.cancel()
+            await cog.experience_service.clear_experience()
+        asyncio.run(clear())
+
+    def _run(self, test):
+        async def run():
+            cog = Experience(FakeBot(), self.db_address)
+            cog.flush_experience.cancel()
+            rewarded = []
+            async def give_level_rewards(totals):
+                rewarded.extend((experience.user_id, previous, experience.amount)
+                                for experience, previous in totals)
+            cog.give_level_rewards = give_level_rewards
+            await test(cog)
+            return rewarded
+        return asyncio.run(run())
+
+    def test_leaderboard_does_not_skip_level_rewards(self):
+        async def test(cog):
+            await cog.experience_service.add_user_experience(1234, 9876, 150, 0)
+            await cog.experience_service.get_guild_leaderboard(9876)
+            await cog.save_experience()
+        self.assertEqual(self._run(test), [(1234, 0, 150)])
+
+    def test_remaining_experience_is_rewarded_when_loop_stops(self):
+        async def test(cog):
+            await cog.experience_service.add_user_experience(1234, 9876, 150, 0)
+            await cog.flush_remaining_experience()
+        self.assertEqual(self._run(test), [(1234, 0, 150)])
+
+    def test_failed_level_rewards_do_not_stop_saving(self):
+        async def test(cog):
+            async def give_level_rewards(_totals):
+                raise RuntimeError("Gateway went away")
+            cog.give_level_rewards = give_level_rewards
+            await cog.experience_service.add_user_experience(1234, 9876, 150, 0)
+            await cog.save_experience()
+            self.assertEqual(len(cog.experience_service.accumulator), 0)
+        self.assertEqual(self._run(test), [])
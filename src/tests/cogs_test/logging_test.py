@@ -0,0 +1,123 @@
+import asyncio
+import unittest
+import os
+import sqlite3
+from types import SimpleNamespace
+from cogs.logging import Logging
+
+class FakeUser:
+    def __init__(self, user_id: int, guilds: list, name: str = None, global_name: str = None,
+                 nick: str = None):
+        self.id = user_id
+        self.name = name
+        self.global_name = global_name
+        self.nick = nick
+        self.mutual_guilds = guilds
+        self.mention = f"<@{user_id}>"
+        self.display_avatar = SimpleNamespace(url="https://example.com/avatar.png")
+        self.timed_out = False
+
+    def __str__(self):
+        return str(self.name)
+
+class FakeGuild:
+    def __init__(self, guild_id: int):
+        self.id = guild_id
+        self.name = "Guild"
+        self.members = {}
+
+    def get_member(self, user_id: int):
+        return self.members.get(user_id)
+
+class FakeBot:
+    def __init__(self, users: list, guilds: list):
+        self.users = {user.id: user for user in users}
+        self.guilds = {guild.id: guild for guild in guilds}
+
+    def get_user(self, user_id: int):
+        return self.users.get(user_id)
+
+    def get_guild(self, guild_id: int):
+        return self.guilds.get(guild_id)
+
+class FakeDispatcher:
+    def __init__(self):
+        self.embeds = []
+
+    def dispatch(self, channels: list, embed):
+        self.embeds.append(embed)
+
+class TestLogging(unittest.TestCase):
+    def setUp(self):
+        self.db_address = "database/test_db.db"
+        os.popen(f"sqlite3 {self.db_address} < database/test_schema.sql")
+        self.guild = FakeGuild(9876)
+        self.user = FakeUser(1234, [self.guild], "old")
+        self.guild.members[1234] = self.user
+        self.bot = FakeBot([self.user], [self.guild])
+
+    def tearDown(self):
+        connection = sqlite3.connect(self.db_address)
+        for table in ("usernames", "global_names", "nicknames"):
+            connection.execute(f"DELETE FROM {table}")
+        connection.commit()
+        connection.close()
+
+    def _run(self, test):
+        async def run():
+            cog = Logging(self.bot, self.db_address, {})
+            cog.flush_name_changes.cancel()
+            cog.log_dispatcher = FakeDispatcher()
+            async def is_logging_name_changes(_guild):
+                return True
+            cog._is_logging_name_changes = is_logging_name_changes
+            return await test(cog)
+        return asyncio.run(run())
+
+    def test_user_update_records_name_changes(self):
+        async def test(cog):
+            after = FakeUser(1234, [self.guild], "new", "Display")
+            await cog.on_user_update(self.user, after)
+            return cog.name_changes.take()
+        self.assertEqual(self._run(test), [("username", 1234, None, "old", "new"),
+                                           ("global_name", 1234, None, None, "Display")])
+
+    def test_member_update_records_nickname_change(self):
+        async def test(cog):
+            before = FakeUser(1234, [self.guild], "old")
+            before.guild = self.guild
+            after = FakeUser(1234, [self.guild], "old", nick="nick")
+            after.guild = self.guild
+            await cog.on_member_update(before, after)
+            return cog.name_changes.take()
+        self.assertEqual(self._run(test), [("nickname", 1234, 9876, None, "nick")])
+
+    def test_name_changes_are_saved_and_logged(self):
+        async def test(cog):
+            cog.name_changes.record("username", 1234, None, "old", "new")
+            cog.name_changes.record("nickname", 1234, 9876, None, "nick")
+            await cog.save_name_changes()
+            usernames = await cog._username_service.find_user_usernames(1234)
+            nicknames = await cog._nickname_service.find_user_nicknames(1234, 9876)
+            return cog, usernames, nicknames
+        cog, usernames, nicknames = self._run(test)
+        self.assertEqual([username.username for username in usernames], ["new"])
+        self.assertEqual([nickname.nickname for nickname in nicknames], ["nick"])
+        self.assertEqual(len(cog.log_dispatcher.embeds), 2)
+        self.assertEqual(len(cog.name_changes), 0)
+
+    def test_only_failed_kind_is_restored(self):
+        async def test(cog):
+            async def add_nicknames(_nicknames):
+                raise sqlite3.OperationalError("database is locked")
+            cog._nickname_service.add_nicknames = add_nicknames
+            cog.name_changes.record("username", 1234, None, "old", "new")
+            cog.name_changes.record("nickname", 1234, 9876, None, "nick")
+            with self.assertRaises(sqlite3.OperationalError):
+                await cog.save_name_changes()
+            usernames = await cog._username_service.find_user_usernames(1234)
+            return cog, usernames
+        cog, usernames = self._run(test)
+        self.assertEqual([username.username for username in usernames], ["new"])
+        self.assertEqual(cog.name_changes.take(), [("nickname", 1234, 9876, None, "nick")])
+        self.assertEqual(len(cog.log_dispatcher.embeds), 1)
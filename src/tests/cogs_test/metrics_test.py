@@ -0,0 +1,54 @@
+import asyncio
+import unittest
+from types import SimpleNamespace
+import discord
+from cogs.metrics import Metrics
+
+class FakeBot:
+    async def _run_event(self, coro, event_name, *args, **kwargs):
+        try:
+            await coro(*args, **kwargs)
+        except Exception: # pylint: disable=broad-exception-caught
+            self.errors.append(event_name)
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self):
+        self.bot = FakeBot()
+        self.bot.errors = []
+        self.metrics = Metrics(self.bot, "database/test_db.db")
+
+    def tearDown(self):
+        self.metrics.cog_unload()
+
+    def _get_context(self, interaction_id: int):
+        return SimpleNamespace(interaction=SimpleNamespace(id=interaction_id),
+                               command=SimpleNamespace(qualified_name="rank", cog=None))
+
+    def _get_counts(self, histogram):
+        return {sample[1].get("outcome", sample[1].get("event")): sample[2]
+                for sample in histogram.samples("test") if sample[0] == "test_count"}
+
+    def test_commands_are_timed_by_outcome(self):
+        async def run_commands():
+            await self.metrics.on_application_command(self._get_context(1))
+            await self.metrics.on_application_command(self._get_context(2))
+            await self.metrics.on_application_command_completion(self._get_context(1))
+            await self.metrics.on_application_command_error(self._get_context(2),
+                                                            discord.DiscordException())
+        asyncio.run(run_commands())
+        self.assertEqual(self._get_counts(self.metrics.command_durations),
+                         {"completed": 1, "failed": 1})
+
+    def test_command_without_start_is_not_timed(self):
+        asyncio.run(self.metrics.on_application_command_error(self._get_context(3),
+                                                              discord.DiscordException()))
+        self.assertEqual(self._get_counts(self.metrics.command_durations), {})
+
+    def test_listeners_are_timed_and_restored(self):
+        async def listener():
+            raise ValueError()
+        asyncio.run(self.bot._run_event(listener, "on_message"))
+        self.assertEqual(self._get_counts(self.metrics.listener_durations), {"on_message": 1})
+        self.assertEqual(self.bot.errors, ["on_message"])
+        self.metrics.cog_unload()
+        self.assertEqual(self.bot._run_event, self.metrics._original_run_event)
@@ -0,0 +1,159 @@
+import asyncio
+import unittest
+import os
+from datetime import datetime, timedelta
+import discord
+from cogs.tasks import Tasks
+
+class FakeGuild:
+    def __init__(self, guild_id: int, error: Exception = None):
+        self.id = guild_id
+        self.error = error
+        self.unbanned = []
+
+    async def unban(self, user, reason=None):
+        if self.error is not None:
+            raise self.error
+        self.unbanned.append(user.id)
+
+class FakeBot:
+    def __init__(self, guilds: list):
+        self.guilds = {guild.id: guild for guild in guilds}
+
+    def get_guild(self, guild_id: int):
+        return self.guilds.get(guild_id)
+
+    async def wait_until_ready(self):
+        await asyncio.Event().wait()
+
+class TestTasks(unittest.TestCase):
+    def setUp(self):
+        self.db_address = "database/test_db.db"
+        os.popen(f"sqlite3 {self.db_address} < database/test_schema.sql")
+
+    def tearDown(self):
+        async def clear():
+            cog = Tasks(FakeBot([]), self.db_address)
+            cog.cog_unload()
+            await cog.temp_ban_service.clear_temp_bans()
+            cog.temp_ban_service.schedule.clear()
+            await cog.reminder_service.clear_reminders()
+            cog.reminder_service.schedule.clear()
+            await cog.unverified_reminder_history_service.clear_unverified_reminder_history()
+            await cog.unverified_reminder_message_service.clear_unverified_reminder_messages()
+        asyncio.run(clear())
+
+    def _unban(self, guilds: list, bans: list):
+        async def unban():
+            cog = Tasks(FakeBot(guilds), self.db_address)
+            cog.cog_unload()
+            expiration = datetime.utcnow() - timedelta(minutes=1)
+            for user_id, guild_id in bans:
+                await cog.temp_ban_service.create_temp_ban(user_id, guild_id, expiration)
+            cog.temp_ban_service.schedule.clear()
+            expired = await cog.temp_ban_service.get_expired_temp_bans()
+            await cog.unban_temp_bans(expired)
+            remaining = await cog.temp_ban_service.get_expired_temp_bans()
+            return cog, [(ban.user_id, ban.guild_id) for ban in remaining]
+        return asyncio.run(unban())
+
+    def test_failing_guild_does_not_stop_other_unbans(self):
+        working = FakeGuild(9876)
+        failing = FakeGuild(8765, RuntimeError("Gateway went away"))
+        cog, remaining = self._unban([working, failing], [(1234, 9876), (2345, 8765)])
+        self.assertEqual(working.unbanned, [1234])
+        self.assertEqual(remaining, [(2345, 8765)])
+        self.assertEqual(len(cog.temp_ban_service.schedule), 1)
+
+    def test_bans_of_left_guild_are_dropped(self):
+        working = FakeGuild(9876)
+        _, remaining = self._unban([working], [(1234, 9876), (2345, 8765)])
+        self.assertEqual(working.unbanned, [1234])
+        self.assertEqual(remaining, [])
+
+    def test_forbidden_unban_is_retried(self):
+        response = type("Response", (), {"status": 403, "reason": "Forbidden"})()
+        forbidden = FakeGuild(9876, discord.Forbidden(response, "Missing Permissions"))
+        cog, remaining = self._unban([forbidden], [(1234, 9876)])
+        self.assertEqual(remaining, [(1234, 9876)])
+        self.assertEqual(len(cog.temp_ban_service.schedule), 1)
+
+    def test_lifted_bans_are_retried_when_deleting_them_fails(self):
+        async def unban_failing():
+            working = FakeGuild(9876)
+            cog = Tasks(FakeBot([working]), self.db_address)
+            cog.cog_unload()
+            expiration = datetime.utcnow() - timedelta(minutes=1)
+            await cog.temp_ban_service.create_temp_ban(1234, 9876, expiration)
+            cog.temp_ban_service.schedule.clear()
+            expired = await cog.temp_ban_service.get_expired_temp_bans()
+            async def fail(ban_ids):
+                raise RuntimeError("Database is locked")
+            cog.temp_ban_service.delete_temp_bans_by_ids = fail
+            await cog.unban_temp_bans(expired)
+            return working, cog.temp_ban_service.schedule
+        working, schedule = asyncio.run(unban_failing())
+        self.assertEqual(working.unbanned, [1234])
+        self.assertEqual(len(schedule), 1)
+
+    def test_kicked_member_reminder_history_is_deleted_when_they_leave(self):
+        async def kick_and_remove():
+            cog = Tasks(FakeBot([]), self.db_address)
+            cog.cog_unload()
+            reminders = cog.unverified_reminder_message_service
+            await reminders.add_guild_unverified_reminder_message(9876, "Please verify", 60)
+            reminder = (await reminders.get_guild_unverified_reminder_messages(9876))[0]
+            history = cog.unverified_reminder_history_service
+            await history.add_to_member_reminder_history(1234, reminder.db_id)
+            scheduler = cog.unverified_member_scheduler
+            scheduler.set_guild_rules(9876, 300, [reminder])
+            joined_at = datetime.utcnow() - timedelta(minutes=10)
+            scheduler.track(9876, 1234, joined_at, [reminder.db_id])
+            scheduler.pop_due(datetime.utcnow())
+            member = type("Member", (), {"id": 1234, "guild": FakeGuild(9876)})()
+            await cog.on_member_remove(member)
+            return await history.get_member_reminder_history(1234, 9876)
+        self.assertEqual(asyncio.run(kick_and_remove()), [])
+
+    def test_reminders_are_retried_when_the_database_fails(self):
+        async def send_failing():
+            cog = Tasks(FakeBot([]), self.db_address)
+            cog.cog_unload()
+            cog.reminder_service.schedule.clear()
+            reminder_date = datetime.utcnow() - timedelta(minutes=1)
+            reminder_id = await cog.reminder_service.add_new_reminder(
+                1234, 9876, "Water the plants", reminder_date, "after")
+            async def fail(reminder_ids):
+                raise RuntimeError("Database is locked")
+            cog.user_reminder_service.get_opted_in_users_of_reminders = fail
+            await cog.send_due_reminders.coro(cog)
+            schedule = cog.reminder_service.schedule
+            return reminder_id, schedule.pop_due(datetime.utcnow() + timedelta(minutes=2))
+        reminder_id, retried = asyncio.run(send_failing())
+        self.assertEqual(retried, [reminder_id])
+
+    def test_unverified_reminder_history_is_saved_after_a_failed_write(self):
+        async def remind_failing():
+            cog = Tasks(FakeBot([]), self.db_address)
+            cog.cog_unload()
+            reminders = cog.unverified_reminder_message_service
+            await reminders.add_guild_unverified_reminder_message(9876, "Please verify", 60)
+            reminder = (await reminders.get_guild_unverified_reminder_messages(9876))[0]
+            scheduler = cog.unverified_member_scheduler
+            scheduler.set_guild_rules(9876, None, [reminder])
+            scheduler.track(9876, 1234, datetime.utcnow() - timedelta(minutes=10))
+            history = cog.unverified_reminder_history_service
+            save = history.add_to_reminder_history_in_bulk
+            async def fail(sent_reminders):
+                raise RuntimeError("Database is locked")
+            history.add_to_reminder_history_in_bulk = fail
+            await cog.process_unverified_members.coro(cog)
+            unsaved = list(cog.unsaved_reminder_history)
+            history.add_to_reminder_history_in_bulk = save
+            await cog.save_reminder_history()
+            saved = await history.get_member_reminder_history(1234, 9876)
+            return reminder.db_id, unsaved, saved, cog.unsaved_reminder_history
+        reminder_id, unsaved, saved, remaining = asyncio.run(remind_failing())
+        self.assertEqual(unsaved, [(9876, 1234, reminder_id)])
+        self.assertEqual(len(saved), 1)
+        self.assertEqual(remaining, [])
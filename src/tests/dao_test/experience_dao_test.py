@@ -0,0 +1,59 @@
+import asyncio
+import unittest
+import os
+from dao.experience_dao import ExperienceDAO
+
+class TestExperienceDAO(unittest.TestCase):
+    def setUp(self):
+        self.db_addr = "database/test_db.db"
+        os.popen(f"sqlite3 {self.db_addr} < database/test_schema.sql")
+        self.experience_dao = ExperienceDAO(self.db_addr)
+
+    def tearDown(self):
+        asyncio.run(self.experience_dao.clear_experience_table())
+
+    def test_experience_is_added_to_a_new_user(self):
+        asyncio.run(self.experience_dao.add_user_experience(1234, 9876, 10, 60))
+        row = asyncio.run(self.experience_dao.get_user_experience(1234, 9876))
+        self.assertEqual(row["amount"], 10)
+
+    def test_experience_is_not_added_during_interval(self):
+        asyncio.run(self.experience_dao.add_user_experience(1234, 9876, 10, 60))
+        asyncio.run(self.experience_dao.add_user_experience(1234, 9876, 10, 60))
+        row = asyncio.run(self.experience_dao.get_user_experience(1234, 9876))
+        self.assertEqual(row["amount"], 10)
+
+    def test_experience_is_added_after_interval(self):
+        asyncio.run(self.experience_dao.add_user_experience(1234, 9876, 10, 0))
+        asyncio.run(self.experience_dao.add_experience_in_bulk([(1234, 9876, "2000-01-01 00:00:00", 0)]))
+        asyncio.run(self.experience_dao.add_user_experience(1234, 9876, 10, 60))
+        row = asyncio.run(self.experience_dao.get_user_experience(1234, 9876))
+        self.assertEqual(row["amount"], 20)
+
+    def test_experience_is_added_in_bulk(self):
+        asyncio.run(self.experience_dao.add_user_experience(1234, 9876, 10, 60))
+        totals = asyncio.run(self.experience_dao.add_experience_in_bulk(
+            [(1234, 9876, "2024-01-01 12:00:00", 5), (2345, 9876, "2024-01-01 12:00:00", 7)]))
+        self.assertEqual({(row["user_id"], row["amount"]) for row in totals}, {(1234, 15), (2345, 7)})
+        leaderboard = asyncio.run(self.experience_dao.get_guild_leaderboard(9876))
+        self.assertEqual([row["user_id"] for row in leaderboard], [1234, 2345])
+        self.assertEqual(leaderboard[0]["last_experience"], "2024-01-01 12:00:00")
+
+    def test_recent_guild_experience_is_found(self):
+        asyncio.run(self.experience_dao.add_user_experience(1234, 9876, 10, 60))
+        asyncio.run(self.experience_dao.add_experience_in_bulk([(2345, 9876, "2000-01-01 00:00:00", 7)]))
+        rows = asyncio.run(self.experience_dao.get_recent_guild_experience(9876, 60))
+        self.assertEqual([row["user_id"] for row in rows], [1234])
+
+    def test_user_experience_is_reset(self):
+        asyncio.run(self.experience_dao.add_user_experience(1234, 9876, 10, 60))
+        asyncio.run(self.experience_dao.reset_user_experience(1234, 9876))
+        row = asyncio.run(self.experience_dao.get_user_experience(1234, 9876))
+        self.assertEqual(row["amount"], 0)
+
+    def test_guild_experience_is_deleted(self):
+        asyncio.run(self.experience_dao.add_user_experience(1234, 9876, 10, 60))
+        asyncio.run(self.experience_dao.add_user_experience(1234, 8765, 10, 60))
+        asyncio.run(self.experience_dao.delete_guild_experience(9876))
+        self.assertIsNone(asyncio.run(self.experience_dao.get_user_experience(1234, 9876)))
+        self.assertIsNotNone(asyncio.run(self.experience_dao.get_user_experience(1234, 8765)))
@@ -0,0 +1,25 @@
+import asyncio
+import unittest
+import os
+from dao.global_names_dao import GlobalNamesDAO
+
+class TestGlobalNamesDAO(unittest.TestCase):
+    def setUp(self):
+        self.db_addr = "database/test_db.db"
+        os.popen(f"sqlite3 {self.db_addr} < database/test_schema.sql")
+        self.global_names_dao = GlobalNamesDAO(self.db_addr)
+
+    def tearDown(self):
+        asyncio.run(self.global_names_dao.clear_global_names_table())
+
+    def test_oldest_global_names_are_trimmed_to_limit(self):
+        ids = [asyncio.run(self.global_names_dao.add_global_name(f"Test{index}", 1234, 2))
+               for index in range(3)]
+        rows = asyncio.run(self.global_names_dao.find_user_global_names(1234))
+        self.assertEqual([row["id"] for row in rows], [ids[2], ids[1]])
+
+    def test_global_names_are_added_in_bulk(self):
+        ids = asyncio.run(self.global_names_dao.add_global_names([("Test1", 1234), ("Test2", 2345)]))
+        self.assertEqual(len(ids), 2)
+        rows = asyncio.run(self.global_names_dao.find_global_names("Test2"))
+        self.assertEqual([(row["id"], row["user_id"]) for row in rows], [(ids[1], 2345)])
@@ -117,6 +117,19 @@ class TestGuildSettingsDAO(unittest.TestCase):
         row = asyncio.run(self.guild_settings_dao.get_guild_setting_value_by_id(rows[0]["id"]))
         self.assertEqual(row["setting_value"], "test-1")
 
+    def test_settings_of_several_guilds_are_initialized_in_bulk(self):
+        rows = asyncio.run(self.guild_settings_dao.initialize_guilds_settings([1234, 2345]))
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(sorted(row["guild_id"] for row in rows), [1234, 1234, 2345, 2345])
+        self.assertEqual(len(asyncio.run(self.guild_settings_dao.get_all_guild_settings(2345))), 2)
+
+    def test_bulk_initialization_only_returns_new_guild_settings(self):
+        asyncio.run(self.guild_settings_dao.initialize_guild_settings(1234))
+        asyncio.run(self.settings_dao.add_setting("another_test", "test-1"))
+        rows = asyncio.run(self.guild_settings_dao.initialize_guilds_settings([1234, 2345]))
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(len([row for row in rows if row["guild_id"] == 1234]), 1)
+
     def test_guild_settings_are_correctly_reset_to_default_value(self):
         row1 = asyncio.run(self.guild_settings_dao.add_guild_setting_by_setting_id(1234, self.setting_id1, "test2"))
         asyncio.run(self.guild_settings_dao.reset_guild_setting_to_default_value(1234, row1["id"]))
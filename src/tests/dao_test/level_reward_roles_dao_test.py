@@ -0,0 +1,35 @@
+import asyncio
+import unittest
+import os
+from dao.level_reward_roles_dao import LevelRewardRolesDAO
+
+class TestLevelRewardRolesDAO(unittest.TestCase):
+    def setUp(self):
+        self.db_addr = "database/test_db.db"
+        os.popen(f"sqlite3 {self.db_addr} < database/test_schema.sql")
+        self.level_reward_roles_dao = LevelRewardRolesDAO(self.db_addr)
+
+    def tearDown(self):
+        asyncio.run(self.level_reward_roles_dao.clear_level_reward_roles_table())
+
+    def test_guild_roles_are_ordered_by_level(self):
+        asyncio.run(self.level_reward_roles_dao.add_level_reward_role(111, 9876, 10))
+        asyncio.run(self.level_reward_roles_dao.add_level_reward_role(222, 9876, 5))
+        asyncio.run(self.level_reward_roles_dao.add_level_reward_role(333, 8765, 1))
+        rows = asyncio.run(self.level_reward_roles_dao.get_guild_level_reward_roles(9876))
+        self.assertEqual([(row["role_id"], row["level_requirement"]) for row in rows],
+                         [(222, 5), (111, 10)])
+
+    def test_level_reward_role_is_deleted(self):
+        asyncio.run(self.level_reward_roles_dao.add_level_reward_role(111, 9876, 10))
+        asyncio.run(self.level_reward_roles_dao.add_level_reward_role(222, 9876, 5))
+        asyncio.run(self.level_reward_roles_dao.delete_level_reward_role(111, 9876))
+        rows = asyncio.run(self.level_reward_roles_dao.get_guild_level_reward_roles(9876))
+        self.assertEqual([row["role_id"] for row in rows], [222])
+
+    def test_guild_level_reward_roles_are_deleted(self):
+        asyncio.run(self.level_reward_roles_dao.add_level_reward_role(111, 9876, 10))
+        asyncio.run(self.level_reward_roles_dao.add_level_reward_role(333, 8765, 1))
+        asyncio.run(self.level_reward_roles_dao.delete_guild_level_reward_roles(9876))
+        self.assertEqual(asyncio.run(self.level_reward_roles_dao.get_guild_level_reward_roles(9876)), [])
+        self.assertEqual(len(asyncio.run(self.level_reward_roles_dao.get_guild_level_reward_roles(8765))), 1)
@@ -0,0 +1,43 @@
+import asyncio
+import unittest
+import os
+from dao.log_webhooks_dao import LogWebhooksDAO
+
+class TestLogWebhooksDAO(unittest.TestCase):
+    def setUp(self):
+        self.db_addr = "database/test_db.db"
+        os.popen(f"sqlite3 {self.db_addr} < database/test_schema.sql")
+        self.log_webhooks_dao = LogWebhooksDAO(self.db_addr)
+
+    def tearDown(self):
+        asyncio.run(self.log_webhooks_dao.clear_log_webhooks_table())
+
+    def test_webhook_is_added_correctly(self):
+        webhook = asyncio.run(self.log_webhooks_dao.get_channel_webhook(1234))
+        self.assertIsNone(webhook)
+        asyncio.run(self.log_webhooks_dao.add_webhook(1234, 9876, 5555, "token"))
+        webhook = asyncio.run(self.log_webhooks_dao.get_channel_webhook(1234))
+        self.assertEqual(webhook["webhook_id"], 5555)
+        self.assertEqual(webhook["webhook_token"], "token")
+
+    def test_adding_webhook_replaces_existing_webhook_of_channel(self):
+        asyncio.run(self.log_webhooks_dao.add_webhook(1234, 9876, 5555, "token"))
+        asyncio.run(self.log_webhooks_dao.add_webhook(1234, 9876, 6666, "token2"))
+        webhooks = asyncio.run(self.log_webhooks_dao.get_guild_webhooks(9876))
+        self.assertEqual(len(webhooks), 1)
+        self.assertEqual(webhooks[0]["webhook_id"], 6666)
+
+    def test_channel_webhook_is_deleted_correctly(self):
+        asyncio.run(self.log_webhooks_dao.add_webhook(1234, 9876, 5555, "token"))
+        asyncio.run(self.log_webhooks_dao.add_webhook(2345, 9876, 6666, "token2"))
+        asyncio.run(self.log_webhooks_dao.delete_channel_webhook(1234))
+        webhooks = asyncio.run(self.log_webhooks_dao.get_guild_webhooks(9876))
+        self.assertEqual(len(webhooks), 1)
+        self.assertEqual(webhooks[0]["channel_id"], 2345)
+
+    def test_guild_webhooks_are_deleted_correctly(self):
+        asyncio.run(self.log_webhooks_dao.add_webhook(1234, 9876, 5555, "token"))
+        asyncio.run(self.log_webhooks_dao.add_webhook(2345, 8765, 6666, "token2"))
+        asyncio.run(self.log_webhooks_dao.delete_guild_webhooks(9876))
+        self.assertEqual(len(asyncio.run(self.log_webhooks_dao.get_guild_webhooks(9876))), 0)
+        self.assertEqual(len(asyncio.run(self.log_webhooks_dao.get_guild_webhooks(8765))), 1)
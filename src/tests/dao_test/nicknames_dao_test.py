@@ -57,3 +57,13 @@ class TestNicknamesDAO(unittest.TestCase):
         self.assertEqual(len(nicknames), 0)
         nicknames = asyncio.run(self.nicknames_dao.find_user_nicknames(1234, 8765))
         self.assertEqual(len(nicknames), 1)
+
+    def test_nicknames_are_added_in_bulk(self):
+        asyncio.run(self.nicknames_dao.add_nickname("Old", 1234, 9876))
+        asyncio.run(self.nicknames_dao.add_nickname("Other", 1234, 8765))
+        asyncio.run(self.nicknames_dao.add_nicknames([("Test1", 1234, 9876), ("Test2", 1234, 9876),
+                                                      ("Test3", 1234, 8765)], 2))
+        nicknames = asyncio.run(self.nicknames_dao.find_user_nicknames(1234, 9876))
+        self.assertEqual([row["nickname"] for row in nicknames], ["Test1", "Test2"])
+        nicknames = asyncio.run(self.nicknames_dao.find_user_nicknames(1234, 8765))
+        self.assertEqual([row["nickname"] for row in nicknames], ["Other", "Test3"])
@@ -0,0 +1,71 @@
+import ast
+import glob
+import os
+import sqlite3
+import unittest
+
+# DAO methods that are meant to read a whole table, e.g. copying every setting to a guild
+FULL_TABLE_READS = {"initialize_guild_settings", "initialize_guilds_settings"}
+# The tables DAO methods are allowed to scan, and why that's fine
+ALLOWED_SCANS = {
+    # A name pattern can't use an index, and the settings table only holds the default settings
+    "edit_guild_settings_by_setting_name_pattern": "settings",
+    # The partial index only holds the finished reminders, so scanning it visits just those
+    "delete_reminders_with_no_repeats": "reminders",
+}
+
+class TestQueryPlans(unittest.TestCase):
+    def setUp(self):
+        self.db_addr = "database/test_db.db"
+        os.popen(f"sqlite3 {self.db_addr} < database/test_schema.sql")
+        self.connection = sqlite3.connect(self.db_addr)
+
+    def tearDown(self):
+        self.connection.close()
+
+    def _get_dao_queries(self):
+        queries = []
+        for path in sorted(glob.glob("src/dao/*.py")):
+            with open(path, encoding="utf-8") as dao_file:
+                tree = ast.parse(dao_file.read())
+            for method in ast.walk(tree):
+                if not isinstance(method, ast.AsyncFunctionDef) or method.name in FULL_TABLE_READS:
+                    continue
+                for node in ast.walk(method):
+                    if isinstance(node, ast.Assign) and isinstance(node.value, ast.Constant) \
+                       and isinstance(node.value.value, str) and node.targets[0].id.endswith("sql"):
+                        queries.append((path, method.name, node.value.value))
+        return queries
+
+    def _get_table_scans(self, method_name: str, plan: list):
+        scans = []
+        for row in plan:
+            detail = row[3]
+            if detail.startswith("SEARCH") and " USING " not in detail:
+                scans.append(detail)
+            if not detail.startswith("SCAN ") or "VIRTUAL TABLE" in detail \
+               or detail == "SCAN CONSTANT ROW":
+                continue
+            if detail.split()[1] != ALLOWED_SCANS.get(method_name):
+                scans.append(detail)
+        return scans
+
+    def test_every_dao_lookup_uses_an_index(self):
+        queries = [query for query in self._get_dao_queries() if " WHERE " in query[2].upper()]
+        self.assertGreater(len(queries), 0)
+        for path, method_name, sql in queries:
+            plan = self.connection.execute("EXPLAIN QUERY PLAN " + sql,
+                                           (None,) * sql.count("?")).fetchall()
+            self.assertEqual(self._get_table_scans(method_name, plan), [],
+                             f"{path}:{method_name} scans a whole table: {sql}")
+
+    def test_index_scan_is_not_a_lookup(self):
+        plan = [(2, 0, 0, "SCAN guild_settings USING INDEX idx_guild_settings_setting_id")]
+        self.assertEqual(self._get_table_scans("get_guild_settings", plan), [plan[0][3]])
+
+    def test_scan_is_allowed_only_for_its_table(self):
+        plan = [(2, 0, 0, "SCAN settings USING COVERING INDEX sqlite_autoindex_settings_1"),
+                (3, 0, 0, "SCAN guild_settings")]
+        self.assertEqual(
+            self._get_table_scans("edit_guild_settings_by_setting_name_pattern", plan),
+            ["SCAN guild_settings"])
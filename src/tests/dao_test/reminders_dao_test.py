@@ -156,3 +156,12 @@ class TestRemindersDAO(unittest.TestCase):
         self.assertEqual(len(rows), 2)
         self.assertEqual(rows[0]["content"], "Test1")
         self.assertEqual(rows[1]["content"], "Test3")
+
+    def test_reminders_are_rescheduled_and_deleted_in_one_batch(self):
+        row1 = asyncio.run(self.reminders_dao.add_new_reminder(1234, 9876, "Test1", self.expired1, "after", False, 3600, 3))
+        row2 = asyncio.run(self.reminders_dao.add_new_reminder(1234, 9876, "Test2", self.expired2, "after"))
+        asyncio.run(self.reminders_dao.reschedule_reminders([(row1["id"], "2100-01-01 00:00:00", 2)], [row2["id"]]))
+        rows = asyncio.run(self.reminders_dao.get_reminders_by_ids([row1["id"], row2["id"]]))
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["reminder_date"], "2100-01-01 00:00:00")
+        self.assertEqual(rows[0]["repeats_left"], 2)
@@ -57,6 +57,15 @@ class TestTempBansDAO(unittest.TestCase):
         temp_bans = asyncio.run(self.temp_bans_dao.get_guild_temp_bans(9876))
         self.assertEqual(len(temp_bans), 1)
 
+    def test_temp_bans_are_deleted_correctly_by_ids(self):
+        row1 = asyncio.run(self.temp_bans_dao.create_temp_ban(1234, 9876, self.expiration2))
+        row2 = asyncio.run(self.temp_bans_dao.create_temp_ban(2345, 9876, self.expiration2))
+        asyncio.run(self.temp_bans_dao.create_temp_ban(3456, 9876, self.expiration2))
+        asyncio.run(self.temp_bans_dao.delete_temp_bans_by_ids([row1["id"], row2["id"]]))
+        temp_bans = asyncio.run(self.temp_bans_dao.get_guild_temp_bans(9876))
+        self.assertEqual(len(temp_bans), 1)
+        self.assertEqual(temp_bans[0]["user_id"], 3456)
+
     def test_user_temp_bans_are_deleted_correctly(self):
         asyncio.run(self.temp_bans_dao.create_temp_ban(1234, 9876, self.expiration1))
         asyncio.run(self.temp_bans_dao.create_temp_ban(2345, 9876, self.expiration1))
@@ -26,6 +26,13 @@ class TestUnverifiedReminderHistoryDAO(unittest.TestCase):
         reminder_history = asyncio.run(self.unverified_reminder_history_dao.get_member_reminder_history(9876, 1234))
         self.assertEqual(len(reminder_history), 1)
 
+    def test_reminder_history_is_added_to_in_bulk(self):
+        asyncio.run(self.unverified_reminder_history_dao.add_to_reminder_history_in_bulk([(9876, self.message_id), (8765, self.message_id), (9876, self.message_id2)]))
+        reminder_history = asyncio.run(self.unverified_reminder_history_dao.get_guild_reminder_history(1234))
+        self.assertEqual(sorted(row["user_id"] for row in reminder_history), [8765, 9876])
+        reminder_history = asyncio.run(self.unverified_reminder_history_dao.get_member_reminder_history(9876, 2345))
+        self.assertEqual(len(reminder_history), 1)
+
     def test_member_reminder_history_is_deleted_correctly(self):
         asyncio.run(self.unverified_reminder_history_dao.add_to_member_reminder_history(9876, self.message_id))
         asyncio.run(self.unverified_reminder_history_dao.add_to_member_reminder_history(8765, self.message_id))
@@ -53,3 +53,18 @@ class TestUsernamesDAO(unittest.TestCase):
         asyncio.run(self.usernames_dao.delete_user_usernames(1234))
         usernames = asyncio.run(self.usernames_dao.find_user_usernames(1234))
         self.assertEqual(len(usernames), 0)
+
+    def test_oldest_usernames_are_trimmed_to_limit(self):
+        for index in range(4):
+            asyncio.run(self.usernames_dao.add_username(f"Test{index}", 1234, 3))
+        usernames = asyncio.run(self.usernames_dao.find_user_usernames(1234))
+        self.assertEqual([row["username"] for row in usernames], ["Test1", "Test2", "Test3"])
+
+    def test_usernames_are_added_in_bulk(self):
+        asyncio.run(self.usernames_dao.add_username("Old", 1234))
+        asyncio.run(self.usernames_dao.add_usernames([("Test1", 1234), ("Test2", 2345),
+                                                      ("Test3", 1234)], 2))
+        usernames = asyncio.run(self.usernames_dao.find_user_usernames(1234))
+        self.assertEqual([row["username"] for row in usernames], ["Test1", "Test3"])
+        usernames = asyncio.run(self.usernames_dao.find_user_usernames(2345))
+        self.assertEqual([row["username"] for row in usernames], ["Test2"])
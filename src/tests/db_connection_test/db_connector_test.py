@@ -0,0 +1,142 @@
+import asyncio
+import contextlib
+import io
+import unittest
+import os
+from db_connection.db_connector import DBConnection, ConnectionPool, QueryMetrics, \
+    redact_parameters
+from dao.time_zones_dao import TimeZonesDAO
+
+class TestDBConnection(unittest.TestCase):
+    def setUp(self):
+        self.db_addr = "database/test_db.db"
+        os.popen(f"sqlite3 {self.db_addr} < database/test_schema.sql")
+        self.db_connection = DBConnection(self.db_addr)
+        self.time_zones_dao = TimeZonesDAO(self.db_addr)
+
+    def tearDown(self):
+        asyncio.run(self.time_zones_dao.clear_time_zones_table())
+
+    def test_connections_to_same_database_share_a_pool(self):
+        other_connection = DBConnection(self.db_addr)
+        self.assertIs(self.db_connection.pool, other_connection.pool)
+        self.assertIs(self.db_connection.pool, ConnectionPool.get_pool(self.db_addr))
+
+    def test_concurrent_reads_do_not_exceed_reader_count(self):
+        async def read_many():
+            await asyncio.gather(*[self.time_zones_dao.get_user_time_zone(i) for i in range(20)])
+        asyncio.run(read_many())
+        metrics = self.db_connection.pool.get_wait_metrics()
+        self.assertLessEqual(metrics["readers_open"], self.db_connection.pool.reader_count)
+        self.assertGreaterEqual(metrics["reader"]["acquisitions"], 20)
+
+    def test_writer_is_released_after_a_failed_write(self):
+        asyncio.run(self.time_zones_dao.add_user_time_zone(1234, "US/Eastern"))
+        with self.assertRaises(Exception):
+            asyncio.run(self.time_zones_dao.add_user_time_zone(1234, "US/Pacific"))
+        asyncio.run(self.time_zones_dao.add_user_time_zone(2345, "US/Pacific"))
+        row = asyncio.run(self.time_zones_dao.get_user_time_zone(2345))
+        self.assertEqual(row["time_zone"], "US/Pacific")
+
+    def test_writer_changes_are_rolled_back_on_error(self):
+        async def failing_write():
+            async with self.db_connection.writer() as cursor:
+                await cursor.execute("INSERT INTO time_zones (user_id, time_zone) VALUES (?, ?)",
+                                     (1234, "US/Eastern"))
+                raise ValueError("Failed")
+        with self.assertRaises(ValueError):
+            asyncio.run(failing_write())
+        row = asyncio.run(self.time_zones_dao.get_user_time_zone(1234))
+        self.assertEqual(row["time_zone"], "UTC")
+
+    def test_unknown_storage_profile_is_rejected(self):
+        with self.assertRaises(ValueError):
+            ConnectionPool(self.db_addr, storage_profile="nonexistent")
+
+    def test_storage_profile_is_applied_to_connections(self):
+        async def get_journal_mode():
+            pool = ConnectionPool(self.db_addr, storage_profile="wal")
+            async with pool.reader() as connection:
+                cursor = await connection.execute("PRAGMA journal_mode;")
+                row = await cursor.fetchone()
+            await pool.close()
+            return row[0]
+        self.assertEqual(asyncio.run(get_journal_mode()), "wal")
+
+    def test_queued_writes_are_committed_in_one_group(self):
+        sql = "INSERT INTO time_zones (user_id, time_zone) VALUES (?, ?) RETURNING id"
+        async def write_many():
+            batches_before = self.db_connection.pool.write_queue.metrics.batches
+            rows = await asyncio.gather(*[self.db_connection.queue_write(sql, (i, "UTC"), "one")
+                                          for i in range(10)])
+            return rows, self.db_connection.pool.write_queue.metrics.batches - batches_before
+        rows, batches = asyncio.run(write_many())
+        self.assertEqual(batches, 1)
+        self.assertEqual(len({row["id"] for row in rows}), 10)
+
+    def test_failed_queued_write_does_not_affect_its_group(self):
+        sql = "INSERT INTO time_zones (user_id, time_zone) VALUES (?, ?)"
+        async def write_with_duplicate():
+            return await asyncio.gather(self.db_connection.queue_write(sql, (1234, "US/Eastern")),
+                                        self.db_connection.queue_write(sql, (1234, "US/Pacific")),
+                                        self.db_connection.queue_write(sql, (2345, "US/Pacific")),
+                                        return_exceptions=True)
+        results = asyncio.run(write_with_duplicate())
+        self.assertIsNone(results[0])
+        self.assertIsInstance(results[1], Exception)
+        self.assertIsNone(results[2])
+        row = asyncio.run(self.time_zones_dao.get_user_time_zone(1234))
+        self.assertEqual(row["time_zone"], "US/Eastern")
+        row = asyncio.run(self.time_zones_dao.get_user_time_zone(2345))
+        self.assertEqual(row["time_zone"], "US/Pacific")
+
+    def test_query_metrics_record_statements_and_rows(self):
+        asyncio.run(self.time_zones_dao.add_user_time_zone(1234, "US/Eastern"))
+        self.db_connection.pool.query_metrics.reset()
+        async def read_twice():
+            for _ in range(2):
+                async with self.db_connection.reader() as cursor:
+                    await cursor.execute("SELECT * FROM time_zones WHERE user_id=?", (1234,))
+                    await cursor.fetchall()
+        asyncio.run(read_twice())
+        summary = self.db_connection.get_query_metrics()
+        self.assertEqual(len(summary), 1)
+        self.assertEqual(summary[0]["sql"], "SELECT * FROM time_zones WHERE user_id=?")
+        self.assertEqual(summary[0]["count"], 2)
+        self.assertEqual(summary[0]["rows"], 2)
+        self.assertGreaterEqual(summary[0]["max_time"], summary[0]["average_time"])
+
+    def test_query_metrics_record_queued_writes(self):
+        sql = "INSERT INTO time_zones (user_id, time_zone) VALUES (?, ?) RETURNING id"
+        self.db_connection.pool.query_metrics.reset()
+        asyncio.run(self.db_connection.queue_write(sql, (1234, "UTC"), "one"))
+        summary = self.db_connection.get_query_metrics()
+        self.assertEqual([statement["sql"] for statement in summary], [sql])
+        self.assertEqual(summary[0]["rows"], 1)
+
+    def test_query_metrics_record_executemany_and_scripts(self):
+        sql = "INSERT INTO time_zones (user_id, time_zone) VALUES (?, ?)"
+        script = "DELETE FROM time_zones WHERE user_id=1234; " \
+                 "DELETE FROM time_zones WHERE user_id=2345;"
+        self.db_connection.pool.query_metrics.reset()
+        async def write_many():
+            async with self.db_connection.writer() as cursor:
+                await cursor.executemany(sql, ((user_id, "UTC") for user_id in (1234, 2345)))
+                await cursor.executescript(script)
+        asyncio.run(write_many())
+        summary = self.db_connection.get_query_metrics()
+        self.assertEqual(sorted(statement["sql"] for statement in summary), sorted([sql, script]))
+        self.assertTrue(all(statement["count"] == 1 for statement in summary))
+
+    def test_slow_queries_are_counted(self):
+        metrics = QueryMetrics(slow_query_threshold=0)
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            metrics.record("SELECT * FROM time_zones WHERE user_id=?", (1234,), 0.5, 1, 0.0)
+        self.assertEqual(metrics.slow_queries, 1)
+        self.assertIn("(int)", output.getvalue())
+        self.assertNotIn("1234", output.getvalue())
+
+    def test_redact_parameters_hides_values(self):
+        self.assertEqual(redact_parameters((1234, "secret", None)), "(int, str, NoneType)")
+        self.assertEqual(redact_parameters({"user": 1234}), "{:user: int}")
+        self.assertEqual(redact_parameters(None), "()")
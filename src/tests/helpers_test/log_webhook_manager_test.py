@@ -0,0 +1,66 @@
+import asyncio
+import unittest
+import os
+from types import SimpleNamespace
+import discord
+from helpers.log_dispatcher import LogDispatcher
+from helpers.log_webhook_manager import LogWebhookManager
+
+class FakeChannel:
+    def __init__(self, channel_id: int):
+        self.id = channel_id
+        self.guild = SimpleNamespace(id=9876, me=SimpleNamespace(name="Bot"))
+        self.create_attempts = 0
+        self.sent = []
+
+    async def create_webhook(self, name: str, reason: str = None):
+        self.create_attempts += 1
+        response = SimpleNamespace(status=403, reason="Forbidden")
+        raise discord.Forbidden(response, "Missing Permissions")
+
+    async def send(self, embeds: list):
+        self.sent.append(embeds)
+
+class TestLogWebhookManager(unittest.TestCase):
+    def setUp(self):
+        self.db_address = "database/test_db.db"
+        os.popen(f"sqlite3 {self.db_address} < database/test_schema.sql")
+
+    def tearDown(self):
+        async def clear():
+            manager = LogWebhookManager(self.db_address)
+            await manager.log_webhook_service.clear_log_webhooks()
+        asyncio.run(clear())
+
+    def test_failed_creation_is_not_retried_within_interval(self):
+        async def get_twice():
+            manager = LogWebhookManager(self.db_address)
+            channel = FakeChannel(1234)
+            with self.assertRaises(discord.Forbidden):
+                await manager.get_webhook(channel)
+            return channel, await manager.get_webhook(channel)
+        channel, webhook = asyncio.run(get_twice())
+        self.assertIsNone(webhook)
+        self.assertEqual(channel.create_attempts, 1)
+
+    def test_failed_creation_is_retried_after_interval(self):
+        async def get_twice():
+            manager = LogWebhookManager(self.db_address, retry_interval=0)
+            channel = FakeChannel(1234)
+            for _ in range(2):
+                with self.assertRaises(discord.Forbidden):
+                    await manager.get_webhook(channel)
+            return channel
+        self.assertEqual(asyncio.run(get_twice()).create_attempts, 2)
+
+    def test_dispatcher_sends_as_bot_without_webhook(self):
+        async def send_twice():
+            dispatcher = LogDispatcher(webhook_manager=LogWebhookManager(self.db_address))
+            channel = FakeChannel(1234)
+            await dispatcher._send(channel, [discord.Embed(title="First")])
+            await dispatcher._send(channel, [discord.Embed(title="Second")])
+            return dispatcher, channel
+        dispatcher, channel = asyncio.run(send_twice())
+        self.assertEqual([embeds[0].title for embeds in channel.sent], ["First", "Second"])
+        self.assertEqual(channel.create_attempts, 1)
+        self.assertEqual(dispatcher.sent, 2)
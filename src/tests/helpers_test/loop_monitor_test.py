@@ -0,0 +1,95 @@
+import asyncio
+import unittest
+from config.constants import LOOP_LAG_BUCKETS
+from helpers.loop_monitor import LoopMonitor, get_callback_owner
+
+class TestGetCallbackOwner(unittest.TestCase):
+    def test_listener_task_belongs_to_event(self):
+        description = "<Task finished name='pycord: on_message_edit' " \
+                      "coro=<Client._run_event() done, defined at client.py:400> result=None>"
+        self.assertEqual(get_callback_owner(description), "on_message_edit")
+
+    def test_task_belongs_to_coroutine(self):
+        description = "<Task pending name='Task-12' " \
+                      "coro=<Tasks.unban_expired_temp_bans() running at tasks.py:80>>"
+        self.assertEqual(get_callback_owner(description), "Tasks.unban_expired_temp_bans")
+
+    def test_handle_belongs_to_function(self):
+        description = "<TimerHandle when=1234.5 Loop._run_once() created at base_events.py:10>"
+        self.assertEqual(get_callback_owner(description), "Loop._run_once")
+
+    def test_unknown_callback(self):
+        self.assertEqual(get_callback_owner("<something else>"), "unknown")
+
+class TestLoopMonitor(unittest.TestCase):
+    def setUp(self):
+        self.monitor = LoopMonitor(interval=0.01, samples=100, slow_callback_threshold=None)
+
+    def test_histogram_counts_lags_into_buckets(self):
+        for lag in (0.0, LOOP_LAG_BUCKETS[0], 0.002, 0.03, 5.0, -0.1):
+            self.monitor.record_lag(lag)
+        histogram = dict(self.monitor.get_histogram())
+        self.assertEqual(histogram[LOOP_LAG_BUCKETS[0]], 3)
+        self.assertEqual(histogram[0.005], 1)
+        self.assertEqual(histogram[0.05], 1)
+        self.assertEqual(histogram[None], 1)
+        self.assertEqual(sum(histogram.values()), 6)
+
+    def test_histogram_of_no_lags_is_empty(self):
+        histogram = self.monitor.get_histogram()
+        self.assertEqual(len(histogram), len(LOOP_LAG_BUCKETS) + 1)
+        self.assertTrue(all(count == 0 for _, count in histogram))
+
+    def test_summary_of_no_lags(self):
+        summary = self.monitor.get_summary()
+        self.assertEqual(summary, {"samples": 0, "p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0,
+                                   "slow_callbacks": []})
+
+    def test_summary_percentiles(self):
+        for lag in range(100):
+            self.monitor.record_lag(lag / 1000)
+        summary = self.monitor.get_summary()
+        self.assertEqual(summary["samples"], 100)
+        self.assertEqual(summary["p50"], 0.05)
+        self.assertEqual(summary["p95"], 0.095)
+        self.assertEqual(summary["p99"], 0.099)
+        self.assertEqual(summary["max"], 0.099)
+
+    def test_rolling_window_keeps_latest_lags(self):
+        for lag in range(150):
+            self.monitor.record_lag(lag / 1000)
+        summary = self.monitor.get_summary()
+        self.assertEqual(summary["samples"], 100)
+        self.assertEqual(summary["p50"], 0.1)
+
+    def test_summary_lists_worst_slow_callbacks_first(self):
+        listener = "<Task pending name='pycord: on_message' coro=<Client._run_event()>>"
+        task = "<Task pending name='Task-1' coro=<Tasks.load_schedule() running>>"
+        self.monitor.record_slow_callback(listener, 0.2)
+        self.monitor.record_slow_callback(task, 0.5)
+        self.monitor.record_slow_callback(listener, 0.4)
+        slow_callbacks = self.monitor.get_summary()["slow_callbacks"]
+        self.assertEqual([callback["owner"] for callback in slow_callbacks],
+                         ["on_message", "Tasks.load_schedule"])
+        self.assertEqual(slow_callbacks[0]["count"], 2)
+        self.assertAlmostEqual(slow_callbacks[0]["total_time"], 0.6)
+        self.assertEqual(slow_callbacks[0]["max_time"], 0.4)
+
+    def test_debug_mode_stays_off_without_threshold(self):
+        async def start_and_stop():
+            self.monitor.start()
+            debug = asyncio.get_running_loop().get_debug()
+            await asyncio.sleep(0.05)
+            self.monitor.stop()
+            return debug
+        self.assertFalse(asyncio.run(start_and_stop(), debug=False))
+        self.assertGreater(len(self.monitor.lags), 0)
+
+    def test_threshold_turns_debug_mode_on_until_stopped(self):
+        monitor = LoopMonitor(interval=0.01, slow_callback_threshold=0.05)
+        async def start_and_stop():
+            monitor.start()
+            started = asyncio.get_running_loop().get_debug()
+            monitor.stop()
+            return started, asyncio.get_running_loop().get_debug()
+        self.assertEqual(asyncio.run(start_and_stop(), debug=False), (True, False))
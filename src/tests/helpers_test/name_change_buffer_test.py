@@ -0,0 +1,55 @@
+import unittest
+from helpers.name_change_buffer import NameChangeBuffer
+
+class TestNameChangeBuffer(unittest.TestCase):
+    def setUp(self):
+        self.buffer = NameChangeBuffer()
+
+    def test_successive_changes_are_merged(self):
+        self.buffer.record("username", 1234, None, "first", "second")
+        self.buffer.record("username", 1234, None, "second", "third")
+        self.assertEqual(self.buffer.take(), [("username", 1234, None, "first", "third")])
+        self.assertEqual(self.buffer.merged, 1)
+
+    def test_changes_of_different_names_are_kept_apart(self):
+        self.buffer.record("username", 1234, None, "first", "second")
+        self.buffer.record("nickname", 1234, 9876, None, "nick")
+        self.buffer.record("nickname", 1234, 8765, None, "other nick")
+        self.assertEqual(len(self.buffer), 3)
+        self.assertEqual(self.buffer.merged, 0)
+
+    def test_change_back_to_original_name_is_dropped(self):
+        self.buffer.record("global_name", 1234, None, "first", "second")
+        self.buffer.record("global_name", 1234, None, "second", "first")
+        self.assertEqual(len(self.buffer), 0)
+        self.assertEqual(self.buffer.take(), [])
+
+    def test_take_empties_buffer_in_order_of_first_change(self):
+        self.buffer.record("username", 1234, None, "a", "b")
+        self.buffer.record("username", 2345, None, "c", "d")
+        self.buffer.record("username", 1234, None, "b", "e")
+        self.assertEqual(self.buffer.take(), [("username", 1234, None, "a", "e"),
+                                              ("username", 2345, None, "c", "d")])
+        self.assertEqual(len(self.buffer), 0)
+
+    def test_restored_changes_come_before_newer_ones(self):
+        self.buffer.record("username", 1234, None, "a", "b")
+        changes = self.buffer.take()
+        self.buffer.record("username", 2345, None, "c", "d")
+        self.buffer.restore(changes)
+        self.assertEqual(self.buffer.take(), [("username", 1234, None, "a", "b"),
+                                              ("username", 2345, None, "c", "d")])
+
+    def test_restored_changes_merge_with_newer_ones(self):
+        self.buffer.record("username", 1234, None, "a", "b")
+        changes = self.buffer.take()
+        self.buffer.record("username", 1234, None, "b", "c")
+        self.buffer.restore(changes)
+        self.assertEqual(self.buffer.take(), [("username", 1234, None, "a", "c")])
+
+    def test_restored_change_reverted_by_newer_one_is_dropped(self):
+        self.buffer.record("nickname", 1234, 9876, "a", "b")
+        changes = self.buffer.take()
+        self.buffer.record("nickname", 1234, 9876, "b", "a")
+        self.buffer.restore(changes)
+        self.assertEqual(len(self.buffer), 0)
@@ -0,0 +1,33 @@
+import unittest
+from helpers.prometheus_metrics import Histogram, MetricsWriter, format_labels
+
+class TestPrometheusMetrics(unittest.TestCase):
+    def test_labels_are_escaped(self):
+        self.assertEqual(format_labels({}), "")
+        self.assertEqual(format_labels({"sql": "a\"b\\c\nd"}), "{sql=\"a\\\"b\\\\c\\nd\"}")
+
+    def test_histogram_buckets_are_cumulative(self):
+        histogram = Histogram(("command",), (0.1, 1.0))
+        histogram.observe(("rank",), 0.05)
+        histogram.observe(("rank",), 0.5)
+        histogram.observe(("rank",), 2.0)
+        samples = list(histogram.samples("duration"))
+        self.assertEqual(samples[:3], [("duration_bucket", {"command": "rank", "le": "0.1"}, 1),
+                                       ("duration_bucket", {"command": "rank", "le": "1"}, 2),
+                                       ("duration_bucket", {"command": "rank", "le": "+Inf"}, 3)])
+        self.assertEqual(samples[3][2], 2.55)
+        self.assertEqual(samples[4], ("duration_count", {"command": "rank"}, 3))
+
+    def test_writer_renders_families(self):
+        writer = MetricsWriter()
+        writer.add("queued", "gauge", "Writes waiting", [({}, 3)])
+        writer.add("wait_seconds", "counter", "Time waited", [({"connection": "reader"}, 0.5)])
+        histogram = Histogram(("event",), (1.0,))
+        histogram.observe(("on_message",), 0.5)
+        writer.add_histogram("listener_seconds", "Listener run times", histogram)
+        lines = writer.render().splitlines()
+        self.assertEqual(lines[:3], ["# HELP queued Writes waiting", "# TYPE queued gauge",
+                                     "queued 3"])
+        self.assertIn("wait_seconds{connection=\"reader\"} 0.5", lines)
+        self.assertIn("# TYPE listener_seconds histogram", lines)
+        self.assertIn("listener_seconds_bucket{event=\"on_message\",le=\"1\"} 1", lines)
@@ -0,0 +1,117 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+from entities.unverified_reminder_message_entity import UnverifiedReminderMessageEntity
+from helpers.unverified_member_scheduler import UnverifiedMemberScheduler
+
+class TestUnverifiedMemberScheduler(unittest.TestCase):
+    def setUp(self):
+        self.scheduler = UnverifiedMemberScheduler()
+        self.joined_at = datetime(2024, 1, 1, 12, 0)
+        self.first = UnverifiedReminderMessageEntity(1, "Please verify", 60)
+        self.second = UnverifiedReminderMessageEntity(2, "Please verify soon", 120)
+
+    def _after(self, seconds: int):
+        return self.joined_at + timedelta(seconds=seconds)
+
+    def test_guild_without_rules_schedules_nothing(self):
+        self.scheduler.track(9876, 1234, self.joined_at)
+        self.assertFalse(self.scheduler.has_rules(9876))
+        self.assertTrue(self.scheduler.is_tracked(9876, 1234))
+        self.assertIsNone(self.scheduler.next_deadline())
+        self.assertEqual(len(self.scheduler), 0)
+
+    def test_next_deadline_is_earliest_of_all_members(self):
+        self.scheduler.set_guild_rules(9876, 300, [self.second])
+        self.scheduler.set_guild_rules(8765, None, [self.first])
+        self.scheduler.track(9876, 1234, self.joined_at)
+        self.scheduler.track(8765, 2345, self.joined_at)
+        self.assertEqual(self.scheduler.next_deadline(), self._after(60))
+        self.assertEqual(len(self.scheduler), 2)
+
+    def test_aware_join_time_is_converted_to_utc(self):
+        self.scheduler.set_guild_rules(9876, None, [self.first])
+        joined_at = self.joined_at.replace(tzinfo=timezone(timedelta(hours=2)))
+        self.scheduler.track(9876, 1234, joined_at)
+        self.assertEqual(self.scheduler.next_deadline(), self._after(60) - timedelta(hours=2))
+
+    def test_nothing_is_due_before_deadline(self):
+        self.scheduler.set_guild_rules(9876, None, [self.first])
+        self.scheduler.track(9876, 1234, self.joined_at)
+        self.assertEqual(self.scheduler.pop_due(self._after(59)), [])
+        self.assertEqual(self.scheduler.next_deadline(), self._after(60))
+
+    def test_due_member_is_rescheduled_for_next_reminder(self):
+        self.scheduler.set_guild_rules(9876, 300, [self.second, self.first])
+        self.scheduler.track(9876, 1234, self.joined_at)
+        self.assertEqual(self.scheduler.pop_due(self._after(60)),
+                         [(9876, 1234, [self.first], False)])
+        self.assertEqual(self.scheduler.next_deadline(), self._after(120))
+        self.assertTrue(self.scheduler.is_tracked(9876, 1234))
+
+    def test_overdue_reminders_are_sent_together(self):
+        self.scheduler.set_guild_rules(9876, 300, [self.first, self.second])
+        self.scheduler.track(9876, 1234, self.joined_at)
+        self.assertEqual(self.scheduler.pop_due(self._after(150)),
+                         [(9876, 1234, [self.first, self.second], False)])
+        self.assertEqual(self.scheduler.next_deadline(), self._after(300))
+
+    def test_sent_reminders_are_not_sent_again(self):
+        self.scheduler.set_guild_rules(9876, None, [self.first, self.second])
+        self.scheduler.track(9876, 1234, self.joined_at, [1])
+        self.assertEqual(self.scheduler.next_deadline(), self._after(120))
+        self.scheduler.pop_due(self._after(120))
+        self.assertIsNone(self.scheduler.next_deadline())
+
+    def test_member_is_kicked_and_untracked_at_kick_deadline(self):
+        self.scheduler.set_guild_rules(9876, 300, [self.first])
+        self.scheduler.track(9876, 1234, self.joined_at)
+        self.assertEqual(self.scheduler.pop_due(self._after(300)), [(9876, 1234, [], True)])
+        self.assertFalse(self.scheduler.is_tracked(9876, 1234))
+        self.assertIsNone(self.scheduler.next_deadline())
+
+    def test_kick_before_reminders_skips_them(self):
+        self.scheduler.set_guild_rules(9876, 30, [self.first])
+        self.scheduler.track(9876, 1234, self.joined_at)
+        self.assertEqual(self.scheduler.next_deadline(), self._after(30))
+        self.assertEqual(self.scheduler.pop_due(self._after(90)), [(9876, 1234, [], True)])
+
+    def test_untracked_member_entry_is_skipped(self):
+        self.scheduler.set_guild_rules(9876, 300, [self.first])
+        self.scheduler.track(9876, 1234, self.joined_at)
+        self.scheduler.track(9876, 2345, self._after(30))
+        self.scheduler.untrack(9876, 1234)
+        self.assertEqual(self.scheduler.next_deadline(), self._after(90))
+        self.assertEqual(self.scheduler.pop_due(self._after(90)),
+                         [(9876, 2345, [self.first], False)])
+
+    def test_changed_rules_reschedule_members(self):
+        self.scheduler.set_guild_rules(9876, 300, [])
+        self.scheduler.track(9876, 1234, self.joined_at)
+        self.scheduler.set_guild_rules(9876, 600, [self.first])
+        self.assertEqual(self.scheduler.next_deadline(), self._after(60))
+        self.scheduler.set_guild_rules(9876, 600, [])
+        self.assertEqual(self.scheduler.next_deadline(), self._after(600))
+        self.assertEqual(self.scheduler.pop_due(self._after(300)), [])
+
+    def test_removed_guild_members_are_untracked(self):
+        self.scheduler.set_guild_rules(9876, 300, [self.first])
+        self.scheduler.set_guild_rules(8765, 300, [])
+        self.scheduler.track(9876, 1234, self.joined_at)
+        self.scheduler.track(8765, 1234, self._after(10))
+        self.scheduler.remove_guild(9876)
+        self.assertFalse(self.scheduler.has_rules(9876))
+        self.assertFalse(self.scheduler.is_tracked(9876, 1234))
+        self.assertEqual(self.scheduler.next_deadline(), self._after(310))
+
+    def test_reminders_without_timedelta_are_skipped(self):
+        undated = UnverifiedReminderMessageEntity(3, "Please verify", None)
+        self.scheduler.set_guild_rules(9876, None, [self.second, undated, self.first])
+        self.scheduler.track(9876, 1234, self.joined_at)
+        self.assertEqual(self.scheduler.pop_due(self._after(120)),
+                         [(9876, 1234, [self.first, self.second], False)])
+        self.assertIsNone(self.scheduler.next_deadline())
+
+    def test_guild_with_only_undated_reminders_has_no_rules(self):
+        undated = UnverifiedReminderMessageEntity(3, "Please verify", None)
+        self.scheduler.set_guild_rules(9876, None, [undated])
+        self.assertFalse(self.scheduler.has_rules(9876))
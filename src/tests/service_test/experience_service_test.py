@@ -0,0 +1,108 @@
+import asyncio
+import unittest
+import os
+from services.experience_service import ExperienceService
+
+class TestExperienceService(unittest.TestCase):
+    def setUp(self):
+        db_address = "database/test_db.db"
+        os.popen(f"sqlite3 {db_address} < database/test_schema.sql")
+        self.experience_service = ExperienceService(db_address)
+
+    def tearDown(self):
+        asyncio.run(self.experience_service.clear_experience())
+
+    def test_experience_is_not_written_before_flush(self):
+        asyncio.run(self.experience_service.add_user_experience(1234, 9876, 10, 60))
+        row = asyncio.run(self.experience_service.experience_dao.get_user_experience(1234, 9876))
+        self.assertIsNone(row)
+        experience = asyncio.run(self.experience_service.get_user_experience(1234, 9876))
+        self.assertEqual(experience.amount, 10)
+
+    def test_cooldown_is_applied_in_memory(self):
+        self.assertTrue(asyncio.run(self.experience_service.add_user_experience(1234, 9876, 10, 60)))
+        self.assertFalse(asyncio.run(self.experience_service.add_user_experience(1234, 9876, 10, 60)))
+        self.assertTrue(asyncio.run(self.experience_service.add_user_experience(2345, 9876, 10, 60)))
+        self.assertEqual(len(self.experience_service.accumulator), 2)
+
+    def test_cooldown_is_loaded_from_database(self):
+        asyncio.run(self.experience_service.experience_dao.add_user_experience(1234, 9876, 10, 60))
+        self.assertFalse(asyncio.run(self.experience_service.add_user_experience(1234, 9876, 10, 60)))
+
+    def test_flush_writes_aggregated_experience(self):
+        asyncio.run(self.experience_service.add_user_experience(1234, 9876, 10, 0))
+        asyncio.run(self.experience_service.add_user_experience(1234, 9876, 10, -1))
+        asyncio.run(self.experience_service.add_user_experience(2345, 9876, 5, 0))
+        totals = asyncio.run(self.experience_service.flush_experience())
+        self.assertEqual({(entity.user_id, entity.amount, previous) for entity, previous in totals},
+                         {(1234, 20, 0), (2345, 5, 0)})
+        self.assertEqual(len(self.experience_service.accumulator), 0)
+        leaderboard = asyncio.run(self.experience_service.get_guild_leaderboard(9876))
+        self.assertEqual([(entity.user_id, entity.amount) for entity in leaderboard],
+                         [(1234, 20), (2345, 5)])
+
+    def test_leaderboard_includes_pending_experience_without_flushing(self):
+        asyncio.run(self.experience_service.add_user_experience(1234, 9876, 10, 0))
+        asyncio.run(self.experience_service.flush_experience())
+        asyncio.run(self.experience_service.add_user_experience(1234, 9876, 10, -1))
+        asyncio.run(self.experience_service.add_user_experience(2345, 9876, 15, 0))
+        leaderboard = asyncio.run(self.experience_service.get_guild_leaderboard(9876))
+        self.assertEqual([(entity.user_id, entity.amount) for entity in leaderboard],
+                         [(1234, 20), (2345, 15)])
+        self.assertEqual(len(self.experience_service.accumulator), 2)
+
+    def test_flush_adds_to_existing_experience(self):
+        asyncio.run(self.experience_service.add_user_experience(1234, 9876, 10, 0))
+        asyncio.run(self.experience_service.flush_experience())
+        asyncio.run(self.experience_service.add_user_experience(1234, 9876, 10, -1))
+        [(entity, previous)] = asyncio.run(self.experience_service.flush_experience())
+        self.assertEqual((entity.amount, previous), (20, 10))
+        experience = asyncio.run(self.experience_service.get_user_experience(1234, 9876))
+        self.assertEqual(experience.amount, 20)
+
+    def test_reset_drops_pending_experience(self):
+        asyncio.run(self.experience_service.add_user_experience(1234, 9876, 10, 60))
+        asyncio.run(self.experience_service.flush_experience())
+        asyncio.run(self.experience_service.add_user_experience(1234, 9876, 10, -1))
+        asyncio.run(self.experience_service.reset_user_experience(1234, 9876))
+        asyncio.run(self.experience_service.flush_experience())
+        experience = asyncio.run(self.experience_service.get_user_experience(1234, 9876))
+        self.assertEqual(experience.amount, 0)
+
+    def test_user_rank_includes_pending_experience(self):
+        asyncio.run(self.experience_service.experience_dao.add_experience_in_bulk(
+            [(1234, 9876, "2000-01-01 00:00:00", 30), (2345, 9876, "2000-01-01 00:00:00", 20)]))
+        asyncio.run(self.experience_service.add_user_experience(3456, 9876, 25, 60))
+        self.assertEqual(asyncio.run(self.experience_service.get_user_rank(3456, 9876)), 2)
+        self.assertEqual(asyncio.run(self.experience_service.get_user_rank(2345, 9876)), 3)
+        self.assertIsNone(asyncio.run(self.experience_service.get_user_rank(4567, 9876)))
+
+    def test_leaderboard_follows_awarded_experience(self):
+        asyncio.run(self.experience_service.add_user_experience(1234, 9876, 10, 60))
+        asyncio.run(self.experience_service.add_user_experience(2345, 9876, 5, 60))
+        self.assertEqual(asyncio.run(self.experience_service.get_user_rank(2345, 9876)), 2)
+        asyncio.run(self.experience_service.add_user_experience(2345, 9876, 10, -1))
+        self.assertEqual(asyncio.run(self.experience_service.get_user_rank(2345, 9876)), 1)
+        asyncio.run(self.experience_service.flush_experience())
+        rebuilt = asyncio.run(self.experience_service.rebuild_leaderboard(9876))
+        self.assertEqual(rebuilt.top(2), [(2345, 15), (1234, 10)])
+
+    def test_leaderboard_pages_are_found(self):
+        for user_id in range(25):
+            asyncio.run(self.experience_service.add_user_experience(user_id, 9876, user_id, 60))
+        asyncio.run(self.experience_service.flush_experience())
+        page = asyncio.run(self.experience_service.get_leaderboard_page(9876, 2, 10))
+        self.assertEqual([entity.user_id for entity in page], list(range(14, 4, -1)))
+        top = asyncio.run(self.experience_service.get_top_experience(9876, 3))
+        self.assertEqual([entity.amount for entity in top], [24, 23, 22])
+        self.assertEqual(asyncio.run(self.experience_service.get_leaderboard_size(9876)), 25)
+
+    def test_reset_and_delete_update_the_leaderboard(self):
+        asyncio.run(self.experience_service.add_user_experience(1234, 9876, 10, 60))
+        asyncio.run(self.experience_service.add_user_experience(2345, 9876, 5, 60))
+        asyncio.run(self.experience_service.flush_experience())
+        self.assertEqual(asyncio.run(self.experience_service.get_user_rank(1234, 9876)), 1)
+        asyncio.run(self.experience_service.reset_user_experience(1234, 9876))
+        self.assertEqual(asyncio.run(self.experience_service.get_user_rank(1234, 9876)), 2)
+        asyncio.run(self.experience_service.delete_user_experience(1234, 9876))
+        self.assertIsNone(asyncio.run(self.experience_service.get_user_rank(1234, 9876)))
@@ -0,0 +1,24 @@
+import asyncio
+import unittest
+import os
+from services.global_name_service import GlobalNameService
+
+class TestGlobalNameService(unittest.TestCase):
+    def setUp(self):
+        db_address = "database/test_db.db"
+        os.popen(f"sqlite3 {db_address} < database/test_schema.sql")
+        self.global_name_service = GlobalNameService(db_address)
+
+    def tearDown(self):
+        asyncio.run(self.global_name_service.clear_global_names())
+
+    def test_user_global_names_are_found_newest_first(self):
+        asyncio.run(self.global_name_service.add_global_names([("Test1", 1234), ("Test2", 1234),
+                                                               ("Test3", 2345)]))
+        global_names = asyncio.run(self.global_name_service.find_user_global_names(1234))
+        self.assertEqual([entity.global_name for entity in global_names], ["Test2", "Test1"])
+
+    def test_user_global_names_are_deleted(self):
+        asyncio.run(self.global_name_service.add_global_name("Test", 1234))
+        asyncio.run(self.global_name_service.delete_user_global_names(1234))
+        self.assertEqual(asyncio.run(self.global_name_service.find_global_names("Test")), [])
@@ -127,6 +127,13 @@ class TestGuildSettingService(unittest.TestCase):
         self.assertEqual(guild_settings[0].value, "testing")
         self.assertEqual(guild_settings[1].value, "testing_too")
 
+    def test_settings_of_several_guilds_are_initialized_correctly(self):
+        asyncio.run(self.guild_setting_service.get_guild_setting_value_by_name(1234, "test"))
+        ids = asyncio.run(self.guild_setting_service.initialize_guilds_settings([1234, 2345]))
+        self.assertEqual(len(ids), 2)
+        guild_setting = asyncio.run(self.guild_setting_service.get_guild_setting_value_by_name(1234, "test"))
+        self.assertEqual(guild_setting.value, "testing")
+
     def test_guild_settings_are_reset_correctly(self):
         guild_setting_id = asyncio.run(self.guild_setting_service.add_guild_setting_by_setting_name(1234, "test", "testing1"))
         asyncio.run(self.guild_setting_service.reset_guild_setting_to_default_value(1234, guild_setting_id))
@@ -147,3 +154,40 @@ class TestGuildSettingService(unittest.TestCase):
         asyncio.run(self.guild_setting_service.reset_guild_setting_to_default_value_by_name(1234, "test"))
         guild_setting = asyncio.run(self.guild_setting_service.get_guild_setting_value_by_name(1234, "test"))
         self.assertEqual(guild_setting.value, "testing")
+
+    def test_guild_settings_are_loaded_into_cache_once(self):
+        asyncio.run(self.guild_setting_service.add_guild_setting_by_setting_name(1234, "test", "testing1"))
+        misses = self.guild_setting_service.cache.misses
+        hits = self.guild_setting_service.cache.hits
+        for _ in range(3):
+            asyncio.run(self.guild_setting_service.get_guild_setting_value_by_name(1234, "test"))
+        self.assertEqual(self.guild_setting_service.cache.misses, misses + 1)
+        self.assertEqual(self.guild_setting_service.cache.hits, hits + 2)
+
+    def test_cached_guild_setting_is_updated_by_edit_through_another_service(self):
+        other_service = GuildSettingService("database/test_db.db")
+        asyncio.run(self.guild_setting_service.add_guild_setting_by_setting_name(1234, "test", "testing1"))
+        asyncio.run(self.guild_setting_service.get_guild_setting_value_by_name(1234, "test"))
+        asyncio.run(other_service.edit_guild_setting_by_setting_name(1234, "test", "testing2"))
+        guild_setting = asyncio.run(self.guild_setting_service.get_guild_setting_value_by_name(1234, "test"))
+        self.assertEqual(guild_setting.value, "testing2")
+
+    def test_guild_load_during_edit_by_id_is_not_cached(self):
+        guild_setting_id = asyncio.run(self.guild_setting_service.add_guild_setting_by_setting_name(1234, "test", "testing1"))
+        cache = self.guild_setting_service.cache
+        version = cache.get_version(1234)
+        stale = asyncio.run(self.guild_setting_service.get_all_guild_settings(1234))
+        asyncio.run(self.guild_setting_service.edit_guild_setting_by_id(guild_setting_id, "testing2"))
+        cache.store_guild(1234, stale, version)
+        guild_setting = asyncio.run(self.guild_setting_service.get_guild_setting_value_by_name(1234, "test"))
+        self.assertEqual(guild_setting.value, "testing2")
+
+    def test_guild_load_during_delete_by_id_is_not_cached(self):
+        guild_setting_id = asyncio.run(self.guild_setting_service.add_guild_setting_by_setting_name(1234, "test", "testing1"))
+        cache = self.guild_setting_service.cache
+        version = cache.get_version(1234)
+        stale = asyncio.run(self.guild_setting_service.get_all_guild_settings(1234))
+        asyncio.run(self.guild_setting_service.delete_guild_setting_by_id(guild_setting_id))
+        cache.store_guild(1234, stale, version)
+        guild_setting = asyncio.run(self.guild_setting_service.get_guild_setting_value_by_name(1234, "test"))
+        self.assertIsNone(guild_setting)
@@ -0,0 +1,36 @@
+import asyncio
+import unittest
+import os
+from helpers.levels import get_level_experience
+from services.level_reward_role_service import LevelRewardRoleService
+
+class TestLevelRewardRoleService(unittest.TestCase):
+    def setUp(self):
+        db_address = "database/test_db.db"
+        os.popen(f"sqlite3 {db_address} < database/test_schema.sql")
+        self.level_reward_role_service = LevelRewardRoleService(db_address)
+        asyncio.run(self.level_reward_role_service.add_level_reward_role(111, 9876, 1))
+        asyncio.run(self.level_reward_role_service.add_level_reward_role(222, 9876, 3))
+        asyncio.run(self.level_reward_role_service.add_level_reward_role(333, 9876, 5))
+
+    def tearDown(self):
+        asyncio.run(self.level_reward_role_service.clear_level_reward_roles())
+
+    def test_crossed_roles_are_batched_per_member(self):
+        earned = asyncio.run(self.level_reward_role_service.get_earned_roles(
+            [(1234, 9876, 0, get_level_experience(3)),
+             (2345, 9876, get_level_experience(1), get_level_experience(5) - 1),
+             (3456, 9876, get_level_experience(1), get_level_experience(2))]))
+        self.assertEqual(earned, {(9876, 1234): [111, 222], (9876, 2345): [222]})
+
+    def test_guild_without_rewards_earns_nothing(self):
+        earned = asyncio.run(self.level_reward_role_service.get_earned_roles(
+            [(1234, 8765, 0, get_level_experience(10))]))
+        self.assertEqual(earned, {})
+
+    def test_new_reward_is_used_after_loading(self):
+        asyncio.run(self.level_reward_role_service.get_earned_roles([(1234, 9876, 0, 1)]))
+        asyncio.run(self.level_reward_role_service.add_level_reward_role(444, 9876, 2))
+        earned = asyncio.run(self.level_reward_role_service.get_earned_roles(
+            [(1234, 9876, get_level_experience(1), get_level_experience(2))]))
+        self.assertEqual(earned, {(9876, 1234): [444]})
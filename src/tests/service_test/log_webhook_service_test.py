@@ -0,0 +1,37 @@
+import asyncio
+import unittest
+import os
+from services.log_webhook_service import LogWebhookService
+
+class TestLogWebhookService(unittest.TestCase):
+    def setUp(self):
+        db_address = "database/test_db.db"
+        os.popen(f"sqlite3 {db_address} < database/test_schema.sql")
+        self.log_webhook_service = LogWebhookService(db_address)
+
+    def tearDown(self):
+        asyncio.run(self.log_webhook_service.clear_log_webhooks())
+
+    def test_channel_webhook_is_found_correctly(self):
+        asyncio.run(self.log_webhook_service.add_webhook(1234, 9876, 5555, "token"))
+        webhook = asyncio.run(self.log_webhook_service.get_channel_webhook(1234))
+        self.assertEqual(webhook.webhook_id, 5555)
+        self.assertEqual(webhook.webhook_token, "token")
+        self.assertEqual(webhook.guild_id, 9876)
+
+    def test_missing_channel_webhook_is_none(self):
+        webhook = asyncio.run(self.log_webhook_service.get_channel_webhook(1234))
+        self.assertIsNone(webhook)
+
+    def test_guild_webhooks_are_found_correctly(self):
+        asyncio.run(self.log_webhook_service.add_webhook(1234, 9876, 5555, "token"))
+        asyncio.run(self.log_webhook_service.add_webhook(2345, 9876, 6666, "token2"))
+        asyncio.run(self.log_webhook_service.add_webhook(3456, 8765, 7777, "token3"))
+        webhooks = asyncio.run(self.log_webhook_service.get_guild_webhooks(9876))
+        self.assertEqual([webhook.channel_id for webhook in webhooks], [1234, 2345])
+
+    def test_channel_webhook_is_deleted_correctly(self):
+        asyncio.run(self.log_webhook_service.add_webhook(1234, 9876, 5555, "token"))
+        asyncio.run(self.log_webhook_service.delete_channel_webhook(1234))
+        webhook = asyncio.run(self.log_webhook_service.get_channel_webhook(1234))
+        self.assertIsNone(webhook)
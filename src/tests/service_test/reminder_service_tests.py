@@ -142,3 +142,23 @@ class TestReminderService(unittest.TestCase):
         asyncio.run(self.reminder_service.delete_reminders_with_no_repeats())
         reminders = asyncio.run(self.reminder_service.get_reminders_by_user(1234))
         self.assertEqual(len(reminders), 1)
+
+    def test_due_reminders_are_popped_from_the_schedule(self):
+        asyncio.run(self.reminder_service.add_new_reminder(1234, 9876, "test1", self.expired1, "time"))
+        asyncio.run(self.reminder_service.add_new_reminder(1234, 9876, "test2", self.date1, "time"))
+        reminders = asyncio.run(self.reminder_service.pop_due_reminders(datetime.utcnow()))
+        self.assertEqual(len(reminders), 1)
+        self.assertEqual(reminders[0].content, "test1")
+        self.assertEqual(self.reminder_service.schedule.next_date(), self.date1)
+
+    def test_delivered_reminders_are_rescheduled_or_deleted(self):
+        asyncio.run(self.reminder_service.add_new_reminder(1234, 9876, "test1", self.expired2, "after", False, 86400 * 3, 2))
+        asyncio.run(self.reminder_service.add_new_reminder(1234, 9876, "test2", self.expired1, "after", False, 3600, 1))
+        now = datetime.utcnow()
+        reminders = asyncio.run(self.reminder_service.pop_due_reminders(now))
+        asyncio.run(self.reminder_service.reschedule_delivered_reminders(reminders, now))
+        reminders = asyncio.run(self.reminder_service.get_reminders_by_user(1234))
+        self.assertEqual(len(reminders), 1)
+        self.assertEqual(reminders[0].repeats_left, 1)
+        self.assertEqual(datetime.fromisoformat(reminders[0].reminder_date), self.expired2 + timedelta(days=3))
+        self.assertEqual(self.reminder_service.schedule.next_date(), self.expired2 + timedelta(days=3))
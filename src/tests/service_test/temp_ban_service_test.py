@@ -76,3 +76,36 @@ class TestTempBanService(unittest.TestCase):
         temp_bans = asyncio.run(self.temp_ban_service.get_expired_temp_bans())
         self.assertEqual(len(temp_bans), 1)
         self.assertNotEqual(temp_bans[0].guild_id, 9876)
+
+    def test_created_temp_bans_are_scheduled_by_expiration(self):
+        asyncio.run(self.temp_ban_service.create_temp_ban(1234, 9876, self.expiration1))
+        asyncio.run(self.temp_ban_service.create_temp_ban(2345, 9876, self.expiration2))
+        self.assertEqual(self.temp_ban_service.schedule.next_expiration(), self.expiration2)
+        expired = self.temp_ban_service.schedule.pop_expired(datetime.utcnow())
+        self.assertEqual(len(expired), 1)
+        self.assertEqual(expired[0].user_id, 2345)
+        self.assertEqual(self.temp_ban_service.schedule.next_expiration(), self.expiration1)
+
+    def test_edited_and_deleted_temp_bans_are_rescheduled(self):
+        asyncio.run(self.temp_ban_service.create_temp_ban(1234, 9876, self.expiration2))
+        asyncio.run(self.temp_ban_service.create_temp_ban(2345, 9876, self.expiration2))
+        asyncio.run(self.temp_ban_service.edit_temp_ban(1234, 9876, self.expiration1))
+        asyncio.run(self.temp_ban_service.delete_temp_ban(2345, 9876))
+        self.assertEqual(len(self.temp_ban_service.schedule.pop_expired(datetime.utcnow())), 0)
+        self.assertEqual(self.temp_ban_service.schedule.next_expiration(), self.expiration1)
+
+    def test_schedule_is_loaded_from_the_database(self):
+        asyncio.run(self.temp_ban_service.create_temp_ban(1234, 9876, self.expiration2))
+        asyncio.run(self.temp_ban_service.create_temp_ban(1234, 8765, self.expiration1))
+        self.temp_ban_service.schedule.clear()
+        asyncio.run(self.temp_ban_service.load_schedule())
+        self.assertEqual(len(self.temp_ban_service.schedule), 2)
+        self.assertEqual(self.temp_ban_service.schedule.next_expiration(), self.expiration2)
+
+    def test_expired_temp_bans_are_deleted_in_bulk_after_popping(self):
+        temp_ban_id = asyncio.run(self.temp_ban_service.create_temp_ban(1234, 9876, self.expiration2))
+        asyncio.run(self.temp_ban_service.edit_temp_ban(1234, 9876, self.expiration2))
+        expired = self.temp_ban_service.schedule.pop_expired(datetime.utcnow())
+        self.assertEqual(expired[0].db_id, temp_ban_id)
+        asyncio.run(self.temp_ban_service.delete_temp_bans_by_ids([ban.db_id for ban in expired]))
+        self.assertIsNone(asyncio.run(self.temp_ban_service.get_temp_ban(1234, 9876)))
@@ -25,6 +25,12 @@ class TestUnverifiedReminderHistoryService(unittest.TestCase):
         history = asyncio.run(self.unverified_reminder_history_service.get_member_reminder_history(1234, 9876))
         self.assertEqual(len(history), 1)
 
+    def test_guild_reminder_history_is_found_correctly_after_bulk_add(self):
+        asyncio.run(self.unverified_reminder_history_service.add_to_reminder_history_in_bulk([(1234, self.message1.db_id), (2345, self.message1.db_id), (1234, self.message2.db_id)]))
+        history = asyncio.run(self.unverified_reminder_history_service.get_guild_reminder_history(9876))
+        self.assertEqual(len(history), 2)
+        self.assertEqual(history[0].reminder_message_id, self.message1.db_id)
+
     def test_member_reminder_history_is_deleted_correctly(self):
         asyncio.run(self.unverified_reminder_history_service.add_to_member_reminder_history(1234, self.message1.db_id))
         asyncio.run(self.unverified_reminder_history_service.add_to_member_reminder_history(1234, self.message2.db_id))
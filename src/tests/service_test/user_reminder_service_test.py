@@ -92,3 +92,13 @@ class TestUserReminderService(unittest.TestCase):
         self.assertEqual(len(user_reminders1), 0)
         self.assertEqual(len(user_reminders2), 0)
         self.assertEqual(len(user_reminders3), 0)
+
+    def test_opted_in_users_of_several_reminders_are_found_correctly(self):
+        asyncio.run(self.user_reminder_service.create_user_reminder(1234, self.reminder_id1))
+        asyncio.run(self.user_reminder_service.create_user_reminder(2345, self.reminder_id1))
+        asyncio.run(self.user_reminder_service.create_user_reminder(2345, self.reminder_id2))
+        asyncio.run(self.user_reminder_service.create_user_reminder(3456, self.reminder_id3))
+        users = asyncio.run(self.user_reminder_service.get_opted_in_users_of_reminders([self.reminder_id1, self.reminder_id2]))
+        self.assertEqual(sorted(users[self.reminder_id1]), [1234, 2345])
+        self.assertEqual(users[self.reminder_id2], [2345])
+        self.assertNotIn(self.reminder_id3, users)
@@ -3,6 +3,18 @@ import unittest
 import os
 from services.utility_channel_service import UtilityChannelService
 
+class FakeChannel:
+    def __init__(self, channel_id):
+        self.id = channel_id
+
+class FakeClient:
+    def __init__(self):
+        self.lookups = 0
+
+    def get_channel(self, channel_id):
+        self.lookups += 1
+        return FakeChannel(channel_id)
+
 class TestUtilityChannelService(unittest.TestCase):
     def setUp(self):
         db_address = "database/test_db.db"
@@ -60,3 +72,30 @@ class TestUtilityChannelService(unittest.TestCase):
         channels2 = asyncio.run(self.utility_channel_service.get_all_guild_utility_channels(8765))
         self.assertEqual(len(channels1), 0)
         self.assertEqual(len(channels2), 1)
+
+    def test_resolved_guild_utility_channels_are_cached(self):
+        client = FakeClient()
+        asyncio.run(self.utility_channel_service.create_guild_utility_channel(1234, 9876, "log"))
+        for _ in range(3):
+            channels = asyncio.run(self.utility_channel_service.get_guild_discord_channels_by_purpose(client, 9876, "log"))
+        self.assertEqual([channel.id for channel in channels], [1234])
+        self.assertEqual(client.lookups, 1)
+
+    def test_cached_guild_utility_channels_are_invalidated_by_changes(self):
+        client = FakeClient()
+        asyncio.run(self.utility_channel_service.create_guild_utility_channel(1234, 9876, "log"))
+        asyncio.run(self.utility_channel_service.get_guild_discord_channels_by_purpose(client, 9876, "log"))
+        asyncio.run(self.utility_channel_service.create_guild_utility_channel(2345, 9876, "log"))
+        channels = asyncio.run(self.utility_channel_service.get_guild_discord_channels_by_purpose(client, 9876, "log"))
+        self.assertEqual(len(channels), 2)
+        asyncio.run(self.utility_channel_service.delete_utility_channel(1234, 9876))
+        channels = asyncio.run(self.utility_channel_service.get_guild_discord_channels_by_purpose(client, 9876, "log"))
+        self.assertEqual([channel.id for channel in channels], [2345])
+
+    def test_forgotten_discord_channel_is_removed_from_cache(self):
+        client = FakeClient()
+        asyncio.run(self.utility_channel_service.create_guild_utility_channel(1234, 9876, "log"))
+        asyncio.run(self.utility_channel_service.get_guild_discord_channels_by_purpose(client, 9876, "log"))
+        self.utility_channel_service.forget_discord_channel(9876, 1234)
+        channels = asyncio.run(self.utility_channel_service.get_guild_discord_channels_by_purpose(client, 9876, "log"))
+        self.assertEqual(channels, [])